@@ -0,0 +1,84 @@
+"""
+Collection storage profile for the initialization scripts.
+
+Mirrors the profiles of server/agent/mcp/collection_profiles.py, which the
+init image does not ship. The profile is chosen with QDRANT_COLLECTION_PROFILE
+(default, balanced or low_memory) and can be adjusted with QDRANT_QUANTIZATION,
+QDRANT_ON_DISK_VECTORS, QDRANT_ON_DISK_PAYLOAD, QDRANT_HNSW_M and
+QDRANT_HNSW_EF_CONSTRUCT.
+"""
+
+import logging
+import os
+
+from qdrant_client.http import models
+
+logger = logging.getLogger(__name__)
+
+PROFILES = {
+    # Full float32 vectors and payloads in RAM
+    "default": {"quantization": "none", "on_disk_vectors": False, "on_disk_payload": False, "hnsw_m": 16, "hnsw_ef_construct": 100},
+    # int8 vectors in RAM (4x smaller), originals and payloads on disk
+    "balanced": {"quantization": "scalar", "on_disk_vectors": True, "on_disk_payload": True, "hnsw_m": 16, "hnsw_ef_construct": 100},
+    # Product-quantized vectors in RAM (16x smaller) and a sparser graph
+    "low_memory": {"quantization": "product", "on_disk_vectors": True, "on_disk_payload": True, "hnsw_m": 8, "hnsw_ef_construct": 64},
+}
+
+
+def _env_bool(name):
+    value = os.getenv(name)
+    return None if value is None else value.lower() in ("1", "true", "yes")
+
+
+def _env_int(name):
+    value = os.getenv(name)
+    return None if value is None else int(value)
+
+
+def load_profile():
+    """Get the selected profile with environment overrides applied"""
+    name = os.getenv("QDRANT_COLLECTION_PROFILE", "default")
+    if name not in PROFILES:
+        raise ValueError(f"Unknown collection profile '{name}', expected one of {', '.join(PROFILES)}")
+    profile = dict(PROFILES[name], name=name)
+    overrides = {
+        "quantization": os.getenv("QDRANT_QUANTIZATION"),
+        "on_disk_vectors": _env_bool("QDRANT_ON_DISK_VECTORS"),
+        "on_disk_payload": _env_bool("QDRANT_ON_DISK_PAYLOAD"),
+        "hnsw_m": _env_int("QDRANT_HNSW_M"),
+        "hnsw_ef_construct": _env_int("QDRANT_HNSW_EF_CONSTRUCT"),
+    }
+    profile.update({key: value for key, value in overrides.items() if value is not None})
+    return profile
+
+
+def create_collection_kwargs(size, distance=models.Distance.COSINE, on_disk_payload=None):
+    """
+    Keyword arguments for client.create_collection under the selected profile
+
+    Args:
+        size: Vector dimensions
+        distance: Distance function
+        on_disk_payload: Force payload storage on disk regardless of the profile
+    """
+    profile = load_profile()
+    quantization = None
+    if profile["quantization"] == "scalar":
+        quantization = models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+    elif profile["quantization"] == "product":
+        quantization = models.ProductQuantization(
+            product=models.ProductQuantizationConfig(compression=models.CompressionRatio.X16, always_ram=True)
+        )
+    elif profile["quantization"] != "none":
+        raise ValueError(f"Unknown quantization '{profile['quantization']}', expected none, scalar or product")
+
+    logger.info(f"Using collection profile '{profile['name']}' (quantization: {profile['quantization']}, "
+                f"on_disk vectors: {profile['on_disk_vectors']})")
+    return {
+        "vectors_config": models.VectorParams(size=size, distance=distance, on_disk=profile["on_disk_vectors"]),
+        "hnsw_config": models.HnswConfigDiff(m=profile["hnsw_m"], ef_construct=profile["hnsw_ef_construct"]),
+        "quantization_config": quantization,
+        "on_disk_payload": profile["on_disk_payload"] if on_disk_payload is None else on_disk_payload,
+    }
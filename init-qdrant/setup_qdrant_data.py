@@ -9,6 +9,7 @@ import numpy as np
 import time
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
+from collection_profile import create_collection_kwargs
 import logging
 import sys
 import json
@@ -67,12 +68,11 @@ def create_knowledge_base(client):
     # Create collection with vector configurations
     client.create_collection(
         collection_name=collection_name,
-        vectors_config=models.VectorParams(
-            size=1536,  # OpenAI embedding dimension
-            distance=models.Distance.COSINE
-        ),
-        # Add payload schema for better filtering
-        on_disk_payload=True,  # Store payload on disk for large collections
+        # OpenAI embedding dimension, stored as the collection profile says
+        **create_collection_kwargs(
+            1536,
+            on_disk_payload=True  # Store payload on disk for large collections
+        )
     )
     
     # Define payload indexes for efficient filtering
@@ -110,10 +110,8 @@ def create_product_catalog(client):
     # Create collection with vector configurations
     client.create_collection(
         collection_name=collection_name,
-        vectors_config=models.VectorParams(
-            size=1536,  # OpenAI embedding dimension
-            distance=models.Distance.COSINE
-        )
+        # OpenAI embedding dimension, stored as the collection profile says
+        **create_collection_kwargs(1536)
     )
     
     # Define payload indexes for efficient filtering
@@ -151,10 +149,8 @@ def create_customer_support(client):
     # Create collection with vector configurations
     client.create_collection(
         collection_name=collection_name,
-        vectors_config=models.VectorParams(
-            size=1536,  # OpenAI embedding dimension
-            distance=models.Distance.COSINE
-        )
+        # OpenAI embedding dimension, stored as the collection profile says
+        **create_collection_kwargs(1536)
     )
     
     # Define payload indexes for efficient filtering
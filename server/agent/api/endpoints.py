@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional, AsyncIterator
 import asyncpg
@@ -31,6 +31,15 @@ from ..tools.state_manager import StateManager
 
 # Import database availability service
 from ..services.database_availability import get_availability_service, DatabaseStatus
+from ..db.pool_manager import get_pool_manager
+from ..db.statement_cache import get_statement_cache
+from ..db.replica_router import get_replica_stats
+from ..db.mongo_client_manager import get_mongo_client_manager
+from ..db.mongo_result_cache import get_mongo_result_cache
+from ..db.qdrant_client_manager import get_qdrant_client_manager
+from ..db.qdrant_indexes import get_filter_usage_tracker
+from ..db.columnar import to_dataframe
+from ..db.export import get_export_store
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -114,6 +123,7 @@ class QueryRequest(BaseModel):
     cross_database: bool = False
     optimize: bool = False
     save_session: bool = True
+    export_format: Optional[str] = None  # 'csv' or 'parquet': export the full result to a downloadable file
 
 class CrossDatabaseQueryRequest(BaseModel):
     question: str
@@ -134,6 +144,7 @@ class QueryResponse(BaseModel):
     session_id: Optional[str] = None
     plan_info: Optional[Dict[str, Any]] = None
     execution_summary: Optional[Dict[str, Any]] = None
+    export: Optional[Dict[str, Any]] = None
 
 class ClassifyResponse(BaseModel):
     question: str
@@ -314,7 +325,8 @@ async def query(request: QueryRequest, http_request: Request):
         "analyze": request.analyze,
         "db_type": request.db_type,
         "cross_database": request.cross_database,
-        "optimize": request.optimize
+        "optimize": request.optimize,
+        "export_format": request.export_format
     }
     
     query_logger.info(f"🚀 Query request started for user: {current_user}")
@@ -330,7 +342,8 @@ async def query(request: QueryRequest, http_request: Request):
             analyze=request.analyze,
             db_type=request.db_type,
             db_uri=request.db_uri,
-            cross_database=request.cross_database
+            cross_database=request.cross_database,
+            export_format=request.export_format
         )
         
         query_logger.info(f"process_ai_query completed: success={result.get('success', True)}, rows={len(result.get('rows', []))}")
@@ -343,7 +356,8 @@ async def query(request: QueryRequest, http_request: Request):
             "success": result.get("success", True),
             "session_id": result.get("session_id"),
             "plan_info": result.get("plan_info"),
-            "execution_summary": result.get("execution_summary")
+            "execution_summary": result.get("execution_summary"),
+            "export": result.get("export")
         }
         
         # Add user context for audit trail
@@ -385,6 +399,68 @@ async def query(request: QueryRequest, http_request: Request):
         logger.error(f"❌ Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=error_msg)
 
+def _get_export_or_404(export_id: str):
+    """Look up an export handle, raising 404 if it is unknown or expired"""
+    handle = get_export_store().get(export_id)
+    if handle is None:
+        raise HTTPException(status_code=404, detail=f"Export '{export_id}' not found or expired")
+    return handle
+
+@router.get("/query/exports/{export_id}")
+async def get_query_export(export_id: str):
+    """
+    Get the handle of a query export created with export_format
+    
+    Returns:
+        Export metadata: format, row count, size, columns and expiry
+    """
+    return _get_export_or_404(export_id).to_dict()
+
+@router.get("/query/exports/{export_id}/download")
+async def download_query_export(export_id: str):
+    """
+    Download the full result file of a query export
+    
+    Returns:
+        The CSV or Parquet file
+    """
+    handle = _get_export_or_404(export_id)
+    media_type = "text/csv" if handle.format == "csv" else "application/vnd.apache.parquet"
+    return FileResponse(handle.path, media_type=media_type, filename=handle.filename)
+
+@router.get("/query/exports/{export_id}/rows")
+async def page_query_export(export_id: str, offset: int = 0, limit: int = 100):
+    """
+    Page through the rows of a query export
+    
+    Args:
+        export_id: Export ID from the query response
+        offset: Index of the first row
+        limit: Maximum number of rows (capped at MAX_ROWS_DIRECT)
+        
+    Returns:
+        Dict with the rows and the offset of the next page (None at the end)
+    """
+    handle = _get_export_or_404(export_id)
+    limit = max(1, min(limit, Settings().MAX_ROWS_DIRECT))
+    offset = max(0, offset)
+    try:
+        # Reading a page scans the file, keep it off the event loop
+        rows = await asyncio.to_thread(get_export_store().read_page, handle, offset, limit)
+    except Exception as e:
+        logger.error(f"❌ Error reading export {export_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to read export: {str(e)}")
+    
+    next_offset = offset + len(rows)
+    return {
+        "export_id": export_id,
+        "rows": rows,
+        "offset": offset,
+        "limit": limit,
+        "row_count": handle.row_count,
+        "next_offset": next_offset if next_offset < handle.row_count else None
+    }
+
 @router.post("/cross-database-query", response_model=QueryResponse)
 async def cross_database_query(request: CrossDatabaseQueryRequest, http_request: Request):
     """
@@ -1388,6 +1464,11 @@ async def query_stream(request: QueryRequest):
             ):
                 yield event
                 
+        except asyncio.CancelledError:
+            # Client disconnected: cancellation propagates into the running query,
+            # which asyncpg cancels on the backend before releasing the connection
+            logger.info("🔌 /query/stream client disconnected, cancelling running query")
+            raise
         except Exception as e:
             logger.error(f"❌ Streaming error: {str(e)}")
             session_id = str(uuid.uuid4())
@@ -1469,6 +1550,10 @@ async def cross_database_query_stream(request: CrossDatabaseQueryRequest):
                 ):
                     yield event
                     
+        except asyncio.CancelledError:
+            # Client disconnected: cancellation propagates into the running operations
+            logger.info(f"🔌 [{session_id}] /cross-database-query/stream client disconnected, cancelling running queries")
+            raise
         except Exception as e:
             logger.error(f"❌ Cross-database streaming error: {str(e)}")
             yield create_stream_event(
@@ -1843,6 +1928,51 @@ async def get_database_summary():
         logger.error(f"❌ Error getting database summary: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get database summary: {str(e)}")
 
+@router.get("/databases/pools")
+async def get_connection_pool_stats():
+    """
+    Get usage statistics for the shared database connection pools.
+    
+    Returns:
+        Dict with per-pool stats keyed by (redacted) DSN (size, in-use and idle
+        connections, wait times), prepared statement cache hit/miss counters,
+        read replica health and routing per source, MongoDB client pools,
+        the MongoDB result cache and the shared Qdrant clients
+    """
+    logger.info(f"📊 API ENDPOINT: /databases/pools - Getting connection pool stats")
+    
+    try:
+        return {
+            "pools": get_pool_manager().get_stats(),
+            "statement_cache": get_statement_cache().get_stats(),
+            "replicas": get_replica_stats(),
+            "mongodb": get_mongo_client_manager().get_stats(),
+            "mongodb_result_cache": get_mongo_result_cache().get_stats(),
+            "qdrant": get_qdrant_client_manager().get_stats()
+        }
+        
+    except Exception as e:
+        logger.error(f"❌ Error getting connection pool stats: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get connection pool stats: {str(e)}")
+
+@router.get("/databases/qdrant/filter-usage")
+async def get_qdrant_filter_usage():
+    """
+    Get how often Qdrant payload keys are used in search filters.
+    
+    Returns:
+        Dict with per-field filter counts, the index type the filters imply and
+        average search latency with and without a payload index
+    """
+    logger.info(f"📊 API ENDPOINT: /databases/qdrant/filter-usage - Getting filter usage stats")
+    
+    try:
+        return get_filter_usage_tracker().get_stats()
+        
+    except Exception as e:
+        logger.error(f"❌ Error getting Qdrant filter usage: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get Qdrant filter usage: {str(e)}")
+
 # ========== VISUALIZATION ENDPOINTS ==========
 
 @router.post("/visualization/analyze", response_model=VisualizationAnalysisResponse)
@@ -1901,7 +2031,7 @@ async def analyze_for_visualization(request: VisualizationAnalysisRequest):
                 )
                 
                 if result.get("success") and result.get("rows"):
-                    df = pd.DataFrame(result["rows"])
+                    df = to_dataframe(result["rows"])
                     chart_logger.info(f"[{session_id}] Real data fetched: {len(df)} rows, {len(df.columns)} columns")
                     chart_logger.debug(f"[{session_id}] Columns: {list(df.columns)}")
                 else:
@@ -18,6 +18,7 @@ from urllib.parse import urlparse
 import requests
 import webbrowser
 import secrets
+import shutil
 import argparse
 
 print("Starting Data Connector CLI...")
@@ -35,6 +36,7 @@ from agent.config.settings import Settings
 from agent.config.config_loader import load_config, load_config_with_defaults
 from agent.performance import ensure_schema_index_updated
 from agent.db.db_orchestrator import Orchestrator
+from agent.db.export import get_export_store
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -672,7 +674,8 @@ def query(
     analyze: bool = typer.Option(False, "--analyze", "-a", help="Analyze query results"),
     orchestrate: bool = typer.Option(False, "--orchestrate", "-o", help="Use multi-step orchestrated analysis"),
     db_uri: Optional[str] = typer.Option(None, "--uri", "-u", help="Database connection URI (overrides settings)"),
-    db_type: Optional[str] = typer.Option(None, "--type", "-t", help="Database type ('postgres', 'mongodb', 'ga4', etc.)")
+    db_type: Optional[str] = typer.Option(None, "--type", "-t", help="Database type ('postgres', 'mongodb', 'ga4', etc.)"),
+    export_format: Optional[str] = typer.Option(None, "--export", "-e", help="Export the full result to a 'csv' or 'parquet' file (PostgreSQL only)")
 ):
     """
     Translate natural language to a database query and execute it
@@ -771,7 +774,7 @@ def query(
             else:
                 # Traditional approach based on database type
                 if detected_db_type.lower() == "postgres" or detected_db_type.lower() == "postgresql":
-                    await run_postgres_query(llm, question, analyze, orchestrator, detected_db_type)
+                    await run_postgres_query(llm, question, analyze, orchestrator, detected_db_type, export_format)
                 elif detected_db_type.lower() == "mongodb":
                     await run_mongodb_query(llm, question, analyze, orchestrator, detected_db_type)
                 elif detected_db_type.lower() == "qdrant":
@@ -784,6 +787,9 @@ def query(
                     await run_ga4_query(llm, question, analyze, orchestrator, detected_db_type)
                 else:
                     console.print(f"[red]Unsupported database type: {detected_db_type}[/red]")
+                
+                if export_format and detected_db_type.lower() not in ("postgres", "postgresql"):
+                    console.print("[yellow]Warning: --export is only supported for PostgreSQL; results were not exported.[/yellow]")
         
         except Exception as e:
             console.print(f"[red]Error: {str(e)}[/red]")
@@ -792,6 +798,86 @@ def query(
 
     asyncio.run(run())
 
+@app.command()
+def export_rows(
+    export_id: str = typer.Argument(..., help="Export ID printed by 'query --export'"),
+    offset: int = typer.Option(0, "--offset", help="Index of the first row to show"),
+    limit: int = typer.Option(20, "--limit", "-n", help="Number of rows to show"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Copy the full export file to this path")
+):
+    """
+    Page through (or save) the result of an exported query
+    """
+    store = get_export_store()
+    handle = store.get(export_id)
+    if handle is None:
+        console.print(f"[red]Export {export_id} not found or expired[/red]")
+        raise typer.Exit(1)
+    
+    if output:
+        shutil.copyfile(handle.path, output)
+        console.print(f"[green]Saved {handle.row_count} rows to {output}[/green]")
+        return
+    
+    rows = store.read_page(handle, offset, limit)
+    if rows:
+        display_query_results(rows)
+        console.print(f"[italic](Rows {offset + 1}-{offset + len(rows)} of {handle.row_count})[/italic]")
+    else:
+        console.print(f"[yellow]No rows at offset {offset} (export has {handle.row_count} rows)[/yellow]")
+
+@app.command()
+def qdrant_indexes(
+    collection: Optional[str] = typer.Option(None, "--collection", "-c", help="Collection to index (default: QDRANT_COLLECTION)"),
+    apply: bool = typer.Option(False, "--apply", help="Create the missing payload indexes (default: only show the plan)"),
+    min_uses: Optional[int] = typer.Option(None, "--min-uses", help="Filter uses before a field gets an index (overrides settings)"),
+    db_uri: Optional[str] = typer.Option(None, "--uri", "-u", help="Qdrant URI (overrides settings)")
+):
+    """
+    Show Qdrant filter usage and create payload indexes for frequently filtered fields
+    """
+    from agent.db.adapters.qdrant import QdrantAdapter
+    from agent.db.qdrant_client_manager import close_qdrant_clients
+    
+    async def run():
+        settings = Settings()
+        adapter = QdrantAdapter(
+            db_uri or settings.QDRANT_URI,
+            collection_name=collection or settings.QDRANT_COLLECTION,
+            api_key=settings.QDRANT_API_KEY
+        )
+        try:
+            actions = await adapter.ensure_payload_indexes(apply=apply, min_uses=min_uses)
+            usage = {u.field: u for u in adapter.get_filter_usage(adapter.collection_name)}
+        finally:
+            await close_qdrant_clients()
+        
+        if not actions:
+            console.print(f"[yellow]No filtered searches recorded for collection {adapter.collection_name}[/yellow]")
+            return
+        
+        table = Table(title=f"Payload indexes for {adapter.collection_name}")
+        for column in ("Field", "Type", "Filter uses", "Avg ms (no index)", "Avg ms (index)", "Action"):
+            table.add_column(column)
+        for action in actions:
+            field_usage = usage.get(action.field)
+            unindexed = field_usage.avg_unindexed_ms if field_usage else None
+            indexed = field_usage.avg_indexed_ms if field_usage else None
+            status = "created" if action.created else f"{action.action}: {action.reason}"
+            table.add_row(
+                action.field, action.schema_type or "-", str(action.uses),
+                f"{unindexed:.1f}" if unindexed is not None else "-",
+                f"{indexed:.1f}" if indexed is not None else "-",
+                status
+            )
+        console.print(table)
+        
+        pending = sum(1 for action in actions if action.action == "create" and not action.created)
+        if not apply and pending:
+            console.print(f"[italic]Run with --apply to create {pending} index(es)[/italic]")
+    
+    asyncio.run(run())
+
 @app.command()
 def shopify_scopes(
     shop: Optional[str] = typer.Option(None, "--shop", help="Shop domain to check scopes for")
@@ -912,8 +998,8 @@ async def run_orchestrated_analysis(llm, question: str, orchestrator: Orchestrat
             if query.get("description"):
                 console.print(f"[dim]{query['description']}[/dim]")
 
-async def run_postgres_query(llm, question: str, analyze: bool, orchestrator: Orchestrator, db_type: str):
-    """Run a PostgreSQL query"""
+async def run_postgres_query(llm, question: str, analyze: bool, orchestrator: Orchestrator, db_type: str, export_format: Optional[str] = None):
+    """Run a PostgreSQL query, or export its full result when export_format is set"""
     
     # Search schema metadata specific to this database type
     searcher = SchemaSearcher(db_type=db_type)
@@ -937,7 +1023,14 @@ async def run_postgres_query(llm, question: str, analyze: bool, orchestrator: Or
     console.print("Executing query...")
     
     try:
-        rows = await orchestrator.execute(validated_sql)
+        if export_format:
+            # COPY the full result to a spill file and show its first page
+            export = await orchestrator.export_query(validated_sql, format=export_format)
+            console.print(f"[green]Exported {export.row_count} rows ({export.size_bytes} bytes) to {export.path}[/green]")
+            console.print(f"Page through it with: [bold]export-rows {export.export_id} --offset N[/bold]")
+            rows = get_export_store().read_page(export, 0, Settings().DEFAULT_SAMPLE_SIZE)
+        else:
+            rows = await orchestrator.execute(validated_sql)
         
         # Display results
         if rows:
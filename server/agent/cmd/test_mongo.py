@@ -74,7 +74,7 @@ def test_connection(
                                   title="MongoDB Connection Test"))
                 
                 # List collections
-                collection_names = adapter.db.list_collection_names()
+                collection_names = await adapter.db.list_collection_names()
                 console.print(f"[bold]Collections in {actual_db}:[/bold]")
                 for collection in collection_names:
                     console.print(f"  • {collection}")
@@ -46,6 +46,20 @@ class Settings(BaseSettings):
     DB_PASS: str = yaml_config.get('postgres', {}).get('password', os.getenv('DB_PASS', 'dataconnector'))
     SSL_MODE: Optional[str] = yaml_config.get('postgres', {}).get('ssl_mode', os.getenv('SSL_MODE'))
     
+    # PostgreSQL Connection Pool Settings
+    DB_POOL_MIN_SIZE: int = yaml_config.get('postgres', {}).get('pool', {}).get('min_connections', int(os.getenv('DB_POOL_MIN_SIZE', 1)))
+    DB_POOL_MAX_SIZE: int = yaml_config.get('postgres', {}).get('pool', {}).get('max_connections', int(os.getenv('DB_POOL_MAX_SIZE', 20)))
+    DB_POOL_IDLE_TIMEOUT: float = yaml_config.get('postgres', {}).get('pool', {}).get('idle_timeout', float(os.getenv('DB_POOL_IDLE_TIMEOUT', 600)))
+    DB_POOL_MAX_INACTIVE_CONNECTION_LIFETIME: float = yaml_config.get('postgres', {}).get('pool', {}).get('max_inactive_connection_lifetime', float(os.getenv('DB_POOL_MAX_INACTIVE_CONNECTION_LIFETIME', 300)))
+    DB_STATEMENT_CACHE_SIZE: int = yaml_config.get('postgres', {}).get('statement_cache_size', int(os.getenv('DB_STATEMENT_CACHE_SIZE', 256)))
+    DB_INTROSPECT_SCHEMAS: List[str] = yaml_config.get('postgres', {}).get('schemas', [schema for schema in os.getenv('DB_INTROSPECT_SCHEMAS', '').split(',') if schema])  # Empty means all non-system schemas
+    
+    # PostgreSQL Read Replicas (read-only generated SQL is routed to these)
+    POSTGRES_URI: Optional[str] = yaml_config.get('postgres', {}).get('uri', os.getenv('POSTGRES_URI'))
+    DB_REPLICA_URIS: List[str] = yaml_config.get('postgres', {}).get('replicas', [uri for uri in os.getenv('DB_REPLICA_URIS', '').split(',') if uri])
+    DB_REPLICA_MAX_LAG_SECONDS: float = yaml_config.get('postgres', {}).get('replica_max_lag_seconds', float(os.getenv('DB_REPLICA_MAX_LAG_SECONDS', 30)))
+    DB_REPLICA_HEALTH_CHECK_INTERVAL: float = yaml_config.get('postgres', {}).get('replica_health_check_interval', float(os.getenv('DB_REPLICA_HEALTH_CHECK_INTERVAL', 15)))
+    
     # Multi-Database Support
     DB_URI: Optional[str] = None  # Don't set a default here, override in connection_uri
     DB_TYPE: str = default_db
@@ -58,6 +72,33 @@ class Settings(BaseSettings):
     MONGODB_DB_NAME: Optional[str] = yaml_config.get('mongodb', {}).get('database', os.getenv('MONGODB_DB_NAME', 'dataconnector_mongo'))
     MONGODB_URI: Optional[str] = yaml_config.get('mongodb', {}).get('uri', os.getenv('MONGODB_URI'))
     
+    # MongoDB client pool settings (one shared client per URI)
+    MONGO_MAX_POOL_SIZE: int = yaml_config.get('mongodb', {}).get('pool_size', int(os.getenv('MONGO_MAX_POOL_SIZE', 100)))
+    MONGO_MIN_POOL_SIZE: int = yaml_config.get('mongodb', {}).get('min_pool_size', int(os.getenv('MONGO_MIN_POOL_SIZE', 0)))
+    MONGO_MAX_IDLE_TIME_MS: int = yaml_config.get('mongodb', {}).get('max_idle_time_ms', int(os.getenv('MONGO_MAX_IDLE_TIME_MS', 300000)))  # 0 keeps idle connections open
+    MONGO_CONNECT_TIMEOUT_MS: int = yaml_config.get('mongodb', {}).get('connect_timeout_ms', int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', 20000)))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = yaml_config.get('mongodb', {}).get('server_selection_timeout_ms', int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', 30000)))
+    
+    # Server-side limits applied to every aggregation
+    MONGO_MAX_TIME_MS: int = yaml_config.get('mongodb', {}).get('max_time_ms', int(os.getenv('MONGO_MAX_TIME_MS', 60000)))  # 0 disables
+    MONGO_ALLOW_DISK_USE: bool = yaml_config.get('mongodb', {}).get('allow_disk_use', os.getenv('MONGO_ALLOW_DISK_USE', 'true').lower() == 'true')  # Let $group/$sort spill past the 100MB stage limit
+    
+    # Explain-based guard for generated pipelines
+    MONGO_GUARD_ENABLED: bool = yaml_config.get('mongodb', {}).get('guard', {}).get('enabled', os.getenv('MONGO_GUARD_ENABLED', 'true').lower() == 'true')
+    MONGO_GUARD_SCAN_THRESHOLD: int = yaml_config.get('mongodb', {}).get('guard', {}).get('scan_threshold', int(os.getenv('MONGO_GUARD_SCAN_THRESHOLD', 1000000)))  # Collection scans over more documents are limited or sampled
+    MONGO_GUARD_SAMPLE_SIZE: int = yaml_config.get('mongodb', {}).get('guard', {}).get('sample_size', int(os.getenv('MONGO_GUARD_SAMPLE_SIZE', 100000)))  # Documents read by an injected $sample
+    
+    # Schema inference from $sample
+    MONGO_SCHEMA_SAMPLE_SIZE: int = yaml_config.get('mongodb', {}).get('schema', {}).get('sample_size', int(os.getenv('MONGO_SCHEMA_SAMPLE_SIZE', 1000)))  # Documents sampled per collection
+    MONGO_SCHEMA_CONCURRENCY: int = yaml_config.get('mongodb', {}).get('schema', {}).get('concurrency', int(os.getenv('MONGO_SCHEMA_CONCURRENCY', 4)))  # Collections sampled at once
+    
+    # Result cache for repeated pipelines, invalidated by change streams (TTL without them)
+    MONGO_RESULT_CACHE_ENABLED: bool = yaml_config.get('mongodb', {}).get('result_cache', {}).get('enabled', os.getenv('MONGO_RESULT_CACHE_ENABLED', 'true').lower() == 'true')
+    MONGO_RESULT_CACHE_MAX_ENTRIES: int = yaml_config.get('mongodb', {}).get('result_cache', {}).get('max_entries', int(os.getenv('MONGO_RESULT_CACHE_MAX_ENTRIES', 256)))
+    MONGO_RESULT_CACHE_MAX_ROWS: int = yaml_config.get('mongodb', {}).get('result_cache', {}).get('max_rows', int(os.getenv('MONGO_RESULT_CACHE_MAX_ROWS', 10000)))  # Larger results are not cached
+    MONGO_RESULT_CACHE_TTL_SECONDS: float = yaml_config.get('mongodb', {}).get('result_cache', {}).get('ttl_seconds', float(os.getenv('MONGO_RESULT_CACHE_TTL_SECONDS', 60)))  # Entry lifetime when no change stream is available
+    MONGO_RESULT_CACHE_WATCH: bool = yaml_config.get('mongodb', {}).get('result_cache', {}).get('watch', os.getenv('MONGO_RESULT_CACHE_WATCH', 'true').lower() == 'true')  # Invalidate from change streams (needs a replica set)
+    
     # If MongoDB URI is not set, construct it from parts
     if not MONGODB_URI:
         MONGODB_URI = f"mongodb://{MONGO_INITDB_ROOT_USERNAME}:{MONGO_INITDB_ROOT_PASSWORD}@{MONGO_HOST}:{MONGO_PORT}/{MONGODB_DB_NAME}?authSource=admin"
@@ -69,7 +110,16 @@ class Settings(BaseSettings):
     QDRANT_API_KEY: Optional[str] = yaml_config.get('qdrant', {}).get('api_key', os.getenv('QDRANT_API_KEY'))
     QDRANT_COLLECTION: Optional[str] = yaml_config.get('qdrant', {}).get('collection', os.getenv('QDRANT_COLLECTION', 'corporate_knowledge'))
     QDRANT_URI: Optional[str] = yaml_config.get('qdrant', {}).get('uri', os.getenv('QDRANT_URI'))
-    QDRANT_PREFER_GRPC: bool = yaml_config.get('qdrant', {}).get('prefer_grpc', os.getenv('QDRANT_PREFER_GRPC', 'false').lower() == 'true')
+    QDRANT_PREFER_GRPC: bool = yaml_config.get('qdrant', {}).get('prefer_grpc', os.getenv('QDRANT_PREFER_GRPC', 'true').lower() == 'true')
+    QDRANT_TIMEOUT: int = yaml_config.get('qdrant', {}).get('timeout', int(os.getenv('QDRANT_TIMEOUT', 30)))
+    # Payload index management: filtered fields are counted and indexed once used min_filter_uses times
+    QDRANT_FILTER_USAGE_ENABLED: bool = yaml_config.get('qdrant', {}).get('indexes', {}).get('track_filters', os.getenv('QDRANT_FILTER_USAGE_ENABLED', 'true').lower() == 'true')
+    QDRANT_FILTER_USAGE_PATH: Optional[str] = yaml_config.get('qdrant', {}).get('indexes', {}).get('usage_path', os.getenv('QDRANT_FILTER_USAGE_PATH'))
+    QDRANT_INDEX_MIN_FILTER_USES: int = yaml_config.get('qdrant', {}).get('indexes', {}).get('min_filter_uses', int(os.getenv('QDRANT_INDEX_MIN_FILTER_USES', 5)))
+    QDRANT_SCHEMA_SAMPLE_SIZE: int = yaml_config.get('qdrant', {}).get('schema', {}).get('sample_size', int(os.getenv('QDRANT_SCHEMA_SAMPLE_SIZE', 256)))  # Points sampled per collection
+    QDRANT_SCHEMA_CONCURRENCY: int = yaml_config.get('qdrant', {}).get('schema', {}).get('concurrency', int(os.getenv('QDRANT_SCHEMA_CONCURRENCY', 4)))  # Collections sampled at once
+    QDRANT_RESCORE: bool = yaml_config.get('qdrant', {}).get('quantization', {}).get('rescore', os.getenv('QDRANT_RESCORE', 'true').lower() == 'true')  # Rescore searches on quantized collections
+    QDRANT_RESCORE_OVERSAMPLING: float = yaml_config.get('qdrant', {}).get('quantization', {}).get('oversampling', float(os.getenv('QDRANT_RESCORE_OVERSAMPLING', 2.0)))  # Candidates rescored per result
     
     # If Qdrant URI is not set, construct it from parts
     if not QDRANT_URI:
@@ -97,6 +147,13 @@ class Settings(BaseSettings):
     VECTOR_EMBEDDING_API_KEY: Optional[str] = yaml_config.get('vector_db', {}).get('embedding', {}).get('api_key', os.getenv('VECTOR_EMBEDDING_API_KEY', os.getenv('LLM_API_KEY')))
     VECTOR_EMBEDDING_ENDPOINT: Optional[str] = yaml_config.get('vector_db', {}).get('embedding', {}).get('endpoint', os.getenv('VECTOR_EMBEDDING_ENDPOINT'))
     VECTOR_EMBEDDING_RESPONSE_FIELD: Optional[str] = yaml_config.get('vector_db', {}).get('embedding', {}).get('response_field', os.getenv('VECTOR_EMBEDDING_RESPONSE_FIELD', 'embedding'))
+    # Batched embedding requests: custom endpoints accepting {"texts": [...]} answer with a list of vectors at batch_response_field
+    VECTOR_EMBEDDING_BATCH_SIZE: int = yaml_config.get('vector_db', {}).get('embedding', {}).get('batch_size', int(os.getenv('VECTOR_EMBEDDING_BATCH_SIZE', 256)))
+    VECTOR_EMBEDDING_BATCH_REQUESTS: bool = yaml_config.get('vector_db', {}).get('embedding', {}).get('batch_requests', os.getenv('VECTOR_EMBEDDING_BATCH_REQUESTS', 'false').lower() == 'true')
+    VECTOR_EMBEDDING_BATCH_RESPONSE_FIELD: str = yaml_config.get('vector_db', {}).get('embedding', {}).get('batch_response_field', os.getenv('VECTOR_EMBEDDING_BATCH_RESPONSE_FIELD', 'embeddings'))
+    # Embedding cache: LRU of recent vectors, optionally persisted to a SQLite file
+    VECTOR_EMBEDDING_CACHE_SIZE: int = yaml_config.get('vector_db', {}).get('embedding', {}).get('cache', {}).get('max_entries', int(os.getenv('VECTOR_EMBEDDING_CACHE_SIZE', 10000)))
+    VECTOR_EMBEDDING_CACHE_PATH: Optional[str] = yaml_config.get('vector_db', {}).get('embedding', {}).get('cache', {}).get('path', os.getenv('VECTOR_EMBEDDING_CACHE_PATH'))
     
     # Debug/Override Settings
     DB_DSN_OVERRIDE: Optional[str] = os.getenv('DB_DSN_OVERRIDE')
@@ -154,7 +211,19 @@ class Settings(BaseSettings):
     MAX_ANALYSIS_STEPS: int = 10
     MAX_ROWS_DIRECT: int = 100000  # Max rows for direct query without sampling
     DEFAULT_SAMPLE_SIZE: int = 1000  # Default sample size for large datasets
-    MAX_QUERY_TIMEOUT: int = 60  # Maximum query timeout in seconds
+    MAX_QUERY_TIMEOUT: int = int(os.getenv('MAX_QUERY_TIMEOUT', 60))  # Maximum query timeout in seconds (enforced per statement, 0 disables)
+    STREAM_BATCH_SIZE: int = int(os.getenv('STREAM_BATCH_SIZE', 1000))  # Rows per batch when streaming query results
+    
+    # Bulk exports of full query results to spill files (CSV or Parquet)
+    EXPORT_DIR: Optional[str] = yaml_config.get('export', {}).get('dir', os.getenv('EXPORT_DIR'))  # Defaults to <app dir>/exports
+    EXPORT_TTL_SECONDS: float = yaml_config.get('export', {}).get('ttl_seconds', float(os.getenv('EXPORT_TTL_SECONDS', 86400)))  # Exports older than this are deleted
+    EXPORT_TIMEOUT: int = yaml_config.get('export', {}).get('timeout_seconds', int(os.getenv('EXPORT_TIMEOUT', 3600)))  # Statement timeout for export COPYs in seconds (replaces MAX_QUERY_TIMEOUT, 0 disables)
+    
+    # EXPLAIN-based cost gate for generated SQL (planner cost units)
+    COST_GATE_ENABLED: bool = yaml_config.get('postgres', {}).get('cost_gate', {}).get('enabled', os.getenv('COST_GATE_ENABLED', 'true').lower() == 'true')
+    COST_GATE_SAMPLE_COST: float = yaml_config.get('postgres', {}).get('cost_gate', {}).get('sample_cost', float(os.getenv('COST_GATE_SAMPLE_COST', 1000000)))  # Sample single-table queries above this cost
+    COST_GATE_MAX_COST: float = yaml_config.get('postgres', {}).get('cost_gate', {}).get('max_cost', float(os.getenv('COST_GATE_MAX_COST', 10000000)))  # Reject unsampleable queries above this cost
+    COST_GATE_MIN_SAMPLE_PERCENT: float = yaml_config.get('postgres', {}).get('cost_gate', {}).get('min_sample_percent', float(os.getenv('COST_GATE_MIN_SAMPLE_PERCENT', 0.01)))
     
     # Application data directory
     APP_DATA_DIR: Optional[str] = None
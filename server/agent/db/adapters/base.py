@@ -4,7 +4,9 @@ All database adapters must implement this interface.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from ..columnar import ColumnarResult
 
 class DBAdapter(ABC):
     """
@@ -67,6 +69,41 @@ class DBAdapter(ABC):
         """
         return await self.execute(query)
     
+    async def execute_columnar(self, query: Any) -> ColumnarResult:
+        """
+        Execute the database query and return results column by column.
+        
+        The default implementation converts the row dictionaries from
+        execute(). Adapters that can read column values straight from the
+        driver should override this to skip the per-row dicts.
+        
+        Args:
+            query: Database-specific query (as returned by llm_to_query)
+            
+        Returns:
+            ColumnarResult with column names and per-column arrays
+        """
+        return ColumnarResult.from_rows(await self.execute(query))
+    
+    async def execute_stream(self, query: Any, batch_size: int = 1000) -> AsyncIterator[List[Dict]]:
+        """
+        Execute the database query and yield results in batches.
+        
+        The default implementation executes the query in full and slices
+        the result. Adapters that can read incrementally from the server
+        (e.g. with a cursor) should override this to bound memory use.
+        
+        Args:
+            query: Database-specific query (as returned by llm_to_query)
+            batch_size: Maximum number of rows per yielded batch
+            
+        Yields:
+            Lists of dictionaries representing consecutive batches of rows
+        """
+        rows = await self.execute(query)
+        for start in range(0, len(rows), batch_size):
+            yield rows[start:start + batch_size]
+    
     @abstractmethod
     async def introspect_schema(self) -> List[Dict[str, str]]:
         """
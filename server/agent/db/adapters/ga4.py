@@ -6,6 +6,7 @@ Provides access to GA4 data through the DBAdapter interface.
 import logging
 import json
 import os
+import numpy as np
 from typing import Any, Dict, List, Optional
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -24,6 +25,7 @@ from google.oauth2 import service_account
 from google.auth.transport.requests import Request
 
 from .base import DBAdapter
+from ..columnar import ColumnarResult, to_column_array
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -381,6 +383,63 @@ class GA4Adapter(DBAdapter):
         
         return results
             
+    async def execute_columnar(self, query: Dict) -> ColumnarResult:
+        """
+        Execute a GA4 query and return the report as columns.
+        
+        Args:
+            query: Dict containing GA4 RunReportRequest parameters
+                
+        Returns:
+            ColumnarResult with one array per dimension and metric
+        """
+        if not isinstance(query, dict):
+            raise ValueError("Query must be a dictionary with GA4 parameters")
+        
+        try:
+            request = self._build_run_report_request(query)
+            response = self.client.run_report(request)
+            return self._process_report_response_columnar(response)
+            
+        except Exception as e:
+            logger.error(f"Error executing GA4 query: {e}")
+            raise
+    
+    def _process_report_response_columnar(self, response) -> ColumnarResult:
+        """
+        Process the GA4 report response into per-column arrays.
+        
+        Dimensions stay strings; metrics are parsed into numeric arrays
+        (int64 for integer metrics, float64 otherwise) when possible.
+        
+        Args:
+            response: GA4 RunReportResponse
+            
+        Returns:
+            ColumnarResult with dimension columns followed by metric columns
+        """
+        rows = response.rows
+        columns = []
+        data = {}
+        
+        for i, header in enumerate(response.dimension_headers):
+            columns.append(header.name)
+            data[header.name] = to_column_array([row.dimension_values[i].value for row in rows])
+        
+        for i, header in enumerate(response.metric_headers):
+            values = [row.metric_values[i].value for row in rows]
+            metric_type = getattr(getattr(header, "type_", None), "name", "")
+            try:
+                array = np.array(values, dtype=np.float64)
+                if metric_type == "TYPE_INTEGER":
+                    array = array.astype(np.int64)
+            except ValueError:
+                array = to_column_array(values)
+            columns.append(header.name)
+            data[header.name] = array
+        
+        return ColumnarResult(columns, data)
+    
     async def execute_query(self, query: Dict) -> List[Dict]:
         """
         Execute a GA4 query (alias for execute).
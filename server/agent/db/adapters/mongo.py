@@ -5,12 +5,17 @@ Provides MongoDB support through the DBAdapter interface.
 
 import logging
 import json
-from typing import Any, Dict, List, Optional
-from pymongo import MongoClient
-from bson import json_util
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 from .base import DBAdapter
+from ..bson_convert import documents_to_native, to_native
+from ..columnar import ColumnarResult, ColumnarBuilder
+from ..mongo_client_manager import get_mongo_client
+from ..mongo_guard import MongoGuardDecision, MongoQueryGuard
+from ..mongo_result_cache import get_mongo_result_cache
+from ..mongo_schema import get_mongo_schema_inferrer
+from ...config.settings import Settings
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -20,7 +25,11 @@ class MongoAdapter(DBAdapter):
     MongoDB adapter implementation.
     
     This adapter provides MongoDB support through the DBAdapter interface,
-    translating natural language to MongoDB aggregation pipelines.
+    translating natural language to MongoDB aggregation pipelines. Queries
+    run through the shared Motor client for the URI, so they never block
+    the event loop. Aggregations run with a server-side ``maxTimeMS`` and
+    ``allowDiskUse``, and generated pipelines pass an explain-based guard
+    that limits or samples collection scans on large collections.
     """
     
     def __init__(self, conn_uri: str, **kwargs):
@@ -62,10 +71,19 @@ class MongoAdapter(DBAdapter):
         # Optional parameters
         self.default_collection = kwargs.get('default_collection')
         
-        # Initialize MongoDB client
-        self.client = MongoClient(conn_uri)
+        # Use the shared async client (and connection pool) for this URI
+        self.client = get_mongo_client(conn_uri)
         self.db = self.client[self.db_name]
         
+        # Identifies this database in the shared schema and result caches
+        self.source = f"{conn_uri}#{self.db_name}"
+        
+        # Server-side limits and the explain pre-check for generated pipelines
+        settings = Settings()
+        self.max_time_ms = kwargs.get('max_time_ms', settings.MONGO_MAX_TIME_MS)
+        self.allow_disk_use = kwargs.get('allow_disk_use', settings.MONGO_ALLOW_DISK_USE)
+        self.guard = MongoQueryGuard()
+        
         logger.info(f"Initialized MongoDB adapter for database: {self.db_name}")
         
     async def llm_to_query(self, nl_prompt: str, **kwargs) -> Dict:
@@ -130,17 +148,15 @@ class MongoAdapter(DBAdapter):
             logger.error(f"Failed to parse LLM response as JSON: {e}")
             raise ValueError(f"Failed to parse LLM response as JSON: {e}")
     
-    async def execute(self, query: Dict) -> List[Dict]:
+    def _parse_query(self, query: Dict) -> Tuple[str, List[Dict]]:
         """
-        Execute a MongoDB query.
+        Validate a query dict and extract the collection name and pipeline.
         
         Args:
-            query: Dict containing:
-                - pipeline: MongoDB aggregation pipeline
-                - collection: Target collection name
-                
+            query: Dict containing 'pipeline' and (optionally) 'collection'
+            
         Returns:
-            List of dictionaries with query results
+            Tuple of (collection name, aggregation pipeline)
         """
         if not isinstance(query, dict):
             raise ValueError("Query must be a dictionary with 'pipeline' and 'collection' fields")
@@ -157,15 +173,173 @@ class MongoAdapter(DBAdapter):
             else:
                 raise ValueError("Query missing 'collection' field and no default collection specified")
         
+        return collection_name, pipeline
+    
+    def _aggregate_options(self, batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Options passed with every aggregate command"""
+        options: Dict[str, Any] = {"allowDiskUse": self.allow_disk_use}
+        if self.max_time_ms:
+            options["maxTimeMS"] = self.max_time_ms
+        if batch_size:
+            options["batchSize"] = batch_size
+        return options
+    
+    async def check_pipeline(self, query: Dict) -> MongoGuardDecision:
+        """
+        Run the explain guard for a query without executing it.
+        
+        Callers that report the decision (e.g. stream endpoints) check first
+        and then execute the decision's pipeline with ``guard=False``.
+        
+        Args:
+            query: Dict containing 'pipeline' and (optionally) 'collection'
+            
+        Returns:
+            MongoGuardDecision with the pipeline to run and the plan estimates
+        """
+        collection_name, pipeline = self._parse_query(query)
+        return await self.guard.check(self.db, collection_name, pipeline)
+    
+    async def _guarded_pipeline(self, collection_name: str, pipeline: List[Dict], guard: bool) -> List[Dict]:
+        """Return the pipeline to run, after the explain guard when enabled"""
+        if not guard:
+            return pipeline
+        decision = await self.guard.check(self.db, collection_name, pipeline)
+        return decision.pipeline
+    
+    async def execute(self, query: Dict, guard: bool = True, use_cache: bool = True) -> List[Dict]:
+        """
+        Execute a MongoDB query.
+        
+        Repeated pipelines are answered from the result cache, which drops a
+        collection's entries when its change stream reports a write (or
+        after a TTL where change streams are unavailable). Unless disabled,
+        the pipeline first passes the explain guard, which may append a
+        $limit or prepend a $sample on large collection scans.
+        
+        Args:
+            query: Dict containing:
+                - pipeline: MongoDB aggregation pipeline
+                - collection: Target collection name
+            guard: Whether to apply the explain guard
+            use_cache: Whether to read and fill the result cache
+                
+        Returns:
+            List of dictionaries with query results
+            
+        Raises:
+            pymongo.errors.ExecutionTimeout: If the aggregation exceeds MONGO_MAX_TIME_MS
+        """
+        collection_name, pipeline = self._parse_query(query)
+        
         # Get the collection
         collection = self.db[collection_name]
         
+        cache = get_mongo_result_cache() if use_cache else None
+        if cache is not None:
+            cached = cache.get(self.source, collection_name, pipeline)
+            if cached is not None:
+                return cached
+            cache.watch_collection(self.source, self.db, collection_name)
+            version = cache.version(self.source, collection_name)
+            watched = cache.is_watched(self.source, collection_name)
+        
         # Execute the aggregation pipeline
         try:
-            results = list(collection.aggregate(pipeline))
+            guarded = await self._guarded_pipeline(collection_name, pipeline, guard)
+            batch_size = Settings().STREAM_BATCH_SIZE
+            cursor = collection.aggregate(guarded, **self._aggregate_options(batch_size))
+            results = []
+            async for batch in self._iterate_batches(cursor, batch_size):
+                results.extend(batch)
+            
+            if cache is not None:
+                cache.put(self.source, collection_name, pipeline, results, version, watched)
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error executing MongoDB query: {e}")
+            raise
+    
+    @staticmethod
+    async def _iterate_batches(cursor: Any, batch_size: int) -> AsyncIterator[List[Dict]]:
+        """
+        Read a Motor cursor batch by batch, converting BSON types on the way
+        
+        Only one batch of raw documents is held at a time; each is converted
+        with the single-pass BSON converter and handed to the caller.
+        
+        Args:
+            cursor: Motor command or find cursor
+            batch_size: Maximum documents per batch
+            
+        Yields:
+            Lists of JSON-safe dictionaries
+        """
+        try:
+            while True:
+                docs = await cursor.to_list(length=batch_size)
+                if not docs:
+                    break
+                yield documents_to_native(docs)
+        finally:
+            # Release the server-side cursor if the caller stops early
+            await cursor.close()
+    
+    async def execute_stream(self, query: Dict, batch_size: Optional[int] = None) -> AsyncIterator[List[Dict]]:
+        """
+        Execute a MongoDB query and yield results in batches as the cursor is read.
+        
+        The server returns documents in batches of ``batch_size``, so at most
+        one batch is materialized at a time. The explain guard is not applied
+        here; callers run ``check_pipeline`` first so they can report the
+        decision.
+        
+        Args:
+            query: Dict containing:
+                - pipeline: MongoDB aggregation pipeline
+                - collection: Target collection name
+            batch_size: Documents per batch (defaults to STREAM_BATCH_SIZE from settings)
+                
+        Yields:
+            Lists of dictionaries, one list per batch
+        """
+        batch_size = batch_size or Settings().STREAM_BATCH_SIZE
+        collection_name, pipeline = self._parse_query(query)
+        cursor = self.db[collection_name].aggregate(pipeline, **self._aggregate_options(batch_size))
+        batches = self._iterate_batches(cursor, batch_size)
+        try:
+            async for batch in batches:
+                yield batch
+        finally:
+            await batches.aclose()
             
-            # Convert ObjectId and other BSON types to string representations
-            return json.loads(json_util.dumps(results))
+    async def execute_columnar(self, query: Dict, guard: bool = True) -> ColumnarResult:
+        """
+        Execute a MongoDB query and build a columnar result from the cursor.
+        
+        Documents are appended field by field as the cursor is iterated,
+        with fields missing from a document filled with None. BSON types
+        are converted as in ``execute``.
+        
+        Args:
+            query: Dict containing:
+                - pipeline: MongoDB aggregation pipeline
+                - collection: Target collection name
+            guard: Whether to apply the explain guard
+                
+        Returns:
+            ColumnarResult with one array per document field
+        """
+        collection_name, pipeline = self._parse_query(query)
+        collection = self.db[collection_name]
+        
+        try:
+            pipeline = await self._guarded_pipeline(collection_name, pipeline, guard)
+            builder = ColumnarBuilder()
+            async for doc in collection.aggregate(pipeline, **self._aggregate_options()):
+                builder.append(to_native(doc))
+            return builder.build()
             
         except Exception as e:
             logger.error(f"Error executing MongoDB query: {e}")
@@ -191,6 +365,10 @@ class MongoAdapter(DBAdapter):
         """
         Introspect MongoDB collections and document structures.
         
+        Field types and presence frequencies are inferred from a ``$sample``
+        of each collection (MONGO_SCHEMA_SAMPLE_SIZE documents), sampling
+        several collections at once.
+        
         Returns:
             List of document dictionaries for embedding
         """
@@ -199,7 +377,7 @@ class MongoAdapter(DBAdapter):
         try:
             # Get all collection names but handle permission issues gracefully
             try:
-                collection_names = self.db.list_collection_names()
+                collection_names = await self.db.list_collection_names()
             except Exception as e:
                 logger.warning(f"Error listing all collections: {e}")
                 # Try to get a list of collections without system views
@@ -209,7 +387,7 @@ class MongoAdapter(DBAdapter):
                                            "orders", "products", "customers", "employees"]:
                     try:
                         # Check if collection exists by attempting to get stats
-                        stats = self.db.command("collStats", possible_collection)
+                        stats = await self.db.command("collStats", possible_collection)
                         collection_names.append(possible_collection)
                     except Exception:
                         # Collection doesn't exist or we don't have permission
@@ -219,59 +397,21 @@ class MongoAdapter(DBAdapter):
                     logger.error("Could not retrieve any collections. Check permissions.")
                     return [{"id": "error", "content": "Could not access MongoDB collections. Check permissions."}]
             
-            for collection_name in collection_names:
-                # Skip system collections
-                if collection_name.startswith("system."):
-                    continue
-                    
-                # Get the collection
-                collection = self.db[collection_name]
-                
-                try:
-                    # Get sample documents to infer schema
-                    sample_docs = list(collection.find().limit(5))
-                    
-                    # Get count
-                    count = collection.count_documents({})
-                    
-                    # Construct field information by examining sample documents
-                    fields = {}
-                    for doc in sample_docs:
-                        for field, value in doc.items():
-                            if field not in fields:
-                                fields[field] = {"type": type(value).__name__, "examples": []}
-                            
-                            # Add example value if we don't have too many already
-                            if len(fields[field]["examples"]) < 3 and str(value) not in fields[field]["examples"]:
-                                fields[field]["examples"].append(str(value))
-                    
-                    # Format field information as text
-                    fields_text = "\n".join([
-                        f"- {field}: {info['type']}" + 
-                        (f" (examples: {', '.join(info['examples'])})" if info['examples'] else "")
-                        for field, info in fields.items()
-                    ])
-                    
-                    # Create document content
-                    content = f"""
-                    COLLECTION: {collection_name}
-                    APPROXIMATE DOCUMENT COUNT: {count}
-                    
-                    FIELDS:
-                    {fields_text or 'No fields identified'}
-                    """
-                    
-                    # Add collection document
+            # Sample collections concurrently; unchanged collections come from the cache
+            schemas = await get_mongo_schema_inferrer().infer_database(
+                self.db, collection_names, source=self.source
+            )
+            for collection_name, schema in schemas.items():
+                if isinstance(schema, Exception):
+                    # Add a placeholder document for the collection
                     documents.append({
                         "id": f"collection:{collection_name}",
-                        "content": content.strip()
+                        "content": f"COLLECTION: {collection_name}\nUnable to retrieve details: {str(schema)}"
                     })
-                except Exception as e:
-                    logger.warning(f"Error introspecting collection {collection_name}: {e}")
-                    # Add a placeholder document for the collection
+                else:
                     documents.append({
                         "id": f"collection:{collection_name}",
-                        "content": f"COLLECTION: {collection_name}\nUnable to retrieve details: {str(e)}"
+                        "content": schema.to_content()
                     })
                 
             return documents
@@ -289,10 +429,10 @@ class MongoAdapter(DBAdapter):
         """
         try:
             # Try to get server info
-            self.client.server_info()
+            await self.client.server_info()
             
             # Try to list collections in the database
-            self.db.list_collection_names()
+            await self.db.list_collection_names()
             
             return True
         except Exception as e:
@@ -317,10 +457,12 @@ class MongoAdapter(DBAdapter):
             collection = self.db[collection_name]
             
             # Execute the aggregation pipeline
-            results = list(collection.aggregate(pipeline))
-            
-            # Convert ObjectId and other BSON types to string representations
-            return json.loads(json_util.dumps(results))
+            batch_size = Settings().STREAM_BATCH_SIZE
+            cursor = collection.aggregate(pipeline, **self._aggregate_options(batch_size))
+            results = []
+            async for batch in self._iterate_batches(cursor, batch_size):
+                results.extend(batch)
+            return results
             
         except Exception as e:
             logger.error(f"Error executing MongoDB aggregation on {collection_name}: {e}")
@@ -349,13 +491,16 @@ class MongoAdapter(DBAdapter):
                 query = {}
             
             # Execute the find query
+            options = {"max_time_ms": self.max_time_ms} if self.max_time_ms else {}
             if projection:
-                results = list(collection.find(query, projection))
+                cursor = collection.find(query, projection, **options)
             else:
-                results = list(collection.find(query))
+                cursor = collection.find(query, **options)
             
-            # Convert ObjectId and other BSON types to string representations
-            return json.loads(json_util.dumps(results))
+            results = []
+            async for batch in self._iterate_batches(cursor, Settings().STREAM_BATCH_SIZE):
+                results.extend(batch)
+            return results
             
         except Exception as e:
             logger.error(f"Error executing MongoDB find on {collection_name}: {e}")
@@ -3,35 +3,119 @@ PostgreSQL adapter implementation.
 Wraps existing PostgreSQL functionality in the DBAdapter interface.
 """
 
+import asyncio
 import logging
 import sys
 import os
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Union
+
+import asyncpg
 
 from .base import DBAdapter
-from ..connection_utils import execute_query, test_conn, create_connection_pool
-from ..introspect import get_schema_metadata
+from ..columnar import ColumnarResult
+from ..cost_gate import CostGateDecision, QueryCostGate, QueryRejectedError, REJECT
+from ..export import ExportHandle, csv_to_parquet, get_export_store
+from ..introspect import fetch_schema_snapshot, format_schema_for_embedding
+from ..pool_manager import redact_dsn
+from ..replica_router import get_replica_router, is_read_only
+from ..statement_cache import coerce_params, get_statement_cache
+from ...config.settings import Settings
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+class QueryTimeoutError(TimeoutError):
+    """Raised when a statement exceeds the query timeout and was cancelled"""
+    pass
+
+@contextmanager
+def _enforce_query_timeout(dsn: str) -> Iterator[None]:
+    """
+    Surface statement timeouts and cancellations of a query consistently.
+    
+    The pool applies MAX_QUERY_TIMEOUT both client-side (asyncpg cancels the
+    statement) and server-side (statement_timeout); both are reported as
+    QueryTimeoutError. When the calling task is cancelled (e.g. the client
+    of a stream endpoint disconnected) asyncpg sends a cancel request for
+    the running statement before the connection goes back to the pool.
+    """
+    try:
+        yield
+    except QueryTimeoutError:
+        raise
+    except asyncio.TimeoutError as e:
+        raise QueryTimeoutError(f"Query on {redact_dsn(dsn)} exceeded the query timeout and was cancelled") from e
+    except asyncpg.exceptions.QueryCanceledError as e:
+        if "timeout" not in str(e):
+            raise
+        raise QueryTimeoutError(f"Query on {redact_dsn(dsn)} was cancelled by statement_timeout") from e
+    except asyncio.CancelledError:
+        logger.info(f"Query on {redact_dsn(dsn)} cancelled by caller; cancelling backend statement")
+        raise
+
 class PostgresAdapter(DBAdapter):
     """
     PostgreSQL adapter implementation.
     
     This adapter wraps the existing PostgreSQL functionality
-    to conform to the DBAdapter interface without modifying
-    the original implementation.
+    to conform to the DBAdapter interface. Each adapter runs against
+    its own connection URI through the shared pool for that URI, so
+    several Postgres sources can be queried side by side. Read-only
+    statements are routed to the source's read replicas when any are
+    configured and healthy.
     """
     
-    def __init__(self, conn_uri: str):
+    def __init__(
+        self,
+        conn_uri: Union[str, Dict[str, Any], None],
+        replicas: Optional[List[str]] = None,
+        **kwargs
+    ):
         """
         Initialize the PostgreSQL adapter.
         
         Args:
-            conn_uri: PostgreSQL connection URI
+            conn_uri: PostgreSQL connection URI, or a postgres config section
+                      (with 'uri' or host/port/database/user/password keys)
+            replicas: Read replica URIs (defaults to the config section's 'replicas',
+                      or postgres.replicas when this is the configured primary)
+            **kwargs: Additional parameters (accepted for orchestrator compatibility)
         """
         super().__init__(conn_uri)
+        self.dsn = self._resolve_dsn(conn_uri)
+        if replicas is None and isinstance(conn_uri, dict):
+            replicas = conn_uri.get('replicas')
+        self.router = get_replica_router(self.dsn, replicas)
+        self.cost_gate = QueryCostGate()
+        logger.info(f"Initialized PostgreSQL adapter for {redact_dsn(self.dsn)}"
+                    f" ({len(self.router.replicas)} read replica(s))")
+    
+    @staticmethod
+    def _resolve_dsn(conn_uri: Union[str, Dict[str, Any], None]) -> str:
+        """
+        Turn the adapter's connection info into a DSN for asyncpg.
+        
+        Args:
+            conn_uri: URI string, postgres config section, or None
+            
+        Returns:
+            PostgreSQL DSN, falling back to the settings DSN when nothing usable is given
+        """
+        if isinstance(conn_uri, dict):
+            if conn_uri.get('uri'):
+                return conn_uri['uri']
+            if conn_uri.get('host'):
+                dsn = (f"postgresql://{conn_uri.get('user', '')}:{conn_uri.get('password', '')}"
+                       f"@{conn_uri['host']}:{conn_uri.get('port', 5432)}/{conn_uri.get('database', '')}")
+                if conn_uri.get('ssl_mode'):
+                    dsn += f"?sslmode={conn_uri['ssl_mode']}"
+                return dsn
+        elif isinstance(conn_uri, str) and conn_uri.startswith(('postgres://', 'postgresql://')):
+            return conn_uri
+        
+        logger.warning("No PostgreSQL URI provided to adapter, using DSN from settings")
+        return Settings().db_dsn
     
     async def llm_to_query(self, nl_prompt: str, **kwargs) -> str:
         """
@@ -67,49 +151,255 @@ class PostgresAdapter(DBAdapter):
         from ...api.endpoints import sanitize_sql
         return sanitize_sql(sql)
     
-    async def execute(self, query: str) -> List[Dict]:
+    async def check_query_cost(self, query: str, params: Optional[List] = None) -> CostGateDecision:
         """
-        Execute a SQL query using the existing execute_query function.
+        Run the EXPLAIN cost gate for a query without executing it.
+        
+        Callers that report the decision (e.g. stream endpoints) check first
+        and then execute ``decision.query`` with ``cost_gate=False``.
         
         Args:
             query: SQL query string
+            params: Optional bind parameters in placeholder order
+            
+        Returns:
+            CostGateDecision with the query to run and the planner estimates
+        """
+        with _enforce_query_timeout(self.dsn):
+            async with self.router.acquire(read_only=is_read_only(query)) as conn:
+                return await self.cost_gate.check(conn, query, params)
+    
+    async def _apply_cost_gate(self, conn, query: str, params: Optional[List]) -> str:
+        """Check a query on an acquired connection and return the query to run"""
+        decision = await self.cost_gate.check(conn, query, params)
+        if decision.action == REJECT:
+            raise QueryRejectedError(decision)
+        return decision.query
+    
+    async def execute(self, query: str, params: Optional[List] = None, cost_gate: bool = True) -> List[Dict]:
+        """
+        Execute a SQL query against this adapter's database.
+        
+        The statement is prepared once per pooled connection and reused
+        from the prepared statement cache on later calls. Unless disabled,
+        the query first passes the EXPLAIN cost gate, which may add a LIMIT,
+        switch to a TABLESAMPLE or reject it.
+        
+        Args:
+            query: SQL query string, with $1, $2, ... placeholders for params
+            params: Optional bind parameters in placeholder order
+            cost_gate: Whether to apply the cost gate
             
         Returns:
             List of dictionaries with query results
+            
+        Raises:
+            QueryRejectedError: If the cost gate rejects the query
+            QueryTimeoutError: If the statement exceeds MAX_QUERY_TIMEOUT
+        """
+        with _enforce_query_timeout(self.dsn):
+            async with self.router.acquire(read_only=is_read_only(query)) as conn:
+                if cost_gate:
+                    query = await self._apply_cost_gate(conn, query, params)
+                records = await get_statement_cache().fetch(conn, query, params)
+            return [dict(record) for record in records]
+    
+    async def execute_columnar(
+        self,
+        query: str,
+        params: Optional[List] = None,
+        cost_gate: bool = True
+    ) -> ColumnarResult:
+        """
+        Execute a SQL query and build the result directly from asyncpg records.
+        
+        Column names come from the prepared statement, so empty results
+        still carry their columns.
+        
+        Args:
+            query: SQL query string, with $1, $2, ... placeholders for params
+            params: Optional bind parameters in placeholder order
+            cost_gate: Whether to apply the cost gate
+            
+        Returns:
+            ColumnarResult with one array per result column
+            
+        Raises:
+            QueryRejectedError: If the cost gate rejects the query
+            QueryTimeoutError: If the statement exceeds MAX_QUERY_TIMEOUT
+        """
+        with _enforce_query_timeout(self.dsn):
+            async with self.router.acquire(read_only=is_read_only(query)) as conn:
+                if cost_gate:
+                    query = await self._apply_cost_gate(conn, query, params)
+                statement, records = await get_statement_cache().fetch_with_statement(conn, query, params)
+                columns = [attribute.name for attribute in statement.get_attributes()]
+            return ColumnarResult.from_records(records, columns)
+    
+    async def execute_stream(
+        self,
+        query: str,
+        batch_size: Optional[int] = None,
+        params: Optional[List] = None
+    ) -> AsyncIterator[List[Dict]]:
         """
-        return await execute_query(query)
+        Execute a SQL query through a server-side cursor and yield row batches.
+        
+        The cursor lives inside a transaction on a single pooled connection,
+        so only one batch is held in memory at a time. The cost gate is not
+        applied here; callers run ``check_query_cost`` first so they can
+        report the decision.
+        
+        Args:
+            query: SQL query string, with $1, $2, ... placeholders for params
+            batch_size: Rows per batch (defaults to STREAM_BATCH_SIZE from settings)
+            params: Optional bind parameters in placeholder order
+            
+        Yields:
+            Lists of dictionaries, one list per fetched batch
+        """
+        batch_size = batch_size or Settings().STREAM_BATCH_SIZE
+        
+        with _enforce_query_timeout(self.dsn):
+            async with self.router.acquire(read_only=is_read_only(query)) as conn:
+                async with conn.transaction():
+                    statement = await get_statement_cache().prepare(conn, query)
+                    cursor = await statement.cursor(*coerce_params(statement, params))
+                    while True:
+                        records = await cursor.fetch(batch_size)
+                        if not records:
+                            break
+                        yield [dict(record) for record in records]
+                        if len(records) < batch_size:
+                            break
     
-    async def execute_query(self, query: str, params: Optional[List] = None) -> List[Dict]:
+    async def export_query(
+        self,
+        query: str,
+        format: str = "csv",
+        params: Optional[List] = None
+    ) -> ExportHandle:
+        """
+        Export the full result of a query to a local spill file.
+        
+        Rows are streamed with ``COPY (query) TO STDOUT`` straight into a CSV
+        file, so memory use does not grow with the result size and no rows
+        go through Python objects or JSON. Parquet exports are converted from
+        that CSV block by block. The cost gate is not applied: exports exist
+        to deliver results beyond MAX_ROWS_DIRECT. The COPY runs in its own
+        transaction under EXPORT_TIMEOUT instead of MAX_QUERY_TIMEOUT.
+        
+        Args:
+            query: Read-only SQL query, with $1, $2, ... placeholders for params
+            format: 'csv' or 'parquet'
+            params: Optional bind parameters in placeholder order
+            
+        Returns:
+            ExportHandle for the finished file
+            
+        Raises:
+            ValueError: If the query is not read-only or the format is unsupported
+        """
+        if not is_read_only(query):
+            raise ValueError("Only read-only queries can be exported")
+        
+        export_timeout = Settings().EXPORT_TIMEOUT
+        store = get_export_store()
+        handle = store.new_export(format)
+        handle.sql = query
+        spill_path = handle.path if format == "csv" else f"{handle.path}.part"
+        
+        try:
+            with _enforce_query_timeout(self.dsn):
+                async with self.router.acquire(read_only=True) as conn:
+                    async with conn.transaction():
+                        # Pooled connections carry MAX_QUERY_TIMEOUT; exports get their own limit
+                        await conn.execute(f"SET LOCAL statement_timeout = {int(export_timeout * 1000)}")
+                        statement = await get_statement_cache().prepare(conn, query)
+                        args = coerce_params(statement, params)
+                        attributes = statement.get_attributes()
+                        status = await conn.copy_from_query(
+                            query.strip().rstrip(";"), *args,
+                            output=spill_path, format="csv", header=True,
+                            timeout=export_timeout or None
+                        )
+            
+            handle.columns = [attribute.name for attribute in attributes]
+            handle.column_types = [attribute.type.name for attribute in attributes]
+            handle.row_count = int(status.split()[-1]) if status else 0
+            
+            if format == "parquet":
+                # Conversion is CPU-bound; keep it off the event loop
+                await asyncio.to_thread(csv_to_parquet, spill_path, handle.path, handle.columns, handle.column_types)
+        except BaseException:
+            store.delete(handle.export_id)
+            raise
+        finally:
+            if spill_path != handle.path and os.path.exists(spill_path):
+                os.remove(spill_path)
+        
+        store.save(handle)
+        return handle
+    
+    async def execute_query(self, query: str, params: Optional[List] = None, cost_gate: bool = True) -> List[Dict]:
         """
         Execute a SQL query (alias for execute).
         
         This method exists for compatibility with the implementation agent.
         
         Args:
-            query: SQL query string
-            params: Optional query parameters (currently not used but accepted for compatibility)
+            query: SQL query string, with $1, $2, ... placeholders for params
+            params: Optional bind parameters from the plan's SqlOperation
+            cost_gate: Whether to apply the cost gate
             
         Returns:
             List of dictionaries with query results
         """
-        # Note: params are currently ignored as the existing execute_query function doesn't support them
-        # Future enhancement could add parameter support
-        return await self.execute(query)
+        return await self.execute(query, params, cost_gate=cost_gate)
     
-    async def introspect_schema(self) -> List[Dict[str, str]]:
+    async def introspect_schema(self, incremental: bool = False) -> List[Dict[str, str]]:
         """
-        Introspect the database schema using the existing functionality.
+        Introspect this adapter's database schema.
         
+        Args:
+            incremental: Re-read only tables whose catalog entries changed since the last call
+            
         Returns:
             List of document dictionaries with schema metadata
         """
-        return await get_schema_metadata()
+        pool = await self.router.get_read_pool()
+        schema_data = await fetch_schema_snapshot(self.dsn, pool, incremental=incremental)
+        return await format_schema_for_embedding(schema_data)
     
     async def test_connection(self) -> bool:
         """
-        Test the database connection using the existing test_conn function.
+        Test the connection to this adapter's database.
+        
+        When the primary is unreachable but a replica is healthy, the source
+        is still available for (read-only) generated queries.
         
         Returns:
             True if connection successful, False otherwise
         """
-        return await test_conn() 
\ No newline at end of file
+        try:
+            async with self.router.acquire() as conn:
+                await conn.fetchval("SELECT 1")
+            return True
+        except Exception as e:
+            logger.error(f"Connection test failed for {redact_dsn(self.dsn)}: {str(e)}")
+        
+        if self.router.has_replicas:
+            await self.router.check_health(force=True)
+            if any(replica.healthy for replica in self.router.replicas):
+                logger.warning(f"Primary {redact_dsn(self.dsn)} unreachable, reads are served by replicas")
+                return True
+        return False
+    
+    def replica_status(self) -> Dict[str, Any]:
+        """
+        Get read replica routing and health for this source.
+        
+        Returns:
+            Dictionary with per-replica health, lag and load
+        """
+        return self.router.get_stats() 
\ No newline at end of file
@@ -3,30 +3,83 @@ Qdrant adapter implementation.
 Provides Qdrant vector database support through the DBAdapter interface.
 """
 
+import asyncio
 import logging
 import json
-from typing import Any, Dict, List, Optional, Union
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import Filter, FieldCondition, MatchValue
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.http.models import (
+    Filter, FieldCondition, MatchValue, QuantizationSearchParams, QueryRequest, SearchParams
+)
 
 from .base import DBAdapter
 from ...config.settings import Settings
+from ..embedding_cache import EmbeddingCache, embedding_key, get_embedding_cache
+from ..qdrant_client_manager import get_async_qdrant_client
+from ..qdrant_indexes import (
+    FieldUsage, PayloadIndexAction, PayloadIndexManager, existing_indexes, filter_fields, get_filter_usage_tracker
+)
+from ..qdrant_schema import get_qdrant_schema_inferrer
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Payload indexes per (URI, collection), refreshed after INDEXED_FIELDS_TTL seconds
+INDEXED_FIELDS_TTL = 300
+_indexed_fields: Dict[Tuple[str, str], Tuple[float, Dict[str, str]]] = {}
+
+# Whether each (URI, collection) is quantized, read by the same get_collection call
+_quantized_collections: Dict[Tuple[str, str], bool] = {}
+
+# Shared HTTP session for custom embedding endpoints, bound to the loop that created it
+_http_session = None
+_http_session_loop = None
+
+async def get_embedding_session():
+    """
+    Get the shared aiohttp session for embedding requests
+
+    Creating a session per request costs a TCP (and TLS) handshake every
+    time; the shared session keeps connections to the endpoint alive.
+    A new session is created if the old one was closed or belongs to
+    another event loop.
+    """
+    global _http_session, _http_session_loop
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        _http_session = aiohttp.ClientSession()
+        _http_session_loop = loop
+    return _http_session
+
+async def close_embedding_session() -> None:
+    """Close the shared embedding HTTP session"""
+    global _http_session, _http_session_loop
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+    _http_session_loop = None
+
+
 class EmbeddingProvider:
     """
     Handles embedding generation for vector search.
     Supports multiple embedding models/providers.
+
+    Embeddings are cached by provider, model and text (see
+    ``EmbeddingCache``), and texts missing from the cache are sent to the
+    provider in batched requests.
     """
     
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, cache: Optional[EmbeddingCache] = None):
         """
         Initialize the embedding provider.
         
         Args:
             settings: Application settings
+            cache: Embedding cache (default: the global cache)
         """
         self.settings = settings
         self.provider = settings.VECTOR_EMBEDDING_PROVIDER
@@ -34,6 +87,10 @@ class EmbeddingProvider:
         self.dimensions = settings.VECTOR_EMBEDDING_DIMENSIONS
         self.api_key = settings.VECTOR_EMBEDDING_API_KEY
         self.custom_endpoint = settings.VECTOR_EMBEDDING_ENDPOINT
+        self.batch_size = max(1, settings.VECTOR_EMBEDDING_BATCH_SIZE)
+        self.cache = cache if cache is not None else get_embedding_cache()
+        self.requests = 0
+        self._openai_client = None
         
     async def get_embedding(self, text: str) -> List[float]:
         """
@@ -45,42 +102,77 @@ class EmbeddingProvider:
         Returns:
             List of floats representing the embedding vector
         """
-        # Use OpenAI embeddings
-        if self.provider.lower() == "openai":
-            return await self._get_openai_embedding(text)
-        
-        # Use custom embedding API
-        elif self.provider.lower() == "custom":
-            return await self._get_custom_embedding(text)
-        
-        else:
+        return (await self.get_embeddings([text]))[0]
+
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embedding vectors for several texts.
+
+        Cached texts are not sent again, duplicates are embedded once, and
+        the rest go to the provider in requests of up to batch_size texts.
+
+        Args:
+            texts: Input texts to embed
+
+        Returns:
+            Embedding vectors in the order of the texts
+        """
+        provider = self.provider.lower()
+        if provider not in ("openai", "custom"):
             raise ValueError(f"Unsupported embedding provider: {self.provider}")
+
+        keys = [embedding_key(provider, self.model, text) for text in texts]
+        vectors = self.cache.get_many(list(dict.fromkeys(keys)))
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+
+        if missing:
+            missing_keys = list(missing)
+            missing_texts = list(missing.values())
+            fresh: List[List[float]] = []
+            for start in range(0, len(missing_texts), self.batch_size):
+                batch = missing_texts[start:start + self.batch_size]
+                self.requests += 1
+                # Use OpenAI embeddings
+                if provider == "openai":
+                    fresh.extend(await self._get_openai_embeddings(batch))
+                # Use custom embedding API
+                else:
+                    fresh.extend(await self._get_custom_embeddings(batch))
+            embedded = dict(zip(missing_keys, fresh))
+            self.cache.put_many(embedded.items())
+            vectors.update(embedded)
+
+        return [list(vectors[key]) for key in keys]
     
-    async def _get_openai_embedding(self, text: str) -> List[float]:
+    async def _get_openai_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
-        Generate an OpenAI embedding.
+        Generate OpenAI embeddings in one request.
         
         Args:
-            text: Input text
+            texts: Input texts
             
         Returns:
-            Embedding vector
+            Embedding vectors in the order of the texts
         """
         try:
             import openai
             
-            # Configure OpenAI client
-            if self.api_key:
-                openai.api_key = self.api_key
+            # One async client per provider keeps its connection pool
+            if self._openai_client is None:
+                self._openai_client = openai.AsyncOpenAI(api_key=self.api_key) if self.api_key else openai.AsyncOpenAI()
             
-            # Get embedding
-            response = await openai.embeddings.create(
-                input=text,
+            # Get embeddings
+            response = await self._openai_client.embeddings.create(
+                input=texts,
                 model=self.model or "text-embedding-ada-002"
             )
             
-            # Extract and return the embedding vector
-            return response.data[0].embedding
+            # Extract the embedding vectors in input order
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
             
         except ImportError:
             logger.error("OpenAI package not installed. Install with: pip install openai")
@@ -89,61 +181,44 @@ class EmbeddingProvider:
             logger.error(f"Error generating OpenAI embedding: {e}")
             raise
     
-    async def _get_custom_embedding(self, text: str) -> List[float]:
+    async def _get_custom_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
-        Get embedding from custom API endpoint.
+        Get embeddings from custom API endpoint.
+
+        Endpoints that accept batches (VECTOR_EMBEDDING_BATCH_REQUESTS) get
+        one {"texts": [...]} request; otherwise the texts are sent as
+        concurrent single-text requests over the shared session.
         
         Args:
-            text: Input text
+            texts: Input texts
             
         Returns:
-            Embedding vector
+            Embedding vectors in the order of the texts
         """
         if not self.custom_endpoint:
             raise ValueError("Custom embedding endpoint not configured")
             
         try:
-            import aiohttp
-            import json
-            
-            # Prepare request based on configured format
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}" if self.api_key else ""
-            }
-            
-            # Default to JSON request format
-            payload = {
-                "text": text,
-                "model": self.model
-            }
-            
-            # Make the request
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.custom_endpoint,
-                    headers=headers,
-                    json=payload
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise ValueError(f"Embedding API error ({response.status}): {error_text}")
-                        
-                    # Parse response
-                    response_data = await response.json()
-                    
-                    # Response field path defaulted to "embedding"
-                    embedding_field = self.settings.VECTOR_EMBEDDING_RESPONSE_FIELD or "embedding"
-                    
-                    # Extract embedding from response based on field path
-                    embedding = response_data
-                    for key in embedding_field.split("."):
-                        embedding = embedding.get(key, {})
-                    
-                    if not isinstance(embedding, list):
-                        raise ValueError(f"Invalid embedding format returned from API: {type(embedding)}")
-                        
-                    return embedding
+            if self.settings.VECTOR_EMBEDDING_BATCH_REQUESTS:
+                response_data = await self._post_custom({"texts": texts, "model": self.model})
+                embeddings = self._extract_field(
+                    response_data, self.settings.VECTOR_EMBEDDING_BATCH_RESPONSE_FIELD or "embeddings"
+                )
+                if not isinstance(embeddings, list) or len(embeddings) != len(texts) or \
+                        not all(isinstance(embedding, list) for embedding in embeddings):
+                    raise ValueError(f"Invalid batch embedding format returned from API: expected {len(texts)} vectors")
+                return embeddings
+
+            async def embed(text: str) -> List[float]:
+                # Default to JSON request format
+                response_data = await self._post_custom({"text": text, "model": self.model})
+                # Response field path defaulted to "embedding"
+                embedding = self._extract_field(response_data, self.settings.VECTOR_EMBEDDING_RESPONSE_FIELD or "embedding")
+                if not isinstance(embedding, list):
+                    raise ValueError(f"Invalid embedding format returned from API: {type(embedding)}")
+                return embedding
+
+            return list(await asyncio.gather(*(embed(text) for text in texts)))
                     
         except ImportError:
             logger.error("aiohttp package not installed. Install with: pip install aiohttp")
@@ -152,12 +227,35 @@ class EmbeddingProvider:
             logger.error(f"Error with custom embedding API: {e}")
             raise
 
+    async def _post_custom(self, payload: Dict[str, Any]) -> Any:
+        # Prepare request based on configured format
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}" if self.api_key else ""
+        }
+        session = await get_embedding_session()
+        async with session.post(self.custom_endpoint, headers=headers, json=payload) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise ValueError(f"Embedding API error ({response.status}): {error_text}")
+            return await response.json()
+
+    @staticmethod
+    def _extract_field(response_data: Any, field_path: str) -> Any:
+        # Extract a value from the response based on a dotted field path
+        value = response_data
+        for key in field_path.split("."):
+            value = value.get(key, {}) if isinstance(value, dict) else {}
+        return value
+
 class QdrantAdapter(DBAdapter):
     """
     Qdrant vector database adapter implementation.
     
     This adapter provides Qdrant support through the DBAdapter interface,
-    focusing on vector similarity search.
+    focusing on vector similarity search. Requests go through the shared
+    async client for the URI (see ``QdrantClientManager``), and several
+    searches can be sent in one round trip with ``execute_batch``.
     """
     
     def __init__(self, conn_uri: str, **kwargs):
@@ -169,7 +267,7 @@ class QdrantAdapter(DBAdapter):
             **kwargs: Additional parameters
                 - api_key: Qdrant API key for cloud deployments (optional)
                 - collection_name: Default collection to query (required)
-                - prefer_grpc: Whether to use gRPC connection (optional, default: False)
+                - prefer_grpc: Whether to use gRPC connection (optional, default from settings)
         """
         super().__init__(conn_uri)
         
@@ -207,17 +305,21 @@ class QdrantAdapter(DBAdapter):
         self.api_key = kwargs.get('api_key') or settings.QDRANT_API_KEY
         self.prefer_grpc = kwargs.get('prefer_grpc', settings.QDRANT_PREFER_GRPC)
         
-        # Initialize Qdrant client
-        self.client = QdrantClient(
-            url=conn_uri, 
-            api_key=self.api_key,
-            prefer_grpc=self.prefer_grpc
-        )
+        # Rescoring of searches on quantized collections
+        self.rescore = kwargs.get('rescore', settings.QDRANT_RESCORE)
+        self.oversampling = kwargs.get('oversampling', settings.QDRANT_RESCORE_OVERSAMPLING)
+        
+        self.client_uri = conn_uri
         
         # Initialize embedding provider
         self.embedding_provider = EmbeddingProvider(settings)
         
         logger.info(f"Initialized Qdrant adapter for collection: {self.collection_name}")
+
+    @property
+    def client(self) -> AsyncQdrantClient:
+        """Shared async Qdrant client for this adapter's URI"""
+        return get_async_qdrant_client(self.client_uri, self.api_key, self.prefer_grpc)
     
     async def llm_to_query(self, nl_prompt: str, **kwargs) -> Dict:
         """
@@ -237,7 +339,7 @@ class QdrantAdapter(DBAdapter):
                 - filter: Query filter (optional)
                 - collection: Target collection name
         """
-        # Get embedding for the query
+        # Get embedding for the query (served from the embedding cache for repeated prompts)
         vector = await self.embedding_provider.get_embedding(nl_prompt)
         
         # Get parameters
@@ -265,20 +367,95 @@ class QdrantAdapter(DBAdapter):
         Args:
             query: Dict containing:
                 - vector: Query vector
-                - top_k: Number of results to return
+                - top_k: Number of results to return (or limit)
                 - filter: Optional query filter
                 - collection: Target collection name
                 
         Returns:
             List of dictionaries with search results
         """
+        collection_name, request = self._build_request(query)
+        
+        # Execute the search
+        try:
+            start = time.perf_counter()
+            response = await self.client.query_points(
+                collection_name=collection_name,
+                query=request.query,
+                query_filter=request.filter,
+                limit=request.limit,
+                search_params=await self._search_params(collection_name),
+                with_payload=True
+            )
+            await self._record_filter_usage(collection_name, [query.get("filter")], time.perf_counter() - start)
+            return self._format_points(response.points)
+            
+        except Exception as e:
+            logger.error(f"Error executing Qdrant query: {e}")
+            raise
+
+    async def execute_batch(self, queries: List[Dict]) -> List[List[Dict]]:
+        """
+        Execute several Qdrant search queries with one request per collection.
+
+        Queries on the same collection are sent together with
+        query_batch_points; different collections are queried concurrently.
+        
+        Args:
+            queries: Query dicts as accepted by execute()
+                
+        Returns:
+            Search results for each query, in the order of the queries
+        """
+        by_collection: Dict[str, List[int]] = {}
+        requests: List[QueryRequest] = []
+        for index, query in enumerate(queries):
+            collection_name, request = self._build_request(query)
+            by_collection.setdefault(collection_name, []).append(index)
+            requests.append(request)
+
+        async def search_collection(collection_name: str, indexes: List[int]) -> None:
+            params = await self._search_params(collection_name)
+            start = time.perf_counter()
+            responses = await self.client.query_batch_points(
+                collection_name=collection_name,
+                requests=[requests[index].copy(update={"params": params}) for index in indexes]
+            )
+            for index, response in zip(indexes, responses):
+                results[index] = self._format_points(response.points)
+            # Each search is charged an equal share of the round trip
+            await self._record_filter_usage(
+                collection_name, [queries[index].get("filter") for index in indexes],
+                (time.perf_counter() - start) / len(indexes)
+            )
+
+        results: List[List[Dict]] = [[] for _ in queries]
+        try:
+            await asyncio.gather(*(
+                search_collection(collection_name, indexes) for collection_name, indexes in by_collection.items()
+            ))
+        except Exception as e:
+            logger.error(f"Error executing Qdrant batch query: {e}")
+            raise
+        return results
+
+    def _build_request(self, query: Dict) -> Tuple[str, QueryRequest]:
+        """
+        Turn a query dict into a collection name and a QueryRequest.
+
+        Args:
+            query: Query dict as accepted by execute()
+
+        Returns:
+            Tuple of (collection name, QueryRequest)
+        """
         if not isinstance(query, dict):
             raise ValueError("Query must be a dictionary with 'vector' and other fields")
             
         vector = query.get("vector")
-        top_k = query.get("top_k", 10)
+        top_k = query.get("top_k", query.get("limit", 10))
         filter_json = query.get("filter")
-        collection_name = query.get("collection", self.collection_name)
+        collection_name = query.get("collection") or self.collection_name
         
         if not vector:
             raise ValueError("Query missing 'vector' field")
@@ -288,31 +465,12 @@ class QdrantAdapter(DBAdapter):
         if filter_json:
             filter_obj = self._parse_filter(filter_json)
         
-        # Execute the search
-        try:
-            search_results = self.client.search(
-                collection_name=collection_name,
-                query_vector=vector,
-                limit=top_k,
-                query_filter=filter_obj
-            )
-            
-            # Format results
-            results = []
-            for hit in search_results:
-                # Combine score, id, and payload into one dict
-                result = {
-                    "id": hit.id,
-                    "score": hit.score,
-                    **hit.payload
-                }
-                results.append(result)
-                
-            return results
-            
-        except Exception as e:
-            logger.error(f"Error executing Qdrant query: {e}")
-            raise
+        return collection_name, QueryRequest(query=vector, filter=filter_obj, limit=top_k, with_payload=True)
+
+    @staticmethod
+    def _format_points(points: List[Any]) -> List[Dict]:
+        # Combine score, id, and payload into one dict
+        return [{"id": hit.id, "score": hit.score, **(hit.payload or {})} for hit in points]
             
     async def execute_query(self, query: Dict) -> List[Dict]:
         """
@@ -332,6 +490,125 @@ class QdrantAdapter(DBAdapter):
         """
         return await self.execute(query)
     
+    async def _record_filter_usage(self, collection_name: str, filters: List[Any], seconds: float) -> None:
+        """
+        Count the payload keys used by the filters of searches
+
+        Args:
+            collection_name: Collection searched
+            filters: Filters of the searches (None for unfiltered searches)
+            seconds: Duration of each search
+        """
+        tracker = get_filter_usage_tracker()
+        if not tracker.enabled or not any(filters):
+            return
+        indexed = await self.get_indexed_fields(collection_name)
+        for filter_json in filters:
+            if filter_json:
+                tracker.record(self.client_uri, collection_name, filter_fields(filter_json), seconds, set(indexed))
+
+    async def get_indexed_fields(self, collection_name: Optional[str] = None, refresh: bool = False) -> Dict[str, str]:
+        """
+        Get the payload indexes of a collection
+
+        Args:
+            collection_name: Collection name (default: the adapter's collection)
+            refresh: Bypass the cached answer
+
+        Returns:
+            Dictionary of payload key to index type
+        """
+        key = (self.client_uri, collection_name or self.collection_name)
+        cached = _indexed_fields.get(key)
+        if cached is not None and not refresh and time.monotonic() - cached[0] < INDEXED_FIELDS_TTL:
+            return cached[1]
+        try:
+            collection_info = await self.client.get_collection(key[1])
+            indexes = existing_indexes(collection_info)
+            _quantized_collections[key] = self._is_quantized(collection_info)
+        except Exception as e:
+            logger.warning(f"Error reading payload indexes of {key[1]}: {e}")
+            indexes = {}
+        _indexed_fields[key] = (time.monotonic(), indexes)
+        return indexes
+
+    async def _search_params(self, collection_name: str) -> Optional[SearchParams]:
+        """
+        Search parameters for a collection
+
+        Quantized collections are searched on the compressed vectors first;
+        rescoring re-ranks ``oversampling`` times the requested number of
+        candidates with the original vectors, which keeps recall close to an
+        unquantized search.
+
+        Args:
+            collection_name: Collection searched
+
+        Returns:
+            SearchParams with rescoring if the collection is quantized, else None
+        """
+        if not self.rescore:
+            return None
+        # Refreshes the cached collection configuration every INDEXED_FIELDS_TTL seconds
+        await self.get_indexed_fields(collection_name)
+        if not _quantized_collections.get((self.client_uri, collection_name)):
+            return None
+        return SearchParams(quantization=QuantizationSearchParams(rescore=True, oversampling=self.oversampling))
+
+    @staticmethod
+    def _is_quantized(collection_info: Any) -> bool:
+        config = getattr(collection_info, "config", None)
+        if getattr(config, "quantization_config", None) is not None:
+            return True
+        # Named vectors can be quantized individually
+        vectors = getattr(getattr(config, "params", None), "vectors", None)
+        vector_configs = vectors.values() if isinstance(vectors, dict) else [vectors]
+        return any(getattr(vector, "quantization_config", None) is not None for vector in vector_configs)
+
+    def get_filter_usage(self, collection_name: Optional[str] = None) -> List[FieldUsage]:
+        """
+        Get how often payload keys were filtered on, and search latencies with and without an index
+
+        Args:
+            collection_name: Only this collection (default: all collections of this server)
+
+        Returns:
+            List of FieldUsage, most used first
+        """
+        return get_filter_usage_tracker().get_usage(self.client_uri, collection_name)
+
+    async def ensure_payload_indexes(
+        self,
+        collection_name: Optional[str] = None,
+        apply: bool = True,
+        min_uses: Optional[int] = None
+    ) -> List[PayloadIndexAction]:
+        """
+        Create payload indexes for frequently filtered keys
+
+        The index type comes from the payload schema found by
+        _extract_payload_schema, falling back to the type implied by the
+        filters.
+
+        Args:
+            collection_name: Collection name (default: the adapter's collection)
+            apply: Create the indexes; otherwise only report the plan
+            min_uses: Filter uses before a key gets an index (default from settings)
+
+        Returns:
+            One action per filtered key
+        """
+        collection_name = collection_name or self.collection_name
+        manager = PayloadIndexManager(min_uses=min_uses)
+        indexed = await self.get_indexed_fields(collection_name, refresh=True)
+        payload_schema = await self._extract_payload_schema(collection_name)
+        actions = manager.plan(self.client_uri, collection_name, indexed, payload_schema)
+        if apply:
+            await manager.apply(self.client, actions)
+            if any(action.created for action in actions):
+                await self.get_indexed_fields(collection_name, refresh=True)
+        return actions
+
     def _parse_filter(self, filter_json: Dict) -> Filter:
         """
         Parse a JSON filter into a Qdrant Filter object.
@@ -361,136 +638,55 @@ class QdrantAdapter(DBAdapter):
                 ]
             )
             
-        # Return as-is if it's already in the correct format
-        return filter_json
+        # Otherwise the filter is already in Qdrant's format
+        if isinstance(filter_json, Filter):
+            return filter_json
+        return Filter(**filter_json)
     
     async def introspect_schema(self) -> List[Dict[str, str]]:
         """
         Introspect Qdrant collections and vector configurations.
-        
+
+        Collections are sampled concurrently by the shared QdrantSchemaInferrer,
+        which skips collections whose points count and configuration have not
+        changed since they were last sampled.
+
         Returns:
             List of document dictionaries for embedding
         """
         documents = []
-        
+
         try:
-            # Get all collection names using the more flexible list_collections API
             try:
-                collections_list = self.client.get_collections().collections
+                collections_list = (await self.client.get_collections()).collections
                 collection_names = [collection.name for collection in collections_list]
             except Exception as e:
                 logger.warning(f"Error using get_collections API, falling back to simplified approach: {e}")
-                # Fallback approach if get_collections() API changed
                 collection_names = [self.collection_name]
-            
-            # Process each collection
-            for collection_name in collection_names:
-                try:
-                    # Basic collection info to add regardless of errors
-                    content_lines = [f"COLLECTION: {collection_name}"]
-                    
-                    # Variable to store raw response data
-                    data = {}
-                    
-                    # Try to get collection info using the high-level client API first
-                    try:
-                        # Get the actual URL from the client's configuration
-                        collection_info = self.client.get_collection(collection_name)
-                        
-                        # Safe access to nested attributes with fallbacks
-                        if hasattr(collection_info, 'config') and hasattr(collection_info.config, 'params'):
-                            params = collection_info.config.params
-                            
-                            if hasattr(params, 'vectors'):
-                                vectors = params.vectors
-                                
-                                # Handle new vector configuration format (multiple named vectors)
-                                if hasattr(vectors, 'items') and callable(vectors.items):
-                                    for vec_name, vec_config in vectors.items():
-                                        vec_size = getattr(vec_config, 'size', 'Unknown')
-                                        vec_distance = getattr(vec_config, 'distance', 'Unknown')
-                                        content_lines.append(f"VECTOR {vec_name} DIMENSIONS: {vec_size}")
-                                        content_lines.append(f"VECTOR {vec_name} DISTANCE: {vec_distance}")
-                                else:
-                                    # Legacy single vector configuration
-                                    content_lines.append(f"VECTOR DIMENSIONS: {getattr(vectors, 'size', 'Unknown')}")
-                                    content_lines.append(f"VECTOR DISTANCE: {getattr(vectors, 'distance', 'Unknown')}")
-                        
-                        # Try to access the raw response data if possible
-                        if hasattr(collection_info, '_raw_response') and collection_info._raw_response:
-                            data = collection_info._raw_response
-                            
-                    except Exception as high_level_error:
-                        logger.warning(f"Error with high-level API for {collection_name}: {high_level_error}")
-                        content_lines.append("VECTOR DIMENSIONS: Unknown (error accessing collection info)")
-                        content_lines.append("VECTOR DISTANCE: Unknown (error accessing collection info)")
-                    
-                    # Get payload schema with better error handling
-                    try:
-                        # Extract schema from the raw response if available
-                        schema_dict = {}
-                        if data and "result" in data and "payload_schema" in data["result"]:
-                            raw_schema = data["result"]["payload_schema"]
-                            for field_name, field_info in raw_schema.items():
-                                schema_dict[field_name] = {
-                                    "type": field_info.get("data_type", "unknown"),
-                                    "indexed": field_info.get("indexed", False)
-                                }
-                        else:
-                            # Fall back to using the extraction method
-                            schema_dict = self._extract_payload_schema(collection_name)
-                        
-                        # Format schema as text
-                        schema_lines = []
-                        for field, schema in schema_dict.items():
-                            if field == "error" and "message" in schema:
-                                continue  # Skip error messages in the schema
-                                
-                            field_type = schema.get('type', 'unknown')
-                            is_indexed = schema.get('indexed', False)
-                            schema_lines.append(f"- {field}: {field_type}" + 
-                                            (f" (indexed: {is_indexed})" if is_indexed else ""))
-                        
-                        schema_text = "\n".join(schema_lines) if schema_lines else "No schema information available"
-                        content_lines.append("\nPAYLOAD SCHEMA:")
-                        content_lines.append(schema_text)
-                    except Exception as schema_error:
-                        logger.warning(f"Error extracting schema for {collection_name}: {schema_error}")
-                        content_lines.append("\nPAYLOAD SCHEMA: Error retrieving schema information")
-                    
-                    # Try to get points count
-                    try:
-                        # Use the standard high-level API
-                        count_response = self.client.count(collection_name)
-                        points_count = getattr(count_response, 'count', 'Unknown')
-                        content_lines.append(f"\nPOINTS COUNT: {points_count}")
-                    except Exception as count_error:
-                        logger.warning(f"Error getting points count for {collection_name}: {count_error}")
-                        content_lines.append("\nPOINTS COUNT: Unknown (error counting points)")
-                    
-                    # Add collection document
-                    documents.append({
-                        "id": f"collection:{collection_name}",
-                        "content": "\n".join(content_lines).strip()
-                    })
-                    
-                except Exception as coll_error:
-                    logger.error(f"Error processing collection {collection_name}: {coll_error}")
+
+            schemas = await get_qdrant_schema_inferrer().infer_all(self.client, collection_names, source=self.client_uri)
+            for collection_name, schema in schemas.items():
+                if isinstance(schema, Exception):
                     # Add minimal information for failed collection
                     documents.append({
                         "id": f"collection:{collection_name}",
                         "content": f"COLLECTION: {collection_name}\nERROR: Could not retrieve collection details"
                     })
-            
+                    continue
+                documents.append({
+                    "id": f"collection:{collection_name}",
+                    "content": schema.to_content()
+                })
+
             # If no documents were created, add a placeholder
             if not documents:
                 documents.append({
                     "id": "qdrant:info",
                     "content": "Qdrant database with no accessible collections or schema information."
                 })
-            
+
             return documents
-            
+
         except Exception as e:
             logger.error(f"Error introspecting Qdrant schema: {e}")
             # Return a minimal document rather than an empty list
@@ -498,119 +694,26 @@ class QdrantAdapter(DBAdapter):
                 "id": "qdrant:error",
                 "content": f"Error introspecting Qdrant database: {e}"
             }]
-    
-    def _extract_payload_schema(self, collection_name: str) -> Dict[str, Dict[str, Any]]:
+
+    async def _extract_payload_schema(self, collection_name: str) -> Dict[str, Dict[str, Any]]:
         """
-        Extract payload schema from collection with improved error handling.
-        
+        Extract the payload schema of a collection from a sample of its points.
+
         Args:
             collection_name: Collection name
-            
+
         Returns:
-            Dict of field name to schema info
+            Dict of field name to schema info (type, indexed, presence and type histogram)
         """
-        schema = {}
-        
         try:
-            # Get collection info including payload schema
-            collection_info = self.client.get_collection(collection_name)
-            
-            # Try to extract schema from collection info if available
-            if hasattr(collection_info, 'config') and hasattr(collection_info.config, 'params'):
-                if hasattr(collection_info.config.params, 'payload_schema'):
-                    raw_schema = collection_info.config.params.payload_schema
-                    if raw_schema:
-                        for field_name, field_info in raw_schema.items():
-                            schema[field_name] = {
-                                "type": getattr(field_info, 'data_type', type(field_info).__name__),
-                                "indexed": getattr(field_info, 'indexed', False)
-                            }
-                        
-                        if schema:
-                            return schema
-            
-            # For older Qdrant versions or if schema not available,
-            # sample a few points to infer schema
-            logger.info(f"No schema information found in collection info for {collection_name}, sampling points to infer schema")
-            
-            # Use scroll API to get sample points
-            try:
-                # Try to sample at least 5 points
-                scroll_result = self.client.scroll(
-                    collection_name=collection_name,
-                    limit=5,
-                    with_payload=True
-                )
-                
-                # Handle tuple response format (points, next_page_offset)
-                if isinstance(scroll_result, tuple):
-                    points = scroll_result[0]
-                else:
-                    points = scroll_result
-                
-                # Extract fields and their types from the sample points
-                for point in points:
-                    # Skip points without payload
-                    if not hasattr(point, 'payload') or not point.payload:
-                        continue
-                    
-                    # Process each field in the payload
-                    for field, value in point.payload.items():
-                        # Skip already processed fields
-                        if field in schema:
-                            continue
-                        
-                        # Determine the field type
-                        field_type = type(value).__name__
-                        
-                        # Add to schema
-                        schema[field] = {
-                            "type": field_type,
-                            "indexed": False  # We can't determine indexing from sampling
-                        }
-                
-                return schema
-                
-            except Exception as scroll_error:
-                logger.warning(f"Error sampling points: {scroll_error}")
-            
-            # If we don't have any schema info yet, try a different approach with search
-            # This might work with some versions of Qdrant
-            if not schema:
-                try:
-                    # Try searching with an empty query to get sample points
-                    search_results = self.client.search(
-                        collection_name=collection_name,
-                        query_vector=[0.0] * 1536,  # Use default dimension
-                        limit=5,
-                        with_payload=True
-                    )
-                    
-                    # Process search results to infer schema
-                    for hit in search_results:
-                        if not hasattr(hit, 'payload') or not hit.payload:
-                            continue
-                            
-                        for field, value in hit.payload.items():
-                            if field in schema:
-                                continue
-                                
-                            schema[field] = {
-                                "type": type(value).__name__,
-                                "indexed": False
-                            }
-                        
-                    return schema
-                    
-                except Exception as search_error:
-                    logger.warning(f"Error using search to infer schema: {search_error}")
-            
-            return schema or {"unknown": {"type": "unknown"}}
-            
+            schema = await get_qdrant_schema_inferrer().infer_collection(
+                self.client, collection_name, source=self.client_uri
+            )
+            return schema.to_payload_schema() or {"unknown": {"type": "unknown"}}
         except Exception as e:
             logger.error(f"Error extracting payload schema: {e}")
             return {"error": {"type": "error", "message": str(e)}}
-    
+
     async def test_connection(self) -> bool:
         """
         Test the Qdrant connection.
@@ -620,7 +723,7 @@ class QdrantAdapter(DBAdapter):
         """
         try:
             # Try to get collection list first - this is the basic test
-            collections_response = self.client.get_collections()
+            collections_response = await self.client.get_collections()
             
             # If we can get collections, that's enough to consider the connection working
             if hasattr(collections_response, 'collections'):
@@ -0,0 +1,99 @@
+"""
+BSON to native Python conversion
+
+MongoDB results used to be made JSON-safe with
+``json.loads(json_util.dumps(docs))``, which serializes every document to a
+string and parses it back. ``to_native`` does the same job in one pass over
+each document: plain values are returned as-is and only BSON-specific types
+are converted (ObjectIds to strings, datetimes to ISO 8601 strings,
+Decimal128 to floats, binary data to base64).
+"""
+
+import base64
+import datetime
+import re
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping
+
+from bson import Binary, DBRef, Decimal128, ObjectId, Regex, Timestamp
+
+# Types returned unchanged; checked by exact type first as the fast path
+_PASSTHROUGH_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _datetime_to_str(value: datetime.datetime) -> str:
+    # PyMongo decodes BSON dates as naive UTC datetimes
+    if value.tzinfo is None:
+        return value.isoformat() + "Z"
+    return value.isoformat()
+
+
+def to_native(value: Any) -> Any:
+    """
+    Convert a BSON value (or a whole document) to JSON-safe Python values
+
+    Args:
+        value: Document, list or scalar decoded by PyMongo
+
+    Returns:
+        Equivalent value built only from dict, list, str, int, float, bool and None
+    """
+    value_type = type(value)
+    if value_type in _PASSTHROUGH_TYPES:
+        return value
+    if value_type is dict:
+        return {key: to_native(item) for key, item in value.items()}
+    if value_type is list:
+        return [to_native(item) for item in value]
+    if value_type is ObjectId:
+        return str(value)
+    if value_type is datetime.datetime:
+        return _datetime_to_str(value)
+
+    # Less common types (and subclasses of the ones above)
+    if isinstance(value, Mapping):
+        return {key: to_native(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_native(item) for item in value]
+    if isinstance(value, bool):
+        return bool(value)
+    if isinstance(value, int):
+        # Int64
+        return int(value)
+    if isinstance(value, float):
+        return float(value)
+    if isinstance(value, str):
+        # bson.Code and other str subclasses
+        return str(value)
+    if isinstance(value, (Decimal128, Decimal)):
+        decimal_value = value.to_decimal() if isinstance(value, Decimal128) else value
+        return float(decimal_value)
+    if isinstance(value, datetime.datetime):
+        return _datetime_to_str(value)
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (Binary, bytes)):
+        return base64.b64encode(bytes(value)).decode("ascii")
+    if isinstance(value, Timestamp):
+        return _datetime_to_str(value.as_datetime())
+    if isinstance(value, DBRef):
+        return {"$ref": value.collection, "$id": to_native(value.id)}
+    if isinstance(value, (Regex, re.Pattern)):
+        return value.pattern if isinstance(value.pattern, str) else value.pattern.decode()
+    return str(value)
+
+
+def documents_to_native(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert a batch of documents with ``to_native``
+
+    Args:
+        docs: Documents decoded by PyMongo
+
+    Returns:
+        List of JSON-safe dictionaries
+    """
+    return [to_native(doc) for doc in docs]
@@ -0,0 +1,276 @@
+"""
+Columnar query results
+
+Adapters return ``List[Dict]`` by default, which repeats every column name
+per row and allocates one dict per row. ``ColumnarResult`` stores the column
+names once plus one NumPy array per column, and can be produced directly
+from asyncpg records, Mongo cursors or GA4 responses. The aggregator and the
+visualization pipeline consume it without converting back to dicts.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+
+def to_column_array(values: Sequence[Any]) -> np.ndarray:
+    """
+    Convert a list of Python values into a NumPy array for one column.
+
+    Homogeneous bool, int and float columns without NULLs get a native
+    dtype; everything else (strings, dates, mixed types, NULLs) is kept as
+    an object array so values round-trip unchanged.
+
+    Args:
+        values: Column values in row order
+
+    Returns:
+        One-dimensional NumPy array
+    """
+    kinds = set()
+    for value in values:
+        if value is None:
+            kinds.add("null")
+            break
+        if isinstance(value, bool):
+            kinds.add("bool")
+        elif isinstance(value, int):
+            kinds.add("int")
+        elif isinstance(value, float):
+            kinds.add("float")
+        else:
+            kinds.add("object")
+            break
+
+    if kinds == {"bool"}:
+        return np.fromiter(values, dtype=np.bool_, count=len(values))
+    if kinds == {"int"}:
+        try:
+            return np.fromiter(values, dtype=np.int64, count=len(values))
+        except OverflowError:
+            kinds = {"object"}
+    if "float" in kinds and kinds <= {"int", "float"}:
+        return np.fromiter(values, dtype=np.float64, count=len(values))
+
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _to_python(value: Any) -> Any:
+    """Convert a NumPy scalar back to the equivalent Python value"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class ColumnarResult:
+    """
+    Query result stored column by column.
+
+    Attributes:
+        columns: Column names in result order
+        data: Mapping of column name to a NumPy array of equal length
+    """
+
+    def __init__(self, columns: List[str], data: Dict[str, np.ndarray]):
+        """
+        Initialize a columnar result
+
+        Args:
+            columns: Column names in result order
+            data: Mapping of column name to column array
+        """
+        lengths = {len(data[name]) for name in columns}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have mismatched lengths: {sorted(lengths)}")
+        self.columns = list(columns)
+        self.data = data
+
+    @property
+    def num_rows(self) -> int:
+        """Number of rows in the result"""
+        return len(self.data[self.columns[0]]) if self.columns else 0
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __repr__(self) -> str:
+        return f"ColumnarResult(columns={self.columns}, rows={self.num_rows})"
+
+    def column(self, name: str) -> np.ndarray:
+        """Get the array for a single column"""
+        return self.data[name]
+
+    @classmethod
+    def empty(cls, columns: Optional[List[str]] = None) -> "ColumnarResult":
+        """Create a result with the given columns and no rows"""
+        columns = columns or []
+        return cls(columns, {name: np.empty(0, dtype=object) for name in columns})
+
+    @classmethod
+    def from_records(cls, records: Sequence[Sequence[Any]], columns: List[str]) -> "ColumnarResult":
+        """
+        Build a result from positional records (e.g. asyncpg.Record)
+
+        Args:
+            records: Row records indexable by column position
+            columns: Column names matching the record positions
+
+        Returns:
+            ColumnarResult
+        """
+        data = {
+            name: to_column_array([record[i] for record in records])
+            for i, name in enumerate(columns)
+        }
+        return cls(columns, data)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> "ColumnarResult":
+        """
+        Build a result from row dictionaries
+
+        Keys missing from some rows are filled with None, so heterogeneous
+        documents (e.g. from MongoDB) are supported.
+
+        Args:
+            rows: Iterable of row mappings
+
+        Returns:
+            ColumnarResult
+        """
+        builder = ColumnarBuilder()
+        for row in rows:
+            builder.append(row)
+        return builder.build()
+
+    @classmethod
+    def concat(cls, results: Sequence["ColumnarResult"]) -> "ColumnarResult":
+        """
+        Concatenate results row-wise, taking the union of their columns
+
+        Args:
+            results: Results to concatenate in order
+
+        Returns:
+            ColumnarResult containing all rows
+        """
+        columns: List[str] = []
+        for result in results:
+            columns.extend(name for name in result.columns if name not in columns)
+
+        data = {}
+        for name in columns:
+            parts = []
+            for result in results:
+                if name in result.data:
+                    parts.append(result.data[name])
+                else:
+                    filler = np.empty(result.num_rows, dtype=object)
+                    filler[:] = None
+                    parts.append(filler)
+            data[name] = np.concatenate(parts) if parts else np.empty(0, dtype=object)
+        return cls(columns, data)
+
+    def slice(self, start: int, stop: Optional[int] = None) -> "ColumnarResult":
+        """Return a view of rows ``start:stop``"""
+        return ColumnarResult(self.columns, {name: self.data[name][start:stop] for name in self.columns})
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convert to the row-oriented ``List[Dict]`` format used by adapters"""
+        columns = [self.data[name].tolist() for name in self.columns]
+        return [dict(zip(self.columns, values)) for values in zip(*columns)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-friendly column-major dictionary"""
+        return {
+            "columns": self.columns,
+            "data": {name: self.data[name].tolist() for name in self.columns},
+            "row_count": self.num_rows
+        }
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Convert to a pandas DataFrame without materializing row dicts"""
+        return pd.DataFrame({name: self.data[name] for name in self.columns}, columns=self.columns)
+
+    def to_arrow(self) -> "pa.Table":
+        """
+        Convert to a pyarrow Table
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        if not ARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Arrow conversion. Install it with 'pip install pyarrow'")
+        return pa.table({name: pa.array(self.data[name].tolist()) for name in self.columns})
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Get a single row as a dictionary"""
+        return {name: _to_python(self.data[name][index]) for name in self.columns}
+
+
+class ColumnarBuilder:
+    """
+    Incrementally builds a ColumnarResult from row mappings.
+
+    Used by adapters that iterate a cursor (e.g. MongoDB) so that values are
+    appended straight into per-column lists without keeping row dicts.
+    """
+
+    def __init__(self, columns: Optional[List[str]] = None):
+        """
+        Initialize the builder
+
+        Args:
+            columns: Optional known column names (more are added as seen)
+        """
+        self.columns: List[str] = list(columns or [])
+        self._values: Dict[str, List[Any]] = {name: [] for name in self.columns}
+        self._num_rows = 0
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        """Append one row, back-filling new columns with None"""
+        for name, value in row.items():
+            values = self._values.get(name)
+            if values is None:
+                values = [None] * self._num_rows
+                self._values[name] = values
+                self.columns.append(name)
+            values.append(value)
+        self._num_rows += 1
+        for name in self.columns:
+            values = self._values[name]
+            if len(values) < self._num_rows:
+                values.append(None)
+
+    def build(self) -> ColumnarResult:
+        """Create the ColumnarResult from the rows appended so far"""
+        return ColumnarResult(
+            self.columns,
+            {name: to_column_array(self._values[name]) for name in self.columns}
+        )
+
+
+def to_dataframe(rows: Union[ColumnarResult, List[Dict[str, Any]]]) -> pd.DataFrame:
+    """
+    Create a DataFrame from either adapter result representation
+
+    Args:
+        rows: ColumnarResult or list of row dictionaries
+
+    Returns:
+        pandas DataFrame
+    """
+    if isinstance(rows, ColumnarResult):
+        return rows.to_pandas()
+    return pd.DataFrame(rows)
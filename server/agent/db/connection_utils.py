@@ -9,13 +9,17 @@ import asyncpg
 import logging
 from typing import Optional, List, Dict, Any
 from ..config.settings import Settings
+from .pool_manager import get_pool_manager
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 async def create_connection_pool() -> asyncpg.Pool:
     """
-    Create and return an asyncpg connection pool
+    Create and return a dedicated asyncpg connection pool
+    
+    The caller owns the returned pool and must close it. Prefer
+    ``get_pool_manager().get_pool()`` for the shared, long-lived pool.
     
     Returns:
         asyncpg.Pool: Configured connection pool
@@ -34,36 +38,34 @@ async def create_connection_pool() -> asyncpg.Pool:
         logger.error(f"Failed to create connection pool: {str(e)}")
         raise
 
-async def execute_query_with_pool(query: str) -> list:
+async def execute_query_with_pool(query: str, dsn: Optional[str] = None) -> list:
     """
-    Execute a SQL query using a connection pool and return the results
+    Execute a SQL query using the shared connection pool and return the results
     
     Args:
         query: SQL query to execute
+        dsn: Optional connection string (defaults to the settings DSN)
         
     Returns:
         List of dictionaries with query results
     """
-    pool = await create_connection_pool()
-    try:
-        async with pool.acquire() as conn:
-            results = await conn.fetch(query)
-            # Convert to dict list for easier serialization
-            return [dict(row) for row in results]
-    finally:
-        await pool.close()
+    async with get_pool_manager().acquire(dsn) as conn:
+        results = await conn.fetch(query)
+        # Convert to dict list for easier serialization
+        return [dict(row) for row in results]
 
-async def execute_query(query: str) -> List[Dict[str, Any]]:
+async def execute_query(query: str, dsn: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Execute a SQL query and return the results (alias for execute_query_with_pool)
     
     Args:
         query: SQL query to execute
+        dsn: Optional connection string (defaults to the settings DSN)
         
     Returns:
         List of dictionaries with query results
     """
-    return await execute_query_with_pool(query)
+    return await execute_query_with_pool(query, dsn)
 
 async def test_postgresql_connection() -> bool:
     """
@@ -76,10 +78,9 @@ async def test_postgresql_connection() -> bool:
     logger.info(f"Testing connection to database: {settings.DB_HOST}/{settings.DB_NAME}")
     
     try:
-        conn = await asyncpg.connect(settings.db_dsn)
-        result = await conn.fetchval("SELECT 1")
+        async with get_pool_manager().acquire() as conn:
+            result = await conn.fetchval("SELECT 1")
         logger.info(f"Connection test successful! Test query result: {result}")
-        await conn.close()
         return True
     except Exception as e:
         logger.error(f"Connection test failed: {str(e)}")
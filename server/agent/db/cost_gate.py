@@ -0,0 +1,249 @@
+"""
+EXPLAIN-based cost gate for generated SQL
+
+Runs ``EXPLAIN (FORMAT JSON)`` before a query is executed and, based on the
+planner's estimated rows and total cost, lets it through, wraps it in a
+LIMIT, rewrites a single-table query to read a ``TABLESAMPLE``, or rejects
+it. The decision carries the estimates so it can be shown to users.
+"""
+
+import json
+import logging
+import re
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import asyncpg
+
+from ..config.settings import Settings
+from .statement_cache import coerce_params, get_statement_cache
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Decisions
+ALLOW = "allow"
+LIMIT = "limit"
+SAMPLE = "sample"
+REJECT = "reject"
+
+_READ_QUERY_RE = re.compile(r"^\s*(\(\s*)*(select|with)\b", re.IGNORECASE)
+_NOT_SAMPLEABLE_RE = re.compile(
+    r"\b(join|union|intersect|except|with|tablesample|lateral)\b", re.IGNORECASE
+)
+_CLAUSE_KEYWORDS = r"(?:where|group|order|limit|having|window|offset|fetch|for)\b"
+_FROM_TABLE_RE = re.compile(
+    r"\bfrom\s+"
+    r"(?P<table>(?:\"[^\"]+\"|\w+)(?:\.(?:\"[^\"]+\"|\w+))?)"
+    r"(?P<alias>\s+(?:as\s+)?(?!" + _CLAUSE_KEYWORDS + r")(?:\"[^\"]+\"|\w+))?",
+    re.IGNORECASE
+)
+
+
+@dataclass
+class CostGateDecision:
+    """Outcome of the cost gate for one query"""
+    action: str
+    query: str
+    original_query: str
+    estimated_rows: Optional[float] = None
+    estimated_cost: Optional[float] = None
+    sample_percent: Optional[float] = None
+    row_limit: Optional[int] = None
+    reason: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a dictionary for stream events and logs"""
+        return asdict(self)
+
+
+class QueryRejectedError(ValueError):
+    """Raised when the cost gate rejects a query as too expensive"""
+
+    def __init__(self, decision: CostGateDecision):
+        super().__init__(decision.reason)
+        self.decision = decision
+
+
+def _strip_query(query: str) -> str:
+    """Remove surrounding whitespace and trailing semicolons"""
+    return query.strip().rstrip(";").strip()
+
+
+def add_limit(query: str, row_limit: int) -> str:
+    """
+    Wrap a query so that it returns at most ``row_limit`` rows
+
+    Args:
+        query: SQL SELECT query
+        row_limit: Maximum number of rows
+
+    Returns:
+        Rewritten SQL
+    """
+    return f"SELECT * FROM (\n{_strip_query(query)}\n) AS cost_gate_limited LIMIT {int(row_limit)}"
+
+
+def add_tablesample(query: str, percent: float) -> Optional[str]:
+    """
+    Rewrite a single-table query to read a block sample of its table
+
+    Only plain ``SELECT ... FROM table [alias] ...`` queries are rewritten;
+    joins, subqueries, CTEs and set operations return None.
+
+    Args:
+        query: SQL SELECT query
+        percent: Sample percentage passed to TABLESAMPLE SYSTEM
+
+    Returns:
+        Rewritten SQL, or None if the query cannot be sampled safely
+    """
+    query = _strip_query(query)
+    if _NOT_SAMPLEABLE_RE.search(query) or len(re.findall(r"\bselect\b", query, re.IGNORECASE)) != 1:
+        return None
+
+    matches = list(_FROM_TABLE_RE.finditer(query))
+    if len(matches) != 1:
+        return None
+    match = matches[0]
+    if query[match.end():].lstrip().startswith(","):
+        return None
+
+    return f"{query[:match.end()]} TABLESAMPLE SYSTEM ({percent:g}){query[match.end():]}"
+
+
+def parse_explain(explain_output: Any) -> Tuple[float, float]:
+    """
+    Extract estimated rows and total cost from EXPLAIN (FORMAT JSON) output
+
+    Args:
+        explain_output: JSON text or decoded JSON returned by EXPLAIN
+
+    Returns:
+        Tuple of (estimated rows, estimated total cost)
+    """
+    plan = json.loads(explain_output) if isinstance(explain_output, str) else explain_output
+    root = plan[0]["Plan"]
+    return float(root.get("Plan Rows", 0)), float(root.get("Total Cost", 0))
+
+
+class QueryCostGate:
+    """
+    Decides how to run a query from its planner estimates.
+
+    - estimated cost above ``sample_cost`` on a single-table query: read a
+      TABLESAMPLE sized to bring the cost down to ``sample_cost``
+    - estimated cost above ``max_cost`` otherwise: reject
+    - estimated rows above ``max_rows``: add a LIMIT of ``max_rows``
+    - anything else runs unchanged
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        max_rows: Optional[int] = None,
+        sample_cost: Optional[float] = None,
+        max_cost: Optional[float] = None,
+        min_sample_percent: Optional[float] = None
+    ):
+        """
+        Initialize the cost gate
+
+        Args:
+            enabled: Whether queries are checked at all (default from settings)
+            max_rows: Row estimate above which a LIMIT is added (default MAX_ROWS_DIRECT)
+            sample_cost: Cost estimate above which single-table queries are sampled
+            max_cost: Cost estimate above which unsampleable queries are rejected
+            min_sample_percent: Lower bound for the TABLESAMPLE percentage
+        """
+        settings = Settings()
+        self.enabled = enabled if enabled is not None else settings.COST_GATE_ENABLED
+        self.max_rows = max_rows if max_rows is not None else settings.MAX_ROWS_DIRECT
+        self.sample_cost = sample_cost if sample_cost is not None else settings.COST_GATE_SAMPLE_COST
+        self.max_cost = max_cost if max_cost is not None else settings.COST_GATE_MAX_COST
+        self.min_sample_percent = (
+            min_sample_percent if min_sample_percent is not None else settings.COST_GATE_MIN_SAMPLE_PERCENT
+        )
+
+    async def check(self, conn: Any, query: str, params: Optional[Sequence[Any]] = None) -> CostGateDecision:
+        """
+        EXPLAIN a query on a connection and decide how to run it
+
+        Args:
+            conn: Pooled asyncpg connection
+            query: SQL query string
+            params: Bind parameters in placeholder order
+
+        Returns:
+            CostGateDecision
+        """
+        if not self.enabled or not _READ_QUERY_RE.match(query):
+            return CostGateDecision(action=ALLOW, query=query, original_query=query,
+                                    reason="Cost gate not applied")
+
+        try:
+            args = []
+            if params:
+                statement = await get_statement_cache().prepare(conn, query)
+                args = coerce_params(statement, params)
+            explain_output = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {_strip_query(query)}", *args)
+            estimated_rows, estimated_cost = parse_explain(explain_output)
+        except (asyncpg.PostgresError, KeyError, IndexError, TypeError, ValueError) as e:
+            # Let the query itself surface the error (or run) rather than failing here
+            logger.warning(f"Cost gate could not EXPLAIN query, running it unchanged: {str(e)}")
+            return CostGateDecision(action=ALLOW, query=query, original_query=query,
+                                    reason=f"EXPLAIN failed: {str(e)}")
+
+        decision = self.decide(query, estimated_rows, estimated_cost)
+        logger.info(f"Cost gate: {decision.action} (rows≈{estimated_rows:.0f}, cost≈{estimated_cost:.0f})")
+        return decision
+
+    def decide(self, query: str, estimated_rows: float, estimated_cost: float) -> CostGateDecision:
+        """
+        Decide how to run a query from planner estimates
+
+        Args:
+            query: SQL query string
+            estimated_rows: Planner row estimate for the query result
+            estimated_cost: Planner total cost estimate
+
+        Returns:
+            CostGateDecision
+        """
+        decision = CostGateDecision(
+            action=ALLOW,
+            query=query,
+            original_query=query,
+            estimated_rows=estimated_rows,
+            estimated_cost=estimated_cost,
+            reason="Within cost and row thresholds"
+        )
+
+        if estimated_cost > self.sample_cost:
+            percent = max(self.min_sample_percent, min(100.0, 100.0 * self.sample_cost / estimated_cost))
+            percent = round(percent, 4)
+            sampled = add_tablesample(query, percent)
+            if sampled is not None:
+                decision.action = SAMPLE
+                decision.query = sampled
+                decision.sample_percent = percent
+                decision.reason = (f"Estimated cost {estimated_cost:.0f} exceeds {self.sample_cost:.0f}; "
+                                   f"reading a {percent:g}% sample of the table")
+                estimated_rows = estimated_rows * percent / 100.0
+            elif estimated_cost > self.max_cost:
+                decision.action = REJECT
+                decision.reason = (f"Estimated cost {estimated_cost:.0f} exceeds the maximum of "
+                                   f"{self.max_cost:.0f} and the query cannot be sampled")
+                return decision
+
+        if estimated_rows > self.max_rows:
+            decision.query = add_limit(decision.query, self.max_rows)
+            decision.row_limit = self.max_rows
+            if decision.action == ALLOW:
+                decision.action = LIMIT
+                decision.reason = (f"Estimated {estimated_rows:.0f} rows exceeds {self.max_rows}; "
+                                   f"returning the first {self.max_rows}")
+            else:
+                decision.reason += f", limited to {self.max_rows} rows"
+
+        return decision
@@ -7,10 +7,12 @@ for all database operations.
 """
 
 import logging
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
 from urllib.parse import urlparse
 
 from .adapters.base import DBAdapter
+from .columnar import ColumnarResult
+from .export import ExportHandle
 from .adapters.postgres import PostgresAdapter
 from .adapters.mongo import MongoAdapter
 from .adapters.qdrant import QdrantAdapter
@@ -113,6 +115,58 @@ class Orchestrator:
         """
         return await self.adapter.execute(query)
     
+    async def execute_columnar(self, query: Any) -> ColumnarResult:
+        """
+        Execute a query on the database and return a columnar result.
+        
+        Args:
+            query: Database-specific query
+            
+        Returns:
+            ColumnarResult with column names and per-column arrays
+        """
+        return await self.adapter.execute_columnar(query)
+    
+    async def export_query(self, query: Any, format: str = "csv") -> ExportHandle:
+        """
+        Export the full result of a query to a local spill file.
+        
+        Args:
+            query: Database-specific query
+            format: 'csv' or 'parquet'
+            
+        Returns:
+            ExportHandle for the finished file
+            
+        Raises:
+            NotImplementedError: If the adapter does not support exports
+        """
+        if not hasattr(self.adapter, "export_query"):
+            raise NotImplementedError(f"Exports are not supported for {self.db_type} databases")
+        return await self.adapter.export_query(query, format=format)
+    
+    async def execute_stream(self, query: Any, batch_size: Optional[int] = None) -> AsyncIterator[List[Dict]]:
+        """
+        Execute a query on the database and yield results in batches.
+        
+        Args:
+            query: Database-specific query
+            batch_size: Optional maximum number of rows per batch
+            
+        Yields:
+            Lists of dictionaries with consecutive batches of results
+        """
+        if batch_size:
+            stream = self.adapter.execute_stream(query, batch_size=batch_size)
+        else:
+            stream = self.adapter.execute_stream(query)
+        try:
+            async for batch in stream:
+                yield batch
+        finally:
+            # Close the adapter stream promptly so its cursor and connection are released
+            await stream.aclose()
+    
     async def run(self, nl_prompt: str, **kwargs) -> List[Dict]:
         """
         Complete pipeline: Convert natural language to query and execute.
@@ -0,0 +1,172 @@
+"""
+Embedding cache
+
+Users ask the same questions again and again, and every time the question
+used to be sent to the embedding API. ``EmbeddingCache`` keeps recent
+embeddings in memory keyed by provider, model and a hash of the text,
+evicting the least recently used past a size bound. With a path configured
+the embeddings are also written to a SQLite file, so they survive restarts
+and are shared between the API server and the CLI.
+"""
+
+import array
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from ..config.settings import Settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def embedding_key(provider: str, model: Optional[str], text: str) -> str:
+    """
+    Cache key for the embedding of a text
+
+    Args:
+        provider: Embedding provider name
+        model: Embedding model name
+        text: Embedded text
+
+    Returns:
+        Hex SHA-256 digest of provider, model and text
+    """
+    digest = hashlib.sha256()
+    for part in (provider or "", model or "", text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    LRU cache of embedding vectors with optional SQLite persistence.
+
+    Vectors are stored on disk as packed doubles, so a vector read back
+    from disk is identical to the one that was cached.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, path: Optional[str] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum vectors kept in memory (default from settings)
+            path: SQLite file for persistence (default from settings; None keeps the cache in memory only)
+        """
+        settings = Settings()
+        self.max_entries = max_entries if max_entries is not None else settings.VECTOR_EMBEDDING_CACHE_SIZE
+        self.path = path if path is not None else settings.VECTOR_EMBEDDING_CACHE_PATH
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+        if self.path:
+            self._open(self.path)
+
+    def _open(self, path: str) -> None:
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache file {path} unavailable, caching in memory only: {str(e)}")
+            self._db = None
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached embeddings
+
+        Args:
+            keys: Keys from embedding_key()
+
+        Returns:
+            Dictionary of the keys that were found and their vectors
+        """
+        found: Dict[str, List[float]] = {}
+        missing: List[str] = []
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is None:
+                    missing.append(key)
+                else:
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+
+            if missing and self._db is not None:
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    rows = self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = array.array("d", blob).tolist()
+                        found[key] = vector
+                        self._remember(key, vector)
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Iterable[tuple]) -> None:
+        """
+        Cache embeddings
+
+        Args:
+            items: (key, vector) pairs
+        """
+        items = list(items)
+        with self._lock:
+            for key, vector in items:
+                self._remember(key, list(vector))
+            if self._db is not None and items:
+                try:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                        [(key, array.array("d", vector).tobytes()) for key, vector in items]
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not persist embeddings: {str(e)}")
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, object]:
+        """Get cache size and hit/miss counters"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "persistent": self._db is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        """Close the SQLite file"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# Global instance
+_embedding_cache: Optional[EmbeddingCache] = None
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the global embedding cache instance"""
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache()
+    return _embedding_cache
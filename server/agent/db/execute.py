@@ -5,8 +5,10 @@ import re
 import random
 import logging
 import uuid
+import time
 from typing import List, Dict, Any, Optional, AsyncIterator
 from datetime import datetime
+from pymongo.errors import ExecutionTimeout
 from ..config.settings import Settings
 
 # Import basic database functions from connection utilities to avoid circular imports
@@ -21,6 +23,9 @@ from ..db.orchestrator.implementation_agent import ImplementationAgent
 from ..db.orchestrator.result_aggregator import ResultAggregator
 from ..tools.state_manager import StateManager, AnalysisState
 from ..db.db_orchestrator import Orchestrator
+from ..db.columnar import to_dataframe
+from ..db.export import get_export_store
+from ..db.adapters.postgres import QueryTimeoutError
 from ..llm.client import get_llm_client
 from ..meta.ingest import SchemaSearcher, ensure_index_exists
 from ..performance.schema_monitor import ensure_schema_index_updated
@@ -242,7 +247,7 @@ class CrossDatabaseQueryEngine:
                 recoverable=True
             )
     
-    async def execute_single_database_query(self, question: str, db_type: str, db_uri: str, analyze: bool = False) -> Dict[str, Any]:
+    async def execute_single_database_query(self, question: str, db_type: str, db_uri: str, analyze: bool = False, export_format: Optional[str] = None) -> Dict[str, Any]:
         """
         Execute a query against a single database
         
@@ -251,6 +256,7 @@ class CrossDatabaseQueryEngine:
             db_type: Database type (postgres, mongodb, etc.)
             db_uri: Database connection URI
             analyze: Whether to include analysis
+            export_format: Export the full result to a spill file ('csv' or 'parquet'; PostgreSQL only)
             
         Returns:
             Query results with optional analysis
@@ -279,7 +285,7 @@ class CrossDatabaseQueryEngine:
             
             # Generate and execute query based on database type
             if db_type.lower() in ["postgres", "postgresql"]:
-                return await self._execute_postgres_query(question, analyze, orchestrator, db_type)
+                return await self._execute_postgres_query(question, analyze, orchestrator, db_type, export_format)
             elif db_type.lower() == "mongodb":
                 return await self._execute_mongodb_query(question, analyze, orchestrator, db_type)
             elif db_type.lower() == "qdrant":
@@ -333,12 +339,52 @@ class CrossDatabaseQueryEngine:
                     yield self._create_stream_event("sql_validating", session_id, sql=sql, syntax_valid=True)
                     break
             
-            yield self._create_stream_event("sql_executing", session_id, sql=sql, explain_plan="Seq Scan")
+            # Check the planner's estimates first; the query may be limited, sampled or rejected
+            if hasattr(orchestrator.adapter, "check_query_cost"):
+                decision = await orchestrator.adapter.check_query_cost(sql)
+                yield self._create_stream_event("cost_gate", session_id, database=db_type, **decision.to_dict())
+                if decision.action == "reject":
+                    yield self._create_stream_event(
+                        "error",
+                        session_id,
+                        error_code="QUERY_REJECTED",
+                        message=decision.reason,
+                        estimated_rows=decision.estimated_rows,
+                        estimated_cost=decision.estimated_cost,
+                        recoverable=True
+                    )
+                    return
+                sql = decision.query
             
-            # Execute query using the orchestrator
-            rows = await orchestrator.execute(sql)
+            yield self._create_stream_event("sql_executing", session_id, sql=sql, explain_plan="Seq Scan")
             
-            yield self._create_stream_event("postgres_results", session_id, rows_processed=len(rows) if rows else 0, execution_time=0.45)
+            # Execute query through a server-side cursor and emit rows as each batch arrives
+            # (rows are only retained when the analysis step needs them)
+            rows = []
+            total_rows = 0
+            batch_index = 0
+            start_time = time.time()
+            stream = orchestrator.execute_stream(sql)
+            try:
+                async for batch in stream:
+                    batch_index += 1
+                    total_rows += len(batch)
+                    if analyze:
+                        rows.extend(batch)
+                    yield self._create_stream_event(
+                        "partial_results",
+                        session_id,
+                        database=db_type,
+                        batch_index=batch_index,
+                        rows=batch,
+                        rows_count=total_rows,
+                        is_complete=False
+                    )
+            finally:
+                # If the client goes away mid-stream, release the cursor's connection right away
+                await stream.aclose()
+            
+            yield self._create_stream_event("postgres_results", session_id, rows_processed=total_rows, execution_time=time.time() - start_time)
             
             # Add analysis if requested
             if analyze:
@@ -351,6 +397,16 @@ class CrossDatabaseQueryEngine:
             
             yield self._create_stream_event("postgres_complete", session_id, success=True)
             
+        except QueryTimeoutError as e:
+            logger.error(f"⏱️ PostgreSQL streaming query timed out: {str(e)}")
+            yield self._create_stream_event(
+                "error",
+                session_id,
+                error_code="QUERY_TIMEOUT",
+                message=str(e),
+                timeout_seconds=Settings().MAX_QUERY_TIMEOUT,
+                recoverable=True
+            )
         except Exception as e:
             logger.error(f"❌ PostgreSQL streaming query error: {str(e)}")
             yield self._create_stream_event(
@@ -750,6 +806,14 @@ class CrossDatabaseQueryEngine:
                 dry_run=False
             )
             
+            # Report cost gate decisions for SQL operations (limited, sampled or rejected queries)
+            execution_data = result.get("execution") if isinstance(result, dict) else None
+            if isinstance(execution_data, dict):
+                operation_details = execution_data.get("execution_summary", {}).get("operation_details", {})
+                for op_id, details in operation_details.items():
+                    if isinstance(details, dict) and details.get("cost_gate"):
+                        yield self._create_stream_event("cost_gate", session_id, operation_id=op_id, **details["cost_gate"])
+            
             # Check if execution was successful
             execution_success = False
             if isinstance(result, dict):
@@ -830,8 +894,8 @@ class CrossDatabaseQueryEngine:
                 recoverable=False
             )
     
-    async def _execute_postgres_query(self, question: str, analyze: bool, orchestrator: Orchestrator, db_type: str) -> Dict[str, Any]:
-        """Execute a PostgreSQL query"""
+    async def _execute_postgres_query(self, question: str, analyze: bool, orchestrator: Orchestrator, db_type: str, export_format: Optional[str] = None) -> Dict[str, Any]:
+        """Execute a PostgreSQL query, or export its full result when export_format is set"""
         try:
             # Search schema metadata
             searcher = SchemaSearcher(db_type=db_type)
@@ -843,14 +907,22 @@ class CrossDatabaseQueryEngine:
             # Generate SQL
             sql = await self.llm_client.generate_sql(prompt)
             
-            # Execute query using the orchestrator
-            rows = await orchestrator.execute(sql)
+            export = None
+            if export_format:
+                # COPY the full result to a spill file and return a preview page inline
+                export = await orchestrator.export_query(sql, format=export_format)
+                rows = get_export_store().read_page(export, 0, Settings().DEFAULT_SAMPLE_SIZE)
+            else:
+                # Execute query using the orchestrator
+                rows = await orchestrator.execute(sql)
             
             result = {
                 "rows": rows,
                 "sql": sql,
                 "success": True
             }
+            if export is not None:
+                result["export"] = export.to_dict()
             
             # Add analysis if requested
             if analyze:
@@ -899,12 +971,41 @@ class CrossDatabaseQueryEngine:
                     yield self._create_stream_event("mongodb_query_validating", session_id, query=json.dumps(query_data), valid=True)
                     break
             
-            yield self._create_stream_event("mongodb_executing", session_id, query=json.dumps(query_data), explain=True)
+            # Explain the pipeline first; collection scans on large collections are limited or sampled
+            if hasattr(orchestrator.adapter, "check_pipeline"):
+                decision = await orchestrator.adapter.check_pipeline(query_data)
+                yield self._create_stream_event("cost_gate", session_id, database=db_type, **decision.to_dict())
+                query_data = {**query_data, "collection": decision.collection, "pipeline": decision.pipeline}
             
-            # Execute query
-            rows = await orchestrator.execute(query_data)
+            yield self._create_stream_event("mongodb_executing", session_id, query=json.dumps(query_data), explain=True)
             
-            yield self._create_stream_event("mongodb_results", session_id, documents_processed=len(rows) if rows else 0, execution_time=0.32)
+            # Read the aggregation cursor batch by batch and emit documents as each batch arrives
+            # (documents are only retained when the analysis step needs them)
+            rows = []
+            total_rows = 0
+            batch_index = 0
+            start_time = time.time()
+            stream = orchestrator.execute_stream(query_data)
+            try:
+                async for batch in stream:
+                    batch_index += 1
+                    total_rows += len(batch)
+                    if analyze:
+                        rows.extend(batch)
+                    yield self._create_stream_event(
+                        "partial_results",
+                        session_id,
+                        database=db_type,
+                        batch_index=batch_index,
+                        rows=batch,
+                        rows_count=total_rows,
+                        is_complete=False
+                    )
+            finally:
+                # If the client goes away mid-stream, close the server-side cursor right away
+                await stream.aclose()
+            
+            yield self._create_stream_event("mongodb_results", session_id, documents_processed=total_rows, execution_time=time.time() - start_time)
             
             # Add analysis if requested
             if analyze:
@@ -917,6 +1018,16 @@ class CrossDatabaseQueryEngine:
             
             yield self._create_stream_event("mongodb_complete", session_id, success=True)
             
+        except ExecutionTimeout as e:
+            logger.error(f"⏱️ MongoDB streaming query timed out: {str(e)}")
+            yield self._create_stream_event(
+                "error",
+                session_id,
+                error_code="QUERY_TIMEOUT",
+                message=str(e),
+                timeout_seconds=Settings().MONGO_MAX_TIME_MS / 1000,
+                recoverable=True
+            )
         except Exception as e:
             logger.error(f"❌ MongoDB streaming query error: {str(e)}")
             yield self._create_stream_event(
@@ -1368,7 +1479,7 @@ async def process_ai_query_stream(question: str, analyze: bool = False, db_type:
             recoverable=False
         )
 
-async def process_ai_query(question: str, analyze: bool = False, db_type: Optional[str] = None, db_uri: Optional[str] = None, cross_database: bool = False) -> Dict[str, Any]:
+async def process_ai_query(question: str, analyze: bool = False, db_type: Optional[str] = None, db_uri: Optional[str] = None, cross_database: bool = False, export_format: Optional[str] = None) -> Dict[str, Any]:
     """
     Process an AI query with enhanced cross-database capabilities
     
@@ -1378,6 +1489,7 @@ async def process_ai_query(question: str, analyze: bool = False, db_type: Option
         db_type: Specific database type (if targeting single DB)
         db_uri: Specific database URI (if targeting single DB)
         cross_database: Whether to force cross-database mode
+        export_format: Export the full result to a spill file ('csv' or 'parquet'; single PostgreSQL queries only)
         
     Returns:
         Formatted response with rows, sql, and optional analysis
@@ -1400,7 +1512,7 @@ async def process_ai_query(question: str, analyze: bool = False, db_type: Option
         # If specific db_type and db_uri provided, use single database mode
         if db_type and db_uri and not cross_database:
             cross_db_logger.info(f"🔄 Using single database mode: {db_type}")
-            result = await query_engine.execute_single_database_query(question, db_type, db_uri, analyze)
+            result = await query_engine.execute_single_database_query(question, db_type, db_uri, analyze, export_format)
         else:
             # Classify the query first to determine if cross-database is needed
             cross_db_logger.info(f"🔍 Classifying query to determine database mode")
@@ -1431,12 +1543,12 @@ async def process_ai_query(question: str, analyze: bool = False, db_type: Option
                         uri = settings.connection_uri
                     
                     cross_db_logger.info(f"🔄 Using single database mode based on classification: {source['type']}")
-                    result = await query_engine.execute_single_database_query(question, source["type"], uri, analyze)
+                    result = await query_engine.execute_single_database_query(question, source["type"], uri, analyze, export_format)
                 else:
                     # Fallback to default database
                     settings = Settings()
                     cross_db_logger.info(f"🔄 Using fallback single database mode: {settings.DB_TYPE}")
-                    result = await query_engine.execute_single_database_query(question, settings.DB_TYPE, settings.connection_uri, analyze)
+                    result = await query_engine.execute_single_database_query(question, settings.DB_TYPE, settings.connection_uri, analyze, export_format)
         
         cross_db_logger.info(f"🏁 ENTRY POINT: process_ai_query returning: {type(result)} with keys: {list(result.keys())}")
         cross_db_logger.info(f"🏁 Result success: {result.get('success', 'KEY_NOT_FOUND')}")
@@ -1517,7 +1629,7 @@ async def _process_visualization_query(question: str, analyze: bool = False) ->
         
         # Create DataFrame from query results
         viz_logger.info(f"Creating pandas DataFrame from {len(rows)} rows")
-        df = pd.DataFrame(rows)
+        df = to_dataframe(rows)
         viz_logger.info(f"DataFrame created - shape: {df.shape}, columns: {list(df.columns)}")
         viz_logger.debug(f"DataFrame dtypes: {df.dtypes.to_dict()}")
         viz_logger.debug(f"DataFrame sample:\n{df.head()}")
@@ -1651,7 +1763,7 @@ async def _process_visualization_query_stream(question: str, analyze: bool = Fal
         from ..visualization.types import VisualizationDataset, UserPreferences
         
         rows = data_result.get("rows", [])
-        df = pd.DataFrame(rows)
+        df = to_dataframe(rows)
         dataset = VisualizationDataset(
             data=df,
             columns=list(df.columns),
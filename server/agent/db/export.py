@@ -0,0 +1,307 @@
+"""
+Bulk export of query results to spill files
+
+Results beyond ``MAX_ROWS_DIRECT`` are too large to return as JSON, but users
+still want the full data. Adapters that support it (PostgreSQL, through
+``COPY ... TO STDOUT``) write the complete result straight to a CSV file on
+local disk, optionally converted to Parquet in bounded memory. Each export is
+described by an ``ExportHandle``, stored next to the file so the API and the
+CLI can download it or page through its rows later.
+"""
+
+import csv
+import itertools
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..config.settings import Settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+EXPORT_FORMATS = ("csv", "parquet")
+
+# Bytes of CSV converted per Arrow record batch when writing Parquet
+PARQUET_BLOCK_SIZE = 16 * 1024 * 1024
+
+_EXPORT_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+@dataclass
+class ExportHandle:
+    """A finished export and where to find it"""
+    export_id: str
+    format: str
+    path: str
+    row_count: int
+    size_bytes: int
+    columns: List[str]
+    column_types: List[str] = field(default_factory=list)
+    sql: str = ""
+    created_at: float = 0.0
+    expires_at: float = 0.0
+
+    @property
+    def filename(self) -> str:
+        """Name to offer when the file is downloaded"""
+        return f"export-{self.export_id}.{self.format}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a dictionary for API responses"""
+        result = asdict(self)
+        result["filename"] = self.filename
+        return result
+
+
+def _arrow_type(type_name: str) -> "pa.DataType":
+    """Arrow type used for a PostgreSQL type name when writing Parquet"""
+    # timestamptz is left as text: COPY prints offsets as "+00", which the
+    # Arrow timestamp parser does not accept
+    return {
+        "int2": pa.int16(),
+        "int4": pa.int32(),
+        "int8": pa.int64(),
+        "float4": pa.float32(),
+        "float8": pa.float64(),
+        "bool": pa.bool_(),
+        "date": pa.date32(),
+        "timestamp": pa.timestamp("us"),
+    }.get(type_name, pa.string())
+
+
+def csv_to_parquet(csv_path: str, parquet_path: str, columns: Sequence[str], column_types: Sequence[str]) -> None:
+    """
+    Convert a CSV file written by COPY into a Parquet file
+
+    The CSV is read one block at a time, so memory use is bounded by
+    ``PARQUET_BLOCK_SIZE`` rather than the size of the result.
+
+    Args:
+        csv_path: CSV file with a header row, in PostgreSQL COPY CSV format
+        parquet_path: Parquet file to write
+        columns: Column names in order
+        column_types: PostgreSQL type names in column order
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    if not ARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for Parquet export. Install it with 'pip install pyarrow'")
+
+    convert_options = pa_csv.ConvertOptions(
+        column_types={name: _arrow_type(type_name) for name, type_name in zip(columns, column_types)},
+        true_values=["t"],
+        false_values=["f"],
+        # COPY writes NULL unquoted and empty strings quoted
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=False
+    )
+    reader = pa_csv.open_csv(
+        csv_path,
+        read_options=pa_csv.ReadOptions(block_size=PARQUET_BLOCK_SIZE),
+        convert_options=convert_options
+    )
+    with pq.ParquetWriter(parquet_path, reader.schema) as writer:
+        for batch in reader:
+            writer.write_table(pa.Table.from_batches([batch]))
+
+
+class ExportStore:
+    """
+    Directory of export files and their handles.
+
+    Each export ``<id>.<format>`` has a ``<id>.json`` handle beside it, so
+    any process (API server or CLI) can serve an export made by another.
+    Exports past their TTL are deleted.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl_seconds: Optional[float] = None):
+        """
+        Initialize the store
+
+        Args:
+            directory: Directory for export files (default from settings)
+            ttl_seconds: Seconds an export is kept (default from settings)
+        """
+        settings = Settings()
+        self.directory = Path(directory or settings.EXPORT_DIR or Path(settings.get_app_dir()) / "exports")
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.EXPORT_TTL_SECONDS
+
+    def new_export(self, format: str) -> ExportHandle:
+        """
+        Reserve an ID and file path for a new export
+
+        Args:
+            format: One of EXPORT_FORMATS
+
+        Returns:
+            ExportHandle with no rows; fill it in and pass it to save()
+
+        Raises:
+            ValueError: If the format is not supported
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{format}'. Use one of: {', '.join(EXPORT_FORMATS)}")
+        if format == "parquet" and not ARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Parquet export. Install it with 'pip install pyarrow'")
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.cleanup_expired()
+        export_id = uuid.uuid4().hex
+        now = time.time()
+        return ExportHandle(
+            export_id=export_id,
+            format=format,
+            path=str(self.directory / f"{export_id}.{format}"),
+            row_count=0,
+            size_bytes=0,
+            columns=[],
+            created_at=now,
+            expires_at=now + self.ttl_seconds
+        )
+
+    def _handle_path(self, export_id: str) -> Optional[Path]:
+        # IDs come from URLs, so anything but our own hex IDs is rejected
+        if not _EXPORT_ID_RE.match(export_id or ""):
+            return None
+        return self.directory / f"{export_id}.json"
+
+    def save(self, handle: ExportHandle) -> None:
+        """Record a finished export"""
+        handle.size_bytes = os.path.getsize(handle.path)
+        self._handle_path(handle.export_id).write_text(json.dumps(asdict(handle)))
+        logger.info(f"Export {handle.export_id}: {handle.row_count} rows, {handle.size_bytes} bytes ({handle.format})")
+
+    def get(self, export_id: str) -> Optional[ExportHandle]:
+        """
+        Look up an export
+
+        Args:
+            export_id: Export ID from a handle
+
+        Returns:
+            ExportHandle, or None if unknown, expired or its file is gone
+        """
+        handle_path = self._handle_path(export_id)
+        if handle_path is None or not handle_path.exists():
+            return None
+        try:
+            handle = ExportHandle(**json.loads(handle_path.read_text()))
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Unreadable export handle {handle_path}: {str(e)}")
+            return None
+        if handle.expires_at < time.time() or not os.path.exists(handle.path):
+            self.delete(export_id)
+            return None
+        return handle
+
+    def delete(self, export_id: str) -> bool:
+        """
+        Delete an export and its handle
+
+        Args:
+            export_id: Export ID
+
+        Returns:
+            True if anything was deleted
+        """
+        handle_path = self._handle_path(export_id)
+        if handle_path is None:
+            return False
+        deleted = False
+        for path in self.directory.glob(f"{export_id}.*"):
+            path.unlink(missing_ok=True)
+            deleted = True
+        return deleted
+
+    def cleanup_expired(self) -> int:
+        """
+        Delete exports past their TTL, and files left behind by failed exports
+
+        Returns:
+            Number of exports deleted
+        """
+        if not self.directory.exists():
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        export_ids = {path.name.split(".", 1)[0] for path in self.directory.iterdir()}
+        deleted = 0
+        for export_id in export_ids:
+            handle_path = self._handle_path(export_id)
+            if handle_path is None:
+                continue
+            files = list(self.directory.glob(f"{export_id}.*"))
+            if all(path.stat().st_mtime < cutoff for path in files) and self.delete(export_id):
+                deleted += 1
+        return deleted
+
+    def read_page(self, handle: ExportHandle, offset: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Read a page of rows from an export
+
+        Only the requested rows are materialized; CSV files are scanned up
+        to the page and Parquet files skip whole row groups before it.
+
+        Args:
+            handle: Export to read
+            offset: Index of the first row
+            limit: Maximum number of rows
+
+        Returns:
+            List of row dictionaries
+        """
+        offset = max(0, offset)
+        limit = max(0, limit)
+
+        if handle.format == "parquet":
+            if not ARROW_AVAILABLE:
+                raise ImportError("pyarrow is required to read Parquet exports. Install it with 'pip install pyarrow'")
+            parquet_file = pq.ParquetFile(handle.path)
+            rows: List[Dict[str, Any]] = []
+            group_start = 0
+            for group in range(parquet_file.num_row_groups):
+                group_rows = parquet_file.metadata.row_group(group).num_rows
+                group_end = group_start + group_rows
+                if group_end > offset and len(rows) < limit:
+                    table = parquet_file.read_row_group(group)
+                    start = max(0, offset - group_start)
+                    rows.extend(table.slice(start, limit - len(rows)).to_pylist())
+                group_start = group_end
+                if len(rows) >= limit:
+                    break
+            return rows
+
+        with open(handle.path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            columns = next(reader, handle.columns)
+            return [
+                # COPY CSV cannot tell NULL from an empty string once parsed; treat both as NULL
+                {name: (value if value != "" else None) for name, value in zip(columns, row)}
+                for row in itertools.islice(reader, offset, offset + limit)
+            ]
+
+
+# Global instance
+_export_store: Optional[ExportStore] = None
+
+def get_export_store() -> ExportStore:
+    """Get the global export store instance"""
+    global _export_store
+    if _export_store is None:
+        _export_store = ExportStore()
+    return _export_store
@@ -1,116 +1,276 @@
+import asyncio
 import asyncpg
 from typing import Dict, List, Any, Optional
 from ..config.settings import Settings
 from urllib.parse import urlparse
 import logging
 
-# Import connection utilities to avoid code duplication
-from .connection_utils import create_connection_pool
+# Import the shared pool manager to avoid a pool per introspection
+from .replica_router import get_replica_router
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-async def fetch_schema(pool: asyncpg.Pool) -> Dict[str, Any]:
+# System schemas never exposed to query generation
+_SYSTEM_SCHEMA_FILTER = """
+    n.nspname NOT IN ('pg_catalog', 'information_schema')
+    AND n.nspname NOT LIKE 'pg\\_toast%'
+    AND n.nspname NOT LIKE 'pg\\_temp\\_%'
+"""
+
+# Ordinary and partitioned tables the current user has any privilege on
+# (the same set information_schema.tables reports as BASE TABLE), limited to
+# the requested schemas ($1, NULL for all)
+_RELATION_FILTER = """
+    c.relkind IN ('r', 'p')
+    AND """ + _SYSTEM_SCHEMA_FILTER + """
+    AND has_table_privilege(c.oid, 'SELECT, INSERT, UPDATE, DELETE, TRUNCATE, REFERENCES, TRIGGER')
+    AND ($1::text[] IS NULL OR n.nspname = ANY($1::text[]))
+"""
+
+# Tables with approximate row counts and a signature of their catalog rows.
+# The signature covers the xmin of every catalog row describing the table
+# (its pg_class, pg_namespace, pg_attribute, pg_attrdef and pg_constraint
+# entries), so any DDL touching the table changes it.
+RELATIONS_QUERY = """
+SELECT
+    c.oid AS table_oid,
+    n.nspname AS schema_name,
+    c.relname AS relname,
+    pg_stat_get_live_tuples(c.oid) AS row_count,
+    md5(
+        c.xmin::text || '/' || n.xmin::text
+        || '/' || COALESCE((SELECT string_agg(a.attnum::text || ':' || a.xmin::text, ',' ORDER BY a.attnum)
+                            FROM pg_attribute a WHERE a.attrelid = c.oid AND a.attnum > 0), '')
+        || '/' || COALESCE((SELECT string_agg(d.xmin::text, ',' ORDER BY d.adnum)
+                            FROM pg_attrdef d WHERE d.adrelid = c.oid), '')
+        || '/' || COALESCE((SELECT string_agg(co.xmin::text, ',' ORDER BY co.oid)
+                            FROM pg_constraint co WHERE co.conrelid = c.oid), '')
+    ) AS signature
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE """ + _RELATION_FILTER + """
+ORDER BY n.nspname, c.relname
+"""
+
+COLUMNS_QUERY = """
+SELECT
+    c.oid AS table_oid,
+    n.nspname AS schema_name,
+    c.relname AS relname,
+    a.attname AS column_name,
+    a.attnum AS ordinal_position,
+    format_type(a.atttypid, a.atttypmod) AS data_type,
+    pg_get_expr(d.adbin, d.adrelid) AS column_default,
+    CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END AS is_nullable
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+LEFT JOIN pg_attrdef d ON d.adrelid = c.oid AND d.adnum = a.attnum
+WHERE """ + _RELATION_FILTER + """
+    AND ($2::oid[] IS NULL OR c.oid = ANY($2::oid[]))
+ORDER BY n.nspname, c.relname, a.attnum
+"""
+
+PRIMARY_KEYS_QUERY = """
+SELECT
+    c.oid AS table_oid,
+    n.nspname AS schema_name,
+    c.relname AS relname,
+    a.attname AS column_name,
+    k.ord AS key_position
+FROM pg_constraint co
+JOIN pg_class c ON c.oid = co.conrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+CROSS JOIN LATERAL unnest(co.conkey) WITH ORDINALITY AS k(attnum, ord)
+JOIN pg_attribute a ON a.attrelid = co.conrelid AND a.attnum = k.attnum
+WHERE co.contype = 'p'
+    AND """ + _RELATION_FILTER + """
+    AND ($2::oid[] IS NULL OR c.oid = ANY($2::oid[]))
+ORDER BY n.nspname, c.relname, k.ord
+"""
+
+# Foreign keys of the given tables and foreign keys pointing at them, so that
+# renaming a referenced table refreshes the tables that reference it
+FOREIGN_KEYS_QUERY = """
+SELECT
+    c.oid AS table_oid,
+    n.nspname AS schema_name,
+    c.relname AS relname,
+    a.attname AS column_name,
+    k.ord AS key_position,
+    fc.oid AS foreign_table_oid,
+    fn.nspname AS foreign_schema_name,
+    fc.relname AS foreign_relname,
+    fa.attname AS foreign_column_name
+FROM pg_constraint co
+JOIN pg_class c ON c.oid = co.conrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+JOIN pg_class fc ON fc.oid = co.confrelid
+JOIN pg_namespace fn ON fn.oid = fc.relnamespace
+CROSS JOIN LATERAL unnest(co.conkey, co.confkey) WITH ORDINALITY AS k(attnum, foreign_attnum, ord)
+JOIN pg_attribute a ON a.attrelid = co.conrelid AND a.attnum = k.attnum
+JOIN pg_attribute fa ON fa.attrelid = co.confrelid AND fa.attnum = k.foreign_attnum
+WHERE co.contype = 'f'
+    AND """ + _RELATION_FILTER + """
+    AND ($2::oid[] IS NULL OR co.conrelid = ANY($2::oid[]) OR co.confrelid = ANY($2::oid[]))
+ORDER BY n.nspname, c.relname, co.conname, k.ord
+"""
+
+
+def qualified_table_name(schema_name: str, relname: str) -> str:
     """
-    Fetch database schema metadata using asyncpg
-    
+    Name a table the way generated SQL should reference it
+
+    Tables in ``public`` keep their bare name (as before schemas other than
+    ``public`` were introspected); all others are schema-qualified.
+
+    Args:
+        schema_name: Schema (namespace) name
+        relname: Table name
+
+    Returns:
+        Table name, qualified unless the schema is public
+    """
+    return relname if schema_name == "public" else f"{schema_name}.{relname}"
+
+
+async def _fetch_catalog(pool: asyncpg.Pool, query: str, *args: Any) -> List[asyncpg.Record]:
+    """Run one catalog query on its own pooled connection"""
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, *args)
+
+
+def _table_row(record: Any) -> Dict[str, Any]:
+    row = dict(record)
+    row["table_name"] = qualified_table_name(row.pop("schema_name"), row.pop("relname"))
+    if "foreign_relname" in row:
+        row["foreign_table_name"] = qualified_table_name(row.pop("foreign_schema_name"), row.pop("foreign_relname"))
+    return row
+
+
+async def fetch_schema(
+    pool: asyncpg.Pool,
+    schemas: Optional[List[str]] = None,
+    previous: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Fetch database schema metadata from pg_catalog
+
+    Tables, columns, primary keys and foreign keys are read with independent
+    catalog queries running concurrently on separate pooled connections.
+
+    With a ``previous`` snapshot (the result of an earlier call) only tables
+    whose catalog signature changed are re-read; everything else is carried
+    over, and tables that no longer exist are dropped.
+
     Args:
         pool: asyncpg connection pool
+        schemas: Schemas to introspect (default from settings; all non-system schemas if empty)
+        previous: Earlier result of fetch_schema for incremental introspection
         
     Returns:
         Dictionary containing tables, columns, and relationships metadata
     """
-    async with pool.acquire() as conn:
-        # Get all tables in the public schema
-        tables = await conn.fetch("""
-            SELECT 
-                table_name 
-            FROM 
-                information_schema.tables 
-            WHERE 
-                table_schema='public' 
-                AND table_type='BASE TABLE'
-            ORDER BY 
-                table_name
-        """)
-        
-        # Get all columns with their data types
-        columns = await conn.fetch("""
-            SELECT 
-                table_name, 
-                column_name, 
-                data_type,
-                column_default,
-                is_nullable 
-            FROM 
-                information_schema.columns 
-            WHERE 
-                table_schema='public'
-            ORDER BY 
-                table_name, 
-                ordinal_position
-        """)
-        
-        # Get primary key constraints
-        primary_keys = await conn.fetch("""
-            SELECT
-                tc.table_name,
-                kc.column_name
-            FROM
-                information_schema.table_constraints tc
-                JOIN information_schema.key_column_usage kc ON
-                    tc.constraint_name = kc.constraint_name AND
-                    tc.table_schema = kc.table_schema
-            WHERE
-                tc.constraint_type = 'PRIMARY KEY' AND
-                tc.table_schema = 'public'
-            ORDER BY
-                tc.table_name,
-                kc.ordinal_position
-        """)
-        
-        # Get foreign key relationships
-        foreign_keys = await conn.fetch("""
-            SELECT
-                tc.table_name,
-                kcu.column_name,
-                ccu.table_name AS foreign_table_name,
-                ccu.column_name AS foreign_column_name
-            FROM
-                information_schema.table_constraints AS tc
-                JOIN information_schema.key_column_usage AS kcu ON
-                    tc.constraint_name = kcu.constraint_name AND
-                    tc.table_schema = kcu.table_schema
-                JOIN information_schema.constraint_column_usage AS ccu ON
-                    ccu.constraint_name = tc.constraint_name AND
-                    ccu.table_schema = tc.table_schema
-            WHERE
-                tc.constraint_type = 'FOREIGN KEY' AND
-                tc.table_schema = 'public'
-            ORDER BY
-                tc.table_name,
-                kcu.ordinal_position
-        """)
-        
-        # Get table row counts (approximate)
-        row_counts = await conn.fetch("""
-            SELECT
-                relname as table_name,
-                n_live_tup as row_count
-            FROM
-                pg_stat_user_tables
-            ORDER BY
-                relname
-        """)
-        
-        # Bundle everything into a structured schema object
-        return {
-            "tables": [dict(t) for t in tables],
-            "columns": [dict(c) for c in columns],
-            "primary_keys": [dict(pk) for pk in primary_keys],
-            "foreign_keys": [dict(fk) for fk in foreign_keys],
-            "row_counts": [dict(rc) for rc in row_counts]
-        }
+    if schemas is None:
+        schemas = list(Settings().DB_INTROSPECT_SCHEMAS or [])
+    schema_filter = sorted(schemas) or None
+
+    if previous is not None and previous.get("schemas") != schema_filter:
+        # The snapshot describes a different set of schemas
+        previous = None
+
+    if previous is None:
+        relations, columns, primary_keys, foreign_keys = await asyncio.gather(
+            _fetch_catalog(pool, RELATIONS_QUERY, schema_filter),
+            _fetch_catalog(pool, COLUMNS_QUERY, schema_filter, None),
+            _fetch_catalog(pool, PRIMARY_KEYS_QUERY, schema_filter, None),
+            _fetch_catalog(pool, FOREIGN_KEYS_QUERY, schema_filter, None),
+        )
+        relations = [_table_row(r) for r in relations]
+        columns = [_table_row(c) for c in columns]
+        primary_keys = [_table_row(pk) for pk in primary_keys]
+        foreign_keys = [_table_row(fk) for fk in foreign_keys]
+        refreshed = {r["table_oid"] for r in relations}
+        removed: set = set()
+    else:
+        relations = [_table_row(r) for r in await _fetch_catalog(pool, RELATIONS_QUERY, schema_filter)]
+        current = {r["table_oid"]: r for r in relations}
+        previous_signatures = previous.get("signatures", {})
+        refreshed = {oid for oid, r in current.items() if previous_signatures.get(oid) != r["signature"]}
+        removed = set(previous_signatures) - set(current)
+        stale = refreshed | removed
+
+        columns = [c for c in previous["columns"] if c["table_oid"] not in stale]
+        primary_keys = [pk for pk in previous["primary_keys"] if pk["table_oid"] not in stale]
+        foreign_keys = [
+            fk for fk in previous["foreign_keys"]
+            if fk["table_oid"] not in stale and fk["foreign_table_oid"] not in stale
+        ]
+
+        if refreshed:
+            oids = sorted(refreshed)
+            new_columns, new_primary_keys, new_foreign_keys = await asyncio.gather(
+                _fetch_catalog(pool, COLUMNS_QUERY, schema_filter, oids),
+                _fetch_catalog(pool, PRIMARY_KEYS_QUERY, schema_filter, oids),
+                _fetch_catalog(pool, FOREIGN_KEYS_QUERY, schema_filter, oids),
+            )
+            columns.extend(_table_row(c) for c in new_columns)
+            primary_keys.extend(_table_row(pk) for pk in new_primary_keys)
+            foreign_keys.extend(_table_row(fk) for fk in new_foreign_keys)
+
+        # Keep the catalog order: tables by schema and name, then key/column position
+        order = {r["table_oid"]: i for i, r in enumerate(relations)}
+        columns.sort(key=lambda c: (order[c["table_oid"]], c["ordinal_position"]))
+        primary_keys.sort(key=lambda pk: (order[pk["table_oid"]], pk["key_position"]))
+        foreign_keys.sort(key=lambda fk: (order[fk["table_oid"]], fk["key_position"]))
+
+    logger.info(
+        f"Introspected {len(relations)} tables ({'full' if previous is None else 'incremental'}): "
+        f"{len(refreshed)} read, {len(removed)} removed"
+    )
+
+    # Bundle everything into a structured schema object
+    return {
+        "tables": [
+            {"table_name": r["table_name"], "table_oid": r["table_oid"]}
+            for r in relations
+        ],
+        "columns": columns,
+        "primary_keys": primary_keys,
+        "foreign_keys": foreign_keys,
+        "row_counts": [
+            {"table_name": r["table_name"], "table_oid": r["table_oid"], "row_count": r["row_count"]}
+            for r in relations
+        ],
+        "schemas": schema_filter,
+        "signatures": {r["table_oid"]: r["signature"] for r in relations},
+        "changed_tables": sorted(r["table_name"] for r in relations if r["table_oid"] in refreshed),
+        "removed_tables": sorted(
+            t["table_name"] for t in (previous or {}).get("tables", []) if t["table_oid"] in removed
+        ),
+    }
+
+
+# Last snapshot per DSN, used for incremental introspection
+_schema_snapshots: Dict[str, Dict[str, Any]] = {}
+
+async def fetch_schema_snapshot(dsn: str, pool: asyncpg.Pool, incremental: bool = False) -> Dict[str, Any]:
+    """
+    Fetch schema metadata for a DSN and keep it as that DSN's snapshot
+
+    Args:
+        dsn: PostgreSQL DSN the pool belongs to
+        pool: asyncpg connection pool (primary or replica)
+        incremental: Re-read only tables changed since the last snapshot
+
+    Returns:
+        Dictionary containing tables, columns, and relationships metadata
+    """
+    previous = _schema_snapshots.get(dsn) if incremental else None
+    schema_data = await fetch_schema(pool, previous=previous)
+    _schema_snapshots[dsn] = schema_data
+    return schema_data
 
 async def format_schema_for_embedding(schema_data: Dict[str, Any]) -> List[Dict[str, str]]:
     """
@@ -194,7 +354,8 @@ async def format_schema_for_embedding(schema_data: Dict[str, Any]) -> List[Dict[
     
     return documents
 
-async def get_schema_metadata(conn_uri: Optional[str] = None, db_type: Optional[str] = None, **kwargs) -> List[Dict[str, str]]:
+async def get_schema_metadata(conn_uri: Optional[str] = None, db_type: Optional[str] = None,
+                              incremental: bool = False, **kwargs) -> List[Dict[str, str]]:
     """
     Main function to get formatted schema metadata ready for embedding.
     Now database-agnostic, supporting all adapter types.
@@ -202,6 +363,7 @@ async def get_schema_metadata(conn_uri: Optional[str] = None, db_type: Optional[
     Args:
         conn_uri: Optional connection URI. If None, uses the default from settings.
         db_type: Optional database type. If provided, overrides detection from URI.
+        incremental: PostgreSQL only: re-read only tables changed since the last call
         **kwargs: Additional adapter-specific parameters
         
     Returns:
@@ -228,12 +390,10 @@ async def get_schema_metadata(conn_uri: Optional[str] = None, db_type: Optional[
     
     if db_type in ["postgresql", "postgres"]:
         # Use existing PostgreSQL implementation for backward compatibility
-        pool = await create_connection_pool()
-        try:
-            schema_data = await fetch_schema(pool)
-            return await format_schema_for_embedding(schema_data)
-        finally:
-            await pool.close()
+        # Introspection is read-only, so a healthy replica can serve it
+        pool = await get_replica_router(uri).get_read_pool()
+        schema_data = await fetch_schema_snapshot(uri, pool, incremental=incremental)
+        return await format_schema_for_embedding(schema_data)
     else:
         # For all other database types, use the orchestrator
         from ..db.db_orchestrator import Orchestrator
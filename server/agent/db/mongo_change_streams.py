@@ -0,0 +1,136 @@
+"""
+MongoDB change stream watchers
+
+Change streams need a replica set or sharded cluster, and Motor only opens
+one when it is first read, so a standalone server fails late and inside a
+background task. ``ChangeStreamWatcher`` opens the stream up front, reports
+whether that worked so callers can fall back (to polling or TTLs), and then
+hands every change to a callback until the stream ends.
+"""
+
+import asyncio
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from pymongo.errors import PyMongoError
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+ChangeHandler = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+StopHandler = Callable[[], Union[None, Awaitable[None]]]
+
+
+async def _call(handler: Optional[Callable], *args: Any) -> None:
+    if handler is None:
+        return
+    result = handler(*args)
+    if inspect.isawaitable(result):
+        await result
+
+
+class ChangeStreamWatcher:
+    """
+    Runs a change stream on a Motor client, database or collection.
+
+    ``start()`` opens the stream and returns False if change streams are
+    unavailable. Otherwise changes are passed to ``on_change`` from a
+    background task; ``on_stop`` is called once when the stream ends for any
+    reason, so callers can stop trusting it.
+    """
+
+    def __init__(
+        self,
+        target: Any,
+        on_change: ChangeHandler,
+        pipeline: Optional[List[Dict[str, Any]]] = None,
+        on_stop: Optional[StopHandler] = None,
+        description: str = "",
+        max_await_time_ms: int = 1000
+    ):
+        """
+        Initialize the watcher
+
+        Args:
+            target: Motor client, database or collection to watch
+            on_change: Called (or awaited) with each change document
+            pipeline: Optional aggregation pipeline filtering the changes
+            on_stop: Called (or awaited) when the stream ends
+            description: Name used in log messages
+            max_await_time_ms: How long each getMore waits for new changes
+        """
+        self.target = target
+        self.on_change = on_change
+        self.pipeline = pipeline or []
+        self.on_stop = on_stop
+        self.description = description or getattr(target, "name", "change stream")
+        self.max_await_time_ms = max_await_time_ms
+        self.active = False
+        self.changes_seen = 0
+        self._stream = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> bool:
+        """
+        Open the change stream and start handing changes to the callback
+
+        Returns:
+            True if the stream is open, False if change streams are unavailable
+        """
+        if self.active:
+            return True
+
+        stream = self.target.watch(pipeline=self.pipeline, max_await_time_ms=self.max_await_time_ms)
+        try:
+            # The first read runs the aggregate that opens the stream
+            first = await stream.try_next()
+        except PyMongoError as e:
+            logger.warning(f"Change stream unavailable for {self.description}: {str(e)}")
+            await stream.close()
+            return False
+
+        self._stream = stream
+        self.active = True
+        self._task = asyncio.create_task(self._run(first))
+        logger.info(f"Watching {self.description} for changes")
+        return True
+
+    async def _run(self, first: Optional[Dict[str, Any]]) -> None:
+        try:
+            if first is not None:
+                await self._dispatch(first)
+            async for change in self._stream:
+                await self._dispatch(change)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error in change stream for {self.description}: {str(e)}")
+        finally:
+            self.active = False
+            try:
+                await self._stream.close()
+            except Exception:
+                pass
+            try:
+                await _call(self.on_stop)
+            except Exception as e:
+                logger.error(f"Error stopping change stream for {self.description}: {str(e)}")
+
+    async def _dispatch(self, change: Dict[str, Any]) -> None:
+        self.changes_seen += 1
+        try:
+            await _call(self.on_change, change)
+        except Exception as e:
+            # One failing handler call must not end the stream
+            logger.error(f"Error handling change in {self.description}: {str(e)}")
+
+    async def stop(self) -> None:
+        """Close the change stream and wait for its task to finish"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,217 @@
+"""
+MongoDB client manager
+
+Keeps one long-lived Motor client per connection URI for the whole process,
+so adapters, introspection and watchers share a warm connection pool instead
+of creating a client (and its monitoring threads) per adapter. Motor runs
+driver calls off the event loop, so a slow aggregation no longer blocks
+other requests.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+from ..config.settings import Settings
+from .pool_manager import redact_dsn
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class PoolUsageListener(monitoring.ConnectionPoolListener):
+    """Counts connection pool events for one client"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open = 0
+        self.checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+
+    def _add(self, attribute: str, delta: int = 1) -> None:
+        # Pool events are published from driver threads
+        with self._lock:
+            setattr(self, attribute, getattr(self, attribute) + delta)
+
+    def connection_created(self, event):
+        self._add("open")
+
+    def connection_closed(self, event):
+        self._add("open", -1)
+
+    def connection_checked_out(self, event):
+        self._add("checked_out")
+        self._add("checkouts")
+
+    def connection_checked_in(self, event):
+        self._add("checked_out", -1)
+
+    def connection_check_out_failed(self, event):
+        self._add("checkout_failures")
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+
+@dataclass
+class ClientEntry:
+    """A managed client together with its pool usage counters"""
+    client: AsyncIOMotorClient
+    listener: PoolUsageListener
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class MongoClientManager:
+    """
+    Process-wide registry of Motor clients keyed by connection URI.
+
+    Clients are created lazily on first use with pool sizes from settings.
+    Motor resolves the running event loop on every call, so a client can be
+    shared across successive ``asyncio.run`` calls in the CLI.
+    """
+
+    def __init__(
+        self,
+        max_pool_size: Optional[int] = None,
+        min_pool_size: Optional[int] = None,
+        max_idle_time_ms: Optional[int] = None,
+        connect_timeout_ms: Optional[int] = None,
+        server_selection_timeout_ms: Optional[int] = None
+    ):
+        """
+        Initialize the client manager
+
+        Args:
+            max_pool_size: Maximum connections per client (default from settings)
+            min_pool_size: Connections kept open per client (default from settings)
+            max_idle_time_ms: Milliseconds an idle pooled connection is kept open
+            connect_timeout_ms: Milliseconds allowed to open a connection
+            server_selection_timeout_ms: Milliseconds to wait for a usable server
+        """
+        settings = Settings()
+        self.max_pool_size = max_pool_size if max_pool_size is not None else settings.MONGO_MAX_POOL_SIZE
+        self.min_pool_size = min_pool_size if min_pool_size is not None else settings.MONGO_MIN_POOL_SIZE
+        self.max_idle_time_ms = max_idle_time_ms if max_idle_time_ms is not None else settings.MONGO_MAX_IDLE_TIME_MS
+        self.connect_timeout_ms = (
+            connect_timeout_ms if connect_timeout_ms is not None else settings.MONGO_CONNECT_TIMEOUT_MS
+        )
+        self.server_selection_timeout_ms = (
+            server_selection_timeout_ms if server_selection_timeout_ms is not None
+            else settings.MONGO_SERVER_SELECTION_TIMEOUT_MS
+        )
+        self._clients: Dict[str, ClientEntry] = {}
+        self._lock = threading.Lock()
+
+    def get_client(self, uri: str) -> AsyncIOMotorClient:
+        """
+        Get the shared client for a URI, creating it on first use
+
+        Args:
+            uri: MongoDB connection URI
+
+        Returns:
+            AsyncIOMotorClient: The long-lived client for this URI
+        """
+        entry = self._clients.get(uri)
+        if entry is not None:
+            return entry.client
+
+        with self._lock:
+            entry = self._clients.get(uri)
+            if entry is None:
+                listener = PoolUsageListener()
+                client = AsyncIOMotorClient(
+                    uri,
+                    maxPoolSize=self.max_pool_size,
+                    minPoolSize=self.min_pool_size,
+                    maxIdleTimeMS=self.max_idle_time_ms or None,
+                    connectTimeoutMS=self.connect_timeout_ms,
+                    serverSelectionTimeoutMS=self.server_selection_timeout_ms,
+                    event_listeners=[listener]
+                )
+                entry = ClientEntry(client=client, listener=listener)
+                self._clients[uri] = entry
+                logger.info(f"MongoDB client created for {redact_dsn(uri)} "
+                            f"(min={self.min_pool_size}, max={self.max_pool_size})")
+            return entry.client
+
+    def close(self, uri: str) -> None:
+        """
+        Close the client for a single URI
+
+        Args:
+            uri: MongoDB connection URI
+        """
+        entry = self._clients.pop(uri, None)
+        if entry is not None:
+            entry.client.close()
+
+    def close_all(self) -> None:
+        """Close every managed client (called on application shutdown)"""
+        uris = list(self._clients.keys())
+        for uri in uris:
+            self.close(uri)
+        if uris:
+            logger.info(f"Closed {len(uris)} MongoDB client(s)")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get connection pool statistics for every managed client
+
+        Returns:
+            Dictionary keyed by redacted URI with open and checked-out connection counts
+        """
+        now = time.monotonic()
+        return {
+            redact_dsn(uri): {
+                "max_pool_size": self.max_pool_size,
+                "min_pool_size": self.min_pool_size,
+                "open": entry.listener.open,
+                "in_use": entry.listener.checked_out,
+                "checkouts": entry.listener.checkouts,
+                "checkout_failures": entry.listener.checkout_failures,
+                "age_seconds": now - entry.created_at,
+            }
+            for uri, entry in self._clients.items()
+        }
+
+
+# Global instance
+_client_manager: Optional[MongoClientManager] = None
+
+def get_mongo_client_manager() -> MongoClientManager:
+    """Get the global MongoDB client manager instance"""
+    global _client_manager
+    if _client_manager is None:
+        _client_manager = MongoClientManager()
+    return _client_manager
+
+def get_mongo_client(uri: str) -> AsyncIOMotorClient:
+    """Get the shared Motor client for a URI"""
+    return get_mongo_client_manager().get_client(uri)
+
+def close_mongo_clients() -> None:
+    """Close all clients held by the global client manager"""
+    if _client_manager is not None:
+        _client_manager.close_all()
@@ -0,0 +1,241 @@
+"""
+Explain-based guard for generated MongoDB aggregation pipelines
+
+Runs ``explain`` on a pipeline before it is executed. When the winning plan
+scans the whole collection (``COLLSCAN``) and the collection is larger than
+a threshold, the pipeline is rewritten so it reads a bounded number of
+documents: pipelines that aggregate get a leading ``$sample``, pipelines
+that return documents get a trailing ``$limit``. The decision carries the
+estimates so it can be shown to users, like the SQL cost gate.
+"""
+
+import copy
+import logging
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import PyMongoError
+
+from ..config.settings import Settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Decisions
+ALLOW = "allow"
+LIMIT = "limit"
+SAMPLE = "sample"
+
+# Stages that summarize their input, so a random sample still gives a useful answer
+_AGGREGATING_STAGES = frozenset(("$group", "$count", "$bucket", "$bucketAuto", "$sortByCount", "$facet"))
+
+# Stages that must stay first in a pipeline, so nothing is injected before them
+_LEADING_STAGES = frozenset(("$geoNear", "$search", "$searchMeta", "$vectorSearch", "$collStats",
+                             "$indexStats", "$changeStream", "$documents"))
+
+
+@dataclass
+class MongoGuardDecision:
+    """Outcome of the guard for one pipeline"""
+    action: str
+    collection: str
+    pipeline: List[Dict[str, Any]]
+    original_pipeline: List[Dict[str, Any]]
+    collection_scan: bool = False
+    estimated_documents: Optional[int] = None
+    row_limit: Optional[int] = None
+    sample_size: Optional[int] = None
+    plan_stages: List[str] = field(default_factory=list)
+    reason: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a dictionary for stream events and logs"""
+        return asdict(self)
+
+
+def plan_stages(explain_output: Any) -> List[str]:
+    """
+    Collect the plan stage names from ``explain`` output
+
+    Handles both the plain ``queryPlanner`` form and the ``stages`` form
+    returned for pipelines with more than a ``$cursor`` stage, and sharded
+    plans, by walking the whole document.
+
+    Args:
+        explain_output: Decoded explain command reply
+
+    Returns:
+        Stage names (e.g. COLLSCAN, IXSCAN, FETCH) in document order
+    """
+    stages: List[str] = []
+
+    def walk(node: Any, in_rejected: bool) -> None:
+        if isinstance(node, dict):
+            stage = node.get("stage")
+            if isinstance(stage, str) and not in_rejected:
+                stages.append(stage)
+            for key, value in node.items():
+                walk(value, in_rejected or key == "rejectedPlans")
+        elif isinstance(node, list):
+            for item in node:
+                walk(item, in_rejected)
+
+    walk(explain_output, False)
+    return stages
+
+
+def add_sample(pipeline: List[Dict[str, Any]], size: int) -> List[Dict[str, Any]]:
+    """
+    Make a pipeline read a random sample of the collection
+
+    Args:
+        pipeline: Aggregation pipeline
+        size: Number of documents to sample
+
+    Returns:
+        New pipeline starting with ``$sample``
+    """
+    return [{"$sample": {"size": int(size)}}] + copy.deepcopy(pipeline)
+
+
+def add_limit(pipeline: List[Dict[str, Any]], row_limit: int) -> List[Dict[str, Any]]:
+    """
+    Make a pipeline return at most ``row_limit`` documents
+
+    Args:
+        pipeline: Aggregation pipeline
+        row_limit: Maximum number of documents
+
+    Returns:
+        New pipeline ending with ``$limit``
+    """
+    return copy.deepcopy(pipeline) + [{"$limit": int(row_limit)}]
+
+
+def _stage_names(pipeline: List[Dict[str, Any]]) -> List[str]:
+    return [next(iter(stage)) for stage in pipeline if isinstance(stage, dict) and stage]
+
+
+class MongoQueryGuard:
+    """
+    Decides how to run a pipeline from its query plan.
+
+    - no collection scan, or a collection of at most ``scan_threshold``
+      documents: run unchanged
+    - collection scan over a larger collection of a pipeline that
+      aggregates: prepend ``$sample`` of ``sample_size`` documents
+    - collection scan over a larger collection otherwise: append a
+      ``$limit`` of ``max_rows`` (unless the pipeline already ends in one)
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        scan_threshold: Optional[int] = None,
+        sample_size: Optional[int] = None,
+        max_rows: Optional[int] = None
+    ):
+        """
+        Initialize the guard
+
+        Args:
+            enabled: Whether pipelines are explained at all (default from settings)
+            scan_threshold: Collection size above which a collection scan is rewritten
+            sample_size: Documents read by an injected ``$sample``
+            max_rows: Documents returned by an injected ``$limit`` (default MAX_ROWS_DIRECT)
+        """
+        settings = Settings()
+        self.enabled = enabled if enabled is not None else settings.MONGO_GUARD_ENABLED
+        self.scan_threshold = scan_threshold if scan_threshold is not None else settings.MONGO_GUARD_SCAN_THRESHOLD
+        self.sample_size = sample_size if sample_size is not None else settings.MONGO_GUARD_SAMPLE_SIZE
+        self.max_rows = max_rows if max_rows is not None else settings.MAX_ROWS_DIRECT
+
+    async def check(self, db: Any, collection: str, pipeline: List[Dict[str, Any]]) -> MongoGuardDecision:
+        """
+        Explain a pipeline and decide how to run it
+
+        Args:
+            db: Motor database
+            collection: Collection the pipeline runs on
+            pipeline: Aggregation pipeline
+
+        Returns:
+            MongoGuardDecision
+        """
+        if not self.enabled:
+            return MongoGuardDecision(action=ALLOW, collection=collection, pipeline=pipeline,
+                                      original_pipeline=pipeline, reason="Guard not applied")
+
+        try:
+            explain_output = await db.command({
+                "explain": {"aggregate": collection, "pipeline": pipeline, "cursor": {}},
+                "verbosity": "queryPlanner"
+            })
+            stages = plan_stages(explain_output)
+            estimated_documents = None
+            if "COLLSCAN" in stages:
+                estimated_documents = await db[collection].estimated_document_count()
+        except PyMongoError as e:
+            # Let the pipeline itself surface the error (or run) rather than failing here
+            logger.warning(f"Mongo guard could not explain pipeline, running it unchanged: {str(e)}")
+            return MongoGuardDecision(action=ALLOW, collection=collection, pipeline=pipeline,
+                                      original_pipeline=pipeline, reason=f"explain failed: {str(e)}")
+
+        decision = self.decide(collection, pipeline, stages, estimated_documents)
+        logger.info(f"Mongo guard: {decision.action} on {collection} "
+                    f"(collscan={decision.collection_scan}, docs≈{estimated_documents})")
+        return decision
+
+    def decide(
+        self,
+        collection: str,
+        pipeline: List[Dict[str, Any]],
+        stages: List[str],
+        estimated_documents: Optional[int]
+    ) -> MongoGuardDecision:
+        """
+        Decide how to run a pipeline from its plan stages
+
+        Args:
+            collection: Collection the pipeline runs on
+            pipeline: Aggregation pipeline
+            stages: Plan stage names from ``plan_stages``
+            estimated_documents: Collection size when the plan scans it
+
+        Returns:
+            MongoGuardDecision
+        """
+        collection_scan = "COLLSCAN" in stages
+        decision = MongoGuardDecision(
+            action=ALLOW,
+            collection=collection,
+            pipeline=pipeline,
+            original_pipeline=pipeline,
+            collection_scan=collection_scan,
+            estimated_documents=estimated_documents,
+            plan_stages=stages,
+            reason="Uses an index" if not collection_scan else "Collection scan within threshold"
+        )
+        if not collection_scan or not estimated_documents or estimated_documents <= self.scan_threshold:
+            return decision
+
+        names = _stage_names(pipeline)
+        if names and names[0] in _LEADING_STAGES:
+            decision.reason = f"Collection scan over {estimated_documents} documents, but {names[0]} must run first"
+            return decision
+
+        if _AGGREGATING_STAGES.intersection(names):
+            decision.action = SAMPLE
+            decision.pipeline = add_sample(pipeline, self.sample_size)
+            decision.sample_size = self.sample_size
+            decision.reason = (f"Collection scan over {estimated_documents} documents exceeds "
+                               f"{self.scan_threshold}; aggregating a random sample of {self.sample_size}")
+        elif names[-1:] == ["$limit"] and isinstance(pipeline[-1]["$limit"], int) and pipeline[-1]["$limit"] <= self.max_rows:
+            decision.reason = f"Collection scan over {estimated_documents} documents, already limited"
+        else:
+            decision.action = LIMIT
+            decision.pipeline = add_limit(pipeline, self.max_rows)
+            decision.row_limit = self.max_rows
+            decision.reason = (f"Collection scan over {estimated_documents} documents exceeds "
+                               f"{self.scan_threshold}; returning the first {self.max_rows}")
+        return decision
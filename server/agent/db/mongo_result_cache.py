@@ -0,0 +1,327 @@
+"""
+Result cache for MongoDB aggregation pipelines
+
+Dashboards send the same pipelines over and over against collections that
+change slowly. ``MongoResultCache`` keeps recent results keyed by source,
+collection and a canonical hash of the pipeline, evicting the least
+recently used entries past a size bound. Each cached collection is watched
+with a change stream and its entries are dropped on any write; where change
+streams are unavailable (standalone servers) entries expire after a TTL.
+"""
+
+import asyncio
+import copy
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import json_util
+
+from ..config.settings import Settings
+from .mongo_change_streams import ChangeStreamWatcher
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Keys whose documents are ordered, so their key order is part of the pipeline's meaning
+_ORDERED_KEYS = frozenset(("$sort", "sortBy", "key", "$orderBy"))
+
+# Change stream events that mean nothing about the collection's data changed
+_IGNORED_OPERATIONS = frozenset(("createIndexes", "dropIndexes", "shardCollection"))
+
+# Seconds before retrying a collection whose change stream could not be opened
+WATCH_RETRY_SECONDS = 300
+
+
+def _canonical(value: Any, ordered: bool = False) -> Any:
+    if isinstance(value, dict):
+        items = [(key, _canonical(item, key in _ORDERED_KEYS)) for key, item in value.items()]
+        # Ordered documents become lists of pairs so their order survives key sorting
+        return [list(pair) for pair in items] if ordered else dict(sorted(items))
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+def pipeline_hash(pipeline: List[Dict[str, Any]]) -> str:
+    """
+    Hash a pipeline so that equivalent pipelines share a cache entry
+
+    Keys are sorted, except inside ordered documents such as ``$sort``
+    where key order changes the result.
+
+    Args:
+        pipeline: Aggregation pipeline
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    canonical = json_util.dumps(_canonical(pipeline), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """Cached results of one pipeline"""
+    results: List[Dict[str, Any]]
+    created_at: float
+    watched: bool
+
+
+class MongoResultCache:
+    """
+    LRU cache of pipeline results with change stream invalidation.
+
+    Every (source, collection) pair has a version that is bumped on
+    invalidation; results are only stored if the version did not change
+    while the query ran, so a write that lands mid-query is never hidden.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        max_entries: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        watch: Optional[bool] = None
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            enabled: Whether results are cached at all (default from settings)
+            max_entries: Maximum number of cached pipelines
+            max_rows: Larger results are not cached
+            ttl_seconds: Lifetime of entries for collections without a change stream
+            watch: Whether to open change streams for cached collections
+        """
+        settings = Settings()
+        self.enabled = enabled if enabled is not None else settings.MONGO_RESULT_CACHE_ENABLED
+        self.max_entries = max_entries if max_entries is not None else settings.MONGO_RESULT_CACHE_MAX_ENTRIES
+        self.max_rows = max_rows if max_rows is not None else settings.MONGO_RESULT_CACHE_MAX_ROWS
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.MONGO_RESULT_CACHE_TTL_SECONDS
+        self.watch = watch if watch is not None else settings.MONGO_RESULT_CACHE_WATCH
+        self._entries: "OrderedDict[Tuple[str, str, str], CacheEntry]" = OrderedDict()
+        self._versions: Dict[Tuple[str, str], int] = {}
+        self._source_versions: Dict[str, int] = {}
+        self._watchers: Dict[Tuple[str, str], ChangeStreamWatcher] = {}
+        self._watch_failures: Dict[Tuple[str, str], float] = {}
+        self._starting: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def version(self, source: str, collection: str) -> Tuple[int, int]:
+        """Current invalidation version of a collection; pass it to put()"""
+        return self._source_versions.get(source, 0), self._versions.get((source, collection), 0)
+
+    def is_watched(self, source: str, collection: str) -> bool:
+        """Whether a live change stream is invalidating this collection"""
+        watcher = self._watchers.get((source, collection))
+        return watcher is not None and watcher.active
+
+    def get(self, source: str, collection: str, pipeline: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached results
+
+        Args:
+            source: Identifies the database (e.g. URI and database name)
+            collection: Collection the pipeline runs on
+            pipeline: Aggregation pipeline
+
+        Returns:
+            A copy of the cached results, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        key = (source, collection, pipeline_hash(pipeline))
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if not (entry.watched and self.is_watched(source, collection)) and \
+                time.monotonic() - entry.created_at > self.ttl_seconds:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry.results)
+
+    def put(
+        self,
+        source: str,
+        collection: str,
+        pipeline: List[Dict[str, Any]],
+        results: List[Dict[str, Any]],
+        version: Tuple[int, int],
+        watched: bool = False
+    ) -> bool:
+        """
+        Store results unless the collection was invalidated since ``version``
+
+        Args:
+            source: Identifies the database
+            collection: Collection the pipeline ran on
+            pipeline: Aggregation pipeline
+            results: Results of the pipeline
+            version: Value of version() taken before the query ran
+            watched: Value of is_watched() taken before the query ran; entries
+                are only exempt from the TTL if the stream covered the whole query
+
+        Returns:
+            True if the results were stored
+        """
+        if not self.enabled or len(results) > self.max_rows or version != self.version(source, collection):
+            return False
+        key = (source, collection, pipeline_hash(pipeline))
+        self._entries[key] = CacheEntry(
+            results=copy.deepcopy(results),
+            created_at=time.monotonic(),
+            watched=watched and self.is_watched(source, collection)
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    def invalidate(self, source: str, collection: Optional[str] = None) -> int:
+        """
+        Drop cached results for a collection, or for every collection of a source
+
+        Args:
+            source: Identifies the database
+            collection: Collection to drop (default: all collections of the source)
+
+        Returns:
+            Number of entries dropped
+        """
+        if collection is None:
+            self._source_versions[source] = self._source_versions.get(source, 0) + 1
+        else:
+            self._versions[(source, collection)] = self._versions.get((source, collection), 0) + 1
+        keys = [key for key in self._entries
+                if key[0] == source and (collection is None or key[1] == collection)]
+        for key in keys:
+            del self._entries[key]
+        self.invalidations += 1
+        return len(keys)
+
+    def watch_collection(self, source: str, db: Any, collection: str) -> None:
+        """
+        Start watching a collection in the background
+
+        Opening a change stream takes a round trip or two, so queries do not
+        wait for it; their results are cached with the TTL until the stream
+        is open. Does nothing if the collection is already watched, is being
+        set up, or recently failed to open a change stream.
+
+        Args:
+            source: Identifies the database
+            db: Motor database
+            collection: Collection to watch
+        """
+        key = (source, collection)
+        if not self.watch or self.is_watched(source, collection) or key in self._starting:
+            return
+        failed_at = self._watch_failures.get(key)
+        if failed_at is not None and time.monotonic() - failed_at < WATCH_RETRY_SECONDS:
+            return
+        self._starting[key] = asyncio.create_task(self._start_watcher(source, db, collection))
+
+    async def ensure_watcher(self, source: str, db: Any, collection: str) -> bool:
+        """
+        Open a change stream on a collection and wait until it is set up
+
+        Args:
+            source: Identifies the database
+            db: Motor database
+            collection: Collection to watch
+
+        Returns:
+            True if the collection is watched
+        """
+        self.watch_collection(source, db, collection)
+        task = self._starting.get((source, collection))
+        if task is not None:
+            await task
+        return self.is_watched(source, collection)
+
+    async def _start_watcher(self, source: str, db: Any, collection: str) -> None:
+        key = (source, collection)
+        try:
+            watcher = ChangeStreamWatcher(
+                db[collection],
+                on_change=lambda change: self._on_change(source, collection, change),
+                on_stop=lambda: self._on_watch_stopped(source, collection),
+                description=f"collection {collection} (result cache)"
+            )
+            if await watcher.start():
+                self._watchers[key] = watcher
+                self._watch_failures.pop(key, None)
+            else:
+                # Fall back to the TTL; try again later in case the deployment changes
+                self._watch_failures[key] = time.monotonic()
+        except Exception as e:
+            logger.error(f"Error watching collection {collection}: {str(e)}")
+            self._watch_failures[key] = time.monotonic()
+        finally:
+            self._starting.pop(key, None)
+
+    def _on_change(self, source: str, collection: str, change: Dict[str, Any]) -> None:
+        if change.get("operationType") not in _IGNORED_OPERATIONS:
+            self.invalidate(source, collection)
+
+    def _on_watch_stopped(self, source: str, collection: str) -> None:
+        # Changes may be missed from now on, so nothing cached under the stream can be trusted
+        self._watchers.pop((source, collection), None)
+        self.invalidate(source, collection)
+
+    async def close(self) -> None:
+        """Stop every change stream watcher and drop all entries"""
+        for task in list(self._starting.values()):
+            task.cancel()
+        watchers = list(self._watchers.values())
+        for watcher in watchers:
+            await watcher.stop()
+        self._watchers.clear()
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with size, hit/miss counters and watched collections
+        """
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "watched_collections": sum(1 for watcher in self._watchers.values() if watcher.active),
+        }
+
+
+# Global instance
+_result_cache: Optional[MongoResultCache] = None
+
+def get_mongo_result_cache() -> MongoResultCache:
+    """Get the global MongoDB result cache instance"""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = MongoResultCache()
+    return _result_cache
+
+async def close_mongo_result_cache() -> None:
+    """Stop the global result cache's change streams"""
+    if _result_cache is not None:
+        await _result_cache.close()
@@ -0,0 +1,333 @@
+"""
+Sampling-based schema inference for MongoDB collections
+
+Documents in a collection rarely share one shape, so the first few
+documents say little about the rest. ``MongoSchemaInferrer`` reads a random
+``$sample`` of each collection and merges every document into per-field
+statistics: how often the field is present and how often it holds each BSON
+type. Collections are sampled concurrently with bounded parallelism, and each
+result is cached until the collection's document count or indexes change.
+"""
+
+import asyncio
+import datetime
+import hashlib
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import Binary, Decimal128, Int64, ObjectId, Regex, Timestamp
+
+from ..config.settings import Settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Nested documents are described down to this many levels
+MAX_FIELD_DEPTH = 3
+
+# Distinct example values kept per field
+MAX_EXAMPLES = 3
+
+# Longest example value shown before it is truncated
+MAX_EXAMPLE_LENGTH = 40
+
+_TYPE_NAMES: List[Tuple[type, str]] = [
+    (bool, "bool"),
+    (Int64, "long"),
+    (int, "int"),
+    (float, "double"),
+    (str, "string"),
+    (ObjectId, "objectId"),
+    (datetime.datetime, "date"),
+    (Decimal128, "decimal"),
+    (Decimal, "decimal"),
+    (Binary, "binData"),
+    (bytes, "binData"),
+    (uuid.UUID, "uuid"),
+    (Timestamp, "timestamp"),
+    (Regex, "regex"),
+    (dict, "object"),
+    (list, "array"),
+]
+
+
+def bson_type_name(value: Any) -> str:
+    """
+    Name of the BSON type of a decoded value
+
+    Args:
+        value: Value decoded by PyMongo
+
+    Returns:
+        BSON type alias as used by ``$type`` (e.g. "string", "objectId", "null")
+    """
+    if value is None:
+        return "null"
+    for python_type, name in _TYPE_NAMES:
+        if isinstance(value, python_type):
+            return name
+    return type(value).__name__
+
+
+@dataclass
+class FieldStats:
+    """Presence and type counts for one field path"""
+    path: str
+    count: int = 0
+    types: Dict[str, int] = field(default_factory=dict)
+    examples: List[str] = field(default_factory=list)
+
+    @property
+    def dominant_type(self) -> str:
+        """Most frequent non-null type (or "null" if the field is always null)"""
+        non_null = {name: n for name, n in self.types.items() if name != "null"}
+        candidates = non_null or self.types
+        return max(candidates, key=lambda name: (candidates[name], name)) if candidates else "null"
+
+
+@dataclass
+class CollectionSchema:
+    """Schema inferred from a sample of one collection"""
+    collection: str
+    document_count: int
+    sampled: int
+    fields: Dict[str, FieldStats] = field(default_factory=dict)
+    indexes: List[Dict[str, Any]] = field(default_factory=list)
+    signature: str = ""
+
+    def presence(self, path: str) -> float:
+        """Fraction of sampled documents that contain a field"""
+        stats = self.fields.get(path)
+        return stats.count / self.sampled if stats and self.sampled else 0.0
+
+    def to_fields(self) -> Dict[str, Dict[str, Any]]:
+        """Field information in the registry's table-schema format"""
+        return {
+            path: {
+                "data_type": stats.dominant_type,
+                "primary_key": path == "_id",
+                "nullable": "null" in stats.types or stats.count < self.sampled,
+                "presence": round(self.presence(path), 4),
+                "types": {name: round(n / self.sampled, 4) for name, n in stats.types.items()},
+            }
+            for path, stats in self.fields.items()
+        }
+
+    def to_content(self) -> str:
+        """Text description of the collection for embedding"""
+        lines = [
+            f"COLLECTION: {self.collection}",
+            f"APPROXIMATE DOCUMENT COUNT: {self.document_count}",
+            f"SAMPLED DOCUMENTS: {self.sampled}",
+            "",
+            "FIELDS:",
+        ]
+        if not self.fields:
+            lines.append("No fields identified")
+        for path, stats in self.fields.items():
+            type_mix = ", ".join(
+                f"{name} {100.0 * n / stats.count:.0f}%"
+                for name, n in sorted(stats.types.items(), key=lambda item: -item[1])
+            )
+            line = f"- {path} ({stats.dominant_type}) present in {100.0 * self.presence(path):.0f}% of documents"
+            if len(stats.types) > 1:
+                line += f"; types: {type_mix}"
+            if stats.examples:
+                line += f"; examples: {', '.join(stats.examples)}"
+            lines.append(line)
+        if self.indexes:
+            lines.append("")
+            lines.append("INDEXES:")
+            for index in self.indexes:
+                keys = ", ".join(f"{key} {direction}" for key, direction in index["key"])
+                lines.append(f"- {index['name']} ({keys}){' UNIQUE' if index.get('unique') else ''}")
+        return "\n".join(lines)
+
+
+def merge_document(fields: Dict[str, FieldStats], doc: Dict[str, Any], prefix: str = "", depth: int = 1) -> None:
+    """
+    Add one document's fields to the running statistics
+
+    Nested documents (and documents inside arrays) are described with
+    dot-separated paths, as used in queries. A field is counted at most
+    once per document, even when it appears in several array elements.
+
+    Args:
+        fields: Statistics keyed by field path, updated in place
+        doc: Document decoded by PyMongo
+        prefix: Path of the enclosing document
+        depth: Nesting level of ``doc``
+    """
+    seen: Dict[str, set] = {}
+    _collect(doc, prefix, depth, seen, fields)
+    for path, type_names in seen.items():
+        stats = fields.get(path)
+        if stats is None:
+            stats = fields[path] = FieldStats(path=path)
+        stats.count += 1
+        for name in type_names:
+            stats.types[name] = stats.types.get(name, 0) + 1
+
+
+def _collect(doc: Dict[str, Any], prefix: str, depth: int, seen: Dict[str, set],
+             fields: Dict[str, FieldStats]) -> None:
+    for key, value in doc.items():
+        path = f"{prefix}{key}"
+        seen.setdefault(path, set()).add(bson_type_name(value))
+        if depth < MAX_FIELD_DEPTH:
+            if isinstance(value, dict):
+                _collect(value, f"{path}.", depth + 1, seen, fields)
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, dict):
+                        _collect(item, f"{path}.", depth + 1, seen, fields)
+        if not isinstance(value, (dict, list)) and value is not None:
+            _add_example(fields, path, value)
+
+
+def _add_example(fields: Dict[str, FieldStats], path: str, value: Any) -> None:
+    stats = fields.get(path)
+    if stats is None:
+        stats = fields[path] = FieldStats(path=path)
+    if len(stats.examples) >= MAX_EXAMPLES:
+        return
+    example = str(value)
+    if len(example) > MAX_EXAMPLE_LENGTH:
+        example = example[:MAX_EXAMPLE_LENGTH] + "..."
+    if example not in stats.examples:
+        stats.examples.append(example)
+
+
+def index_signature(document_count: int, indexes: List[Dict[str, Any]]) -> str:
+    """Signature of a collection's size and indexes, used to invalidate cached schemas"""
+    payload = json.dumps([document_count, indexes], sort_keys=True, default=str)
+    return hashlib.md5(payload.encode("utf-8")).hexdigest()
+
+
+class MongoSchemaInferrer:
+    """
+    Infers collection schemas from ``$sample`` and caches them.
+
+    The cache is keyed by source (URI and database) and collection. A cached
+    schema is reused while the collection's estimated document count and
+    index definitions are unchanged; both are cheap metadata reads.
+    """
+
+    def __init__(self, sample_size: Optional[int] = None, concurrency: Optional[int] = None):
+        """
+        Initialize the inferrer
+
+        Args:
+            sample_size: Documents sampled per collection (default from settings)
+            concurrency: Collections sampled at once (default from settings)
+        """
+        settings = Settings()
+        self.sample_size = sample_size if sample_size is not None else settings.MONGO_SCHEMA_SAMPLE_SIZE
+        self.concurrency = max(1, concurrency if concurrency is not None else settings.MONGO_SCHEMA_CONCURRENCY)
+        self._cache: Dict[Tuple[str, str], CollectionSchema] = {}
+
+    async def infer_collection(self, db: Any, collection_name: str, source: str = "") -> CollectionSchema:
+        """
+        Infer the schema of one collection, reusing the cached result if still valid
+
+        Args:
+            db: Motor database
+            collection_name: Collection to sample
+            source: Identifies the database in the cache (e.g. its URI)
+
+        Returns:
+            CollectionSchema
+        """
+        collection = db[collection_name]
+        document_count = await collection.estimated_document_count()
+        index_info = await collection.index_information()
+        indexes = [
+            {"name": name, "key": [list(pair) for pair in info.get("key", [])], "unique": bool(info.get("unique"))}
+            for name, info in sorted(index_info.items())
+        ]
+        signature = index_signature(document_count, indexes)
+
+        cache_key = (source or db.name, collection_name)
+        cached = self._cache.get(cache_key)
+        if cached is not None and cached.signature == signature:
+            return cached
+
+        cursor = collection.aggregate([{"$sample": {"size": self.sample_size}}], allowDiskUse=True)
+        fields: Dict[str, FieldStats] = {}
+        sampled = 0
+        async for doc in cursor:
+            merge_document(fields, doc)
+            sampled += 1
+
+        schema = CollectionSchema(
+            collection=collection_name,
+            document_count=document_count,
+            sampled=sampled,
+            fields=dict(sorted(fields.items(), key=lambda item: (item[0] != "_id", item[0]))),
+            indexes=indexes,
+            signature=signature
+        )
+        self._cache[cache_key] = schema
+        logger.info(f"Inferred schema for {collection_name}: {len(fields)} fields from {sampled} documents")
+        return schema
+
+    async def infer_database(
+        self,
+        db: Any,
+        collection_names: Optional[List[str]] = None,
+        source: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Infer schemas for many collections concurrently
+
+        Args:
+            db: Motor database
+            collection_names: Collections to sample (default: all non-system collections)
+            source: Identifies the database in the cache (e.g. its URI)
+
+        Returns:
+            Dictionary mapping collection name to a CollectionSchema, or to the
+            exception raised while sampling it
+        """
+        if collection_names is None:
+            collection_names = await db.list_collection_names()
+        collection_names = [name for name in collection_names if not name.startswith("system.")]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def infer(name: str) -> CollectionSchema:
+            async with semaphore:
+                return await self.infer_collection(db, name, source)
+
+        results = await asyncio.gather(*(infer(name) for name in collection_names), return_exceptions=True)
+        for name, result in zip(collection_names, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Error inferring schema for collection {name}: {result}")
+        return dict(zip(collection_names, results))
+
+    def invalidate(self, source: str, collection_name: Optional[str] = None) -> None:
+        """
+        Drop cached schemas for a source, or for one of its collections
+
+        Args:
+            source: Source the schemas were cached under
+            collection_name: Collection to drop (default: all collections of the source)
+        """
+        for key in list(self._cache):
+            if key[0] == source and (collection_name is None or key[1] == collection_name):
+                del self._cache[key]
+
+
+# Global instance
+_schema_inferrer: Optional[MongoSchemaInferrer] = None
+
+def get_mongo_schema_inferrer() -> MongoSchemaInferrer:
+    """Get the global MongoDB schema inferrer instance"""
+    global _schema_inferrer
+    if _schema_inferrer is None:
+        _schema_inferrer = MongoSchemaInferrer()
+    return _schema_inferrer
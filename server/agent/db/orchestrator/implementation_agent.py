@@ -20,6 +20,7 @@ from ...llm.client import get_llm_client
 from ..registry.integrations import registry_client
 from ..adapters import mongo, postgres, qdrant, slack, shopify
 from ..adapters.base import DBAdapter
+from ..cost_gate import QueryRejectedError
 from .result_aggregator import ResultAggregator, JoinType, AggregationFunction
 from .plans.base import QueryPlan, Operation, OperationStatus
 
@@ -76,6 +77,9 @@ class ImplementationAgent:
         # Cache for database adapters to avoid recreating them
         self._adapter_cache = {}
         
+        # Results of vector searches run ahead in a batch, by operation ID
+        self._vector_results: Dict[str, Any] = {}
+        
         # Execution metrics
         self.metrics = {
             "operation_timings": {},
@@ -151,6 +155,10 @@ class ImplementationAgent:
             if not uri:
                 raise ValueError(f"MongoDB source {mapped_source_id} missing URI")
             adapter = mongo.MongoAdapter(uri)
+        elif source_type.lower() in ("postgres", "postgresql") and source_info.get("uri"):
+            # Each Postgres source runs against its own registered URI (and pool),
+            # not the type-wide config section shared by every Postgres source
+            adapter = postgres.PostgresAdapter(source_info["uri"], replicas=source_info.get("replicas"))
         else:
             # For other adapters, use connection_info
             connection_info = source_info.get("connection_info", {})
@@ -269,7 +277,20 @@ class ImplementationAgent:
                             else:
                                 # Execute the SQL query
                                 try:
-                                    if hasattr(adapter, 'execute_query'):
+                                    if hasattr(adapter, 'check_query_cost'):
+                                        # Run the EXPLAIN cost gate up front so the decision is recorded
+                                        decision = await asyncio.wait_for(
+                                            adapter.check_query_cost(sql_query, params),
+                                            timeout=self.operation_timeout_seconds
+                                        )
+                                        operation.metadata["cost_gate"] = decision.to_dict()
+                                        if decision.action == "reject":
+                                            raise QueryRejectedError(decision)
+                                        result = await asyncio.wait_for(
+                                            adapter.execute_query(decision.query, params, cost_gate=False),
+                                            timeout=self.operation_timeout_seconds
+                                        )
+                                    elif hasattr(adapter, 'execute_query'):
                                         result = await asyncio.wait_for(
                                             adapter.execute_query(sql_query, params),
                                             timeout=self.operation_timeout_seconds
@@ -279,8 +300,11 @@ class ImplementationAgent:
                                             adapter.execute(sql_query, params),
                                             timeout=self.operation_timeout_seconds
                                         )
+                                except postgres.QueryTimeoutError:
+                                    raise
                                 except asyncio.TimeoutError:
-                                    raise TimeoutError(f"SQL query execution timed out after {self.operation_timeout_seconds}s")
+                                    # wait_for already cancelled the statement; don't re-run it on retry
+                                    raise postgres.QueryTimeoutError(f"SQL query execution timed out after {self.operation_timeout_seconds}s")
                                     
                         elif op_class_name == "MongoOperation":
                             # MongoDB operation - get collection and query details
@@ -315,16 +339,16 @@ class ImplementationAgent:
                             # Qdrant operation - get vector search details
                             adapter_params = operation.get_adapter_params()
                             collection = adapter_params.get("collection")
-                            vector_query = adapter_params.get("vector_query", [])
-                            filter_conditions = adapter_params.get("filter", {})
-                            top_k = adapter_params.get("top_k", 10)
                             
                             if dry_run:
                                 result = {"valid": True, "collection": collection}
+                            elif operation.id in self._vector_results:
+                                # Served by the plan's batched search
+                                result = self._vector_results.pop(operation.id)
                             else:
                                 try:
                                     result = await asyncio.wait_for(
-                                        adapter.search(collection, vector_query, filter_conditions, top_k),
+                                        adapter.execute(adapter_params),
                                         timeout=self.operation_timeout_seconds
                                     )
                                 except asyncio.TimeoutError:
@@ -470,6 +494,10 @@ class ImplementationAgent:
         Returns:
             True if the operation should be retried, False otherwise
         """
+        # Runaway queries that hit the query timeout are not re-run
+        if isinstance(error, postgres.QueryTimeoutError):
+            return False
+        
         # Retry on connection errors, timeouts, and transient failures
         retryable_errors = (
             TimeoutError,
@@ -515,6 +543,79 @@ class ImplementationAgent:
         
         return ready_ops
     
+    async def _embed_query_texts(self, query_plan: QueryPlan) -> None:
+        """
+        Embed the query texts of a plan's vector search operations.
+
+        All texts that go to the same embedding provider are embedded in one
+        batched call instead of one request per operation.
+
+        Args:
+            query_plan: The query plan whose operations to prepare
+        """
+        pending: Dict[int, Tuple[Any, List[Operation]]] = {}
+        for op in query_plan.operations:
+            if op.__class__.__name__ != "QdrantOperation" or op.vector_query or not op.query_text:
+                continue
+            try:
+                adapter = await self._get_adapter(op.source_id)
+            except Exception as e:
+                logger.error(f"Error getting adapter for {op.source_id}: {e}")
+                continue
+            provider = adapter.embedding_provider
+            pending.setdefault(id(provider), (provider, []))[1].append(op)
+
+        for provider, ops in pending.values():
+            try:
+                vectors = await provider.get_embeddings([op.query_text for op in ops])
+            except Exception as e:
+                # The operations fail on their own for lack of a vector
+                logger.error(f"Error embedding vector search queries: {e}")
+                continue
+            for op, vector in zip(ops, vectors):
+                op.vector_query = vector
+            logger.info(f"Embedded {len(ops)} vector search queries in one batch")
+    
+    async def _batch_vector_searches(self, operations: List[Operation]) -> None:
+        """
+        Run the vector searches among ready operations in batches.
+
+        Searches on the same adapter are sent with one execute_batch call,
+        which makes one round trip per collection. Their results are picked
+        up when the operations execute; if a batch fails, its operations
+        run (and retry) individually.
+
+        Args:
+            operations: Operations that are ready to execute
+        """
+        pending: Dict[int, Tuple[Any, List[Operation]]] = {}
+        for op in operations:
+            if op.__class__.__name__ != "QdrantOperation" or op.metadata.get("dry_run") or not op.vector_query:
+                continue
+            try:
+                adapter = await self._get_adapter(op.source_id)
+            except Exception as e:
+                logger.error(f"Error getting adapter for {op.source_id}: {e}")
+                continue
+            if hasattr(adapter, "execute_batch"):
+                pending.setdefault(id(adapter), (adapter, []))[1].append(op)
+
+        for adapter, ops in pending.values():
+            if len(ops) < 2:
+                continue
+            try:
+                results = await asyncio.wait_for(
+                    adapter.execute_batch([op.get_adapter_params() for op in ops]),
+                    timeout=self.operation_timeout_seconds
+                )
+            except Exception as e:
+                logger.warning(f"Batched vector search failed, running searches individually: {e}")
+                continue
+            for op, result in zip(ops, results):
+                self._vector_results[op.id] = result
+                op.metadata["batched_with"] = len(ops)
+            logger.info(f"Ran {len(ops)} vector searches in one batch")
+    
     async def execute_plan(
         self, 
         query_plan: QueryPlan,
@@ -547,6 +648,8 @@ class ImplementationAgent:
         if dry_run:
             for op in query_plan.operations:
                 op.metadata["dry_run"] = True
+        else:
+            await self._embed_query_texts(query_plan)
         
         # Execute operations in dependency order
         while True:
@@ -565,14 +668,13 @@ class ImplementationAgent:
                 await asyncio.sleep(0.1)
                 continue
             
+            # Find the ready operations in the plan
+            ready = [op for op in query_plan.operations if op.operation_id in ready_ops]
+            if not dry_run:
+                await self._batch_vector_searches(ready)
+            
             # Create tasks for ready operations
-            tasks = []
-            for op_id in ready_ops:
-                # Find operation in the plan
-                op = next((op for op in query_plan.operations if op.operation_id == op_id), None)
-                if op:
-                    # Create task for executing operation
-                    tasks.append(self._execute_operation(op, semaphore))
+            tasks = [self._execute_operation(op, semaphore) for op in ready]
             
             # Execute operations in parallel
             if tasks:
@@ -631,7 +733,8 @@ class ImplementationAgent:
                 "status": op.status,
                 "type": op.operation_type,
                 "duration": op.metadata.get("duration_seconds"),
-                "error": op.metadata.get("error")
+                "error": op.metadata.get("error"),
+                "cost_gate": op.metadata.get("cost_gate")
             } for op in query_plan.operations},
             "metrics": {
                 "operation_timings": self.metrics["operation_timings"],
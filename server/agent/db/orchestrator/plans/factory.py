@@ -134,7 +134,8 @@ def create_operation(
                     filter=params.get("filter", {}),
                     top_k=params.get("limit", 10),
                     depends_on=depends_on,
-                    metadata=metadata
+                    metadata=metadata,
+                    query_text=params.get("query_text")
                 )
             elif db_type == "slack":
                 # Slack operation parameters
@@ -274,6 +275,7 @@ def create_plan_from_dict(plan_dict: Dict[str, Any]) -> QueryPlan:
             params = {
                 "collection": operation_params.get("collection", op_dict.get("collection", "")),
                 "vector": operation_params.get("vector", op_dict.get("vector_query", [])),
+                "query_text": operation_params.get("query_text", op_dict.get("query_text")),
                 "filter": operation_params.get("filter", op_dict.get("filter", {})),
                 "limit": operation_params.get("limit", op_dict.get("top_k", 10))
             }
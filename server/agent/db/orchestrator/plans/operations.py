@@ -268,7 +268,8 @@ class QdrantOperation(Operation):
         filter: Dict[str, Any] = None,
         top_k: int = 10,
         depends_on: List[str] = None,
-        metadata: Dict[str, Any] = None
+        metadata: Dict[str, Any] = None,
+        query_text: str = None
     ):
         """
         Initialize a Qdrant operation
@@ -282,18 +283,22 @@ class QdrantOperation(Operation):
             top_k: Number of results to return
             depends_on: List of operation IDs this operation depends on
             metadata: Additional metadata for this operation
+            query_text: Text to embed when no vector_query is given; the
+                implementation agent embeds all of a plan's texts in one batch
         """
         super().__init__(id, source_id, depends_on, metadata)
         self.collection = collection
         self.vector_query = vector_query or []
         self.filter = filter or {}
         self.top_k = top_k
+        self.query_text = query_text
     
     def get_adapter_params(self) -> Dict[str, Any]:
         """Get parameters for the database adapter"""
         return {
             "collection": self.collection,
             "vector": self.vector_query,
+            "query_text": self.query_text,
             "filter": self.filter,
             "limit": self.top_k
         }
@@ -324,15 +329,15 @@ class QdrantOperation(Operation):
             cross_db_logger.error(f"🔍 Qdrant operation {self.id} missing collection")
             return False
         
-        # Check if we have a vector query
-        if not self.vector_query:
+        # Check if we have a vector query, or text to embed before execution
+        if not self.vector_query and not self.query_text:
             cross_db_logger.error(f"🔍 Qdrant operation {self.id} missing vector_query. Found: {self.vector_query}")
             # Print params for debugging
             cross_db_logger.error(f"🔍 Qdrant operation params: collection={self.collection}, filter={self.filter}, top_k={self.top_k}")
             return False
         
         # Validate vector query format
-        if not isinstance(self.vector_query, list):
+        if self.vector_query and not isinstance(self.vector_query, list):
             cross_db_logger.error(f"🔍 Qdrant operation {self.id} vector_query must be a list, got {type(self.vector_query)}")
             return False
         
@@ -18,6 +18,10 @@ import functools
 import itertools
 from collections import defaultdict
 
+import numpy as np
+
+from ..columnar import ColumnarResult
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -214,9 +218,15 @@ class ResultAggregator:
         
         try:
             # Convert operation results to JSON-serializable format
+            # Columnar results stay column-major; only the rows shown to the LLM become dicts
             processed_results = {}
+            columnar_results = {}
             for op_id, result in operation_results.items():
-                processed_results[op_id] = self._convert_for_aggregation(result)
+                if isinstance(result, ColumnarResult):
+                    columnar_results[op_id] = result
+                    processed_results[op_id] = self._convert_for_aggregation(result.to_dict())
+                else:
+                    processed_results[op_id] = self._convert_for_aggregation(result)
             
             # Convert query plan to dict if it's not already
             if hasattr(query_plan, 'to_dict'):
@@ -227,7 +237,12 @@ class ResultAggregator:
             # Create a summary for LLM analysis
             summary_data = []
             for op_id, result in processed_results.items():
-                if isinstance(result, list):
+                if op_id in columnar_results:
+                    remaining = max(0, 100 - len(summary_data))
+                    summary_data.extend(
+                        self._convert_for_aggregation(columnar_results[op_id].slice(0, remaining).to_dicts())
+                    )
+                elif isinstance(result, list):
                     summary_data.extend(result)
                 elif isinstance(result, dict):
                     summary_data.append(result)
@@ -358,11 +373,20 @@ class ResultAggregator:
         failed_count = len(results) - success_count
         
         # Collect all data
-        all_data = []
-        for result in results:
-            if result.get("success", False) and "data" in result:
-                data = result.get("data", [])
-                if isinstance(data, list):
+        successful_data = [
+            result.get("data", []) for result in results
+            if result.get("success", False) and "data" in result
+        ]
+        
+        # When every source returned columns, concatenate them without going through dicts
+        if successful_data and all(isinstance(data, ColumnarResult) for data in successful_data):
+            all_data = ColumnarResult.concat(successful_data)
+        else:
+            all_data = []
+            for data in successful_data:
+                if isinstance(data, ColumnarResult):
+                    all_data.extend(data.to_dicts())
+                elif isinstance(data, list):
                     all_data.extend(data)
                 else:
                     all_data.append(data)
@@ -638,6 +662,9 @@ class ResultAggregator:
         Returns:
             Aggregated value
         """
+        if isinstance(data, ColumnarResult):
+            return self._apply_aggregate_function_columnar(data, function, field)
+        
         if not data:
             return None
             
@@ -698,6 +725,55 @@ class ResultAggregator:
             logger.warning(f"Unsupported aggregation function: {function}")
             return None
     
+    def _apply_aggregate_function_columnar(
+        self,
+        data: ColumnarResult,
+        function: AggregationFunction,
+        field: str
+    ) -> Any:
+        """
+        Apply an aggregation function to one column of a columnar result.
+        
+        Numeric columns are aggregated with vectorized NumPy operations;
+        other columns fall back to the row-wise implementation on that
+        column's values only.
+        
+        Args:
+            data: Columnar result
+            function: Aggregation function to apply
+            field: Column to aggregate
+            
+        Returns:
+            Aggregated value
+        """
+        if field not in data.data or data.num_rows == 0:
+            return None
+        
+        column = data.column(field)
+        if column.dtype == object:
+            values = [{field: value} for value in column.tolist()]
+            return self.apply_aggregate_function(values, function, field)
+        
+        if function == AggregationFunction.COUNT:
+            return int(column.size)
+        
+        numeric = column.astype(np.float64)
+        if function == AggregationFunction.SUM:
+            return float(numeric.sum())
+        elif function == AggregationFunction.AVG:
+            return float(numeric.mean())
+        elif function == AggregationFunction.MIN:
+            return column.min().item()
+        elif function == AggregationFunction.MAX:
+            return column.max().item()
+        elif function == AggregationFunction.MEDIAN:
+            return float(np.median(numeric))
+        elif function == AggregationFunction.STDDEV:
+            return float(numeric.std())
+        else:
+            logger.warning(f"Unsupported aggregation function: {function}")
+            return None
+    
     def group_by_aggregation(
         self,
         data: List[Dict[str, Any]],
@@ -718,6 +794,9 @@ class ResultAggregator:
         Returns:
             List of aggregated records
         """
+        if isinstance(data, ColumnarResult):
+            return self._group_by_aggregation_columnar(data, group_by_fields, aggregations)
+        
         if not data or not group_by_fields or not aggregations:
             return []
             
@@ -752,6 +831,54 @@ class ResultAggregator:
             
         return result
     
+    def _group_by_aggregation_columnar(
+        self,
+        data: ColumnarResult,
+        group_by_fields: List[str],
+        aggregations: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Perform GROUP BY-like aggregation on a columnar result.
+        
+        Groups are computed over the column arrays (rows with a missing
+        group key are skipped, as in the row-wise version) and each
+        aggregation runs on the column slices of a group.
+        
+        Args:
+            data: Columnar result
+            group_by_fields: Fields to group by
+            aggregations: Aggregation specifications (see group_by_aggregation)
+            
+        Returns:
+            List of aggregated records
+        """
+        if data.num_rows == 0 or not group_by_fields or not aggregations:
+            return []
+        if any(field not in data.data for field in group_by_fields):
+            return []
+        
+        # Map each distinct key to the row indices that belong to it
+        key_columns = [data.column(field).tolist() for field in group_by_fields]
+        groups = defaultdict(list)
+        for index, key in enumerate(zip(*key_columns)):
+            groups[key].append(index)
+        
+        result = []
+        for key, indices in groups.items():
+            index_array = np.asarray(indices)
+            group = ColumnarResult(data.columns, {name: data.data[name][index_array] for name in data.columns})
+            record = {field: value for field, value in zip(group_by_fields, key)}
+            
+            for agg in aggregations:
+                function = AggregationFunction(agg["function"])
+                field = agg["field"]
+                output_field = agg.get("output_field", f"{function.value}_{field}")
+                record[output_field] = self._apply_aggregate_function_columnar(group, function, field)
+            
+            result.append(record)
+        
+        return result
+    
     def aggregate_results_legacy(
         self, 
         results: List[Dict[str, Any]], 
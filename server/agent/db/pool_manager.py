@@ -0,0 +1,307 @@
+"""
+PostgreSQL connection pool manager
+
+Keeps one long-lived asyncpg pool per DSN for the whole process, so that
+adapters, introspection, tools and the availability checker share warm
+connections instead of opening a fresh pool for every query.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import asyncpg
+
+from ..config.settings import Settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def redact_dsn(dsn: str) -> str:
+    """
+    Redact the password from a DSN for safer logging and stats output
+
+    Args:
+        dsn: PostgreSQL connection string
+
+    Returns:
+        DSN with the password replaced by '***'
+    """
+    try:
+        parsed = urlparse(dsn)
+        if not parsed.password:
+            return dsn
+        netloc = parsed.netloc.replace(f":{parsed.password}@", ":***@", 1)
+        return parsed._replace(netloc=netloc).geturl()
+    except Exception:
+        return dsn
+
+
+@dataclass
+class PoolEntry:
+    """A managed pool together with its usage bookkeeping"""
+    pool: asyncpg.Pool
+    loop: asyncio.AbstractEventLoop
+    created_at: float
+    last_used: float
+    in_flight: int = 0
+    acquisitions: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+class PostgresPoolManager:
+    """
+    Process-wide registry of asyncpg pools keyed by DSN.
+
+    Pools are created lazily on first use, sized from settings, and closed
+    again once they have been idle for longer than the configured timeout.
+    A pool is bound to the event loop it was created on; if a caller runs on
+    a different loop (e.g. successive ``asyncio.run`` calls in the CLI), the
+    stale pool is discarded and a new one is created transparently.
+    
+    Every pooled connection carries the query timeout twice: as asyncpg's
+    ``command_timeout`` (the client cancels the running statement) and as
+    the server-side ``statement_timeout`` (the backend stops on its own even
+    if the client has gone away).
+    """
+
+    def __init__(
+        self,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        max_inactive_connection_lifetime: Optional[float] = None,
+        command_timeout: Optional[float] = None
+    ):
+        """
+        Initialize the pool manager
+
+        Args:
+            min_size: Minimum connections per pool (default from settings)
+            max_size: Maximum connections per pool (default from settings)
+            idle_timeout: Seconds a pool may sit unused before it is closed
+            max_inactive_connection_lifetime: Seconds an idle connection is kept open inside a pool
+            command_timeout: Per-statement timeout in seconds (default MAX_QUERY_TIMEOUT, 0 disables)
+        """
+        settings = Settings()
+        self.min_size = min_size if min_size is not None else settings.DB_POOL_MIN_SIZE
+        self.max_size = max_size if max_size is not None else settings.DB_POOL_MAX_SIZE
+        self.idle_timeout = idle_timeout if idle_timeout is not None else settings.DB_POOL_IDLE_TIMEOUT
+        self.max_inactive_connection_lifetime = (
+            max_inactive_connection_lifetime
+            if max_inactive_connection_lifetime is not None
+            else settings.DB_POOL_MAX_INACTIVE_CONNECTION_LIFETIME
+        )
+        self.command_timeout = command_timeout if command_timeout is not None else settings.MAX_QUERY_TIMEOUT
+        self._pools: Dict[str, PoolEntry] = {}
+        self._locks: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = {}
+
+    def _default_dsn(self) -> str:
+        """Return the DSN used when callers do not name one"""
+        return Settings().db_dsn
+
+    def _lock_for(self, dsn: str) -> asyncio.Lock:
+        """Get the creation lock for a DSN, replacing it if bound to another loop"""
+        loop = asyncio.get_running_loop()
+        bound = self._locks.get(dsn)
+        if bound is None or bound[0] is not loop:
+            bound = (loop, asyncio.Lock())
+            self._locks[dsn] = bound
+        return bound[1]
+
+    async def get_pool(self, dsn: Optional[str] = None) -> asyncpg.Pool:
+        """
+        Get the shared pool for a DSN, creating it on first use
+
+        Args:
+            dsn: PostgreSQL connection string (defaults to the settings DSN)
+
+        Returns:
+            asyncpg.Pool: The long-lived pool for this DSN
+        """
+        entry = await self._get_entry(dsn or self._default_dsn())
+        entry.last_used = time.monotonic()
+        return entry.pool
+
+    async def _get_entry(self, dsn: str) -> PoolEntry:
+        """Get or lazily create the pool entry for a DSN"""
+        await self.evict_idle()
+
+        loop = asyncio.get_running_loop()
+        entry = self._pools.get(dsn)
+        if entry is not None and entry.loop is loop and not entry.pool._closed:
+            return entry
+
+        async with self._lock_for(dsn):
+            entry = self._pools.get(dsn)
+            if entry is not None and entry.loop is loop and not entry.pool._closed:
+                return entry
+
+            if entry is not None:
+                # Pool belongs to a finished event loop or was closed externally
+                self._discard(dsn, entry)
+
+            timeout_kwargs = {}
+            if self.command_timeout and self.command_timeout > 0:
+                timeout_kwargs = {
+                    "command_timeout": self.command_timeout,
+                    "server_settings": {"statement_timeout": str(int(self.command_timeout * 1000))}
+                }
+            
+            try:
+                pool = await asyncpg.create_pool(
+                    dsn=dsn,
+                    min_size=self.min_size,
+                    max_size=self.max_size,
+                    max_inactive_connection_lifetime=self.max_inactive_connection_lifetime,
+                    **timeout_kwargs
+                )
+            except Exception as e:
+                logger.error(f"Failed to create connection pool for {redact_dsn(dsn)}: {str(e)}")
+                raise
+
+            now = time.monotonic()
+            entry = PoolEntry(pool=pool, loop=loop, created_at=now, last_used=now)
+            self._pools[dsn] = entry
+            logger.info(f"PostgreSQL connection pool created for {redact_dsn(dsn)} "
+                        f"(min={self.min_size}, max={self.max_size})")
+            return entry
+
+    @asynccontextmanager
+    async def acquire(self, dsn: Optional[str] = None) -> AsyncIterator[asyncpg.Connection]:
+        """
+        Acquire a connection from the shared pool for a DSN
+
+        Records the time spent waiting for a free connection and the number
+        of connections currently checked out, which feed ``get_stats``.
+
+        Args:
+            dsn: PostgreSQL connection string (defaults to the settings DSN)
+
+        Yields:
+            asyncpg.Connection: A pooled connection
+        """
+        entry = await self._get_entry(dsn or self._default_dsn())
+
+        wait_start = time.monotonic()
+        async with entry.pool.acquire() as conn:
+            waited = time.monotonic() - wait_start
+            entry.acquisitions += 1
+            entry.total_wait_seconds += waited
+            entry.max_wait_seconds = max(entry.max_wait_seconds, waited)
+            entry.in_flight += 1
+            try:
+                yield conn
+            finally:
+                entry.in_flight -= 1
+                entry.last_used = time.monotonic()
+
+    async def evict_idle(self) -> int:
+        """
+        Close pools that have not been used within the idle timeout
+
+        Returns:
+            Number of pools closed
+        """
+        if not self.idle_timeout or self.idle_timeout <= 0:
+            return 0
+
+        now = time.monotonic()
+        stale = [
+            dsn for dsn, entry in self._pools.items()
+            if entry.in_flight == 0 and now - entry.last_used > self.idle_timeout
+        ]
+        for dsn in stale:
+            entry = self._pools.pop(dsn, None)
+            if entry is None:
+                continue
+            logger.info(f"Closing idle PostgreSQL pool for {redact_dsn(dsn)}")
+            await self._close_entry(dsn, entry)
+        return len(stale)
+
+    async def close(self, dsn: str) -> None:
+        """
+        Close the pool for a single DSN
+
+        Args:
+            dsn: PostgreSQL connection string
+        """
+        entry = self._pools.pop(dsn, None)
+        if entry is not None:
+            await self._close_entry(dsn, entry)
+
+    async def close_all(self) -> None:
+        """Close every managed pool (called on application shutdown)"""
+        dsns = list(self._pools.keys())
+        for dsn in dsns:
+            await self.close(dsn)
+        if dsns:
+            logger.info(f"Closed {len(dsns)} PostgreSQL connection pool(s)")
+
+    async def _close_entry(self, dsn: str, entry: PoolEntry) -> None:
+        """Close a pool gracefully, or terminate it if it belongs to another loop"""
+        try:
+            if entry.loop is asyncio.get_running_loop():
+                await entry.pool.close()
+            else:
+                entry.pool.terminate()
+        except Exception as e:
+            logger.warning(f"Error closing PostgreSQL pool for {redact_dsn(dsn)}: {str(e)}")
+
+    def _discard(self, dsn: str, entry: PoolEntry) -> None:
+        """Drop a pool that can no longer be used from the current loop"""
+        self._pools.pop(dsn, None)
+        try:
+            entry.pool.terminate()
+        except Exception as e:
+            logger.debug(f"Error terminating stale pool for {redact_dsn(dsn)}: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get usage statistics for every managed pool
+
+        Returns:
+            Dictionary keyed by redacted DSN with size, in-use, idle and wait-time figures
+        """
+        now = time.monotonic()
+        stats = {}
+        for dsn, entry in self._pools.items():
+            pool = entry.pool
+            size = pool.get_size()
+            idle = pool.get_idle_size()
+            stats[redact_dsn(dsn)] = {
+                "size": size,
+                "min_size": pool.get_min_size(),
+                "max_size": pool.get_max_size(),
+                "in_use": size - idle,
+                "idle": idle,
+                "in_flight": entry.in_flight,
+                "acquisitions": entry.acquisitions,
+                "avg_wait_ms": (entry.total_wait_seconds / entry.acquisitions * 1000) if entry.acquisitions else 0.0,
+                "max_wait_ms": entry.max_wait_seconds * 1000,
+                "age_seconds": now - entry.created_at,
+                "idle_seconds": now - entry.last_used,
+            }
+        return stats
+
+
+# Global instance
+_pool_manager: Optional[PostgresPoolManager] = None
+
+def get_pool_manager() -> PostgresPoolManager:
+    """Get the global PostgreSQL pool manager instance"""
+    global _pool_manager
+    if _pool_manager is None:
+        _pool_manager = PostgresPoolManager()
+    return _pool_manager
+
+async def close_pool_manager() -> None:
+    """Close all pools held by the global pool manager"""
+    if _pool_manager is not None:
+        await _pool_manager.close_all()
@@ -0,0 +1,158 @@
+"""
+Qdrant client manager
+
+Keeps one long-lived ``AsyncQdrantClient`` per URI for the whole process,
+so adapters share a warm connection instead of each opening their own.
+The async client does not block the event loop during searches, and gRPC
+(preferred by default) avoids JSON encoding of vectors on every request.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from qdrant_client import AsyncQdrantClient
+
+from ..config.settings import Settings
+from .pool_manager import redact_dsn
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+ClientKey = Tuple[str, Optional[str], bool]
+
+
+@dataclass
+class ClientEntry:
+    """A managed client and the event loop its connections belong to"""
+    client: AsyncQdrantClient
+    loop: Optional[asyncio.AbstractEventLoop] = None
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class QdrantClientManager:
+    """
+    Process-wide registry of async Qdrant clients keyed by URI.
+
+    gRPC channels are bound to the event loop they were opened on, so a
+    client first used on a loop that has since been closed (successive
+    ``asyncio.run`` calls in the CLI) is replaced with a new one.
+    """
+
+    def __init__(
+        self,
+        prefer_grpc: Optional[bool] = None,
+        grpc_port: Optional[int] = None,
+        timeout: Optional[int] = None
+    ):
+        """
+        Initialize the client manager
+
+        Args:
+            prefer_grpc: Whether clients talk gRPC instead of REST (default from settings)
+            grpc_port: gRPC port of the Qdrant servers (default from settings)
+            timeout: Request timeout in seconds (default from settings)
+        """
+        settings = Settings()
+        self.prefer_grpc = prefer_grpc if prefer_grpc is not None else settings.QDRANT_PREFER_GRPC
+        self.grpc_port = grpc_port if grpc_port is not None else settings.QDRANT_GRPC_PORT
+        self.timeout = timeout if timeout is not None else settings.QDRANT_TIMEOUT
+        self._clients: Dict[ClientKey, ClientEntry] = {}
+        self._lock = threading.Lock()
+
+    def get_client(self, uri: str, api_key: Optional[str] = None, prefer_grpc: Optional[bool] = None) -> AsyncQdrantClient:
+        """
+        Get the shared client for a URI, creating it on first use
+
+        Args:
+            uri: Qdrant HTTP URI (qdrant:// is treated as http://)
+            api_key: Qdrant API key (optional)
+            prefer_grpc: Override the manager's gRPC preference
+
+        Returns:
+            AsyncQdrantClient: The long-lived client for this URI
+        """
+        if uri.startswith("qdrant://"):
+            uri = uri.replace("qdrant://", "http://", 1)
+        prefer_grpc = self.prefer_grpc if prefer_grpc is None else prefer_grpc
+        key = (uri, api_key, prefer_grpc)
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is not None and entry.loop is not None and loop is not None and \
+                    entry.loop is not loop and entry.loop.is_closed():
+                # The old client's connections died with its loop
+                entry = None
+            if entry is None:
+                client = AsyncQdrantClient(
+                    url=uri,
+                    api_key=api_key,
+                    prefer_grpc=prefer_grpc,
+                    grpc_port=self.grpc_port,
+                    timeout=self.timeout,
+                    # The version check is a blocking request made from the constructor
+                    check_compatibility=False
+                )
+                entry = ClientEntry(client=client, loop=loop)
+                self._clients[key] = entry
+                logger.info(f"Qdrant client created for {redact_dsn(uri)} ({'gRPC' if prefer_grpc else 'REST'})")
+            elif entry.loop is None:
+                entry.loop = loop
+            return entry.client
+
+    async def close_all(self) -> None:
+        """Close every managed client (called on application shutdown)"""
+        with self._lock:
+            entries = list(self._clients.values())
+            self._clients.clear()
+        for entry in entries:
+            try:
+                await entry.client.close()
+            except Exception as e:
+                logger.warning(f"Error closing Qdrant client: {e}")
+        if entries:
+            logger.info(f"Closed {len(entries)} Qdrant client(s)")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get statistics for every managed client
+
+        Returns:
+            Dictionary keyed by redacted URI with transport and age
+        """
+        now = time.monotonic()
+        return {
+            redact_dsn(uri): {
+                "transport": "grpc" if prefer_grpc else "rest",
+                "age_seconds": now - entry.created_at,
+            }
+            for (uri, _, prefer_grpc), entry in self._clients.items()
+        }
+
+
+# Global instance
+_client_manager: Optional[QdrantClientManager] = None
+
+def get_qdrant_client_manager() -> QdrantClientManager:
+    """Get the global Qdrant client manager instance"""
+    global _client_manager
+    if _client_manager is None:
+        _client_manager = QdrantClientManager()
+    return _client_manager
+
+def get_async_qdrant_client(uri: str, api_key: Optional[str] = None, prefer_grpc: Optional[bool] = None) -> AsyncQdrantClient:
+    """Get the shared async Qdrant client for a URI"""
+    return get_qdrant_client_manager().get_client(uri, api_key, prefer_grpc)
+
+async def close_qdrant_clients() -> None:
+    """Close all clients held by the global client manager"""
+    if _client_manager is not None:
+        await _client_manager.close_all()
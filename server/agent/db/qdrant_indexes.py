@@ -0,0 +1,449 @@
+"""
+Payload index management for Qdrant
+
+Filters generated by the LLM can name any payload key, and a filter on a
+key without a payload index makes Qdrant check the payload of every
+candidate point. ``FilterUsageTracker`` records which keys appear in
+filters, with the schema type the filter implies and how long filtered
+searches took with and without an index. ``PayloadIndexManager`` turns the
+frequently filtered keys into payload indexes; it runs from the
+``qdrant-indexes`` admin command rather than on the query path, since
+building an index on a large collection is expensive.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config.settings import Settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Keys of a Qdrant filter that hold lists of nested conditions
+_CLAUSES = ("must", "should", "must_not")
+
+# Payload value types found by sampling (see QdrantAdapter._extract_payload_schema)
+_SAMPLED_TYPES = {
+    "str": "keyword",
+    "int": "integer",
+    "float": "float",
+    "bool": "bool",
+}
+
+# Index types Qdrant accepts for create_payload_index
+PAYLOAD_SCHEMA_TYPES = frozenset(("keyword", "integer", "float", "bool", "geo", "datetime", "text", "uuid"))
+
+
+def _value_type(value: Any) -> Optional[str]:
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, str):
+        return "keyword"
+    return None
+
+
+def _condition_type(condition: Dict[str, Any]) -> Optional[str]:
+    """Index type implied by a single field condition"""
+    match = condition.get("match")
+    if isinstance(match, dict):
+        if "text" in match:
+            return "text"
+        values = match.get("any") or match.get("except")
+        if values is None:
+            return _value_type(match.get("value"))
+        return _value_type(values[0]) if values else None
+
+    range_ = condition.get("range")
+    if isinstance(range_, dict):
+        bounds = [value for value in range_.values() if value is not None]
+        if any(isinstance(value, str) for value in bounds):
+            return "datetime"
+        if bounds and all(isinstance(value, int) and not isinstance(value, bool) for value in bounds):
+            return "integer"
+        return "float"
+
+    if any(key in condition for key in ("geo_bounding_box", "geo_radius", "geo_polygon")):
+        return "geo"
+    # values_count, is_empty and is_null say nothing about the value type
+    return None
+
+
+def filter_fields(filter_json: Any) -> Dict[str, Optional[str]]:
+    """
+    Find the payload keys a filter conditions on
+
+    Understands Qdrant's filter format (nested must / should / must_not
+    clauses of field conditions) and the adapter's ``exact_match`` shorthand.
+
+    Args:
+        filter_json: Filter as passed to QdrantAdapter._parse_filter
+
+    Returns:
+        Dictionary of payload key to implied index type (None if the
+        condition does not imply one)
+    """
+    fields: Dict[str, Optional[str]] = {}
+
+    def visit(node: Any) -> None:
+        if hasattr(node, "dict") and not isinstance(node, dict):
+            node = node.dict(exclude_none=True)
+        if isinstance(node, list):
+            for item in node:
+                visit(item)
+            return
+        if not isinstance(node, dict):
+            return
+
+        exact = node.get("exact_match")
+        if isinstance(exact, dict) and exact.get("field"):
+            fields[exact["field"]] = fields.get(exact["field"]) or _value_type(exact.get("value"))
+        if isinstance(node.get("key"), str):
+            fields[node["key"]] = fields.get(node["key"]) or _condition_type(node)
+        for clause in _CLAUSES:
+            visit(node.get(clause))
+        min_should = node.get("min_should")
+        if isinstance(min_should, dict):
+            visit(min_should.get("conditions"))
+        # Nested conditions filter on the objects of an array field
+        nested = node.get("nested")
+        if isinstance(nested, dict) and nested.get("key"):
+            for key, schema_type in filter_fields(nested.get("filter")).items():
+                fields.setdefault(f"{nested['key']}[].{key}", schema_type)
+
+    visit(filter_json)
+    return fields
+
+
+def index_type_for(field: str, filter_type: Optional[str], payload_schema: Dict[str, Dict[str, Any]]) -> Optional[str]:
+    """
+    Choose the payload index type for a field
+
+    The type found in the collection's payload wins over the one implied by
+    filters, which may be wrong (e.g. a number compared as a string).
+
+    Args:
+        field: Payload key
+        filter_type: Index type implied by the filters on the field
+        payload_schema: Output of QdrantAdapter._extract_payload_schema
+
+    Returns:
+        Index type, or None if the field cannot be indexed
+    """
+    sampled = (payload_schema.get(field) or {}).get("type")
+    if isinstance(sampled, str):
+        sampled = sampled.lower()
+        if sampled in PAYLOAD_SCHEMA_TYPES:
+            return sampled
+        if sampled in _SAMPLED_TYPES:
+            # A text match needs a full-text index even on string fields
+            return "text" if filter_type == "text" else _SAMPLED_TYPES[sampled]
+    return filter_type if filter_type in PAYLOAD_SCHEMA_TYPES else None
+
+
+@dataclass
+class FieldUsage:
+    """How often a payload key was filtered on, and how fast those searches were"""
+    source: str
+    collection: str
+    field: str
+    schema_type: Optional[str]
+    uses: int
+    indexed_uses: int
+    unindexed_seconds: float
+    indexed_seconds: float
+    last_used: float
+
+    @property
+    def avg_unindexed_ms(self) -> Optional[float]:
+        unindexed = self.uses - self.indexed_uses
+        return self.unindexed_seconds * 1000 / unindexed if unindexed else None
+
+    @property
+    def avg_indexed_ms(self) -> Optional[float]:
+        return self.indexed_seconds * 1000 / self.indexed_uses if self.indexed_uses else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result["avg_unindexed_ms"] = self.avg_unindexed_ms
+        result["avg_indexed_ms"] = self.avg_indexed_ms
+        return result
+
+
+class FilterUsageTracker:
+    """
+    Counts filtered payload keys per collection in a SQLite file.
+
+    The file is shared by the API server, which records usage, and the
+    admin command, which reads it to decide which indexes to build.
+    """
+
+    def __init__(self, path: Optional[str] = None, enabled: Optional[bool] = None):
+        """
+        Initialize the tracker
+
+        Args:
+            path: SQLite file (default from settings, else in the app data directory)
+            enabled: Whether usage is recorded (default from settings)
+        """
+        settings = Settings()
+        self.enabled = enabled if enabled is not None else settings.QDRANT_FILTER_USAGE_ENABLED
+        self.path = path or settings.QDRANT_FILTER_USAGE_PATH or str(Path(settings.get_app_dir()) / "qdrant_filter_usage.db")
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS filter_usage (
+                    source TEXT NOT NULL,
+                    collection TEXT NOT NULL,
+                    field TEXT NOT NULL,
+                    schema_type TEXT,
+                    uses INTEGER NOT NULL DEFAULT 0,
+                    indexed_uses INTEGER NOT NULL DEFAULT 0,
+                    unindexed_seconds REAL NOT NULL DEFAULT 0,
+                    indexed_seconds REAL NOT NULL DEFAULT 0,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (source, collection, field)
+                )
+            """)
+            self._db.commit()
+        return self._db
+
+    def record(
+        self,
+        source: str,
+        collection: str,
+        fields: Dict[str, Optional[str]],
+        seconds: float,
+        indexed_fields: Optional[set] = None
+    ) -> None:
+        """
+        Record one filtered search
+
+        Args:
+            source: Identifies the Qdrant server (its URI)
+            collection: Collection searched
+            fields: Output of filter_fields() for the search's filter
+            seconds: Duration of the search
+            indexed_fields: Payload keys of the collection that have an index
+        """
+        if not self.enabled or not fields:
+            return
+        indexed_fields = indexed_fields or set()
+        now = time.time()
+        rows = []
+        for field, schema_type in fields.items():
+            indexed = field in indexed_fields
+            rows.append((
+                source, collection, field, schema_type, int(indexed),
+                0.0 if indexed else seconds, seconds if indexed else 0.0, now
+            ))
+        try:
+            with self._lock:
+                db = self._connect()
+                db.executemany("""
+                    INSERT INTO filter_usage
+                        (source, collection, field, schema_type, uses, indexed_uses, unindexed_seconds, indexed_seconds, last_used)
+                    VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?)
+                    ON CONFLICT (source, collection, field) DO UPDATE SET
+                        schema_type = COALESCE(excluded.schema_type, schema_type),
+                        uses = uses + 1,
+                        indexed_uses = indexed_uses + excluded.indexed_uses,
+                        unindexed_seconds = unindexed_seconds + excluded.unindexed_seconds,
+                        indexed_seconds = indexed_seconds + excluded.indexed_seconds,
+                        last_used = excluded.last_used
+                """, rows)
+                db.commit()
+        except sqlite3.Error as e:
+            # Usage statistics must never fail a search
+            logger.warning(f"Could not record Qdrant filter usage: {str(e)}")
+
+    def get_usage(self, source: Optional[str] = None, collection: Optional[str] = None) -> List[FieldUsage]:
+        """
+        Get recorded usage, most used first
+
+        Args:
+            source: Only this Qdrant server (optional)
+            collection: Only this collection (optional)
+
+        Returns:
+            List of FieldUsage
+        """
+        query = "SELECT source, collection, field, schema_type, uses, indexed_uses, unindexed_seconds, " \
+                "indexed_seconds, last_used FROM filter_usage WHERE 1 = 1"
+        params: List[Any] = []
+        if source is not None:
+            query += " AND source = ?"
+            params.append(source)
+        if collection is not None:
+            query += " AND collection = ?"
+            params.append(collection)
+        query += " ORDER BY uses DESC, field"
+        try:
+            with self._lock:
+                rows = self._connect().execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read Qdrant filter usage: {str(e)}")
+            return []
+        return [FieldUsage(*row) for row in rows]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get filter usage statistics
+
+        Returns:
+            Dictionary with per-field usage and search latencies with and without an index
+        """
+        return {
+            "enabled": self.enabled,
+            "fields": [usage.to_dict() for usage in self.get_usage()],
+        }
+
+    def close(self) -> None:
+        """Close the SQLite file"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+@dataclass
+class PayloadIndexAction:
+    """What the index manager did (or would do) for one payload key"""
+    collection: str
+    field: str
+    schema_type: Optional[str]
+    uses: int
+    action: str  # "create", "exists" or "skip"
+    reason: str
+    created: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class PayloadIndexManager:
+    """
+    Creates payload indexes for frequently filtered keys.
+
+    Fields qualify once they were filtered on at least ``min_uses`` times;
+    the index type comes from the sampled payload schema, falling back to
+    the type implied by the filters.
+    """
+
+    def __init__(self, tracker: Optional[FilterUsageTracker] = None, min_uses: Optional[int] = None):
+        """
+        Initialize the index manager
+
+        Args:
+            tracker: Filter usage tracker (default: the global tracker)
+            min_uses: Filter uses before a field gets an index (default from settings)
+        """
+        settings = Settings()
+        self.tracker = tracker or get_filter_usage_tracker()
+        self.min_uses = min_uses if min_uses is not None else settings.QDRANT_INDEX_MIN_FILTER_USES
+
+    def plan(
+        self,
+        source: str,
+        collection: str,
+        indexed_fields: Dict[str, str],
+        payload_schema: Dict[str, Dict[str, Any]]
+    ) -> List[PayloadIndexAction]:
+        """
+        Decide which payload indexes a collection needs
+
+        Args:
+            source: Identifies the Qdrant server
+            collection: Collection name
+            indexed_fields: Existing payload indexes (field to index type)
+            payload_schema: Output of QdrantAdapter._extract_payload_schema
+
+        Returns:
+            One action per filtered field
+        """
+        actions = []
+        for usage in self.tracker.get_usage(source, collection):
+            schema_type = indexed_fields.get(usage.field) or index_type_for(usage.field, usage.schema_type, payload_schema)
+            if usage.field in indexed_fields:
+                action, reason = "exists", "already indexed"
+            elif usage.uses < self.min_uses:
+                action, reason = "skip", f"filtered {usage.uses} times (< {self.min_uses})"
+            elif schema_type is None:
+                action, reason = "skip", "index type unknown"
+            else:
+                action, reason = "create", f"filtered {usage.uses} times"
+            actions.append(PayloadIndexAction(
+                collection=collection, field=usage.field, schema_type=schema_type,
+                uses=usage.uses, action=action, reason=reason
+            ))
+        return actions
+
+    async def apply(self, client: Any, actions: List[PayloadIndexAction]) -> List[PayloadIndexAction]:
+        """
+        Create the indexes planned with action "create"
+
+        Args:
+            client: AsyncQdrantClient
+            actions: Output of plan()
+
+        Returns:
+            The same actions, with ``created`` set for the indexes that were built
+        """
+        for action in actions:
+            if action.action != "create":
+                continue
+            try:
+                await client.create_payload_index(
+                    collection_name=action.collection,
+                    field_name=action.field,
+                    field_schema=action.schema_type,
+                    wait=True
+                )
+                action.created = True
+                logger.info(f"Created {action.schema_type} payload index on {action.collection}.{action.field}")
+            except Exception as e:
+                action.reason = f"index creation failed: {str(e)}"
+                logger.error(f"Error creating payload index on {action.collection}.{action.field}: {str(e)}")
+        return actions
+
+
+def existing_indexes(collection_info: Any) -> Dict[str, str]:
+    """
+    Payload indexes of a collection
+
+    Args:
+        collection_info: Result of get_collection()
+
+    Returns:
+        Dictionary of payload key to index type
+    """
+    indexes = {}
+    for field, info in (getattr(collection_info, "payload_schema", None) or {}).items():
+        data_type = getattr(info, "data_type", None)
+        indexes[field] = getattr(data_type, "value", data_type) or "unknown"
+    return indexes
+
+
+# Global instance
+_usage_tracker: Optional[FilterUsageTracker] = None
+
+def get_filter_usage_tracker() -> FilterUsageTracker:
+    """Get the global filter usage tracker instance"""
+    global _usage_tracker
+    if _usage_tracker is None:
+        _usage_tracker = FilterUsageTracker()
+    return _usage_tracker
@@ -0,0 +1,384 @@
+"""
+Sampling-based payload schema inference for Qdrant collections
+
+Qdrant only knows the types of indexed payload keys, so the rest of the
+payload schema has to be read from points. ``QdrantSchemaInferrer`` reads a
+random sample of each collection and merges every payload into per-key
+statistics: how often the key is present and how often it holds each type.
+Collections are sampled concurrently with bounded parallelism, and each
+result is cached until the collection's points count or configuration
+changes.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from qdrant_client.http.models import Sample, SampleQuery
+
+from ..config.settings import Settings
+from .qdrant_indexes import existing_indexes
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Nested payload objects are described down to this many levels
+MAX_FIELD_DEPTH = 3
+
+# Distinct example values kept per key
+MAX_EXAMPLES = 3
+
+# Longest example value shown before it is truncated
+MAX_EXAMPLE_LENGTH = 40
+
+
+def payload_type_name(value: Any) -> str:
+    """
+    Name of the type of a payload value
+
+    Args:
+        value: Value decoded from a point's payload
+
+    Returns:
+        Python type name as used in the registry (e.g. "str", "int", "null")
+    """
+    if value is None:
+        return "null"
+    return type(value).__name__
+
+
+def _model_dict(model: Any) -> Any:
+    if model is None:
+        return None
+    if hasattr(model, "model_dump"):
+        return model.model_dump(mode="json")
+    if hasattr(model, "dict"):
+        return model.dict()
+    return model
+
+
+@dataclass
+class PayloadFieldStats:
+    """Presence and type counts for one payload key"""
+    path: str
+    count: int = 0
+    types: Dict[str, int] = field(default_factory=dict)
+    examples: List[str] = field(default_factory=list)
+
+    @property
+    def dominant_type(self) -> str:
+        """Most frequent non-null type (or "null" if the key is always null)"""
+        non_null = {name: n for name, n in self.types.items() if name != "null"}
+        candidates = non_null or self.types
+        return max(candidates, key=lambda name: (candidates[name], name)) if candidates else "null"
+
+
+@dataclass
+class CollectionPayloadSchema:
+    """Payload schema inferred from a sample of one collection"""
+    collection: str
+    points_count: int
+    sampled: int
+    vectors: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    fields: Dict[str, PayloadFieldStats] = field(default_factory=dict)
+    indexes: Dict[str, str] = field(default_factory=dict)
+    signature: str = ""
+
+    def presence(self, path: str) -> float:
+        """Fraction of sampled points whose payload contains a key"""
+        stats = self.fields.get(path)
+        return stats.count / self.sampled if stats and self.sampled else 0.0
+
+    def histogram(self, path: str) -> Dict[str, float]:
+        """Fraction of the sampled values of a key that have each type"""
+        stats = self.fields[path]
+        return {name: round(n / stats.count, 4) for name, n in stats.types.items()} if stats.count else {}
+
+    def to_payload_schema(self) -> Dict[str, Dict[str, Any]]:
+        """Payload schema in the format of QdrantAdapter._extract_payload_schema"""
+        schema = {
+            path: {
+                "type": stats.dominant_type,
+                "indexed": path in self.indexes,
+                "presence": round(self.presence(path), 4),
+                "types": self.histogram(path),
+            }
+            for path, stats in self.fields.items()
+        }
+        # Indexed keys missing from the sample are still part of the schema
+        for path, index_type in self.indexes.items():
+            schema.setdefault(path, {"type": index_type, "indexed": True, "presence": 0.0, "types": {}})
+        return schema
+
+    def to_fields(self) -> Dict[str, Dict[str, Any]]:
+        """Field information in the registry's table-schema format"""
+        fields: Dict[str, Dict[str, Any]] = {}
+        for name, vector in self.vectors.items():
+            fields[f"vector_{name}" if name else "vector_dimensions"] = {
+                "data_type": "vector",
+                "dimensions": str(vector.get("size", "Unknown")),
+                "distance": str(vector.get("distance", "Unknown")),
+            }
+        for path, info in self.to_payload_schema().items():
+            fields[path] = {
+                "data_type": info["type"],
+                "indexed": info["indexed"],
+                "nullable": "null" in info["types"] or info["presence"] < 1.0,
+                "presence": info["presence"],
+                "types": info["types"],
+            }
+        fields["points_count"] = {"data_type": "integer", "value": str(self.points_count)}
+        return fields
+
+    def to_content(self) -> str:
+        """Text description of the collection for embedding"""
+        lines = [f"COLLECTION: {self.collection}"]
+        for name, vector in self.vectors.items():
+            prefix = f"VECTOR {name} " if name else "VECTOR "
+            lines.append(f"{prefix}DIMENSIONS: {vector.get('size', 'Unknown')}")
+            lines.append(f"{prefix}DISTANCE: {vector.get('distance', 'Unknown')}")
+
+        lines.append("")
+        lines.append("PAYLOAD SCHEMA:")
+        schema = self.to_payload_schema()
+        if not schema:
+            lines.append("No schema information available")
+        for path, info in schema.items():
+            line = f"- {path}: {info['type']}"
+            if info["indexed"]:
+                line += f" (indexed: True, {self.indexes.get(path, 'unknown')})"
+            if path in self.fields:
+                line += f"; present in {100.0 * info['presence']:.0f}% of points"
+                if len(info["types"]) > 1:
+                    type_mix = ", ".join(
+                        f"{name} {100.0 * share:.0f}%"
+                        for name, share in sorted(info["types"].items(), key=lambda item: (-item[1], item[0]))
+                    )
+                    line += f"; types: {type_mix}"
+                if self.fields[path].examples:
+                    line += f"; examples: {', '.join(self.fields[path].examples)}"
+            lines.append(line)
+
+        lines.append("")
+        lines.append(f"POINTS COUNT: {self.points_count}")
+        lines.append(f"SAMPLED POINTS: {self.sampled}")
+        return "\n".join(lines)
+
+
+def merge_payload(fields: Dict[str, PayloadFieldStats], payload: Dict[str, Any]) -> None:
+    """
+    Add one point's payload to the running statistics
+
+    Nested objects are described with dot-separated keys and objects inside
+    arrays with ``[]``, as used in Qdrant filters. A key is counted at most
+    once per point, even when it appears in several array elements.
+
+    Args:
+        fields: Statistics keyed by payload key, updated in place
+        payload: Payload of one point
+    """
+    seen: Dict[str, set] = {}
+    _collect(payload, "", 1, seen, fields)
+    for path, type_names in seen.items():
+        stats = fields.get(path)
+        if stats is None:
+            stats = fields[path] = PayloadFieldStats(path=path)
+        stats.count += 1
+        for name in type_names:
+            stats.types[name] = stats.types.get(name, 0) + 1
+
+
+def _collect(payload: Dict[str, Any], prefix: str, depth: int, seen: Dict[str, set],
+             fields: Dict[str, PayloadFieldStats]) -> None:
+    for key, value in payload.items():
+        path = f"{prefix}{key}"
+        seen.setdefault(path, set()).add(payload_type_name(value))
+        if depth < MAX_FIELD_DEPTH:
+            if isinstance(value, dict):
+                _collect(value, f"{path}.", depth + 1, seen, fields)
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, dict):
+                        _collect(item, f"{path}[].", depth + 1, seen, fields)
+        if not isinstance(value, (dict, list)) and value is not None:
+            _add_example(fields, path, value)
+
+
+def _add_example(fields: Dict[str, PayloadFieldStats], path: str, value: Any) -> None:
+    stats = fields.get(path)
+    if stats is None:
+        stats = fields[path] = PayloadFieldStats(path=path)
+    if len(stats.examples) >= MAX_EXAMPLES:
+        return
+    example = str(value)
+    if len(example) > MAX_EXAMPLE_LENGTH:
+        example = example[:MAX_EXAMPLE_LENGTH] + "..."
+    if example not in stats.examples:
+        stats.examples.append(example)
+
+
+def collection_signature(collection_info: Any) -> str:
+    """Signature of a collection's points count, configuration and payload indexes"""
+    payload = json.dumps([
+        getattr(collection_info, "points_count", None),
+        _model_dict(getattr(collection_info, "config", None)),
+        sorted(existing_indexes(collection_info).items()),
+    ], sort_keys=True, default=str)
+    return hashlib.md5(payload.encode("utf-8")).hexdigest()
+
+
+def _vectors(collection_info: Any) -> Dict[str, Dict[str, Any]]:
+    params = getattr(getattr(collection_info, "config", None), "params", None)
+    vectors = getattr(params, "vectors", None)
+    if vectors is None:
+        return {}
+    # Named vectors are a mapping; a single unnamed vector is keyed by ""
+    named = vectors.items() if isinstance(vectors, dict) else [("", vectors)]
+    return {
+        name: {
+            "size": getattr(config, "size", "Unknown"),
+            "distance": getattr(getattr(config, "distance", None), "value", getattr(config, "distance", "Unknown")),
+        }
+        for name, config in named
+    }
+
+
+class QdrantSchemaInferrer:
+    """
+    Infers payload schemas from random samples of points and caches them.
+
+    The cache is keyed by source (the server URI) and collection. A cached
+    schema is reused while the collection's points count, configuration and
+    payload indexes are unchanged; all three come from one get_collection call.
+    """
+
+    def __init__(self, sample_size: Optional[int] = None, concurrency: Optional[int] = None):
+        """
+        Initialize the inferrer
+
+        Args:
+            sample_size: Points sampled per collection (default from settings)
+            concurrency: Collections sampled at once (default from settings)
+        """
+        settings = Settings()
+        self.sample_size = sample_size if sample_size is not None else settings.QDRANT_SCHEMA_SAMPLE_SIZE
+        self.concurrency = max(1, concurrency if concurrency is not None else settings.QDRANT_SCHEMA_CONCURRENCY)
+        self._cache: Dict[Tuple[str, str], CollectionPayloadSchema] = {}
+
+    async def infer_collection(self, client: Any, collection_name: str, source: str = "") -> CollectionPayloadSchema:
+        """
+        Infer the payload schema of one collection, reusing the cached result if still valid
+
+        Args:
+            client: AsyncQdrantClient
+            collection_name: Collection to sample
+            source: Identifies the server in the cache (e.g. its URI)
+
+        Returns:
+            CollectionPayloadSchema
+        """
+        info = await client.get_collection(collection_name)
+        signature = collection_signature(info)
+
+        cache_key = (source, collection_name)
+        cached = self._cache.get(cache_key)
+        if cached is not None and cached.signature == signature:
+            return cached
+
+        fields: Dict[str, PayloadFieldStats] = {}
+        points = await self._sample(client, collection_name)
+        for point in points:
+            merge_payload(fields, point.payload or {})
+
+        schema = CollectionPayloadSchema(
+            collection=collection_name,
+            points_count=getattr(info, "points_count", None) or 0,
+            sampled=len(points),
+            vectors=_vectors(info),
+            fields=dict(sorted(fields.items())),
+            indexes=existing_indexes(info),
+            signature=signature
+        )
+        self._cache[cache_key] = schema
+        logger.info(f"Inferred payload schema for {collection_name}: {len(fields)} keys from {len(points)} points")
+        return schema
+
+    async def _sample(self, client: Any, collection_name: str) -> List[Any]:
+        try:
+            response = await client.query_points(
+                collection_name=collection_name,
+                query=SampleQuery(sample=Sample.RANDOM),
+                limit=self.sample_size,
+                with_payload=True,
+                with_vectors=False
+            )
+            return response.points
+        except Exception as e:
+            # Servers before 1.11 cannot sample randomly; read the first points instead
+            logger.info(f"Random sampling unavailable for {collection_name}, scrolling instead: {e}")
+            points, _ = await client.scroll(
+                collection_name=collection_name,
+                limit=self.sample_size,
+                with_payload=True,
+                with_vectors=False
+            )
+            return points
+
+    async def infer_all(
+        self,
+        client: Any,
+        collection_names: Optional[List[str]] = None,
+        source: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Infer payload schemas for many collections concurrently
+
+        Args:
+            client: AsyncQdrantClient
+            collection_names: Collections to sample (default: all collections)
+            source: Identifies the server in the cache (e.g. its URI)
+
+        Returns:
+            Dictionary mapping collection name to a CollectionPayloadSchema, or
+            to the exception raised while sampling it
+        """
+        if collection_names is None:
+            collection_names = [collection.name for collection in (await client.get_collections()).collections]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def infer(name: str) -> CollectionPayloadSchema:
+            async with semaphore:
+                return await self.infer_collection(client, name, source)
+
+        results = await asyncio.gather(*(infer(name) for name in collection_names), return_exceptions=True)
+        for name, result in zip(collection_names, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Error inferring payload schema for collection {name}: {result}")
+        return dict(zip(collection_names, results))
+
+    def invalidate(self, source: str, collection_name: Optional[str] = None) -> None:
+        """
+        Drop cached schemas for a source, or for one of its collections
+
+        Args:
+            source: Source the schemas were cached under
+            collection_name: Collection to drop (default: all collections of the source)
+        """
+        for key in list(self._cache):
+            if key[0] == source and (collection_name is None or key[1] == collection_name):
+                del self._cache[key]
+
+
+# Global instance
+_schema_inferrer: Optional[QdrantSchemaInferrer] = None
+
+def get_qdrant_schema_inferrer() -> QdrantSchemaInferrer:
+    """Get the global Qdrant schema inferrer instance"""
+    global _schema_inferrer
+    if _schema_inferrer is None:
+        _schema_inferrer = QdrantSchemaInferrer()
+    return _schema_inferrer
@@ -2,6 +2,7 @@ import asyncio
 import logging
 import os
 import json
+import re
 import yaml
 from typing import Any, Dict, List, Optional
 from pathlib import Path
@@ -153,10 +154,11 @@ async def introspect_mongodb(source_id: str, uri: str, version: str = "1.0.0"):
         if collections_added == 0:
             # Direct approach if no collections were found in the metadata
             # Connect to MongoDB directly to get collections
-            from motor.motor_asyncio import AsyncIOMotorClient
             from pymongo.errors import ConnectionFailure
+            from agent.db.mongo_client_manager import get_mongo_client
+            from agent.db.mongo_schema import get_mongo_schema_inferrer
             
-            client = AsyncIOMotorClient(uri)
+            client = get_mongo_client(uri)
             db_name = uri.split("/")[-1].split("?")[0]
             db = client[db_name]
             
@@ -164,38 +166,23 @@ async def introspect_mongodb(source_id: str, uri: str, version: str = "1.0.0"):
                 # Verify connection
                 await db.command("ping")
                 
-                # Get collection names
-                collection_names = await db.list_collection_names()
+                # Sample every collection concurrently to infer field types and presence
+                schemas = await get_mongo_schema_inferrer().infer_database(db, source=f"{uri}#{db_name}")
                 
-                for collection_name in collection_names:
-                    # Skip system collections
-                    if collection_name.startswith("system.") and collection_name != "system.views":
+                for collection_name, schema in schemas.items():
+                    if isinstance(schema, Exception):
                         continue
                     
-                    # Get a sample document to infer schema
-                    sample = await db[collection_name].find_one()
+                    schema_dict = {
+                        "raw_content": schema.to_content(),
+                        "fields": schema.to_fields(),
+                        "document_count": schema.document_count,
+                        "sampled_documents": schema.sampled
+                    }
                     
-                    # Create a schema dictionary from the sample
-                    if sample:
-                        fields = {}
-                        for field_name, value in sample.items():
-                            # Determine field type
-                            field_type = type(value).__name__
-                            is_primary = field_name == "_id"
-                            
-                            fields[field_name] = {
-                                "data_type": field_type,
-                                "primary_key": is_primary
-                            }
-                        
-                        schema_dict = {
-                            "raw_content": f"Collection: {collection_name}\nSample fields: {', '.join(fields.keys())}",
-                            "fields": fields
-                        }
-                        
-                        # Store in registry
-                        upsert_table_meta(source_id, collection_name, schema_dict, version)
-                        logger.info(f"  - Added collection: {collection_name}")
+                    # Store in registry
+                    upsert_table_meta(source_id, collection_name, schema_dict, version)
+                    logger.info(f"  - Added collection: {collection_name}")
                 
             except ConnectionFailure as e:
                 logger.error(f"MongoDB connection failed: {str(e)}")
@@ -233,7 +220,7 @@ def parse_mongodb_schema_content(content: str) -> Dict[str, Dict[str, Any]]:
             continue
         
         if in_fields_section and line.startswith("-"):
-            # Field format: "- field_name (data_type)"
+            # Field format: "- field_name (data_type) present in N% of documents; ..."
             parts = line[1:].strip().split(" ", 1)
             if len(parts) < 2:
                 continue
@@ -254,6 +241,12 @@ def parse_mongodb_schema_content(content: str) -> Dict[str, Dict[str, Any]]:
                 "data_type": data_type,
                 "primary_key": is_primary
             }
+            
+            # Presence frequency from sampled schema inference
+            presence = re.search(r"present in (\d+(?:\.\d+)?)% of documents", type_part)
+            if presence:
+                fields[field_name]["presence"] = float(presence.group(1)) / 100.0
+                fields[field_name]["nullable"] = fields[field_name]["presence"] < 1.0 or "null" in type_part
     
     return fields
 
@@ -272,25 +265,30 @@ async def introspect_qdrant(source_id: str, uri: str, version: str = "1.0.0"):
     upsert_data_source(source_id, uri, "qdrant", version)
     
     try:
-        # Use the existing introspection mechanism
-        documents = await get_schema_metadata(uri, "qdrant")
+        from agent.config.settings import Settings
+        from agent.db.qdrant_client_manager import get_async_qdrant_client
+        from agent.db.qdrant_schema import get_qdrant_schema_inferrer
+        
+        client = get_async_qdrant_client(uri, Settings().QDRANT_API_KEY)
+        
+        # Sample every collection concurrently; unchanged collections come from the cache
+        schemas = await get_qdrant_schema_inferrer().infer_all(client, source=uri)
         
         # Process each collection as a "table" in the registry
-        for doc in documents:
-            doc_id = doc.get("id", "")
-            if doc_id.startswith("collection:"):
-                collection_name = doc_id.split(":", 1)[1]
-                content = doc.get("content", "")
-                
-                # Process the content to create a schema dictionary
-                schema_dict = {
-                    "raw_content": content,
-                    "fields": parse_qdrant_schema_content(content)
-                }
-                
-                # Store in registry as a table
-                upsert_table_meta(source_id, collection_name, schema_dict, version)
-                logger.info(f"  - Added collection: {collection_name}")
+        for collection_name, schema in schemas.items():
+            if isinstance(schema, Exception):
+                continue
+            
+            schema_dict = {
+                "raw_content": schema.to_content(),
+                "fields": schema.to_fields(),
+                "points_count": schema.points_count,
+                "sampled_points": schema.sampled
+            }
+            
+            # Store in registry as a table
+            upsert_table_meta(source_id, collection_name, schema_dict, version)
+            logger.info(f"  - Added collection: {collection_name}")
     
     except Exception as e:
         logger.error(f"Error introspecting Qdrant {source_id}: {str(e)}")
@@ -368,13 +366,20 @@ def parse_qdrant_schema_content(content: str) -> Dict[str, Dict[str, Any]]:
                 indexed = False
                 
                 if "indexed" in field_info:
-                    data_type = field_info.split("(", 1)[0].strip()
                     indexed = "indexed: true" in field_info.lower()
+                if "(" in field_info or ";" in field_info:
+                    data_type = re.split(r"[(;]", field_info, 1)[0].strip()
                 
                 fields[field_name] = {
                     "data_type": data_type,
                     "indexed": indexed
                 }
+                
+                # Presence frequency from sampled schema inference
+                presence = re.search(r"present in (\d+(?:\.\d+)?)% of points", field_info)
+                if presence:
+                    fields[field_name]["presence"] = float(presence.group(1)) / 100.0
+                    fields[field_name]["nullable"] = fields[field_name]["presence"] < 1.0 or "null" in field_info
     
     # Add vector information if available
     if vectors_info:
@@ -50,6 +50,9 @@ class SchemaWatcher:
         # Store Qdrant collection fingerprints separately
         self.qdrant_cache: Dict[str, Dict[str, Any]] = {}
         
+        # Open MongoDB change stream watchers by source ID
+        self.mongodb_watchers: Dict[str, Any] = {}
+        
     async def calculate_schema_fingerprints(self) -> Dict[str, Dict[str, str]]:
         """
         Calculate fingerprints for all schemas in the registry
@@ -229,7 +232,8 @@ class SchemaWatcher:
             client = QdrantClient(
                 url=uri, 
                 api_key=settings.QDRANT_API_KEY,
-                prefer_grpc=settings.QDRANT_PREFER_GRPC
+                prefer_grpc=settings.QDRANT_PREFER_GRPC,
+                grpc_port=settings.QDRANT_GRPC_PORT
             )
             
             # Get collections
@@ -359,56 +363,48 @@ class SchemaWatcher:
             source_id: The data source ID
             conn_uri: MongoDB connection URI
         """
-        from motor.motor_asyncio import AsyncIOMotorClient
+        from agent.db.mongo_client_manager import get_mongo_client
+        from agent.db.mongo_change_streams import ChangeStreamWatcher
         
         try:
-            # Connect to MongoDB
-            client = AsyncIOMotorClient(conn_uri)
+            # Use the shared client for this URI
+            client = get_mongo_client(conn_uri)
             db = client.get_database()
             
-            # Get existing collections
-            collections = await db.list_collection_names()
-            
-            # Set up change stream on admin database to detect collection changes
+            # Watch the database for collection changes
             # Note: This requires MongoDB replica set
-            try:
-                change_stream = db.watch(
-                    pipeline=[
-                        {
-                            '$match': {
-                                'operationType': {
-                                    '$in': ['create', 'drop', 'rename', 'modify']
-                                }
+            watcher = ChangeStreamWatcher(
+                db,
+                on_change=lambda change: self._handle_mongodb_change(change, source_id),
+                pipeline=[
+                    {
+                        '$match': {
+                            'operationType': {
+                                '$in': ['create', 'drop', 'rename', 'modify']
                             }
                         }
-                    ]
-                )
-                
-                # Create task to listen for changes
-                asyncio.create_task(self._handle_mongodb_changes(change_stream, source_id))
+                    }
+                ],
+                description=f"MongoDB source {source_id}"
+            )
+            if await watcher.start():
+                self.mongodb_watchers[source_id] = watcher
                 logger.info(f"Set up MongoDB change stream for {source_id}")
                 return client
-                
-            except Exception as e:
-                logger.warning(f"Could not set up MongoDB change stream for {source_id}: {str(e)}")
-                logger.info(f"Will fall back to periodic fingerprint checking for {source_id}")
-                return None
+            
+            logger.info(f"Will fall back to periodic fingerprint checking for {source_id}")
+            return None
             
         except Exception as e:
             logger.error(f"Error setting up MongoDB watcher for {source_id}: {str(e)}")
             logger.info(f"Will fall back to periodic fingerprint checking for {source_id}")
             return None
     
-    async def _handle_mongodb_changes(self, change_stream, source_id):
-        """Handle MongoDB change stream events"""
-        try:
-            async for change in change_stream:
-                logger.info(f"MongoDB schema change detected in {source_id}: {change}")
-                # Update registry for this source
-                await self.update_registry(changed_sources=[source_id])
-        except Exception as e:
-            logger.error(f"Error in MongoDB change stream for {source_id}: {str(e)}")
-            logger.info("Will fall back to periodic fingerprint checking")
+    async def _handle_mongodb_change(self, change, source_id):
+        """Handle one MongoDB change stream event"""
+        logger.info(f"MongoDB schema change detected in {source_id}: {change}")
+        # Update registry for this source
+        await self.update_registry(changed_sources=[source_id])
     
     async def setup_qdrant_watcher(self, source_id: str, uri: str):
         """
@@ -431,7 +427,8 @@ class SchemaWatcher:
             client = QdrantClient(
                 url=uri, 
                 api_key=settings.QDRANT_API_KEY,
-                prefer_grpc=settings.QDRANT_PREFER_GRPC
+                prefer_grpc=settings.QDRANT_PREFER_GRPC,
+                grpc_port=settings.QDRANT_GRPC_PORT
             )
             
             # Test connection and get collections
@@ -532,8 +529,8 @@ class SchemaWatcher:
             for conn in postgres_connections.values():
                 await conn.close()
             
-            for client in mongodb_connections.values():
-                client.close()
+            # MongoDB clients are shared and closed by the client manager on shutdown
+            mongodb_connections.clear()
             
             # Qdrant clients don't have async close method
             qdrant_clients.clear()
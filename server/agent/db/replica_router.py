@@ -0,0 +1,330 @@
+"""
+PostgreSQL read-replica routing
+
+Generated SQL is read-only, so it can be served by streaming replicas
+instead of the primary. A ``ReplicaRouter`` belongs to one primary DSN and
+its replica DSNs; read-only statements go to the healthy replica with the
+fewest outstanding queries, everything else (and everything when no replica
+is usable) goes to the primary. Replica health is the replication lag
+reported by the replica itself, re-checked on an interval.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import asyncpg
+
+from ..config.settings import Settings
+from .pool_manager import get_pool_manager, redact_dsn
+from .statement_cache import normalize_sql
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_READ_ONLY_START_RE = re.compile(r"^\(*\s*(select|with|table|values|explain)\b", re.IGNORECASE)
+_WRITE_RE = re.compile(
+    r"\b(insert|update|delete|merge|upsert|create|alter|drop|truncate|grant|revoke|copy|"
+    r"vacuum|analyze|cluster|reindex|refresh|lock|call|do|nextval|setval|pg_advisory_\w*)\b"
+    r"|\binto\b|\bfor\s+(update|share|no\s+key\s+update|key\s+share)\b",
+    re.IGNORECASE
+)
+
+REPLICA_LAG_QUERY = """
+SELECT pg_is_in_recovery() AS in_recovery,
+       CASE
+           WHEN NOT pg_is_in_recovery() THEN 0
+           WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+           ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+       END AS lag_seconds
+"""
+
+# Errors that mean the replica itself is unusable (as opposed to a bad query)
+REPLICA_CONNECTION_ERRORS = (
+    OSError,
+    asyncio.TimeoutError,
+    asyncpg.exceptions.PostgresConnectionError,
+    asyncpg.exceptions.CannotConnectNowError,
+    asyncpg.exceptions.InterfaceError,
+)
+
+
+def is_read_only(query: str) -> bool:
+    """
+    Decide whether a statement can safely run on a replica
+
+    Only SELECT-style statements without data-modifying keywords qualify.
+    Keyword matches inside string literals make the check conservative
+    (the query goes to the primary), never unsafe.
+
+    Args:
+        query: SQL query string
+
+    Returns:
+        True if the statement is read-only
+    """
+    normalized = normalize_sql(query)
+    return bool(_READ_ONLY_START_RE.match(normalized)) and not _WRITE_RE.search(normalized) and ";" not in normalized
+
+
+@dataclass
+class ReplicaState:
+    """Routing and health bookkeeping for one replica"""
+    dsn: str
+    outstanding: int = 0
+    healthy: bool = False
+    lag_seconds: Optional[float] = None
+    last_checked: Optional[float] = None
+    last_error: Optional[str] = None
+    queries_routed: int = 0
+
+
+class ReplicaRouter:
+    """
+    Routes connections for one PostgreSQL source between primary and replicas.
+
+    Connections come from the shared pool manager, so each replica gets its
+    own long-lived pool like any other DSN.
+    """
+
+    def __init__(
+        self,
+        primary_dsn: str,
+        replica_dsns: Optional[List[str]] = None,
+        max_lag_seconds: Optional[float] = None,
+        health_check_interval: Optional[float] = None,
+        health_check_timeout: float = 5.0
+    ):
+        """
+        Initialize the router
+
+        Args:
+            primary_dsn: DSN of the primary
+            replica_dsns: DSNs of the read replicas
+            max_lag_seconds: Replicas lagging more than this are skipped (default from settings)
+            health_check_interval: Seconds between lag checks (default from settings)
+            health_check_timeout: Seconds before a lag check counts as failed
+        """
+        settings = Settings()
+        self.primary_dsn = primary_dsn
+        self.replicas = [ReplicaState(dsn=dsn) for dsn in dict.fromkeys(replica_dsns or []) if dsn != primary_dsn]
+        self.max_lag_seconds = (
+            max_lag_seconds if max_lag_seconds is not None else settings.DB_REPLICA_MAX_LAG_SECONDS
+        )
+        self.health_check_interval = (
+            health_check_interval if health_check_interval is not None else settings.DB_REPLICA_HEALTH_CHECK_INTERVAL
+        )
+        self.health_check_timeout = health_check_timeout
+        self.primary_queries = 0
+        self.fallbacks = 0
+        self._last_health_check: Optional[float] = None
+        self._health_lock: Optional[asyncio.Lock] = None
+        self._health_lock_loop = None
+
+    @property
+    def has_replicas(self) -> bool:
+        """Whether any replicas are configured"""
+        return bool(self.replicas)
+
+    def _lock(self) -> asyncio.Lock:
+        """Get the health-check lock for the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._health_lock is None or self._health_lock_loop is not loop:
+            self._health_lock = asyncio.Lock()
+            self._health_lock_loop = loop
+        return self._health_lock
+
+    async def _check_replica(self, replica: ReplicaState) -> None:
+        """Measure one replica's lag and update its health"""
+        try:
+            async def measure():
+                async with get_pool_manager().acquire(replica.dsn) as conn:
+                    return await conn.fetchrow(REPLICA_LAG_QUERY)
+
+            row = await asyncio.wait_for(measure(), timeout=self.health_check_timeout)
+            replica.lag_seconds = float(row["lag_seconds"] or 0)
+            replica.healthy = replica.lag_seconds <= self.max_lag_seconds
+            replica.last_error = None if replica.healthy else (
+                f"Replication lag {replica.lag_seconds:.1f}s exceeds {self.max_lag_seconds:.1f}s"
+            )
+        except Exception as e:
+            replica.healthy = False
+            replica.last_error = str(e) or type(e).__name__
+        replica.last_checked = time.monotonic()
+
+        if not replica.healthy:
+            logger.warning(f"Replica {redact_dsn(replica.dsn)} unavailable for reads: {replica.last_error}")
+
+    async def check_health(self, force: bool = False) -> None:
+        """
+        Refresh replica health if the last check is older than the interval
+
+        Args:
+            force: Check now regardless of the interval
+        """
+        if not self.replicas:
+            return
+
+        def due() -> bool:
+            return (force or self._last_health_check is None
+                    or time.monotonic() - self._last_health_check >= self.health_check_interval)
+
+        if not due():
+            return
+        async with self._lock():
+            if not due():
+                return
+            await asyncio.gather(*(self._check_replica(replica) for replica in self.replicas))
+            self._last_health_check = time.monotonic()
+
+    def _choose_replica(self) -> Optional[ReplicaState]:
+        """Pick the healthy replica with the fewest outstanding queries"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return min(healthy, key=lambda replica: replica.outstanding)
+
+    def _mark_unhealthy(self, replica: ReplicaState, error: BaseException) -> None:
+        """Take a replica out of rotation until the next health check"""
+        replica.healthy = False
+        replica.last_error = str(error) or type(error).__name__
+        self.fallbacks += 1
+        logger.warning(f"Replica {redact_dsn(replica.dsn)} failed, falling back to primary: {replica.last_error}")
+
+    @asynccontextmanager
+    async def acquire(self, read_only: bool = False) -> AsyncIterator[asyncpg.Connection]:
+        """
+        Acquire a connection for a statement
+
+        Args:
+            read_only: Whether the statement may run on a replica
+
+        Yields:
+            Pooled connection to a replica or to the primary
+        """
+        pool_manager = get_pool_manager()
+        async with AsyncExitStack() as stack:
+            conn = None
+            if read_only and self.replicas:
+                await self.check_health()
+                replica = self._choose_replica()
+                if replica is not None:
+                    replica.outstanding += 1
+                    stack.callback(self._release_replica, replica)
+                    try:
+                        conn = await stack.enter_async_context(pool_manager.acquire(replica.dsn))
+                        replica.queries_routed += 1
+                    except REPLICA_CONNECTION_ERRORS as e:
+                        self._mark_unhealthy(replica, e)
+                elif self.replicas:
+                    self.fallbacks += 1
+
+            if conn is None:
+                conn = await stack.enter_async_context(pool_manager.acquire(self.primary_dsn))
+                self.primary_queries += 1
+
+            yield conn
+
+    @staticmethod
+    def _release_replica(replica: ReplicaState) -> None:
+        replica.outstanding -= 1
+
+    async def get_read_pool(self) -> asyncpg.Pool:
+        """
+        Get a pool suitable for read-only work such as introspection
+
+        Returns:
+            Pool of the least busy healthy replica, or of the primary
+        """
+        if self.replicas:
+            await self.check_health()
+            replica = self._choose_replica()
+            if replica is not None:
+                try:
+                    return await get_pool_manager().get_pool(replica.dsn)
+                except REPLICA_CONNECTION_ERRORS as e:
+                    self._mark_unhealthy(replica, e)
+        return await get_pool_manager().get_pool(self.primary_dsn)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get routing and health statistics
+
+        Returns:
+            Dictionary with primary query count, fallbacks and per-replica state
+        """
+        now = time.monotonic()
+        return {
+            "primary": redact_dsn(self.primary_dsn),
+            "primary_queries": self.primary_queries,
+            "fallbacks": self.fallbacks,
+            "max_lag_seconds": self.max_lag_seconds,
+            "replicas": [
+                {
+                    "dsn": redact_dsn(replica.dsn),
+                    "healthy": replica.healthy,
+                    "lag_seconds": replica.lag_seconds,
+                    "outstanding": replica.outstanding,
+                    "queries_routed": replica.queries_routed,
+                    "last_error": replica.last_error,
+                    "seconds_since_check": (now - replica.last_checked) if replica.last_checked else None,
+                }
+                for replica in self.replicas
+            ],
+        }
+
+
+def default_replica_dsns(primary_dsn: str) -> List[str]:
+    """
+    Get the configured replicas for a primary DSN
+
+    Replicas in the ``postgres`` config section belong to that section's
+    primary (its ``uri`` or the DSN built from host/port/database).
+
+    Args:
+        primary_dsn: DSN of the primary
+
+    Returns:
+        List of replica DSNs (empty for other sources)
+    """
+    settings = Settings()
+    if primary_dsn in (settings.POSTGRES_URI, settings.db_dsn):
+        return list(settings.DB_REPLICA_URIS or [])
+    return []
+
+
+# Global registry, one router per primary so health and load are shared
+_routers: Dict[str, ReplicaRouter] = {}
+
+def get_replica_router(primary_dsn: str, replica_dsns: Optional[List[str]] = None) -> ReplicaRouter:
+    """
+    Get the shared router for a primary DSN
+
+    Args:
+        primary_dsn: DSN of the primary
+        replica_dsns: Replica DSNs (defaults to the configured replicas for this primary)
+
+    Returns:
+        ReplicaRouter
+    """
+    if replica_dsns is None:
+        replica_dsns = default_replica_dsns(primary_dsn)
+    router = _routers.get(primary_dsn)
+    if router is None or [replica.dsn for replica in router.replicas] != [
+        dsn for dsn in dict.fromkeys(replica_dsns) if dsn != primary_dsn
+    ]:
+        router = ReplicaRouter(primary_dsn, replica_dsns)
+        _routers[primary_dsn] = router
+    return router
+
+def get_replica_stats() -> Dict[str, Dict[str, Any]]:
+    """Get routing statistics for every source that has replicas"""
+    return {
+        redact_dsn(dsn): router.get_stats()
+        for dsn, router in _routers.items()
+        if router.has_replicas
+    }
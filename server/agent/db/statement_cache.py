@@ -0,0 +1,291 @@
+"""
+Prepared statement cache for PostgreSQL
+
+Keeps asyncpg prepared statements per connection, keyed by normalized SQL
+text, so that repeated queries (e.g. dashboard refreshes that only differ in
+bind parameters or formatting) skip the parse and plan steps. Also converts
+planner-supplied parameters (usually JSON strings and numbers) to the Python
+types asyncpg expects for each placeholder.
+"""
+
+import json
+import logging
+import re
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import asyncpg
+
+from ..config.settings import Settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Literals and quoted identifiers are kept verbatim, comments are dropped and
+# whitespace runs collapse to a single space
+_SQL_TOKEN_RE = re.compile(
+    r"(?P<literal>'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|(\$[A-Za-z_]*\$).*?\2)"
+    r"|(?P<gap>(?:\s+|--[^\n]*|/\*.*?\*/)+)",
+    re.DOTALL
+)
+
+
+def normalize_sql(query: str) -> str:
+    """
+    Normalize SQL text for use as a cache key
+
+    Collapses whitespace and strips comments and trailing semicolons outside
+    of string literals and quoted identifiers, so formatting differences do
+    not produce separate prepared statements.
+
+    Args:
+        query: SQL query string
+
+    Returns:
+        Normalized SQL text
+    """
+    def replace(match: "re.Match") -> str:
+        if match.group("literal"):
+            return match.group("literal")
+        return " "
+
+    return _SQL_TOKEN_RE.sub(replace, query).strip().rstrip(";").strip()
+
+
+def _parse_bool(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in ("true", "t", "yes", "y", "1", "on"):
+        return True
+    if lowered in ("false", "f", "no", "n", "0", "off"):
+        return False
+    raise ValueError(f"Invalid boolean value: {value!r}")
+
+
+def _parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+# Converters from string values to the Python type asyncpg encodes for each
+# PostgreSQL type name
+_STRING_CONVERTERS = {
+    "int2": int,
+    "int4": int,
+    "int8": int,
+    "float4": float,
+    "float8": float,
+    "numeric": Decimal,
+    "bool": _parse_bool,
+    "date": date.fromisoformat,
+    "time": time.fromisoformat,
+    "timestamp": lambda v: _parse_datetime(v).replace(tzinfo=None),
+    "timestamptz": _parse_datetime,
+    "uuid": uuid.UUID,
+}
+
+
+def coerce_params(statement: asyncpg.prepared_stmt.PreparedStatement, params: Optional[Sequence[Any]]) -> List[Any]:
+    """
+    Convert bind parameters to the types expected by a prepared statement
+
+    Plans produced by the LLM carry parameters as JSON values, so dates,
+    timestamps, UUIDs and numerics arrive as strings. Values that already
+    have a suitable type are passed through unchanged.
+
+    Args:
+        statement: Prepared statement the parameters are bound to
+        params: Parameter values in placeholder order ($1, $2, ...)
+
+    Returns:
+        List of converted parameter values
+
+    Raises:
+        ValueError: If the number of parameters does not match the placeholders
+    """
+    params = list(params or [])
+    param_types = statement.get_parameters()
+    if len(params) != len(param_types):
+        raise ValueError(
+            f"Query expects {len(param_types)} parameter(s) but {len(params)} were given"
+        )
+
+    coerced = []
+    for value, param_type in zip(params, param_types):
+        type_name = param_type.name
+        if isinstance(value, str) and type_name in _STRING_CONVERTERS:
+            try:
+                value = _STRING_CONVERTERS[type_name](value)
+            except (ValueError, ArithmeticError) as e:
+                raise ValueError(f"Cannot convert parameter {value!r} to {type_name}: {e}")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and type_name == "numeric":
+            value = Decimal(str(value))
+        elif isinstance(value, float) and value.is_integer() and type_name in ("int2", "int4", "int8"):
+            value = int(value)
+        elif isinstance(value, (dict, list)) and type_name in ("json", "jsonb"):
+            value = json.dumps(value)
+        coerced.append(value)
+    return coerced
+
+
+class PreparedStatementCache:
+    """
+    Per-connection LRU cache of asyncpg prepared statements.
+
+    Prepared statements are bound to the physical connection that created
+    them, so the cache holds one LRU map per connection. Maps belonging to
+    connections the pool has since closed are pruned whenever a new
+    connection is seen.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_size: Maximum statements kept per connection (default from settings)
+        """
+        self.max_size = max_size if max_size is not None else Settings().DB_STATEMENT_CACHE_SIZE
+        self._statements: Dict[Any, OrderedDict] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _physical_connection(conn: Any) -> Any:
+        """Unwrap a pool proxy to the connection that owns the statements"""
+        # PoolConnectionProxy is recreated on every acquire; the wrapped
+        # connection is what the prepared statements belong to
+        return getattr(conn, "_con", None) or conn
+
+    async def prepare(self, conn: Any, query: str) -> asyncpg.prepared_stmt.PreparedStatement:
+        """
+        Get a prepared statement for a query, preparing it on a cache miss
+
+        Args:
+            conn: Pooled asyncpg connection
+            query: SQL query string
+
+        Returns:
+            Prepared statement bound to the connection
+        """
+        if self.max_size <= 0:
+            self.misses += 1
+            return await conn.prepare(query)
+
+        key = normalize_sql(query)
+        physical = self._physical_connection(conn)
+        statements = self._statements.get(physical)
+        if statements is None:
+            self._prune_closed()
+            statements = OrderedDict()
+            self._statements[physical] = statements
+
+        statement = statements.get(key)
+        if statement is not None:
+            statements.move_to_end(key)
+            self.hits += 1
+            return statement
+
+        self.misses += 1
+        statement = await conn.prepare(query)
+        statements[key] = statement
+        if len(statements) > self.max_size:
+            statements.popitem(last=False)
+            self.evictions += 1
+        return statement
+
+    def _prune_closed(self) -> None:
+        """Forget statements of connections that have been closed"""
+        closed = [conn for conn in self._statements if getattr(conn, "is_closed", lambda: False)()]
+        for conn in closed:
+            del self._statements[conn]
+
+    def invalidate(self, conn: Any, query: str) -> None:
+        """
+        Drop a cached statement, e.g. after the schema it was planned against changed
+
+        Args:
+            conn: Connection the statement belongs to
+            query: SQL query string
+        """
+        statements = self._statements.get(self._physical_connection(conn))
+        if statements is not None and statements.pop(normalize_sql(query), None) is not None:
+            self.invalidations += 1
+
+    async def fetch(self, conn: Any, query: str, params: Optional[Sequence[Any]] = None) -> List[asyncpg.Record]:
+        """
+        Run a query through the cache and return all records
+
+        Args:
+            conn: Pooled asyncpg connection
+            query: SQL query string
+            params: Bind parameters in placeholder order
+
+        Returns:
+            List of asyncpg records
+        """
+        _, records = await self.fetch_with_statement(conn, query, params)
+        return records
+
+    async def fetch_with_statement(
+        self,
+        conn: Any,
+        query: str,
+        params: Optional[Sequence[Any]] = None
+    ) -> Tuple[asyncpg.prepared_stmt.PreparedStatement, List[asyncpg.Record]]:
+        """
+        Run a query through the cache and return the statement with its records
+
+        A statement invalidated by a schema change is re-prepared once.
+
+        Args:
+            conn: Pooled asyncpg connection
+            query: SQL query string
+            params: Bind parameters in placeholder order
+
+        Returns:
+            Tuple of (prepared statement, list of asyncpg records)
+        """
+        statement = await self.prepare(conn, query)
+        try:
+            return statement, await statement.fetch(*coerce_params(statement, params))
+        except (asyncpg.exceptions.InvalidCachedStatementError,
+                asyncpg.exceptions.OutdatedSchemaCacheError) as e:
+            logger.info(f"Re-preparing statement after schema change: {str(e)}")
+            self.invalidate(conn, query)
+            statement = await self.prepare(conn, query)
+            return statement, await statement.fetch(*coerce_params(statement, params))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache hit/miss counters
+
+        Returns:
+            Dictionary with hits, misses, hit rate, evictions and cached statement counts
+        """
+        self._prune_closed()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "connections": len(self._statements),
+            "statements": sum(len(statements) for statements in self._statements.values()),
+            "max_size_per_connection": self.max_size,
+        }
+
+
+# Global instance
+_statement_cache: Optional[PreparedStatementCache] = None
+
+def get_statement_cache() -> PreparedStatementCache:
+    """Get the global prepared statement cache instance"""
+    global _statement_cache
+    if _statement_cache is None:
+        _statement_cache = PreparedStatementCache()
+    return _statement_cache
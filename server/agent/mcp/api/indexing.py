@@ -1,25 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Security
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Security
 from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+import json
 import logging
 import time
 from typing import List, Optional, Dict, Any
+from slack_sdk.signature import SignatureVerifier
 
 from ..db.database import get_db
+from ..config import settings
 from ..db import crud, models
 from ..models.indexing import IndexingStatus, IndexingRequest, SearchQuery, SearchResult
 from ..security import verify_jwt_token, JWTData, decode_jwt_token
 from ..qdrant_client import get_qdrant_client, initialize_collection
+from ..hybrid_search import SEARCH_MODES, search_messages as run_search
+from ..lexical_index import get_lexical_index
 from ..indexer import start_indexing
-from qdrant_client.http.models import VectorParams, Distance, CollectionStatus
+from ..indexer.processor import enqueue_slack_event
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Query embedding models, loaded once per model name
+_query_models: Dict[str, Any] = {}
+
+def get_query_model(model_name: str):
+    """Get the sentence transformer used to embed search queries"""
+    if model_name not in _query_models:
+        from sentence_transformers import SentenceTransformer
+        _query_models[model_name] = SentenceTransformer(model_name)
+    return _query_models[model_name]
+
 # Define API dependencies
 security = HTTPBearer(auto_error=False)
 
@@ -164,28 +179,8 @@ async def run_indexing(
         if status.collection_name not in collection_names:
             logger.info(f"Collection {status.collection_name} does not exist, creating it now")
             try:
-                # Define vector size for the embedding model
-                vector_size = 384  # Default for all-MiniLM-L6-v2
-                
-                # Create the collection
-                qdrant_client.create_collection(
-                    collection_name=status.collection_name,
-                    vectors_config=VectorParams(
-                        size=vector_size,
-                        distance=Distance.COSINE
-                    )
-                )
-                
-                # Wait for collection to be available
-                for i in range(5):
-                    try:
-                        collection_info = qdrant_client.get_collection(status.collection_name)
-                        if collection_info.status == CollectionStatus.GREEN:
-                            logger.info(f"Collection {status.collection_name} created successfully")
-                            break
-                    except Exception as inner_e:
-                        logger.warning(f"Waiting for collection to be ready: {str(inner_e)}")
-                    time.sleep(1)
+                # Create the collection with the configured storage profile
+                initialize_collection(qdrant_client, status.collection_name)
             except Exception as create_e:
                 logger.error(f"Failed to create collection: {str(create_e)}")
                 raise HTTPException(status_code=500, detail=f"Failed to create vector collection: {str(create_e)}")
@@ -222,6 +217,42 @@ async def run_indexing(
         "message": "Indexing started in the background"
     })
 
+@router.post("/events")
+async def slack_events(request: Request):
+    """
+    Slack Events API request URL
+    
+    Message events (new messages, thread replies, edits and deletes) are
+    queued and applied to the workspace's collection in batches, so the
+    index stays current between history sweeps. Slack expects an answer
+    within three seconds, so nothing is indexed before responding.
+    
+    Every request must carry a valid Slack signature; without a configured
+    SLACK_SIGNING_SECRET the endpoint is disabled.
+    """
+    if not settings.SLACK_SIGNING_SECRET:
+        raise HTTPException(status_code=503, detail="Slack events are disabled: SLACK_SIGNING_SECRET is not configured")
+    
+    body = await request.body()
+    verifier = SignatureVerifier(settings.SLACK_SIGNING_SECRET)
+    if not verifier.is_valid_request(body, dict(request.headers)):
+        raise HTTPException(status_code=401, detail="Invalid Slack signature")
+    
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+    
+    # Slack checks the URL once when it is configured
+    if payload.get("type") == "url_verification":
+        return {"challenge": payload.get("challenge")}
+    
+    if payload.get("type") == "event_callback":
+        if not await enqueue_slack_event(payload):
+            logger.info(f"Ignoring Slack event for team {payload.get('team_id')} without a message index")
+    
+    return {"ok": True}
+
 @router.post("/search", response_model=SearchResult)
 async def search_messages(
     query: SearchQuery,
@@ -229,7 +260,15 @@ async def search_messages(
     db: Session = Depends(get_db)
 ):
     """
-    Search for messages using vector similarity
+    Search for messages by meaning, by their words, or both
+    
+    Vector mode (the default) ranks by cosine similarity. Hybrid mode runs
+    a vector search and a BM25 search over the message text at the same
+    time and merges them with reciprocal-rank fusion, so exact terms such
+    as ticket IDs and error codes are found too. Each message's ``score``
+    stays the cosine similarity in every mode; hybrid results are ordered
+    by ``fused_score``. The time spent in each leg is returned in
+    ``timings``.
     
     This endpoint accepts either:
     1. JWT token in Authorization header (preferred)
@@ -269,66 +308,39 @@ async def search_messages(
     if not status:
         raise HTTPException(status_code=404, detail="No index found for this workspace")
     
-    # Check if collection exists
+    mode = query.mode or settings.SEARCH_MODE
+    if mode not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown search mode {mode}, expected one of {', '.join(SEARCH_MODES)}")
+    
     try:
         qdrant_client = get_qdrant_client()
-        
-        # Build filter based on query parameters
-        search_filter = {}
-        
-        if query.channels:
-            search_filter["channel_id"] = {"$in": query.channels}
-        
-        if query.users:
-            search_filter["user_id"] = {"$in": query.users}
-        
-        # Add date filters if provided
-        if query.date_from or query.date_to:
-            timestamp_filter = {}
-            
-            if query.date_from:
-                timestamp_filter["$gte"] = query.date_from.timestamp()
-            
-            if query.date_to:
-                timestamp_filter["$lte"] = query.date_to.timestamp()
-            
-            if timestamp_filter:
-                search_filter["ts"] = timestamp_filter
-        
-        # Perform the search
         start_time = time.time()
-        from sentence_transformers import SentenceTransformer
-        
-        # Get embedding for query
-        model = SentenceTransformer(status.embedding_model)
-        query_embedding = model.encode(query.query).tolist()
         
-        # Search in Qdrant
-        search_results = qdrant_client.search(
-            collection_name=status.collection_name,
-            query_vector=query_embedding,
+        # The query is embedded in the vector leg, so lexical searches never load the model
+        messages, timings = await run_search(
+            qdrant_client,
+            get_lexical_index(),
+            status.collection_name,
+            query.query,
+            encode=lambda text: get_query_model(status.embedding_model).encode(text).tolist(),
             limit=query.limit,
-            query_filter=search_filter if search_filter else None
+            mode=mode,
+            channels=query.channels,
+            users=query.users,
+            ts_from=query.date_from.timestamp() if query.date_from else None,
+            ts_to=query.date_to.timestamp() if query.date_to else None
         )
         
-        # Process results
-        messages = []
-        for result in search_results:
-            # Get the payload
-            message_data = result.payload
-            
-            # Add score from search result
-            message_data["score"] = result.score
-            
-            messages.append(message_data)
-        
         # Calculate query time
         query_time_ms = (time.time() - start_time) * 1000
+        logger.info(f"{mode} search returned {len(messages)} messages in {query_time_ms:.1f} ms: {timings}")
         
         return SearchResult(
             messages=messages,
             total=len(messages),
-            query_time_ms=query_time_ms
+            query_time_ms=query_time_ms,
+            mode=mode,
+            timings={step: round(ms, 2) for step, ms in timings.items()}
         )
         
     except Exception as e:
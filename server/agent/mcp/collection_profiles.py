@@ -0,0 +1,272 @@
+"""
+Storage profiles for Qdrant collections
+
+A profile describes how a collection stores its vectors and payloads. It
+covers quantization (none, scalar int8 or product), whether the original
+vectors and payloads live on disk instead of in RAM, and the HNSW graph
+parameters. Quantized vectors are small enough to stay in RAM while the
+float32 originals move to disk. Searches then rescore their candidates
+against the originals, so recall stays close to unquantized search.
+
+Profiles are applied when a collection is created (``initialize_collection``)
+and can be applied to existing collections with ``migrate_collection``
+(see ``migrate_collections.py``).
+"""
+
+import logging
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qdrant_models
+
+from .config import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+QUANTIZATION_TYPES = ("none", "scalar", "product")
+
+# Whether each collection is quantized, re-read after QUANTIZATION_CACHE_TTL seconds
+QUANTIZATION_CACHE_TTL = 300
+_quantized_collections: Dict[str, Tuple[float, bool]] = {}
+
+
+@dataclass(frozen=True)
+class CollectionProfile:
+    """Storage settings for a Qdrant collection"""
+    name: str
+    quantization: str = "none"  # "none", "scalar" or "product"
+    product_compression: str = "x16"  # Compression ratio for product quantization
+    quantized_always_ram: bool = True  # Keep quantized vectors in RAM when originals are on disk
+    on_disk_vectors: bool = False
+    on_disk_payload: bool = False
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    oversampling: float = 2.0  # Candidates fetched per result before rescoring
+
+    def __post_init__(self):
+        if self.quantization not in QUANTIZATION_TYPES:
+            raise ValueError(f"Unknown quantization '{self.quantization}', expected one of {', '.join(QUANTIZATION_TYPES)}")
+
+    @property
+    def quantized(self) -> bool:
+        return self.quantization != "none"
+
+    def vector_params(self, size: int, distance: qdrant_models.Distance = qdrant_models.Distance.COSINE) -> qdrant_models.VectorParams:
+        """Vector parameters for create_collection"""
+        return qdrant_models.VectorParams(size=size, distance=distance, on_disk=self.on_disk_vectors)
+
+    def hnsw_config(self) -> qdrant_models.HnswConfigDiff:
+        """HNSW parameters for create_collection and update_collection"""
+        return qdrant_models.HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+
+    def quantization_config(self) -> Optional[Any]:
+        """Quantization for create_collection (None when disabled)"""
+        if self.quantization == "scalar":
+            return qdrant_models.ScalarQuantization(
+                scalar=qdrant_models.ScalarQuantizationConfig(
+                    type=qdrant_models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=self.quantized_always_ram
+                )
+            )
+        if self.quantization == "product":
+            return qdrant_models.ProductQuantization(
+                product=qdrant_models.ProductQuantizationConfig(
+                    compression=qdrant_models.CompressionRatio(self.product_compression),
+                    always_ram=self.quantized_always_ram
+                )
+            )
+        return None
+
+    def create_kwargs(self, size: int, distance: qdrant_models.Distance = qdrant_models.Distance.COSINE) -> Dict[str, Any]:
+        """Keyword arguments for QdrantClient.create_collection"""
+        return {
+            "vectors_config": self.vector_params(size, distance),
+            "hnsw_config": self.hnsw_config(),
+            "quantization_config": self.quantization_config(),
+            "on_disk_payload": self.on_disk_payload,
+        }
+
+    def search_params(self) -> Optional[qdrant_models.SearchParams]:
+        """Search parameters that rescore quantized candidates (None when not quantized)"""
+        if not self.quantized:
+            return None
+        return rescoring_params(self.oversampling)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# Built-in profiles, selected with MCP_QDRANT_COLLECTION_PROFILE
+PROFILES: Dict[str, CollectionProfile] = {
+    # Full float32 vectors and payloads in RAM (the previous behaviour)
+    "default": CollectionProfile(name="default"),
+    # int8 vectors in RAM (4x smaller), originals and payloads on disk
+    "balanced": CollectionProfile(
+        name="balanced", quantization="scalar", on_disk_vectors=True, on_disk_payload=True
+    ),
+    # Product-quantized vectors in RAM (16x smaller) and a sparser graph
+    "low_memory": CollectionProfile(
+        name="low_memory", quantization="product", on_disk_vectors=True, on_disk_payload=True,
+        hnsw_m=8, hnsw_ef_construct=64, oversampling=3.0
+    ),
+}
+
+
+def rescoring_params(oversampling: Optional[float] = None) -> qdrant_models.SearchParams:
+    """
+    Search parameters that search quantized vectors, then rescore with the originals
+
+    Args:
+        oversampling: Candidates fetched per requested result (default from settings)
+
+    Returns:
+        SearchParams for query_points / search
+    """
+    return qdrant_models.SearchParams(
+        quantization=qdrant_models.QuantizationSearchParams(
+            ignore=False,
+            rescore=True,
+            oversampling=oversampling if oversampling is not None else settings.QDRANT_RESCORE_OVERSAMPLING
+        )
+    )
+
+
+def get_collection_profile(name: Optional[str] = None) -> CollectionProfile:
+    """
+    Get a collection profile with the setting overrides applied
+
+    Args:
+        name: Profile name (default: MCP_QDRANT_COLLECTION_PROFILE)
+
+    Returns:
+        CollectionProfile
+    """
+    name = name or settings.QDRANT_COLLECTION_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown collection profile '{name}', expected one of {', '.join(PROFILES)}")
+
+    overrides = {
+        "quantization": settings.QDRANT_QUANTIZATION,
+        "on_disk_vectors": settings.QDRANT_ON_DISK_VECTORS,
+        "on_disk_payload": settings.QDRANT_ON_DISK_PAYLOAD,
+        "hnsw_m": settings.QDRANT_HNSW_M,
+        "hnsw_ef_construct": settings.QDRANT_HNSW_EF_CONSTRUCT,
+    }
+    return replace(PROFILES[name], **{key: value for key, value in overrides.items() if value is not None})
+
+
+def is_quantized(collection_info: Any) -> bool:
+    """
+    Check whether a collection (or any of its named vectors) is quantized
+
+    Args:
+        collection_info: Result of get_collection()
+
+    Returns:
+        True if searches on the collection should rescore
+    """
+    config = getattr(collection_info, "config", None)
+    if getattr(config, "quantization_config", None) is not None:
+        return True
+    vectors = getattr(getattr(config, "params", None), "vectors", None)
+    if isinstance(vectors, dict):
+        return any(getattr(params, "quantization_config", None) is not None for params in vectors.values())
+    return getattr(vectors, "quantization_config", None) is not None
+
+
+def search_params_for(client: QdrantClient, collection_name: str) -> Optional[qdrant_models.SearchParams]:
+    """
+    Search parameters for a collection: rescoring if it is quantized, else None
+
+    Whether the collection is quantized is cached for QUANTIZATION_CACHE_TTL
+    seconds, so searches do not pay for an extra get_collection call.
+
+    Args:
+        client: QdrantClient instance
+        collection_name: Collection to search
+
+    Returns:
+        SearchParams or None
+    """
+    cached = _quantized_collections.get(collection_name)
+    if cached is None or time.monotonic() - cached[0] >= QUANTIZATION_CACHE_TTL:
+        try:
+            cached = (time.monotonic(), is_quantized(client.get_collection(collection_name)))
+        except Exception as e:
+            logger.warning(f"Could not read quantization of {collection_name}: {str(e)}")
+            return None
+        _quantized_collections[collection_name] = cached
+    return rescoring_params() if cached[1] else None
+
+
+def migrate_collection(
+    client: QdrantClient,
+    collection_name: str,
+    profile: CollectionProfile,
+    dry_run: bool = False
+) -> List[str]:
+    """
+    Bring an existing collection in line with a profile
+
+    Only the settings that differ from the profile are updated. Qdrant
+    applies them in place and rebuilds segments in the background, so the
+    collection stays searchable during the migration.
+
+    Args:
+        client: QdrantClient instance
+        collection_name: Collection to migrate
+        profile: Target profile
+        dry_run: Only report the changes
+
+    Returns:
+        Descriptions of the changes (empty if the collection already matches)
+    """
+    config = client.get_collection(collection_name).config
+    changes: List[str] = []
+    update: Dict[str, Any] = {}
+
+    vectors = config.params.vectors
+    names = list(vectors) if isinstance(vectors, dict) else [""]
+    on_disk = {name: bool(getattr(vectors[name] if isinstance(vectors, dict) else vectors, "on_disk", False)) for name in names}
+    if any(value != profile.on_disk_vectors for value in on_disk.values()):
+        update["vectors_config"] = {name: qdrant_models.VectorParamsDiff(on_disk=profile.on_disk_vectors) for name in names}
+        changes.append(f"on_disk vectors: {'yes' if profile.on_disk_vectors else 'no'}")
+
+    if bool(config.params.on_disk_payload) != profile.on_disk_payload:
+        update["collection_params"] = qdrant_models.CollectionParamsDiff(on_disk_payload=profile.on_disk_payload)
+        changes.append(f"on_disk payload: {'yes' if profile.on_disk_payload else 'no'}")
+
+    hnsw = config.hnsw_config
+    if (hnsw.m, hnsw.ef_construct) != (profile.hnsw_m, profile.hnsw_ef_construct):
+        update["hnsw_config"] = profile.hnsw_config()
+        changes.append(f"hnsw: m {hnsw.m} -> {profile.hnsw_m}, ef_construct {hnsw.ef_construct} -> {profile.hnsw_ef_construct}")
+
+    current = _quantization_name(config.quantization_config)
+    if current != profile.quantization:
+        update["quantization_config"] = profile.quantization_config() or qdrant_models.Disabled.DISABLED
+        changes.append(f"quantization: {current} -> {profile.quantization}")
+
+    if not update:
+        logger.info(f"Collection {collection_name} already matches profile {profile.name}")
+        return changes
+
+    if dry_run:
+        logger.info(f"Collection {collection_name} would change: {'; '.join(changes)}")
+    else:
+        client.update_collection(collection_name=collection_name, **update)
+        _quantized_collections.pop(collection_name, None)
+        logger.info(f"Migrated collection {collection_name} to profile {profile.name}: {'; '.join(changes)}")
+    return changes
+
+
+def _quantization_name(quantization_config: Any) -> str:
+    if quantization_config is None:
+        return "none"
+    for name in ("scalar", "product", "binary"):
+        if getattr(quantization_config, name, None) is not None:
+            return name
+    return "unknown"
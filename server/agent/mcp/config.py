@@ -76,11 +76,40 @@ class Settings(BaseSettings):
     QDRANT_PREFER_GRPC: bool = False
     QDRANT_TIMEOUT: float = 5.0  # Timeout in seconds
     
+    # Qdrant collection storage (see collection_profiles.py)
+    QDRANT_COLLECTION_PROFILE: str = "default"  # default, balanced or low_memory
+    QDRANT_QUANTIZATION: Optional[str] = None  # Override the profile: none, scalar or product
+    QDRANT_ON_DISK_VECTORS: Optional[bool] = None  # Override the profile's vector storage
+    QDRANT_ON_DISK_PAYLOAD: Optional[bool] = None  # Override the profile's payload storage
+    QDRANT_HNSW_M: Optional[int] = None  # Override the profile's HNSW edges per node
+    QDRANT_HNSW_EF_CONSTRUCT: Optional[int] = None  # Override the profile's HNSW build-time beam width
+    QDRANT_RESCORE_OVERSAMPLING: float = 2.0  # Candidates per result rescored on quantized collections
+    
     # Indexing settings
     DEFAULT_HISTORY_DAYS: int = 30
     DEFAULT_UPDATE_FREQUENCY: int = 6  # Hours
     DEFAULT_EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"  # Sentence transformers model
     EMBEDDING_BATCH_SIZE: int = 50
+    EMBEDDING_CACHE_SIZE: int = 20000  # Message vectors cached by text hash (0 disables)
+    
+    # Indexing pipeline (see indexer/pipeline.py)
+    INDEXING_FETCH_CONCURRENCY: int = 4  # Channels fetched at once
+    INDEXING_EMBEDDING_WORKERS: int = 1  # Threads encoding embedding batches
+    INDEXING_UPSERT_CONCURRENCY: int = 2  # Concurrent Qdrant upserts
+    INDEXING_QUEUE_SIZE: int = 1000  # Messages buffered between pipeline stages
+    SLACK_RATE_LIMIT_FACTOR: float = 0.9  # Fraction of each Slack rate limit tier to use
+    SLACK_RATE_LIMIT_BURST: int = 3  # Calls per method allowed back to back
+    
+    # Slack Events API ingestion (see indexer/events.py)
+    EVENTS_BATCH_SIZE: int = 100  # Events applied together
+    EVENTS_BATCH_LINGER_SECONDS: float = 1.0  # Wait for more events before applying a partial batch
+    EVENTS_QUEUE_SIZE: int = 10000  # Events buffered per workspace
+    
+    # Message search (see hybrid_search.py)
+    SEARCH_MODE: str = "vector"  # Default mode: vector, hybrid or lexical
+    SEARCH_RRF_K: int = 60  # Reciprocal-rank fusion damping constant
+    SEARCH_CANDIDATES: int = 50  # Results taken from each leg of a hybrid search before fusion
+    LEXICAL_INDEX_PATH: str = "data/lexical_index.db"  # SQLite file of the BM25 message index
     
     @validator("SECRET_KEY", pre=True)
     def validate_secret_key(cls, v):
@@ -397,3 +397,25 @@ def update_indexed_channel(db: Session, index_id: int, channel_id: str,
     })
     db.commit()
     return True
+
+def save_channel_checkpoint(db: Session, index_id: int, channel_id: str,
+                            indexed_messages: int = 0, **checkpoint) -> bool:
+    """
+    Save a channel's backfill checkpoint
+    
+    Args:
+        index_id: ID of the message index
+        channel_id: Slack channel ID
+        indexed_messages: Messages stored since the previous checkpoint
+        **checkpoint: Any of last_indexed_ts, backfill_cursor and oldest_indexed_ts
+    """
+    values = {key: value for key, value in checkpoint.items()
+              if key in ("last_indexed_ts", "backfill_cursor", "oldest_indexed_ts")}
+    values["message_count"] = func.coalesce(models.IndexedChannel.message_count, 0) + indexed_messages
+    values["updated_at"] = datetime.utcnow()
+    db.query(models.IndexedChannel).filter(
+        models.IndexedChannel.index_id == index_id,
+        models.IndexedChannel.channel_id == channel_id
+    ).update(values, synchronize_session=False)
+    db.commit()
+    return True
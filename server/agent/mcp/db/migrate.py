@@ -59,6 +59,11 @@ def run_migration():
         ("scopes", "TEXT")
     ]
     
+    indexed_channel_columns = [
+        ("backfill_cursor", "TEXT"),
+        ("oldest_indexed_ts", "VARCHAR(255)")
+    ]
+    
     # Apply column migrations
     with engine.connect() as conn:
         # User table columns
@@ -93,6 +98,17 @@ def run_migration():
                 logger.info(f"Adding column {col_name} to user_workspaces table")
                 conn.execute(text(sql))
                 conn.commit()
+        
+        # IndexedChannel table columns
+        for col_name, col_type in indexed_channel_columns:
+            if table_exists(engine, "indexed_channels") and not column_exists(engine, "indexed_channels", col_name):
+                sql = f"""
+                ALTER TABLE indexed_channels 
+                ADD COLUMN {col_name} {col_type};
+                """
+                logger.info(f"Adding column {col_name} to indexed_channels table")
+                conn.execute(text(sql))
+                conn.commit()
     
     # Create new tables for message indexing if they don't exist
     with engine.connect() as conn:
@@ -131,6 +147,8 @@ def run_migration():
                 channel_name VARCHAR(255) NOT NULL,
                 last_indexed_ts VARCHAR(255),
                 message_count INTEGER DEFAULT 0,
+                backfill_cursor TEXT,
+                oldest_indexed_ts VARCHAR(255),
                 created_at TIMESTAMP DEFAULT NOW(),
                 updated_at TIMESTAMP DEFAULT NOW(),
                 UNIQUE (index_id, channel_id)
@@ -147,6 +147,9 @@ class IndexedChannel(Base):
     channel_name = Column(String(255), nullable=False)
     last_indexed_ts = Column(String(255), nullable=True)
     message_count = Column(Integer, default=0)
+    # Backfill checkpoint: cursor of the next page to fetch (None once the backfill is done)
+    backfill_cursor = Column(Text, nullable=True)
+    oldest_indexed_ts = Column(String(255), nullable=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     
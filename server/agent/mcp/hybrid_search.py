@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qdrant_models
+
+from .collection_profiles import search_params_for
+from .config import settings
+from .lexical_index import LexicalIndex
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ("hybrid", "vector", "lexical")
+
+
+def message_filter(
+    channels: Optional[List[str]] = None,
+    users: Optional[List[str]] = None,
+    ts_from: Optional[float] = None,
+    ts_to: Optional[float] = None
+) -> Optional[qdrant_models.Filter]:
+    """Qdrant filter for the channel, user and date restrictions of a search"""
+    conditions = []
+    if channels:
+        conditions.append(qdrant_models.FieldCondition(key="channel_id", match=qdrant_models.MatchAny(any=channels)))
+    if users:
+        conditions.append(qdrant_models.FieldCondition(key="user_id", match=qdrant_models.MatchAny(any=users)))
+    if ts_from is not None or ts_to is not None:
+        conditions.append(qdrant_models.FieldCondition(key="ts", range=qdrant_models.Range(gte=ts_from, lte=ts_to)))
+    return qdrant_models.Filter(must=conditions) if conditions else None
+
+
+def reciprocal_rank_fusion(rankings: Dict[str, List[str]], k: Optional[int] = None) -> List[Tuple[str, float, Dict[str, int]]]:
+    """
+    Merge ranked result lists with reciprocal-rank fusion
+
+    Each result scores 1 / (k + rank) in every list it appears in. Only
+    ranks are used, so BM25 and cosine scores never have to be compared.
+
+    Args:
+        rankings: Point IDs per retriever, best first
+        k: Damping constant (default from settings; 60 in the original paper)
+
+    Returns:
+        List of (point ID, fused score, rank per retriever), best first
+    """
+    k = k if k is not None else settings.SEARCH_RRF_K
+    scores: Dict[str, float] = {}
+    ranks: Dict[str, Dict[str, int]] = {}
+    for retriever, point_ids in rankings.items():
+        for rank, point_id in enumerate(point_ids, start=1):
+            scores[point_id] = scores.get(point_id, 0.0) + 1.0 / (k + rank)
+            ranks.setdefault(point_id, {})[retriever] = rank
+    fused = sorted(scores, key=lambda point_id: (-scores[point_id], min(ranks[point_id].values())))
+    return [(point_id, scores[point_id], ranks[point_id]) for point_id in fused]
+
+
+async def search_messages(
+    client: QdrantClient,
+    lexical_index: LexicalIndex,
+    collection_name: str,
+    query: str,
+    encode: Callable[[str], List[float]],
+    limit: int = 20,
+    mode: str = "vector",
+    channels: Optional[List[str]] = None,
+    users: Optional[List[str]] = None,
+    ts_from: Optional[float] = None,
+    ts_to: Optional[float] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+    """
+    Search indexed messages by meaning, by words, or both
+
+    In hybrid mode the vector and lexical searches run at the same time,
+    each returning up to MCP_SEARCH_CANDIDATES results, and are merged with
+    reciprocal-rank fusion. Payloads of messages found only by their words
+    are then read from Qdrant.
+
+    "score" is always the cosine similarity from the vector search, so
+    thresholds on it keep working in every mode. It is None for messages
+    the vector search did not return. Fused and BM25 scores are reported
+    separately.
+
+    Args:
+        client: QdrantClient instance
+        lexical_index: Lexical index holding the collection's message text
+        collection_name: Collection to search
+        query: Search query
+        encode: Blocking function embedding the query (run in a worker thread)
+        limit: Maximum number of results
+        mode: "hybrid", "vector" or "lexical"
+        channels: Only messages from these channel IDs
+        users: Only messages from these user IDs
+        ts_from: Only messages at or after this timestamp
+        ts_to: Only messages at or before this timestamp
+
+    Returns:
+        Tuple of (messages, milliseconds per step). Messages are payloads
+        with a "score"; in lexical and hybrid mode also "lexical_score", and
+        in hybrid mode "fused_score" (the order of the results),
+        "vector_rank" and "lexical_rank".
+    """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode {mode}, expected one of {', '.join(SEARCH_MODES)}")
+
+    candidates = max(limit, settings.SEARCH_CANDIDATES) if mode == "hybrid" else limit
+    timings: Dict[str, float] = {}
+
+    def vector_search() -> List[qdrant_models.ScoredPoint]:
+        start = time.perf_counter()
+        try:
+            # Rescore with the original vectors if the collection is quantized
+            return client.query_points(
+                collection_name=collection_name,
+                query=encode(query),
+                limit=candidates,
+                query_filter=message_filter(channels, users, ts_from, ts_to),
+                search_params=search_params_for(client, collection_name),
+                with_payload=True
+            ).points
+        finally:
+            timings["vector_ms"] = (time.perf_counter() - start) * 1000
+
+    def lexical_search() -> List[Tuple[str, float]]:
+        start = time.perf_counter()
+        try:
+            return lexical_index.search(collection_name, query, candidates, channels, users, ts_from, ts_to)
+        finally:
+            timings["lexical_ms"] = (time.perf_counter() - start) * 1000
+
+    vector_hits: List[qdrant_models.ScoredPoint] = []
+    lexical_hits: List[Tuple[str, float]] = []
+    if mode == "vector":
+        vector_hits = await asyncio.to_thread(vector_search)
+    elif mode == "lexical":
+        lexical_hits = await asyncio.to_thread(lexical_search)
+    else:
+        vector_hits, lexical_hits = await asyncio.gather(
+            asyncio.to_thread(vector_search), asyncio.to_thread(lexical_search)
+        )
+
+    payloads = {str(point.id): point.payload or {} for point in vector_hits}
+    if mode == "vector":
+        return [{**payloads[str(point.id)], "score": point.score} for point in vector_hits], timings
+    vector_scores = {str(point.id): point.score for point in vector_hits}
+    lexical_scores = dict(lexical_hits)
+
+    if mode == "lexical":
+        ranked = [(point_id, score, {}) for point_id, score in lexical_hits[:limit]]
+    else:
+        start = time.perf_counter()
+        ranked = reciprocal_rank_fusion({
+            "vector": [str(point.id) for point in vector_hits],
+            "lexical": [point_id for point_id, _ in lexical_hits],
+        })[:limit]
+        timings["fusion_ms"] = (time.perf_counter() - start) * 1000
+
+    missing = [point_id for point_id, _, _ in ranked if point_id not in payloads]
+    if missing:
+        start = time.perf_counter()
+        records = await asyncio.to_thread(
+            client.retrieve, collection_name=collection_name, ids=missing, with_payload=True, with_vectors=False
+        )
+        payloads.update({str(record.id): record.payload or {} for record in records})
+        timings["fetch_ms"] = (time.perf_counter() - start) * 1000
+
+    messages = []
+    for point_id, score, ranks in ranked:
+        if point_id not in payloads:
+            # Deleted from Qdrant but not yet from the lexical index
+            continue
+        message = {
+            **payloads[point_id],
+            "score": vector_scores.get(point_id),
+            "lexical_score": lexical_scores.get(point_id)
+        }
+        if mode == "hybrid":
+            message["fused_score"] = score
+            message["vector_rank"] = ranks.get("vector")
+            message["lexical_rank"] = ranks.get("lexical")
+        messages.append(message)
+    return messages, timings
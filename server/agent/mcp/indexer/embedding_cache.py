@@ -0,0 +1,105 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..config import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def text_hash(text: str) -> str:
+    """Hex SHA-256 digest of the text a message is embedded from"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class MessageEmbeddingCache:
+    """
+    LRU cache of message embeddings keyed by model and text hash
+
+    Channels repeat themselves (bot notifications, "thanks!", links shared
+    in several places), and a full re-index encodes every message again.
+    Vectors are cached per model under the hash of the embedded text, so a
+    text is only encoded once per process however often it appears.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum vectors kept (default from settings)
+        """
+        self.max_entries = max_entries if max_entries is not None else settings.EMBEDDING_CACHE_SIZE
+        self._entries: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, model: str, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        """
+        Look up the vectors of some texts
+
+        Args:
+            model: Embedding model name
+            hashes: Text hashes
+
+        Returns:
+            Dictionary of text hash to vector, for the hashes that are cached
+        """
+        found = {}
+        with self._lock:
+            for digest in hashes:
+                vector = self._entries.get((model, digest))
+                if vector is None:
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end((model, digest))
+                found[digest] = vector
+                self.hits += 1
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, List[float]]) -> None:
+        """
+        Cache the vectors of some texts
+
+        Args:
+            model: Embedding model name
+            vectors: Dictionary of text hash to vector
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            for digest, vector in vectors.items():
+                self._entries[(model, digest)] = vector
+                self._entries.move_to_end((model, digest))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Entries, hits and misses of the cache"""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Global cache instance, shared by every indexing run of the process
+_embedding_cache = None
+
+def get_embedding_cache() -> MessageEmbeddingCache:
+    """
+    Get or create the message embedding cache
+
+    Returns:
+        MessageEmbeddingCache instance
+    """
+    global _embedding_cache
+
+    if _embedding_cache is None:
+        _embedding_cache = MessageEmbeddingCache()
+
+    return _embedding_cache
@@ -0,0 +1,219 @@
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..config import settings
+from ..qdrant_client import message_point_id
+from .pipeline import ChannelJob, IndexingPipeline
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Event fields that are not part of the message itself
+_ENVELOPE_FIELDS = {"type", "channel", "event_ts", "channel_type"}
+
+
+def read_event_file(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read recorded Slack Events API payloads for replay
+
+    Args:
+        path: File with one JSON payload per line (blank lines are ignored)
+
+    Yields:
+        Event payloads in the order they were recorded
+    """
+    with open(path, "r", encoding="utf-8") as events:
+        for line in events:
+            if line.strip():
+                yield json.loads(line)
+
+
+@dataclass
+class EventIngestionStats:
+    """Counters for a batch of events"""
+    events: int = 0
+    ignored: int = 0
+    upserts: int = 0
+    deletes: int = 0
+    indexed: int = 0
+    unchanged: int = 0
+    replies: int = 0
+    elapsed_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "events": self.events,
+            "ignored": self.ignored,
+            "upserts": self.upserts,
+            "deletes": self.deletes,
+            "indexed": self.indexed,
+            "unchanged": self.unchanged,
+            "replies": self.replies,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+        }
+
+
+class SlackEventIngester:
+    """
+    Keeps a workspace collection up to date from Slack Events API payloads
+
+    New messages, thread replies and edits are upserted and deleted messages
+    are removed, one point at a time, instead of waiting for the next
+    history sweep. Events of a batch are collapsed per message, so only the
+    last change to a message is applied. Messages go through an
+    ``IndexingPipeline``, which skips unchanged text and fetches the replies
+    of threads whose parent carries a ``reply_count`` (e.g. from a
+    ``message_replied`` event).
+
+    Payloads can come from the events endpoint, a queue, or a recorded
+    file (see ``read_event_file``), so ingestion can be replayed.
+    """
+
+    def __init__(
+        self,
+        workspace_id: str,
+        pipeline_factory: Callable[[Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]], IndexingPipeline],
+        delete: Callable[[List[str]], Awaitable[int]],
+        channel_name: Optional[Callable[[str], str]] = None
+    ):
+        """
+        Initialize the ingester
+
+        Args:
+            workspace_id: Slack team ID of the workspace; events of other teams are ignored
+            pipeline_factory: Builds an IndexingPipeline around a fetch_page coroutine
+            delete: Coroutine deleting points by ID
+            channel_name: Returns the name of a channel ID (default: the ID itself)
+        """
+        self.workspace_id = workspace_id
+        self.pipeline_factory = pipeline_factory
+        self.delete = delete
+        self.channel_name = channel_name or (lambda channel_id: channel_id)
+
+    def _collapse(self, payloads: Iterable[Dict[str, Any]], stats: EventIngestionStats) -> Dict[Tuple[str, str], Optional[Dict[str, Any]]]:
+        """Latest state of each message touched by the events: the message, or None if it was deleted"""
+        changes: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+        for payload in payloads:
+            stats.events += 1
+            event = payload.get("event", payload)
+            team_id = payload.get("team_id") or event.get("team")
+            if (team_id and team_id != self.workspace_id) or event.get("type") != "message" or not event.get("channel"):
+                stats.ignored += 1
+                continue
+
+            channel_id = event["channel"]
+            subtype = event.get("subtype")
+            if subtype == "message_deleted":
+                changes[(channel_id, event["deleted_ts"])] = None
+            elif subtype in ("message_changed", "message_replied"):
+                message = event.get("message") or {}
+                if "ts" not in message:
+                    stats.ignored += 1
+                    continue
+                # A deleted thread parent stays behind as a tombstone
+                deleted = message.get("subtype") == "tombstone"
+                changes[(channel_id, message["ts"])] = None if deleted else message
+            elif "ts" in event:
+                changes[(channel_id, event["ts"])] = {
+                    key: value for key, value in event.items() if key not in _ENVELOPE_FIELDS
+                }
+            else:
+                stats.ignored += 1
+        return changes
+
+    async def ingest(self, payloads: Iterable[Dict[str, Any]]) -> EventIngestionStats:
+        """
+        Apply a batch of events to the collection
+
+        Args:
+            payloads: Events API payloads (event_callback envelopes or bare events)
+
+        Returns:
+            What the batch changed
+        """
+        start = time.perf_counter()
+        stats = EventIngestionStats()
+        changes = self._collapse(payloads, stats)
+
+        deleted = [message_point_id(self.workspace_id, channel_id, ts)
+                   for (channel_id, ts), message in changes.items() if message is None]
+        if deleted:
+            stats.deletes = await self.delete(deleted)
+
+        by_channel: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for (channel_id, _), message in changes.items():
+            if message is not None:
+                by_channel[channel_id].append(message)
+        if by_channel:
+            async def fetch_page(channel_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+                return {"messages": by_channel[channel_id]}
+
+            pipeline = self.pipeline_factory(fetch_page)
+            await pipeline.run([ChannelJob(channel_id, self.channel_name(channel_id)) for channel_id in by_channel])
+            stats.upserts = sum(len(messages) for messages in by_channel.values())
+            stats.indexed = pipeline.stats.indexed
+            stats.unchanged = pipeline.stats.unchanged
+            stats.replies = pipeline.stats.replies
+
+        stats.elapsed_seconds = time.perf_counter() - start
+        logger.info(f"Ingested Slack events for {self.workspace_id}: {stats.to_dict()}")
+        return stats
+
+    async def consume(
+        self,
+        queue: asyncio.Queue,
+        batch_size: Optional[int] = None,
+        linger_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Ingest events from a queue in batches until None is queued
+
+        Args:
+            queue: Queue of event payloads
+            batch_size: Events applied together (default from settings)
+            linger_seconds: How long to wait for more events before applying a partial batch (default from settings)
+        """
+        batch_size = max(1, batch_size or settings.EVENTS_BATCH_SIZE)
+        linger_seconds = linger_seconds if linger_seconds is not None else settings.EVENTS_BATCH_LINGER_SECONDS
+        done = False
+        while not done:
+            payload = await queue.get()
+            if payload is None:
+                return
+            batch = [payload]
+            while len(batch) < batch_size:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), linger_seconds)
+                except asyncio.TimeoutError:
+                    break
+                if payload is None:
+                    done = True
+                    break
+                batch.append(payload)
+            try:
+                await self.ingest(batch)
+            except Exception as e:
+                logger.error(f"Error ingesting {len(batch)} Slack events: {str(e)}")
+
+
+def main():
+    """Replay recorded Slack events into a workspace's collection"""
+    parser = argparse.ArgumentParser(description="Replay Slack Events API payloads into the message index")
+    parser.add_argument("--workspace-id", type=int, required=True, help="Workspace ID in the MCP database")
+    parser.add_argument("path", help="File with one event payload per line")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    from .processor import replay_event_file
+    result = asyncio.run(replay_event_file(args.workspace_id, args.path))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
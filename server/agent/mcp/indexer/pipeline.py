@@ -0,0 +1,591 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..config import settings
+from ..qdrant_client import point_id_for
+from .embedding_cache import MessageEmbeddingCache, get_embedding_cache, text_hash
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Messages requested per conversations.history page
+HISTORY_PAGE_SIZE = 200
+
+# How long the embedder waits for more messages before encoding a partial batch
+BATCH_LINGER_SECONDS = 0.05
+
+# Marks the end of a queue
+_DONE = object()
+
+
+def prepare_message(
+    msg: Dict[str, Any],
+    channel_id: str,
+    channel_name: str,
+    workspace_id: str = ""
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Build the text to embed and the point payload for a Slack message
+
+    Args:
+        msg: Message from conversations.history
+        channel_id: Slack channel ID
+        channel_name: Slack channel name
+        workspace_id: Slack team ID, part of the message's point ID
+
+    Returns:
+        Tuple of (text, payload), or None if the message has no text
+    """
+    if not msg.get("text"):
+        return None
+
+    # Create text for embedding
+    text = msg["text"]
+
+    # Add attachments if any
+    for attachment in msg.get("attachments") or []:
+        if attachment.get("text"):
+            text += f"\n{attachment['text']}"
+
+    payload = {
+        "ts": float(msg["ts"]),
+        "text": msg["text"],
+        "user_id": msg.get("user", ""),
+        "channel_id": channel_id,
+        "channel_name": channel_name,
+        "workspace_id": workspace_id,
+        # Lets a re-index skip messages whose text has not changed
+        "text_hash": text_hash(text),
+        "has_attachments": bool(msg.get("attachments")),
+        "has_files": bool(msg.get("files")),
+        "datetime": datetime.fromtimestamp(float(msg["ts"])).isoformat(),
+        # Keep track of original message data
+        "original_msg": {
+            key: value for key, value in msg.items()
+            if key in ["user", "ts", "thread_ts", "reply_count", "reactions"]
+        },
+    }
+    return text, payload
+
+
+@dataclass
+class ChannelJob:
+    """
+    A channel to fetch, and its checkpoint from earlier runs
+
+    Without ``oldest_ts`` the channel is backfilled from its newest message
+    back to the cutoff. With it, only newer messages are fetched, and an
+    unfinished backfill is resumed from ``backfill_cursor`` (or from
+    ``oldest_indexed_ts`` if Slack no longer accepts the cursor).
+    """
+    channel_id: str
+    channel_name: str
+    oldest_ts: Optional[str] = None
+    backfill_cursor: Optional[str] = None
+    oldest_indexed_ts: Optional[str] = None
+
+
+@dataclass
+class ChannelProgress:
+    """What the pipeline has fetched and indexed for one channel"""
+    channel_id: str
+    channel_name: str
+    fetched: int = 0
+    indexed: int = 0
+    skipped: int = 0
+    unchanged: int = 0
+    oldest_ts: Optional[str] = None
+    newest_ts: Optional[str] = None
+    error: Optional[str] = None
+    failed: int = 0
+    pending: int = 0
+    fetch_done: bool = False
+    completed: bool = False
+    # Pages whose messages are not all stored yet, oldest fetched last
+    pages: deque = field(default_factory=deque, repr=False)
+    checkpoint_blocked: bool = False
+
+    def track_ts(self, ts: str) -> None:
+        if not self.oldest_ts or float(ts) < float(self.oldest_ts):
+            self.oldest_ts = ts
+        if not self.newest_ts or float(ts) > float(self.newest_ts):
+            self.newest_ts = ts
+
+
+@dataclass
+class PipelineStats:
+    """Counters for one pipeline run"""
+    channels: int = 0
+    fetched: int = 0
+    indexed: int = 0
+    skipped: int = 0
+    unchanged: int = 0
+    threads: int = 0
+    replies: int = 0
+    encoded: int = 0
+    cache_hits: int = 0
+    vectors_written: int = 0
+    pages: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    embed_seconds: float = 0.0
+    upsert_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+    max_queued: int = 0
+
+    @property
+    def messages_per_second(self) -> float:
+        # Unchanged messages count, so a re-index reports how fast it got through the history
+        return (self.indexed + self.unchanged) / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "channels": self.channels,
+            "fetched": self.fetched,
+            "indexed": self.indexed,
+            "skipped": self.skipped,
+            "unchanged": self.unchanged,
+            "threads": self.threads,
+            "replies": self.replies,
+            "encoded": self.encoded,
+            "cache_hits": self.cache_hits,
+            "vectors_written": self.vectors_written,
+            "pages": self.pages,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "embed_seconds": round(self.embed_seconds, 3),
+            "upsert_seconds": round(self.upsert_seconds, 3),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "messages_per_second": round(self.messages_per_second, 1),
+            "max_queued": self.max_queued,
+        }
+
+
+@dataclass
+class _Page:
+    # Checkpoint columns to save once this page and every page before it are stored
+    update: Dict[str, Any]
+    pending: int = 0
+    indexed: int = 0
+    failed: int = 0
+    queued: bool = False
+
+
+@dataclass
+class _Item:
+    progress: ChannelProgress
+    page: _Page
+    text: str
+    payload: Dict[str, Any]
+
+    @property
+    def point_id(self) -> str:
+        return point_id_for(self.payload)
+
+
+class IndexingPipeline:
+    """
+    Staged pipeline that fetches, embeds and stores Slack messages.
+
+    - Fetchers page through several channels at once. Every Slack call goes
+      through ``fetch_page``, which the indexer routes through its rate
+      limiter. Replies of the threads on a page (messages with a
+      ``reply_count``) are fetched together through ``fetch_replies`` and
+      indexed with the page.
+    - Embedders collect messages from all channels into batches and encode
+      them in a thread pool, so the event loop stays responsive. Messages
+      whose point already holds the same text (per ``stored_hashes``) are
+      neither encoded nor stored again, and texts already in the embedding
+      cache are not encoded again.
+    - Upserters write the batches to Qdrant with the async client.
+
+    The stages are connected by bounded queues. A slow stage makes the ones
+    before it wait instead of buffering a whole workspace in memory.
+    ``on_channel_complete`` is called once every fetched message of a
+    channel has been stored (or has failed).
+
+    Channels are indexed page by page with no limit on their length. Once
+    a page and all pages fetched before it are stored, ``on_checkpoint`` is
+    called with the checkpoint columns to save (``last_indexed_ts``,
+    ``backfill_cursor``, ``oldest_indexed_ts``), so an interrupted backfill
+    resumes after the last stored page. A page with failed messages stops
+    the channel's checkpoint from advancing for the rest of the run.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        encode: Callable[[List[str]], Any],
+        upsert: Callable[[List[List[float]], List[Dict[str, Any]]], Awaitable[int]],
+        cutoff_ts: float,
+        on_channel_complete: Optional[Callable[[ChannelProgress], Any]] = None,
+        on_checkpoint: Optional[Callable[[ChannelProgress, Dict[str, Any], int], Any]] = None,
+        fetch_replies: Optional[Callable[[str, str], Awaitable[List[Dict[str, Any]]]]] = None,
+        workspace_id: str = "",
+        stored_hashes: Optional[Callable[[List[str]], Awaitable[Dict[str, str]]]] = None,
+        embedding_cache: Optional[MessageEmbeddingCache] = None,
+        model_name: Optional[str] = None,
+        fetch_concurrency: Optional[int] = None,
+        embedding_workers: Optional[int] = None,
+        upsert_concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None
+    ):
+        """
+        Initialize the pipeline
+
+        Args:
+            fetch_page: Coroutine returning one conversations.history response for (channel_id, params)
+            encode: Blocking function turning texts into vectors (run in the thread pool)
+            upsert: Coroutine storing (embeddings, payloads) and returning the number stored
+            cutoff_ts: Messages older than this are not indexed
+            on_channel_complete: Called with a channel's progress once it is fully indexed
+            on_checkpoint: Called with (progress, checkpoint columns, messages indexed since the last checkpoint)
+            fetch_replies: Coroutine returning the replies of a thread for (channel_id, thread_ts)
+            workspace_id: Slack team ID, part of every point ID
+            stored_hashes: Coroutine returning the stored text hash of each existing point among some point IDs
+            embedding_cache: Cache of vectors by text hash (default: the process-wide cache)
+            model_name: Embedding model, part of the cache key (default from settings)
+            fetch_concurrency: Channels fetched at once (default from settings)
+            embedding_workers: Threads encoding batches (default from settings)
+            upsert_concurrency: Concurrent upserts (default from settings)
+            batch_size: Messages per embedding batch (default from settings)
+            queue_size: Messages buffered between stages (default from settings)
+        """
+        self.fetch_page = fetch_page
+        self.encode = encode
+        self.upsert = upsert
+        self.cutoff_ts = cutoff_ts
+        self.on_channel_complete = on_channel_complete
+        self.on_checkpoint = on_checkpoint
+        self.fetch_replies = fetch_replies
+        self.workspace_id = workspace_id
+        self.stored_hashes = stored_hashes
+        self.embedding_cache = embedding_cache or get_embedding_cache()
+        self.model_name = model_name or settings.DEFAULT_EMBEDDING_MODEL
+        self.fetch_concurrency = max(1, fetch_concurrency or settings.INDEXING_FETCH_CONCURRENCY)
+        self.embedding_workers = max(1, embedding_workers or settings.INDEXING_EMBEDDING_WORKERS)
+        self.upsert_concurrency = max(1, upsert_concurrency or settings.INDEXING_UPSERT_CONCURRENCY)
+        self.batch_size = max(1, batch_size or settings.EMBEDDING_BATCH_SIZE)
+        self.queue_size = max(self.batch_size, queue_size or settings.INDEXING_QUEUE_SIZE)
+        self.stats = PipelineStats()
+
+    async def run(self, jobs: List[ChannelJob]) -> Dict[str, ChannelProgress]:
+        """
+        Fetch, embed and store the messages of some channels
+
+        Args:
+            jobs: Channels to index
+
+        Returns:
+            Progress for each channel, keyed by channel ID
+        """
+        start = time.perf_counter()
+        self.stats = PipelineStats(channels=len(jobs))
+        progress = {job.channel_id: ChannelProgress(job.channel_id, job.channel_name) for job in jobs}
+
+        channels: asyncio.Queue = asyncio.Queue()
+        for job in jobs:
+            channels.put_nowait(job)
+        messages: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        # Each queued batch holds up to batch_size messages
+        batches: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.queue_size // self.batch_size))
+
+        executor = ThreadPoolExecutor(max_workers=self.embedding_workers, thread_name_prefix="slack-embed")
+        try:
+            fetchers = [asyncio.create_task(self._fetcher(channels, messages, progress))
+                        for _ in range(min(self.fetch_concurrency, len(jobs)) or 1)]
+            embedders = [asyncio.create_task(self._embedder(messages, batches, executor))
+                         for _ in range(self.embedding_workers)]
+            upserters = [asyncio.create_task(self._upserter(batches)) for _ in range(self.upsert_concurrency)]
+
+            await asyncio.gather(*fetchers)
+            for _ in embedders:
+                await messages.put(_DONE)
+            await asyncio.gather(*embedders)
+            for _ in upserters:
+                await batches.put(_DONE)
+            await asyncio.gather(*upserters)
+        finally:
+            executor.shutdown(wait=False)
+
+        self.stats.elapsed_seconds = time.perf_counter() - start
+        logger.info(f"Indexing pipeline finished: {self.stats.to_dict()}")
+        return progress
+
+    async def _fetcher(self, channels: asyncio.Queue, messages: asyncio.Queue, progress: Dict[str, ChannelProgress]) -> None:
+        while True:
+            try:
+                job = channels.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            channel = progress[job.channel_id]
+            try:
+                await self._fetch_channel(job, channel, messages)
+            except Exception as e:
+                channel.error = str(e)
+                logger.error(f"Error retrieving messages for channel {job.channel_name}: {str(e)}")
+            finally:
+                channel.fetch_done = True
+                await self._check_complete(channel)
+
+    async def _fetch_channel(self, job: ChannelJob, channel: ChannelProgress, messages: asyncio.Queue) -> None:
+        cutoff = str(self.cutoff_ts)
+        if not job.oldest_ts:
+            # Walk back from the newest message, checkpointing every page
+            await self._fetch_pages(job, channel, messages, {"oldest": cutoff}, backfill=True)
+            return
+
+        # Messages newer than the last indexed one; their newest ts is saved once they are all stored
+        await self._fetch_pages(job, channel, messages, {"oldest": job.oldest_ts}, backfill=False)
+        if job.backfill_cursor:
+            logger.info(f"Resuming backfill of channel #{job.channel_name} before {job.oldest_indexed_ts}")
+            await self._fetch_pages(
+                job, channel, messages, {"oldest": cutoff}, backfill=True,
+                cursor=job.backfill_cursor, latest=job.oldest_indexed_ts
+            )
+
+    async def _fetch_pages(
+        self,
+        job: ChannelJob,
+        channel: ChannelProgress,
+        messages: asyncio.Queue,
+        params: Dict[str, Any],
+        backfill: bool,
+        cursor: Optional[str] = None,
+        latest: Optional[str] = None
+    ) -> None:
+        first_page = True
+        newest_ts = None
+        while True:
+            # Slack filters by ts itself, so pages only hold messages within range
+            request = {"channel": job.channel_id, "limit": HISTORY_PAGE_SIZE, **params}
+            if cursor:
+                request["cursor"] = cursor
+
+            try:
+                response = await self.fetch_page(job.channel_id, request)
+            except Exception as e:
+                # A saved cursor can expire; continue from the oldest indexed message instead
+                if not (first_page and cursor and latest and "invalid_cursor" in str(e)):
+                    raise
+                logger.warning(f"Backfill cursor of channel #{job.channel_name} was rejected, resuming before {latest}")
+                cursor = None
+                params = {**params, "latest": latest}
+                first_page = False
+                continue
+            self.stats.pages += 1
+            entries = response.get("messages", [])
+            logger.info(f"Retrieved {len(entries)} messages from channel #{job.channel_name}")
+            cursor = (response.get("response_metadata") or {}).get("next_cursor") or None
+
+            page = _Page(update={})
+            channel.pages.append(page)
+            page_ts = [msg["ts"] for msg in entries if "ts" in msg and float(msg["ts"]) >= self.cutoff_ts]
+            if page_ts:
+                newest_ts = max([newest_ts, *page_ts] if newest_ts else page_ts, key=float)
+            if backfill:
+                page.update["backfill_cursor"] = cursor
+                if page_ts:
+                    page.update["oldest_indexed_ts"] = min(page_ts, key=float)
+                if first_page and not job.oldest_ts and newest_ts:
+                    page.update["last_indexed_ts"] = newest_ts
+            elif not cursor and newest_ts:
+                page.update["last_indexed_ts"] = newest_ts
+            first_page = False
+
+            for msg in entries + await self._thread_replies(job, channel, page, entries):
+                if "ts" not in msg or float(msg["ts"]) < self.cutoff_ts:
+                    continue
+                channel.fetched += 1
+                self.stats.fetched += 1
+                channel.track_ts(msg["ts"])
+                prepared = prepare_message(msg, job.channel_id, job.channel_name, self.workspace_id)
+                if prepared is None:
+                    channel.skipped += 1
+                    self.stats.skipped += 1
+                    continue
+                channel.pending += 1
+                page.pending += 1
+                # Waits here while the embedders are behind
+                await messages.put(_Item(channel, page, *prepared))
+                self.stats.max_queued = max(self.stats.max_queued, messages.qsize())
+
+            page.queued = True
+            await self._advance_checkpoint(channel)
+            if not cursor:
+                return
+
+    async def _thread_replies(
+        self,
+        job: ChannelJob,
+        channel: ChannelProgress,
+        page: _Page,
+        entries: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Fetch the replies of every thread started on a page, a few threads at a time"""
+        threads = [msg["ts"] for msg in entries
+                   if msg.get("reply_count") and msg.get("thread_ts", msg.get("ts")) == msg.get("ts")]
+        if self.fetch_replies is None or not threads:
+            return []
+
+        results = await asyncio.gather(
+            *(self.fetch_replies(job.channel_id, thread_ts) for thread_ts in threads),
+            return_exceptions=True
+        )
+        replies = []
+        for thread_ts, result in zip(threads, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Error retrieving replies of thread {thread_ts} in channel #{job.channel_name}: {str(result)}")
+                # Hold the checkpoint back so the next run fetches the thread again
+                channel.failed += 1
+                page.failed += 1
+                continue
+            replies.extend(reply for reply in result if reply.get("ts") != thread_ts)
+        self.stats.threads += len(threads)
+        self.stats.replies += len(replies)
+        return replies
+
+    async def _embedder(self, messages: asyncio.Queue, batches: asyncio.Queue, executor: ThreadPoolExecutor) -> None:
+        loop = asyncio.get_running_loop()
+        done = False
+        while not done:
+            item = await messages.get()
+            if item is _DONE:
+                return
+            batch = [item]
+            # Fill the batch from any channel, waiting briefly for stragglers
+            while len(batch) < self.batch_size:
+                try:
+                    item = await asyncio.wait_for(messages.get(), BATCH_LINGER_SECONDS)
+                except asyncio.TimeoutError:
+                    break
+                if item is _DONE:
+                    done = True
+                    break
+                batch.append(item)
+
+            start = time.perf_counter()
+            try:
+                batch = await self._drop_unchanged(batch)
+                if not batch:
+                    continue
+                vectors = await self._embed(batch, loop, executor)
+            except Exception as e:
+                self.stats.failed_batches += 1
+                logger.error(f"Error generating embeddings for {len(batch)} messages: {str(e)}")
+                await self._finish(batch, indexed=False)
+                continue
+            finally:
+                self.stats.embed_seconds += time.perf_counter() - start
+            await batches.put((batch, vectors))
+
+    async def _drop_unchanged(self, batch: List[_Item]) -> List[_Item]:
+        """Finish the messages whose stored point already holds the same text, and return the rest"""
+        if self.stored_hashes is None:
+            return batch
+        try:
+            stored = await self.stored_hashes([item.point_id for item in batch])
+        except Exception as e:
+            # Without the stored hashes every message is written again, which is still correct
+            logger.warning(f"Could not look up stored messages, re-indexing the batch: {str(e)}")
+            return batch
+        unchanged = [item for item in batch if stored.get(item.point_id) == item.payload["text_hash"]]
+        if unchanged:
+            await self._finish(unchanged, indexed=False, unchanged=True)
+        return [item for item in batch if stored.get(item.point_id) != item.payload["text_hash"]]
+
+    async def _embed(self, batch: List[_Item], loop: asyncio.AbstractEventLoop, executor: ThreadPoolExecutor) -> List[List[float]]:
+        """Vectors of a batch, encoding only the texts that are not cached"""
+        hashes = [item.payload["text_hash"] for item in batch]
+        vectors = self.embedding_cache.get_many(self.model_name, set(hashes))
+        self.stats.cache_hits += sum(1 for digest in hashes if digest in vectors)
+
+        # Encode each missing text once, even if it appears several times in the batch
+        missing = {item.payload["text_hash"]: item.text for item in batch if item.payload["text_hash"] not in vectors}
+        if missing:
+            encoded = await loop.run_in_executor(executor, self.encode, list(missing.values()))
+            if hasattr(encoded, "tolist"):
+                encoded = encoded.tolist()
+            new_vectors = dict(zip(missing, encoded))
+            self.embedding_cache.put_many(self.model_name, new_vectors)
+            vectors.update(new_vectors)
+            self.stats.encoded += len(missing)
+        return [vectors[digest] for digest in hashes]
+
+    async def _upserter(self, batches: asyncio.Queue) -> None:
+        while True:
+            entry = await batches.get()
+            if entry is _DONE:
+                return
+            batch, vectors = entry
+            start = time.perf_counter()
+            try:
+                written = await self.upsert(vectors, [item.payload for item in batch])
+                self.stats.vectors_written += written
+                self.stats.batches += 1
+                await self._finish(batch, indexed=True)
+            except Exception as e:
+                self.stats.failed_batches += 1
+                logger.error(f"Error storing batch of {len(batch)} messages: {str(e)}")
+                await self._finish(batch, indexed=False)
+            finally:
+                self.stats.upsert_seconds += time.perf_counter() - start
+
+    async def _finish(self, batch: List[_Item], indexed: bool, unchanged: bool = False) -> None:
+        channels = {}
+        for item in batch:
+            item.progress.pending -= 1
+            item.page.pending -= 1
+            if indexed:
+                item.progress.indexed += 1
+                item.page.indexed += 1
+                self.stats.indexed += 1
+            elif unchanged:
+                item.progress.unchanged += 1
+                self.stats.unchanged += 1
+            else:
+                item.progress.failed += 1
+                item.page.failed += 1
+            channels[item.progress.channel_id] = item.progress
+        for channel in channels.values():
+            await self._advance_checkpoint(channel)
+            await self._check_complete(channel)
+
+    async def _advance_checkpoint(self, channel: ChannelProgress) -> None:
+        """Save the checkpoint of each stored page, in the order the pages were fetched"""
+        while channel.pages and channel.pages[0].queued and not channel.pages[0].pending:
+            page = channel.pages.popleft()
+            if page.failed:
+                channel.checkpoint_blocked = True
+            if channel.checkpoint_blocked or self.on_checkpoint is None:
+                continue
+            if not page.update and not page.indexed:
+                continue
+            try:
+                result = self.on_checkpoint(channel, page.update, page.indexed)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                channel.checkpoint_blocked = True
+                logger.error(f"Error saving checkpoint of channel {channel.channel_name}: {str(e)}")
+
+    async def _check_complete(self, channel: ChannelProgress) -> None:
+        if channel.completed or not channel.fetch_done or channel.pending:
+            return
+        channel.completed = True
+        logger.info(f"Indexed {channel.indexed}/{channel.fetched} messages from channel #{channel.channel_name} "
+                    f"({channel.unchanged} unchanged)")
+        if self.on_channel_complete is not None:
+            try:
+                result = self.on_channel_complete(channel)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Error recording progress of channel {channel.channel_name}: {str(e)}")
@@ -1,22 +1,25 @@
 import asyncio
 import logging
 import time
-import json
 import os
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple, Set
 from sqlalchemy.orm import Session
-from sentence_transformers import SentenceTransformer
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams, CollectionStatus
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
 from ..db.database import get_db
 from ..db import crud, models
-from ..qdrant_client import get_qdrant_client, store_message_embeddings, delete_old_messages
+from ..qdrant_client import (
+    get_qdrant_client, get_async_qdrant_client, initialize_collection, upsert_message_embeddings,
+    get_stored_text_hashes, get_legacy_message_point_ids, delete_message_points, delete_old_messages, point_id_for
+)
+from ..lexical_index import get_lexical_index
 from ..config import settings
 from ..security import decrypt
+from .events import SlackEventIngester, read_event_file
+from .pipeline import ChannelJob, ChannelProgress, IndexingPipeline
+from .rate_limiter import SlackRateLimiter
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -45,6 +48,7 @@ class MessageIndexer:
         # Get Qdrant client
         try:
             self.qdrant_client = get_qdrant_client()
+            self.async_qdrant_client = get_async_qdrant_client()
             logger.info(f"Connected to Qdrant for workspace {workspace_id}")
         except Exception as e:
             logger.error(f"Failed to connect to Qdrant: {str(e)}")
@@ -52,6 +56,7 @@ class MessageIndexer:
         
         # Initialize embedding model
         try:
+            from sentence_transformers import SentenceTransformer
             self.embedding_model = SentenceTransformer(settings.DEFAULT_EMBEDDING_MODEL)
             logger.info(f"Initialized embedding model: {settings.DEFAULT_EMBEDDING_MODEL}")
         except Exception as e:
@@ -79,6 +84,12 @@ class MessageIndexer:
         # Initialize Slack clients
         self.slack_client = self._get_slack_client()
         self.user_slack_client = self._get_user_slack_client()
+        
+        # Slack limits each method per workspace, so all fetchers share one limiter
+        self.rate_limiter = SlackRateLimiter()
+        # BM25 index over the same messages, for hybrid search
+        self.lexical_index = get_lexical_index()
+        self.last_run_stats: Dict[str, Any] = {}
     
     def _get_slack_client(self) -> WebClient:
         """Create a Slack client for the workspace using bot token"""
@@ -135,32 +146,8 @@ class MessageIndexer:
                 logger.info(f"Collection {collection_name} already exists")
                 return
             
-            # Create collection
-            logger.info(f"Creating collection {collection_name}")
-            vector_size = 384  # Default for all-MiniLM-L6-v2
-            
-            self.qdrant_client.create_collection(
-                collection_name=collection_name,
-                vectors_config=VectorParams(
-                    size=vector_size,
-                    distance=Distance.COSINE
-                )
-            )
-            
-            # Wait for collection to be ready
-            max_retries = 5
-            for i in range(max_retries):
-                try:
-                    collection_info = self.qdrant_client.get_collection(collection_name)
-                    if collection_info.status == CollectionStatus.GREEN:
-                        logger.info(f"Collection {collection_name} created and ready")
-                        return
-                except Exception as e:
-                    logger.warning(f"Collection not ready yet (attempt {i+1}/{max_retries}): {str(e)}")
-                
-                time.sleep(1)
-            
-            logger.error(f"Failed to verify collection {collection_name} is ready after {max_retries} attempts")
+            # Create collection with the configured storage profile
+            initialize_collection(self.qdrant_client, collection_name)
         except Exception as e:
             logger.error(f"Error creating collection {collection_name}: {str(e)}")
             raise ValueError(f"Failed to create collection: {str(e)}")
@@ -169,14 +156,14 @@ class MessageIndexer:
         """Check if Slack client is authenticated correctly"""
         try:
             # Test authentication by making a simple API call
-            auth_test = self.slack_client.auth_test()
+            auth_test = await self.rate_limiter.call("auth.test", self.slack_client.auth_test)
             if auth_test and auth_test["ok"]:
                 logger.info(f"Successfully authenticated with Slack as {auth_test.get('user')} for team {auth_test.get('team')}")
                 
                 # Also test user token if available
                 if self.user_slack_client:
                     try:
-                        user_auth_test = self.user_slack_client.auth_test()
+                        user_auth_test = await self.rate_limiter.call("auth.test", self.user_slack_client.auth_test)
                         if user_auth_test and user_auth_test["ok"]:
                             logger.info(f"User token is also valid for {user_auth_test.get('user')}")
                         else:
@@ -194,6 +181,14 @@ class MessageIndexer:
         """
         Process all channels in the workspace
         
+        Channels are fetched concurrently and their messages embedded and
+        stored by an IndexingPipeline. Messages already stored with the same
+        text are not embedded or written again, so a full re-index only
+        pays for what changed. Each channel's checkpoint is saved page by
+        page, so a backfill interrupted by a restart resumes where it
+        stopped. Messages still stored under the integer point IDs of older
+        versions force a full re-index, after which those points are deleted.
+        
         Args:
             force_full: If True, reindex all messages within history_days
         
@@ -206,7 +201,7 @@ class MessageIndexer:
         
         # Get all channels directly using Slack API
         try:
-            response = self.slack_client.conversations_list(limit=1000)
+            response = await self.rate_limiter.call("conversations.list", self.slack_client.conversations_list, limit=1000)
             channels = [{"id": c["id"], "name": c["name"]} for c in response["channels"]]
             logger.info(f"Found {len(channels)} channels in workspace {self.workspace.team_name}")
             for channel in channels:
@@ -215,72 +210,56 @@ class MessageIndexer:
             logger.error(f"Failed to list channels: {str(e)}")
             return 0, 0
         
+        # Unchanged messages are not written again, so fill a new lexical index from the collection
+        await self._ensure_lexical_index()
+        
+        # Points from before deterministic IDs would be duplicated by a re-index; replace them all
+        legacy_ids = await get_legacy_message_point_ids(self.async_qdrant_client, self.index_status.collection_name)
+        if legacy_ids:
+            logger.info(f"Found {len(legacy_ids)} messages stored under legacy point IDs, re-indexing all channels")
+            force_full = True
+        
         # Calculate the cutoff date for history
         cutoff_date = datetime.utcnow() - timedelta(days=self.index_status.history_days)
         cutoff_ts = cutoff_date.timestamp()
         logger.info(f"Using cutoff date {cutoff_date.isoformat()} (timestamp: {cutoff_ts})")
         
-        # Track overall stats
-        total_messages = 0
-        indexed_messages = 0
-        oldest_ts = None
-        newest_ts = None
-        
-        # Process each channel
+        # Get or create channel indexing status
+        jobs = []
         for channel in channels:
-            channel_id = channel["id"]
-            channel_name = channel["name"]
-            
-            # Get or create channel indexing status
-            indexed_channel = crud.get_indexed_channel(self.db, self.index_status.id, channel_id)
-            if not indexed_channel:
-                indexed_channel = crud.create_indexed_channel(
-                    self.db,
-                    index_id=self.index_status.id,
-                    channel_id=channel_id,
-                    channel_name=channel_name
-                )
-            
-            # Get messages to index
-            last_indexed_ts = None if force_full else indexed_channel.last_indexed_ts
-            if last_indexed_ts:
-                logger.info(f"Channel #{channel_name}: Only fetching messages newer than {datetime.fromtimestamp(float(last_indexed_ts)).isoformat()}")
-            else:
-                logger.info(f"Channel #{channel_name}: Fetching all messages within history days")
-            
+            indexed_channel = crud.create_indexed_channel(
+                self.db,
+                index_id=self.index_status.id,
+                channel_id=channel["id"],
+                channel_name=channel["name"]
+            )
+            if force_full or not indexed_channel.last_indexed_ts:
+                jobs.append(ChannelJob(channel["id"], channel["name"]))
+                continue
+            last_indexed_ts = indexed_channel.last_indexed_ts
+            logger.info(f"Channel #{channel['name']}: Only fetching messages newer than {datetime.fromtimestamp(float(last_indexed_ts)).isoformat()}")
+            jobs.append(ChannelJob(
+                channel["id"],
+                channel["name"],
+                last_indexed_ts,
+                backfill_cursor=indexed_channel.backfill_cursor,
+                oldest_indexed_ts=indexed_channel.oldest_indexed_ts
+            ))
+        
+        progress = await self._run_pipeline(jobs, cutoff_ts)
+        
+        if legacy_ids:
             try:
-                # Process this channel
-                channel_total, channel_indexed, channel_oldest, channel_newest = await self.process_channel(
-                    channel_id=channel_id,
-                    channel_name=channel_name,
-                    cutoff_ts=cutoff_ts,
-                    last_indexed_ts=last_indexed_ts
-                )
-                
-                # Update stats
-                total_messages += channel_total
-                indexed_messages += channel_indexed
-                
-                # Track oldest/newest message timestamps
-                if channel_oldest and (not oldest_ts or float(channel_oldest) < float(oldest_ts)):
-                    oldest_ts = channel_oldest
-                
-                if channel_newest and (not newest_ts or float(channel_newest) > float(newest_ts)):
-                    newest_ts = channel_newest
-                
-                # Update success in DB
-                if channel_indexed > 0 and channel_newest:
-                    crud.update_indexed_channel(
-                        self.db,
-                        index_id=self.index_status.id,
-                        channel_id=channel_id,
-                        last_indexed_ts=channel_newest,
-                        message_count=indexed_channel.message_count + channel_indexed
-                    )
-            
+                await self._delete(legacy_ids)
+                logger.info(f"Deleted {len(legacy_ids)} messages stored under legacy point IDs")
             except Exception as e:
-                logger.error(f"Error processing channel {channel_name}: {str(e)}")
-                # Continue with next channel
+                logger.error(f"Error deleting legacy message points: {str(e)}")
+        
+        # Track overall stats
+        total_messages = sum(channel.fetched for channel in progress.values())
+        indexed_messages = sum(channel.indexed + channel.unchanged for channel in progress.values())
+        oldest_ts = min((c.oldest_ts for c in progress.values() if c.oldest_ts), key=float, default=None)
+        newest_ts = max((c.newest_ts for c in progress.values() if c.newest_ts), key=float, default=None)
         
         # Prune old messages
         try:
@@ -290,6 +269,7 @@ class MessageIndexer:
                 cutoff_ts
             )
             logger.info(f"Deleted {deleted} messages older than {cutoff_date.isoformat()}")
+            await asyncio.to_thread(self.lexical_index.delete_older_than, self.index_status.collection_name, cutoff_ts)
         except Exception as e:
             logger.error(f"Error pruning old messages: {str(e)}")
         
@@ -320,121 +300,142 @@ class MessageIndexer:
             channel_name: Slack channel name
             cutoff_ts: Timestamp to cutoff older messages
             last_indexed_ts: Optional timestamp of last indexed message
+                (default: resume from the channel's saved checkpoint)
         
         Returns:
             Tuple of (total_messages, indexed_messages, oldest_ts, newest_ts)
         """
         logger.info(f"Processing channel #{channel_name} ({channel_id})")
-        
-        # Initialize tracking
-        all_messages = []
-        oldest_ts = None
-        newest_ts = None
-        has_more = True
+        indexed_channel = crud.create_indexed_channel(
+            self.db, index_id=self.index_status.id, channel_id=channel_id, channel_name=channel_name
+        )
+        if last_indexed_ts is None and indexed_channel.last_indexed_ts:
+            job = ChannelJob(
+                channel_id,
+                channel_name,
+                indexed_channel.last_indexed_ts,
+                backfill_cursor=indexed_channel.backfill_cursor,
+                oldest_indexed_ts=indexed_channel.oldest_indexed_ts
+            )
+        else:
+            job = ChannelJob(channel_id, channel_name, last_indexed_ts)
+        progress = await self._run_pipeline([job], cutoff_ts)
+        channel = progress[channel_id]
+        return channel.fetched, channel.indexed + channel.unchanged, channel.oldest_ts, channel.newest_ts
+    
+    def _pipeline(self, fetch_page, cutoff_ts: float, on_checkpoint=None) -> IndexingPipeline:
+        return IndexingPipeline(
+            fetch_page=fetch_page,
+            encode=self.embedding_model.encode,
+            upsert=self._upsert,
+            cutoff_ts=cutoff_ts,
+            on_checkpoint=on_checkpoint,
+            fetch_replies=self._fetch_replies,
+            workspace_id=self.workspace.team_id,
+            stored_hashes=self._stored_hashes,
+            model_name=settings.DEFAULT_EMBEDDING_MODEL
+        )
+    
+    async def _run_pipeline(self, jobs: List[ChannelJob], cutoff_ts: float) -> Dict[str, ChannelProgress]:
+        """Index channels with the staged pipeline and record the statistics of the run"""
+        pipeline = self._pipeline(self._fetch_history_page, cutoff_ts, self._save_checkpoint)
+        progress = await pipeline.run(jobs)
+        self.last_run_stats = {**pipeline.stats.to_dict(), "slack": self.rate_limiter.get_stats()}
+        logger.info(
+            f"Indexed {pipeline.stats.indexed + pipeline.stats.unchanged} messages at "
+            f"{pipeline.stats.messages_per_second:.1f} messages/s: {pipeline.stats.vectors_written} vectors written, "
+            f"{pipeline.stats.unchanged} unchanged, {pipeline.stats.encoded} texts encoded"
+        )
+        return progress
+    
+    async def _fetch_history_page(self, channel_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch one conversations.history page, falling back to the user token if the bot is not in the channel"""
+        logger.debug(f"Requesting messages from channel {channel_id} with params: {params}")
+        try:
+            return await self.rate_limiter.call("conversations.history", self.slack_client.conversations_history, **params)
+        except SlackApiError as e:
+            # Check if error is 'not_in_channel' and try with user token as fallback
+            if "not_in_channel" in str(e) and self.user_slack_client:
+                logger.info(f"Bot not in channel {channel_id}, trying with user token instead")
+                return await self.rate_limiter.call("conversations.history", self.user_slack_client.conversations_history, **params)
+            # Re-raise if no user token or different error
+            raise
+    
+    async def _fetch_replies(self, channel_id: str, thread_ts: str) -> List[Dict[str, Any]]:
+        """Fetch every message of a thread with conversations.replies (the parent comes first)"""
+        client = self.slack_client
+        messages = []
         cursor = None
-        
-        # Retrieve messages in batches
-        while has_more:
+        while True:
+            params = {"channel": channel_id, "ts": thread_ts, "limit": 200}
+            if cursor:
+                params["cursor"] = cursor
             try:
-                # Prepare parameters for Slack API
-                params = {
-                    "channel": channel_id,
-                    "limit": 100  # Slack API limit
-                }
-                
-                if cursor:
-                    params["cursor"] = cursor
-                
-                # If we're only getting new messages, add oldest timestamp
-                if last_indexed_ts:
-                    params["oldest"] = last_indexed_ts
-                
-                # Get messages directly using Slack API with bot token
-                logger.debug(f"Requesting messages from channel #{channel_name} with params: {params}")
-                try:
-                    response = self.slack_client.conversations_history(**params)
-                    messages = response.get("messages", [])
-                except SlackApiError as e:
-                    # Check if error is 'not_in_channel' and try with user token as fallback
-                    if "not_in_channel" in str(e) and self.user_slack_client:
-                        logger.info(f"Bot not in channel #{channel_name}, trying with user token instead")
-                        response = self.user_slack_client.conversations_history(**params)
-                        messages = response.get("messages", [])
-                    else:
-                        # Re-raise if no user token or different error
-                        raise
-                
-                logger.info(f"Retrieved {len(messages)} messages from channel #{channel_name}")
-                
-                # Process pagination
-                cursor = response.get("response_metadata", {}).get("next_cursor")
-                has_more = bool(cursor)
-                
-                # Add messages to our list
-                if messages:
-                    # Filter out messages older than cutoff
-                    filtered_messages = []
-                    skipped_cutoff = 0
-                    for msg in messages:
-                        if "ts" in msg and float(msg["ts"]) >= cutoff_ts:
-                            filtered_messages.append(msg)
-                        else:
-                            skipped_cutoff += 1
-                    
-                    if skipped_cutoff > 0:
-                        logger.info(f"Skipped {skipped_cutoff} messages older than cutoff date {datetime.fromtimestamp(cutoff_ts).isoformat()}")
-                    
-                    all_messages.extend(filtered_messages)
-                    
-                    # Track timestamp range
-                    for msg in filtered_messages:
-                        if "ts" in msg:
-                            if not oldest_ts or float(msg["ts"]) < float(oldest_ts):
-                                oldest_ts = msg["ts"]
-                            if not newest_ts or float(msg["ts"]) > float(newest_ts):
-                                newest_ts = msg["ts"]
-                
-                # Don't hammer the API
-                await asyncio.sleep(0.5)
-                
-                # Limit to reasonable number of messages per channel to avoid overloading
-                if len(all_messages) >= 1000:
-                    logger.info(f"Reached 1000 message limit for channel {channel_name}")
-                    break
-            
-            except Exception as e:
-                logger.error(f"Error retrieving messages for channel {channel_name}: {str(e)}")
-                break
-        
-        # Return early if no messages
-        if not all_messages:
-            logger.info(f"No new messages found in channel {channel_name}")
-            return 0, 0, oldest_ts, newest_ts
-        
-        logger.info(f"Retrieved {len(all_messages)} messages from channel {channel_name}")
-        
-        # Debug message contents
-        for i, msg in enumerate(all_messages[:5]):  # Log first 5 messages as samples
-            log_msg = {
-                "ts": msg.get("ts"),
-                "has_text": "text" in msg and bool(msg["text"]),
-                "text_length": len(msg.get("text", "")) if "text" in msg else 0,
-                "has_attachments": "attachments" in msg and bool(msg["attachments"]),
-                "has_files": "files" in msg and bool(msg["files"]),
-                "has_thread_ts": "thread_ts" in msg
-            }
-            logger.debug(f"Message sample {i+1}: {json.dumps(log_msg)}")
-        
-        # Process and index the messages
+                response = await self.rate_limiter.call("conversations.replies", client.conversations_replies, **params)
+            except SlackApiError as e:
+                if "not_in_channel" in str(e) and self.user_slack_client and client is not self.user_slack_client:
+                    client = self.user_slack_client
+                    continue
+                raise
+            messages.extend(response.get("messages", []))
+            cursor = (response.get("response_metadata") or {}).get("next_cursor")
+            if not cursor:
+                return messages
+    
+    async def _upsert(self, embeddings: List[List[float]], payloads: List[Dict[str, Any]]) -> int:
+        stored = await upsert_message_embeddings(
+            self.async_qdrant_client,
+            self.index_status.collection_name,
+            embeddings,
+            payloads
+        )
+        await asyncio.to_thread(
+            self.lexical_index.upsert,
+            self.index_status.collection_name,
+            [(point_id_for(payload), payload) for payload in payloads]
+        )
+        return stored
+    
+    async def _ensure_lexical_index(self) -> None:
+        collection_name = self.index_status.collection_name
         try:
-            indexed_count = await self.index_messages(all_messages, channel_id, channel_name)
-            logger.info(f"Indexed {indexed_count}/{len(all_messages)} messages from channel #{channel_name}")
-            if indexed_count < len(all_messages):
-                logger.info(f"Skipped {len(all_messages) - indexed_count} messages in channel #{channel_name}")
-            return len(all_messages), indexed_count, oldest_ts, newest_ts
+            if await asyncio.to_thread(self.lexical_index.count, collection_name) == 0:
+                await asyncio.to_thread(self.lexical_index.rebuild, self.qdrant_client, collection_name)
         except Exception as e:
-            logger.error(f"Error indexing messages for channel {channel_name}: {str(e)}")
-            return len(all_messages), 0, oldest_ts, newest_ts
+            logger.error(f"Error rebuilding lexical index of {collection_name}: {str(e)}")
+    
+    async def _stored_hashes(self, point_ids: List[str]) -> Dict[str, str]:
+        return await get_stored_text_hashes(self.async_qdrant_client, self.index_status.collection_name, point_ids)
+    
+    async def _delete(self, point_ids: List[str]) -> int:
+        deleted = await delete_message_points(self.async_qdrant_client, self.index_status.collection_name, point_ids)
+        await asyncio.to_thread(
+            self.lexical_index.delete, self.index_status.collection_name, [str(point_id) for point_id in point_ids]
+        )
+        return deleted
+    
+    def event_ingester(self) -> SlackEventIngester:
+        """Create an ingester applying Slack events to this workspace's collection"""
+        channel_names = {
+            channel.channel_id: channel.channel_name
+            for channel in crud.get_indexed_channels(self.db, self.index_status.id)
+        }
+        return SlackEventIngester(
+            workspace_id=self.workspace.team_id,
+            pipeline_factory=lambda fetch_page: self._pipeline(fetch_page, cutoff_ts=0),
+            delete=self._delete,
+            channel_name=lambda channel_id: channel_names.get(channel_id, channel_id)
+        )
+    
+    def _save_checkpoint(self, channel: ChannelProgress, checkpoint: Dict[str, Any], indexed_messages: int) -> None:
+        """Save a channel's checkpoint once the pages before it are stored"""
+        crud.save_channel_checkpoint(
+            self.db,
+            index_id=self.index_status.id,
+            channel_id=channel.channel_id,
+            indexed_messages=indexed_messages,
+            **checkpoint
+        )
     
     async def index_messages(self, messages: List[Dict[str, Any]], channel_id: str, channel_name: str) -> int:
         """
@@ -448,98 +449,16 @@ class MessageIndexer:
         Returns:
             Number of messages indexed
         """
-        if not messages:
-            return 0
-        
-        # Extract text from messages
-        texts = []
-        payloads = []
-        skipped_messages = 0
-        skipped_reasons = {
-            "no_text": 0,
-            "empty_text": 0
-        }
-        
-        for msg in messages:
-            # Skip messages without text
-            if "text" not in msg:
-                skipped_messages += 1
-                skipped_reasons["no_text"] += 1
-                logger.debug(f"Skipping message {msg.get('ts')}: No text field. Keys: {list(msg.keys())}")
-                continue
-                
-            if not msg["text"]:
-                skipped_messages += 1
-                skipped_reasons["empty_text"] += 1
-                logger.debug(f"Skipping message {msg.get('ts')}: Empty text. Type: {type(msg['text'])}")
-                continue
-            
-            # Create text for embedding
-            text = msg["text"]
-            
-            # Add attachments if any
-            if "attachments" in msg and msg["attachments"]:
-                for attachment in msg["attachments"]:
-                    if "text" in attachment and attachment["text"]:
-                        text += f"\n{attachment['text']}"
-            
-            # Create payload
-            payload = {
-                "ts": float(msg["ts"]),
-                "text": msg["text"],
-                "user_id": msg.get("user", ""),
-                "channel_id": channel_id,
-                "channel_name": channel_name,
-                "has_attachments": "attachments" in msg and bool(msg["attachments"]),
-                "has_files": "files" in msg and bool(msg["files"]),
-                # TODO: Add timestamp as datetime for readability
-                "datetime": datetime.fromtimestamp(float(msg["ts"])).isoformat(),
-            }
-            
-            # Keep track of original message data
-            payload["original_msg"] = {
-                key: value for key, value in msg.items()
-                if key in ["user", "ts", "thread_ts", "reply_count", "reactions"]
-            }
-            
-            texts.append(text)
-            payloads.append(payload)
-        
-        if skipped_messages > 0:
-            logger.info(f"Skipped {skipped_messages} messages from channel {channel_name} during preprocessing")
-            logger.info(f"Skip reasons: {json.dumps(skipped_reasons)}")
-        
-        logger.info(f"Preparing to index {len(texts)} messages with valid text from channel {channel_name}")
-        
-        # Generate embeddings in batches
-        batch_size = settings.EMBEDDING_BATCH_SIZE
-        total_indexed = 0
-        
-        for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i:i + batch_size]
-            batch_payloads = payloads[i:i + batch_size]
-            
-            # Generate embeddings
-            try:
-                logger.debug(f"Generating embeddings for batch {i//batch_size+1} with {len(batch_texts)} messages")
-                batch_embeddings = self.embedding_model.encode(batch_texts).tolist()
-                
-                # Store in Qdrant
-                stored = store_message_embeddings(
-                    self.qdrant_client,
-                    self.index_status.collection_name,
-                    batch_embeddings,
-                    batch_payloads
-                )
-                
-                total_indexed += stored
-                logger.info(f"Indexed {stored} messages in batch ({i}-{i+len(batch_texts)})")
-                
-            except Exception as e:
-                logger.error(f"Error indexing batch {i//batch_size}: {str(e)}")
-                # Continue with next batch
-        
-        return total_indexed
+        async def fetch_page(channel_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+            return {"messages": messages}
+        
+        # Same path as a channel fetch, so unchanged and cached messages are skipped here too
+        pipeline = self._pipeline(fetch_page, cutoff_ts=0)
+        progress = await pipeline.run([ChannelJob(channel_id, channel_name)])
+        channel = progress[channel_id]
+        if channel.skipped:
+            logger.info(f"Skipped {channel.skipped} messages without text from channel {channel_name}")
+        return channel.indexed
 
 async def process_workspace(workspace_id: int, force_full: bool = False):
     """
@@ -588,7 +507,8 @@ async def process_workspace(workspace_id: int, force_full: bool = False):
             "success": True,
             "total_messages": total_messages,
             "indexed_messages": indexed_messages,
-            "elapsed_time": elapsed_time
+            "elapsed_time": elapsed_time,
+            "pipeline": indexer.last_run_stats
         }
     
     except Exception as e:
@@ -605,6 +525,72 @@ async def process_workspace(workspace_id: int, force_full: bool = False):
             "error": str(e)
         }
 
+async def replay_event_file(workspace_id: int, path: str) -> Dict[str, Any]:
+    """
+    Apply recorded Slack Events API payloads to a workspace's collection
+    
+    Args:
+        workspace_id: ID of the workspace
+        path: File with one event payload per line
+        
+    Returns:
+        Totals over all batches
+    """
+    indexer = MessageIndexer(workspace_id)
+    ingester = indexer.event_ingester()
+    totals: Dict[str, Any] = {}
+    
+    batch: List[Dict[str, Any]] = []
+    for payload in read_event_file(path):
+        batch.append(payload)
+        if len(batch) >= settings.EVENTS_BATCH_SIZE:
+            for key, value in (await ingester.ingest(batch)).to_dict().items():
+                totals[key] = totals.get(key, 0) + value
+            batch = []
+    if batch:
+        for key, value in (await ingester.ingest(batch)).to_dict().items():
+            totals[key] = totals.get(key, 0) + value
+    return totals
+
+# Event queues per Slack team ID, each drained by one consumer task
+_event_queues: Dict[str, asyncio.Queue] = {}
+
+async def enqueue_slack_event(payload: Dict[str, Any]) -> bool:
+    """
+    Queue a Slack Events API payload for incremental ingestion
+    
+    The first event of a team starts a consumer that loads the workspace's
+    indexer and applies events in batches.
+    
+    Args:
+        payload: event_callback payload
+        
+    Returns:
+        True if the event was queued, False if the team has no message index
+    """
+    team_id = payload.get("team_id")
+    queue = _event_queues.get(team_id)
+    if queue is None:
+        db = next(get_db())
+        workspace = crud.get_workspace_by_team_id(db, team_id) if team_id else None
+        if not workspace or not crud.get_indexing_status(db, workspace.id):
+            return False
+        queue = asyncio.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+        _event_queues[team_id] = queue
+        asyncio.create_task(_consume_events(team_id, workspace.id, queue))
+    await queue.put(payload)
+    return True
+
+async def _consume_events(team_id: str, workspace_id: int, queue: asyncio.Queue) -> None:
+    try:
+        # Loading the embedding model blocks, so build the indexer in a worker thread
+        indexer = await asyncio.to_thread(MessageIndexer, workspace_id)
+        await indexer.event_ingester().consume(queue)
+    except Exception as e:
+        logger.error(f"Error ingesting Slack events for workspace {workspace_id}: {str(e)}")
+    finally:
+        _event_queues.pop(team_id, None)
+
 async def run_scheduled_indexing():
     """
     Run scheduled indexing for workspaces that need updates
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from slack_sdk.errors import SlackApiError
+
+from ..config import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Requests per minute allowed by each Slack rate limit tier
+SLACK_TIER_LIMITS = {1: 1, 2: 20, 3: 50, 4: 100}
+
+# Tier of each Web API method used by the indexer (others default to tier 3)
+SLACK_METHOD_TIERS = {
+    "auth.test": 4,
+    "conversations.list": 2,
+    "conversations.history": 3,
+    "conversations.replies": 3,
+    "conversations.info": 3,
+    "users.info": 4,
+}
+
+DEFAULT_TIER = 3
+
+
+def retry_after_seconds(headers: Optional[Dict[str, str]], default: float = 1.0) -> float:
+    """
+    Read the Retry-After header of a 429 response
+
+    HTTP header names are case-insensitive and proxies often lowercase them,
+    while the Slack SDK hands headers over as a plain dict.
+
+    Args:
+        headers: Response headers
+        default: Seconds to wait when the header is missing or not a number
+
+    Returns:
+        Seconds to wait before retrying
+    """
+    for name, value in (headers or {}).items():
+        if name.lower() == "retry-after":
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return default
+    return default
+
+
+class SlackRateLimiter:
+    """
+    Paces Slack Web API calls per method according to Slack's rate limit tiers
+
+    Slack limits each app per workspace and per method, so concurrent channel
+    fetchers share one limiter. Calls are spaced with the generic cell rate
+    algorithm, which allows a short burst and then a steady rate. A 429
+    response pauses the method for the Retry-After period before the call is
+    retried.
+    """
+
+    def __init__(
+        self,
+        factor: Optional[float] = None,
+        burst: Optional[int] = None,
+        requests_per_minute: Optional[Dict[str, float]] = None,
+        max_retries: int = 3
+    ):
+        """
+        Initialize the rate limiter
+
+        Args:
+            factor: Fraction of each tier's limit to use (default from settings)
+            burst: Calls per method allowed back to back (default from settings)
+            requests_per_minute: Per-method limits overriding the tiers
+            max_retries: Retries of a call that was rate limited
+        """
+        self.factor = factor if factor is not None else settings.SLACK_RATE_LIMIT_FACTOR
+        self.burst = max(1, burst if burst is not None else settings.SLACK_RATE_LIMIT_BURST)
+        self.requests_per_minute = requests_per_minute or {}
+        self.max_retries = max_retries
+        self._arrival: Dict[str, float] = {}
+        self._paused_until: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+        self.calls = 0
+        self.rate_limited = 0
+        self.waited_seconds = 0.0
+
+    def interval(self, method: str) -> float:
+        """Seconds between calls of a method at its sustained rate"""
+        per_minute = self.requests_per_minute.get(method)
+        if per_minute is None:
+            per_minute = SLACK_TIER_LIMITS[SLACK_METHOD_TIERS.get(method, DEFAULT_TIER)] * self.factor
+        return 60.0 / per_minute
+
+    async def acquire(self, method: str) -> None:
+        """Wait until a call of a method is allowed"""
+        async with self._lock:
+            now = time.monotonic()
+            interval = self.interval(method)
+            arrival = max(self._arrival.get(method, now), now)
+            start = max(arrival - (self.burst - 1) * interval, now, self._paused_until.get(method, now))
+            self._arrival[method] = max(arrival, start) + interval
+        wait = start - now
+        if wait > 0:
+            self.waited_seconds += wait
+            await asyncio.sleep(wait)
+
+    def backoff(self, method: str, seconds: float) -> None:
+        """Pause a method after Slack answered 429 Too Many Requests"""
+        until = time.monotonic() + seconds
+        self._paused_until[method] = max(self._paused_until.get(method, 0.0), until)
+        self.rate_limited += 1
+        logger.warning(f"Slack rate limited {method}, pausing for {seconds:.1f} seconds")
+
+    async def call(self, method: str, func: Callable[..., Any], **kwargs) -> Any:
+        """
+        Call a blocking Slack SDK method in a worker thread once the limiter allows it
+
+        Args:
+            method: Web API method name (e.g. "conversations.history")
+            func: Bound WebClient method
+            **kwargs: Arguments for the call
+
+        Returns:
+            The Slack response
+        """
+        for attempt in range(self.max_retries + 1):
+            await self.acquire(method)
+            self.calls += 1
+            try:
+                return await asyncio.to_thread(func, **kwargs)
+            except SlackApiError as e:
+                response = getattr(e, "response", None)
+                if getattr(response, "status_code", None) != 429 or attempt == self.max_retries:
+                    raise
+                self.backoff(method, retry_after_seconds(getattr(response, "headers", None)))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Calls made, calls rate limited by Slack, and time spent waiting"""
+        return {
+            "calls": self.calls,
+            "rate_limited": self.rate_limited,
+            "waited_seconds": round(self.waited_seconds, 3),
+        }
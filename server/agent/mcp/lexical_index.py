@@ -0,0 +1,247 @@
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from qdrant_client import QdrantClient
+
+from .config import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Words of a query, keeping identifiers such as PROJ-1234 or ERR_TIMEOUT together
+_QUERY_TOKEN = re.compile(r"[\w][\w\-\.:/#@]*", re.UNICODE)
+
+
+def _table(collection_name: str) -> str:
+    return "messages_" + re.sub(r"\W", "_", collection_name)
+
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    Turn a search query into an FTS5 MATCH expression
+
+    Each word is quoted, so punctuation inside identifiers is matched as a
+    phrase ("PROJ-1234" matches the tokens proj and 1234 next to each other)
+    instead of being read as FTS5 syntax. Words are OR-ed and BM25 ranks
+    messages containing more of them, and rarer ones, first.
+
+    Args:
+        query: Search query as typed
+
+    Returns:
+        MATCH expression, or None if the query has no words
+    """
+    words = _QUERY_TOKEN.findall(query)
+    if not words:
+        return None
+    return " OR ".join('"' + word.replace('"', '""') + '"' for word in dict.fromkeys(words))
+
+
+class LexicalIndex:
+    """
+    BM25 inverted index over indexed message text, kept next to the Qdrant collections
+
+    Vector search finds messages about the same thing, but exact terms
+    (ticket IDs, error codes, names) are better found by the words
+    themselves. Each collection gets a SQLite FTS5 table, which is an
+    inverted index ranked with BM25, plus a table of the filterable fields
+    (channel, user, ts) keyed by Qdrant point ID. The indexer writes to it
+    whenever it writes points, so both indexes hold the same messages.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the index
+
+        Args:
+            path: SQLite file (default from settings; ":memory:" keeps the index in memory)
+        """
+        self.path = path or settings.LEXICAL_INDEX_PATH
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._tables = set()
+
+    def _ensure_tables(self, collection_name: str) -> str:
+        table = _table(collection_name)
+        if table not in self._tables:
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table}_docs (id INTEGER PRIMARY KEY, point_id TEXT UNIQUE NOT NULL, "
+                f"channel_id TEXT, user_id TEXT, ts REAL)"
+            )
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS {table}_docs_ts ON {table}_docs (ts)")
+            self._db.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {table}_text USING fts5(text)")
+            self._db.commit()
+            self._tables.add(table)
+        return table
+
+    def _delete_ids(self, table: str, point_ids: Iterable[str]) -> int:
+        deleted = 0
+        for point_id in point_ids:
+            row = self._db.execute(f"SELECT id FROM {table}_docs WHERE point_id = ?", (point_id,)).fetchone()
+            if row is None:
+                continue
+            self._db.execute(f"DELETE FROM {table}_text WHERE rowid = ?", (row[0],))
+            self._db.execute(f"DELETE FROM {table}_docs WHERE id = ?", (row[0],))
+            deleted += 1
+        return deleted
+
+    def upsert(self, collection_name: str, documents: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Add or replace messages
+
+        Args:
+            collection_name: Qdrant collection the messages belong to
+            documents: (point ID, payload) pairs; payloads as built by prepare_message
+
+        Returns:
+            Number of messages written
+        """
+        documents = list(documents)
+        with self._lock:
+            table = self._ensure_tables(collection_name)
+            self._delete_ids(table, [point_id for point_id, _ in documents])
+            for point_id, payload in documents:
+                cursor = self._db.execute(
+                    f"INSERT INTO {table}_docs (point_id, channel_id, user_id, ts) VALUES (?, ?, ?, ?)",
+                    (point_id, payload.get("channel_id"), payload.get("user_id"), payload.get("ts"))
+                )
+                self._db.execute(
+                    f"INSERT INTO {table}_text (rowid, text) VALUES (?, ?)",
+                    (cursor.lastrowid, payload.get("text") or "")
+                )
+            self._db.commit()
+        return len(documents)
+
+    def delete(self, collection_name: str, point_ids: Iterable[str]) -> int:
+        """Remove messages by point ID"""
+        with self._lock:
+            table = self._ensure_tables(collection_name)
+            deleted = self._delete_ids(table, point_ids)
+            self._db.commit()
+        return deleted
+
+    def delete_older_than(self, collection_name: str, cutoff_ts: float) -> int:
+        """Remove messages older than the history cutoff, as delete_old_messages does in Qdrant"""
+        with self._lock:
+            table = self._ensure_tables(collection_name)
+            self._db.execute(f"DELETE FROM {table}_text WHERE rowid IN (SELECT id FROM {table}_docs WHERE ts < ?)", (cutoff_ts,))
+            deleted = self._db.execute(f"DELETE FROM {table}_docs WHERE ts < ?", (cutoff_ts,)).rowcount
+            self._db.commit()
+        return deleted
+
+    def count(self, collection_name: str) -> int:
+        """Number of messages indexed for a collection"""
+        with self._lock:
+            table = self._ensure_tables(collection_name)
+            return self._db.execute(f"SELECT COUNT(*) FROM {table}_docs").fetchone()[0]
+
+    def search(
+        self,
+        collection_name: str,
+        query: str,
+        limit: int = 20,
+        channels: Optional[List[str]] = None,
+        users: Optional[List[str]] = None,
+        ts_from: Optional[float] = None,
+        ts_to: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find messages by their words, best BM25 score first
+
+        Args:
+            collection_name: Qdrant collection to search
+            query: Search query
+            limit: Maximum number of results
+            channels: Only messages from these channel IDs
+            users: Only messages from these user IDs
+            ts_from: Only messages at or after this timestamp
+            ts_to: Only messages at or before this timestamp
+
+        Returns:
+            List of (point ID, score) pairs, higher scores first
+        """
+        expression = match_expression(query)
+        if expression is None:
+            return []
+
+        conditions = [f"{_table(collection_name)}_text MATCH ?"]
+        params: List[Any] = [expression]
+        if channels:
+            conditions.append(f"d.channel_id IN ({', '.join('?' * len(channels))})")
+            params.extend(channels)
+        if users:
+            conditions.append(f"d.user_id IN ({', '.join('?' * len(users))})")
+            params.extend(users)
+        if ts_from is not None:
+            conditions.append("d.ts >= ?")
+            params.append(ts_from)
+        if ts_to is not None:
+            conditions.append("d.ts <= ?")
+            params.append(ts_to)
+        params.append(limit)
+
+        with self._lock:
+            table = self._ensure_tables(collection_name)
+            # bm25() is lower for better matches
+            rows = self._db.execute(
+                f"SELECT d.point_id, bm25({table}_text) AS rank FROM {table}_text "
+                f"JOIN {table}_docs d ON d.id = {table}_text.rowid "
+                f"WHERE {' AND '.join(conditions)} ORDER BY rank LIMIT ?",
+                params
+            ).fetchall()
+        return [(point_id, -rank) for point_id, rank in rows]
+
+    def rebuild(self, client: QdrantClient, collection_name: str, batch_size: int = 1000) -> int:
+        """
+        Index every message already stored in a Qdrant collection
+
+        Used when the lexical index is newer than the collection, since the
+        indexer skips messages that have not changed.
+
+        Args:
+            client: QdrantClient instance
+            collection_name: Collection to read
+            batch_size: Points read per scroll request
+
+        Returns:
+            Number of messages indexed
+        """
+        total = 0
+        offset = None
+        while True:
+            points, offset = client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=["text", "channel_id", "user_id", "ts"],
+                with_vectors=False
+            )
+            total += self.upsert(collection_name, ((str(point.id), point.payload or {}) for point in points))
+            if offset is None:
+                break
+        logger.info(f"Rebuilt lexical index of {collection_name} with {total} messages")
+        return total
+
+
+# Global index instance
+_lexical_index = None
+
+def get_lexical_index() -> LexicalIndex:
+    """
+    Get or create the lexical index
+
+    Returns:
+        LexicalIndex instance
+    """
+    global _lexical_index
+
+    if _lexical_index is None:
+        _lexical_index = LexicalIndex()
+
+    return _lexical_index
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Collection migration script to apply a storage profile to existing Qdrant collections.
+Run this script manually after changing MCP_QDRANT_COLLECTION_PROFILE or its overrides.
+
+Usage:
+    python -m agent.mcp.migrate_collections --profile balanced --dry-run
+    python -m agent.mcp.migrate_collections --profile low_memory --collection slack_messages_T123
+"""
+import argparse
+import logging
+import os
+import sys
+from typing import Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Add the parent directory to path so we can import the module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(os.path.dirname(current_dir))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from qdrant_client import QdrantClient
+
+from agent.mcp.config import settings
+from agent.mcp.collection_profiles import PROFILES, get_collection_profile, migrate_collection
+
+def run_migration(
+    client: QdrantClient,
+    profile_name: Optional[str] = None,
+    collection_names: Optional[List[str]] = None,
+    dry_run: bool = False
+) -> Dict[str, List[str]]:
+    """
+    Apply a storage profile to collections
+
+    Args:
+        client: QdrantClient instance
+        profile_name: Profile to apply (default: MCP_QDRANT_COLLECTION_PROFILE)
+        collection_names: Collections to migrate (default: all collections)
+        dry_run: Only report the changes
+
+    Returns:
+        Dictionary of collection name to the changes made (or that would be made)
+    """
+    profile = get_collection_profile(profile_name)
+    if not collection_names:
+        collection_names = [c.name for c in client.get_collections().collections]
+
+    results = {}
+    for collection_name in collection_names:
+        try:
+            results[collection_name] = migrate_collection(client, collection_name, profile, dry_run=dry_run)
+        except Exception as e:
+            logger.error(f"Error migrating collection {collection_name}: {str(e)}")
+            results[collection_name] = [f"error: {str(e)}"]
+    return results
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Apply a storage profile to existing Qdrant collections")
+    parser.add_argument("--profile", choices=sorted(PROFILES), help="Profile to apply (default: MCP_QDRANT_COLLECTION_PROFILE)")
+    parser.add_argument("--collection", action="append", dest="collections", help="Collection to migrate (repeatable, default: all)")
+    parser.add_argument("--url", help="Qdrant URL (default: MCP_QDRANT_HOST on port 6333)")
+    parser.add_argument("--dry-run", action="store_true", help="Only show what would change")
+    args = parser.parse_args(argv)
+
+    client = QdrantClient(url=args.url) if args.url else QdrantClient(host=settings.QDRANT_HOST, port=6333, timeout=settings.QDRANT_TIMEOUT)
+    results = run_migration(client, args.profile, args.collections, dry_run=args.dry_run)
+
+    for collection_name, changes in results.items():
+        logger.info(f"{collection_name}: {'; '.join(changes) if changes else 'no changes'}")
+    return 1 if any(change.startswith("error:") for changes in results.values() for change in changes) else 0
+
+if __name__ == "__main__":
+    logger.info("Starting collection migration...")
+    sys.exit(main())
@@ -24,6 +24,9 @@ class SearchQuery(BaseModel):
     date_to: Optional[datetime] = None
     users: Optional[List[str]] = None
     limit: int = 20
+    # vector, hybrid or lexical (default: MCP_SEARCH_MODE). Message "score" is the
+    # cosine similarity in every mode; hybrid adds "fused_score", which orders the results
+    mode: Optional[str] = None
     # Optional user_id for direct credential authentication
     user_id: Optional[int] = None
 
@@ -33,6 +36,9 @@ class SearchResult(BaseModel):
     messages: List[Dict[str, Any]]
     total: int
     query_time_ms: float
+    mode: str = "vector"
+    # Milliseconds spent in each step (vector_ms, lexical_ms, fusion_ms, fetch_ms)
+    timings: Dict[str, float] = {}
 
 
 class IndexingRequest(BaseModel):
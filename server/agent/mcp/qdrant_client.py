@@ -1,20 +1,31 @@
 import os
 import logging
+import uuid
 from typing import Optional, Dict, Any, List
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.http import models as qdrant_models
 from qdrant_client.http.exceptions import UnexpectedResponse
-from qdrant_client.http.models import Distance, VectorParams, PointStruct
+from qdrant_client.http.models import Distance, PointStruct
 from qdrant_client.http.models import CollectionStatus
 import time
 
 from .config import settings
+from .collection_profiles import CollectionProfile, get_collection_profile
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Global client instance
+# Namespace for message point IDs, so an ID only depends on the message it stores
+MESSAGE_POINT_NAMESPACE = uuid.UUID("5b1c7a53-2f6e-4d8a-9c1e-6f0d3a8b4e27")
+
+# Points written before message IDs became deterministic have integer IDs and no text hash
+LEGACY_MESSAGE_FILTER = qdrant_models.Filter(
+    must=[qdrant_models.IsEmptyCondition(is_empty=qdrant_models.PayloadField(key="text_hash"))]
+)
+
+# Global client instances
 _qdrant_client = None
+_async_qdrant_client = None
 
 def get_qdrant_client() -> QdrantClient:
     """
@@ -49,13 +60,39 @@ def get_qdrant_client() -> QdrantClient:
     
     return _qdrant_client
 
-def initialize_collection(client: QdrantClient, collection_name: str):
+def get_async_qdrant_client() -> AsyncQdrantClient:
+    """
+    Get or create the async Qdrant client used by the indexing pipeline
+    
+    Returns:
+        AsyncQdrantClient for the same server as get_qdrant_client()
+    """
+    global _async_qdrant_client
+    
+    if _async_qdrant_client is None:
+        _async_qdrant_client = AsyncQdrantClient(
+            host=settings.QDRANT_HOST,
+            port=6333,  # Use the container's internal port
+            prefer_grpc=settings.QDRANT_PREFER_GRPC,
+            timeout=settings.QDRANT_TIMEOUT
+        )
+    
+    return _async_qdrant_client
+
+def initialize_collection(
+    client: QdrantClient,
+    collection_name: str,
+    profile: Optional[CollectionProfile] = None,
+    vector_size: int = 384
+):
     """
     Initialize a collection in Qdrant for storing message embeddings
     
     Args:
         client: QdrantClient instance
         collection_name: Name of the collection to create
+        profile: Storage profile (default: MCP_QDRANT_COLLECTION_PROFILE)
+        vector_size: Embedding dimensions (384 for all-MiniLM-L6-v2)
     """
     try:
         # Check if collection already exists
@@ -66,19 +103,16 @@ def initialize_collection(client: QdrantClient, collection_name: str):
             logger.info(f"Collection {collection_name} already exists")
             return
         
-        # Create collection with proper schema
-        logger.info(f"Creating collection {collection_name}")
+        profile = profile or get_collection_profile()
         
-        # Default to all-MiniLM-L6-v2 which uses 384-dimensional embeddings
-        vector_size = 384
+        # Create collection with proper schema
+        logger.info(f"Creating collection {collection_name} with profile {profile.name} "
+                    f"(quantization: {profile.quantization}, on_disk vectors: {profile.on_disk_vectors})")
         
         # Create collection
         client.create_collection(
             collection_name=collection_name,
-            vectors_config=VectorParams(
-                size=vector_size,
-                distance=Distance.COSINE
-            )
+            **profile.create_kwargs(vector_size, Distance.COSINE)
         )
         
         # Wait for collection to be created
@@ -124,22 +158,7 @@ def store_message_embeddings(
     if not embeddings or not payloads:
         return 0
     
-    if len(embeddings) != len(payloads):
-        raise ValueError("Must have same number of embeddings and payloads")
-    
-    # Create points
-    points = []
-    for i, (embedding, payload) in enumerate(zip(embeddings, payloads)):
-        # Use timestamp as ID to avoid duplicates
-        # Convert to int and ensure it's unique by adding index
-        ts = payload.get("ts", 0)
-        point_id = int(ts * 1000000) + i
-        
-        points.append(PointStruct(
-            id=point_id,
-            vector=embedding,
-            payload=payload
-        ))
+    points = _message_points(embeddings, payloads)
     
     # Store in Qdrant
     try:
@@ -154,6 +173,155 @@ def store_message_embeddings(
         logger.error(f"Error storing points: {str(e)}")
         raise
 
+async def upsert_message_embeddings(
+    client: AsyncQdrantClient,
+    collection_name: str,
+    embeddings: List[List[float]],
+    payloads: List[Dict[str, Any]]
+) -> int:
+    """
+    Store message embeddings in Qdrant without blocking the event loop
+    
+    Args:
+        client: AsyncQdrantClient instance
+        collection_name: Name of the collection
+        embeddings: List of embedding vectors
+        payloads: List of message payloads
+        
+    Returns:
+        Number of points stored
+    """
+    if not embeddings or not payloads:
+        return 0
+    
+    points = _message_points(embeddings, payloads)
+    await client.upsert(collection_name=collection_name, points=points)
+    logger.debug(f"Stored {len(points)} points in collection {collection_name}")
+    return len(points)
+
+def message_point_id(workspace_id: str, channel_id: str, ts: str) -> str:
+    """
+    Get the Qdrant point ID of a Slack message
+    
+    The ID is a UUID derived from the workspace, channel and message ts, so
+    re-indexing a message overwrites its point instead of adding another one.
+    
+    Args:
+        workspace_id: Slack team ID
+        channel_id: Slack channel ID
+        ts: Message ts as Slack returns it (e.g. "1700000000.000100")
+        
+    Returns:
+        Point ID as a UUID string
+    """
+    return str(uuid.uuid5(MESSAGE_POINT_NAMESPACE, f"{workspace_id}/{channel_id}/{ts}"))
+
+def point_id_for(payload: Dict[str, Any]) -> str:
+    """Get the point ID of a message payload built by prepare_message"""
+    # The original ts string is exact, the float in "ts" is rounded
+    ts = (payload.get("original_msg") or {}).get("ts") or f"{payload.get('ts', 0):.6f}"
+    return message_point_id(payload.get("workspace_id", ""), payload.get("channel_id", ""), ts)
+
+async def get_stored_text_hashes(
+    client: AsyncQdrantClient,
+    collection_name: str,
+    point_ids: List[str]
+) -> Dict[str, str]:
+    """
+    Get the text hash stored with each of some message points
+    
+    Args:
+        client: AsyncQdrantClient instance
+        collection_name: Name of the collection
+        point_ids: Point IDs to look up
+        
+    Returns:
+        Dictionary of point ID to text hash, for the points that exist
+    """
+    if not point_ids:
+        return {}
+    
+    records = await client.retrieve(
+        collection_name=collection_name,
+        ids=point_ids,
+        with_payload=["text_hash"],
+        with_vectors=False
+    )
+    return {
+        str(record.id): record.payload["text_hash"]
+        for record in records if record.payload and record.payload.get("text_hash")
+    }
+
+async def delete_message_points(
+    client: AsyncQdrantClient,
+    collection_name: str,
+    point_ids: List[str]
+) -> int:
+    """
+    Delete individual message points, e.g. for messages deleted in Slack
+    
+    Args:
+        client: AsyncQdrantClient instance
+        collection_name: Name of the collection
+        point_ids: Point IDs from message_point_id()
+        
+    Returns:
+        Number of points requested for deletion
+    """
+    if not point_ids:
+        return 0
+    
+    await client.delete(
+        collection_name=collection_name,
+        points_selector=qdrant_models.PointIdsList(points=point_ids)
+    )
+    logger.debug(f"Deleted {len(point_ids)} points from collection {collection_name}")
+    return len(point_ids)
+
+async def get_legacy_message_point_ids(
+    client: AsyncQdrantClient,
+    collection_name: str,
+    batch_size: int = 1000
+) -> List[Any]:
+    """
+    Get the IDs of message points stored before point IDs were derived with message_point_id()
+    
+    Re-indexing writes those messages again under their new IDs, so the old
+    points have to be deleted once the re-index has run.
+    
+    Args:
+        client: AsyncQdrantClient instance
+        collection_name: Name of the collection
+        batch_size: Points read per scroll request
+        
+    Returns:
+        List of legacy point IDs
+    """
+    point_ids = []
+    offset = None
+    while True:
+        points, offset = await client.scroll(
+            collection_name=collection_name,
+            scroll_filter=LEGACY_MESSAGE_FILTER,
+            limit=batch_size,
+            offset=offset,
+            with_payload=False,
+            with_vectors=False
+        )
+        point_ids.extend(point.id for point in points)
+        if offset is None:
+            return point_ids
+
+def _message_points(embeddings: List[List[float]], payloads: List[Dict[str, Any]]) -> List[PointStruct]:
+    if len(embeddings) != len(payloads):
+        raise ValueError("Must have same number of embeddings and payloads")
+    
+    # Points are keyed by workspace, channel and ts, so upserting a message again replaces it
+    return [
+        PointStruct(id=point_id_for(payload), vector=embedding, payload=payload)
+        for embedding, payload in zip(embeddings, payloads)
+    ]
+
 def delete_old_messages(client: QdrantClient, collection_name: str, cutoff_ts: float) -> int:
     """
     Delete messages older than the cutoff timestamp
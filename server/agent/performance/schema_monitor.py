@@ -86,6 +86,7 @@ class SchemaMonitor:
             schema_metadata = await get_schema_metadata(
                 conn_uri=self.conn_uri, 
                 db_type=self.db_type, 
+                incremental=True,
                 **self.kwargs
             )
             
@@ -53,9 +53,9 @@ Your task is to produce a JSON object that defines the query plan with the follo
 
 For each database type, you must format params differently:
 
-- **postgres**: `{"query": "SQL query string", "params": ["optional", "parameters"]}`
+- **postgres**: `{"query": "SQL query string", "params": ["optional", "parameters"]}` — put literal values (dates, ids, names, thresholds) in `params` and reference them as `$1`, `$2`, ... in the query instead of inlining them
 - **mongodb**: `{"collection": "collection_name", "pipeline": [{"$match": {}}, ...]}`
-- **qdrant**: `{"collection": "collection_name", "vector": [...], "filter": {}, "limit": 10}`
+- **qdrant**: `{"collection": "collection_name", "query_text": "text to search for", "filter": {}, "limit": 10}` — give `query_text` and leave out `vector`; the text is embedded before execution
 - **slack**: `{"channels": ["list"], "query": "text", "date_from": "ISO-date", "date_to": "ISO-date"}`
 
 # Response (valid JSON only)
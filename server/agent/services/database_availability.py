@@ -151,6 +151,12 @@ class DatabaseAvailabilityService:
             # Get connection details (sanitized)
             connection_details = self._get_connection_details(db_config)
             
+            # Report read replica health for sources that route reads to replicas
+            if hasattr(adapter, 'replica_status'):
+                replica_status = adapter.replica_status()
+                if replica_status.get('replicas'):
+                    connection_details['replicas'] = replica_status['replicas']
+            
             logger.info(f"✅ Database {db_name} is ONLINE (response time: {response_time:.0f}ms)")
             
             return DatabaseStatus(
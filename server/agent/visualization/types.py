@@ -2,12 +2,15 @@
 Type definitions for the visualization system
 """
 
-from typing import Dict, List, Optional, Any, Union, Literal
+from typing import Dict, List, Optional, Any, Union, Literal, TYPE_CHECKING
 from dataclasses import dataclass
 from datetime import datetime
 import numpy as np
 import pandas as pd
 
+if TYPE_CHECKING:
+    from ..db.columnar import ColumnarResult
+
 # Chart types supported by the system
 ChartType = Literal[
     'scatter', 'line', 'bar', 'histogram', 'box_plot', 'violin_plot',
@@ -79,6 +82,22 @@ class VisualizationDataset:
     def size(self) -> int:
         return len(self.data)
 
+    @classmethod
+    def from_columnar(
+        cls,
+        result: 'ColumnarResult',
+        metadata: Optional[Dict[str, Any]] = None,
+        source_info: Optional[Dict[str, Any]] = None
+    ) -> 'VisualizationDataset':
+        """Create a dataset straight from a ColumnarResult without row dicts"""
+        df = result.to_pandas()
+        return cls(
+            data=df,
+            columns=list(df.columns),
+            metadata=metadata or {},
+            source_info=source_info or {}
+        )
+
     def merge(self, other: 'VisualizationDataset') -> None:
         """Merge another dataset into this one"""
         self.data = pd.concat([self.data, other.data], ignore_index=True)
@@ -51,6 +51,20 @@ def create_app() -> FastAPI:
         """Health check endpoint"""
         return {"status": "healthy", "service": "ceneca-agent"}
 
+    @app.on_event("shutdown")
+    async def close_connection_pools():
+        """Close shared database connection pools"""
+        from agent.db.pool_manager import close_pool_manager
+        from agent.db.mongo_client_manager import close_mongo_clients
+        from agent.db.mongo_result_cache import close_mongo_result_cache
+        from agent.db.adapters.qdrant import close_embedding_session
+        from agent.db.qdrant_client_manager import close_qdrant_clients
+        await close_pool_manager()
+        await close_mongo_result_cache()
+        close_mongo_clients()
+        await close_qdrant_clients()
+        await close_embedding_session()
+
     return app
 
 def main():
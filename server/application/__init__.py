@@ -92,6 +92,48 @@ def create_app():
             
         except Exception as e:
             logger.error(f"Error cleaning up database availability monitoring: {e}")
+            
+        # Close shared PostgreSQL connection pools
+        try:
+            from agent.db.pool_manager import close_pool_manager
+            
+            await close_pool_manager()
+            logger.info("🔌 PostgreSQL connection pools closed")
+            
+        except Exception as e:
+            logger.error(f"Error closing PostgreSQL connection pools: {e}")
+            
+        # Close shared MongoDB clients
+        try:
+            from agent.db.mongo_client_manager import close_mongo_clients
+            from agent.db.mongo_result_cache import close_mongo_result_cache
+            
+            await close_mongo_result_cache()
+            close_mongo_clients()
+            logger.info("🔌 MongoDB clients closed")
+            
+        except Exception as e:
+            logger.error(f"Error closing MongoDB clients: {e}")
+            
+        # Close shared Qdrant clients
+        try:
+            from agent.db.qdrant_client_manager import close_qdrant_clients
+            
+            await close_qdrant_clients()
+            logger.info("🔌 Qdrant clients closed")
+            
+        except Exception as e:
+            logger.error(f"Error closing Qdrant clients: {e}")
+            
+        # Close the shared embedding HTTP session
+        try:
+            from agent.db.adapters.qdrant import close_embedding_session
+            
+            await close_embedding_session()
+            logger.info("🔌 Embedding HTTP session closed")
+            
+        except Exception as e:
+            logger.error(f"Error closing embedding HTTP session: {e}")
     
     # Add IP filtering middleware for VPN restriction
     settings = get_settings()
@@ -0,0 +1,125 @@
+"""
+MongoDB Test Fixtures
+
+This module contains the fake Motor cursor, collection and database shared
+by the MongoDB tests, so no live MongoDB server is required.
+"""
+
+import asyncio
+from contextlib import contextmanager
+
+IXSCAN_PLAN = {"queryPlanner": {
+    "winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}},
+    "rejectedPlans": [{"stage": "COLLSCAN"}]
+}}
+
+
+class ConcurrencyTracker:
+    """Counts cursors being read at the same time, across collections"""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+
+    @contextmanager
+    def reading(self):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            yield
+        finally:
+            self.active -= 1
+
+
+class FakeCursor:
+    """Async cursor over a fixed list of documents, waiting for the collection's delay before reading"""
+
+    def __init__(self, docs, collection):
+        self.docs = list(docs)
+        self.collection = collection
+        self.position = 0
+        self.closed = False
+
+    async def to_list(self, length=None):
+        await asyncio.sleep(self.collection.delay)
+        end = len(self.docs) if length is None else self.position + length
+        batch = self.docs[self.position:end]
+        self.position += len(batch)
+        return batch
+
+    async def close(self):
+        self.closed = True
+
+    def limit(self, n):
+        return FakeCursor(self.docs[:n], self.collection)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        with self.collection.tracker.reading():
+            await asyncio.sleep(self.collection.delay)
+            while self.position < len(self.docs):
+                self.position += 1
+                yield self.docs[self.position - 1]
+                await asyncio.sleep(0)
+
+
+class FakeCollection:
+    """
+    Collection over a list of documents, recording the aggregations it runs
+
+    A leading $sample stage limits the documents returned. Subclasses
+    override results() for other answers.
+    """
+
+    def __init__(self, docs=(), delay=0.0, size=None, tracker=None):
+        self.docs = list(docs)
+        self.delay = delay
+        self.size = size
+        self.tracker = tracker or ConcurrencyTracker()
+        self.indexes = {"_id_": {"key": [("_id", 1)]}}
+        self.aggregations = []
+        self.cursors = []
+
+    def results(self, pipeline):
+        if pipeline and "$sample" in pipeline[0]:
+            return self.docs[:pipeline[0]["$sample"]["size"]]
+        return self.docs
+
+    def aggregate(self, pipeline, **kwargs):
+        self.aggregations.append((pipeline, kwargs))
+        self.cursors.append(FakeCursor(self.results(pipeline), self))
+        return self.cursors[-1]
+
+    def find(self, query=None, projection=None, **kwargs):
+        return FakeCursor(self.docs, self)
+
+    async def count_documents(self, query):
+        return len(self.docs)
+
+    async def estimated_document_count(self):
+        return self.size if self.size is not None else len(self.docs)
+
+    async def index_information(self):
+        return self.indexes
+
+
+class FakeDatabase(dict):
+    """Database mapping collection names to fake collections, answering explain with a fixed plan"""
+
+    name = "shop"
+
+    def __init__(self, plan=IXSCAN_PLAN, **collections):
+        super().__init__(**collections)
+        self.plan = plan
+        self.commands = []
+
+    async def list_collection_names(self):
+        return list(self.keys())
+
+    async def command(self, command):
+        self.commands.append(command)
+        if isinstance(self.plan, Exception):
+            raise self.plan
+        return self.plan
@@ -0,0 +1,81 @@
+"""
+Slack Indexing Test Fixtures
+
+This module contains the fakes shared by the Slack indexing tests: an
+in-memory conversations.history, message generators, and a test case base
+that wires the indexing pipeline to a fake embedding model and a Qdrant
+collection running in local in-memory mode.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Distance, VectorParams
+
+from server.agent.mcp.qdrant_client import (
+    delete_message_points, get_stored_text_hashes, upsert_message_embeddings
+)
+
+NOW = 1_700_000_000
+
+
+def channel_messages(prefix, count, start=0):
+    """Messages of a channel, newest first, one second apart"""
+    return [{"ts": f"{NOW + start + i}.000100", "text": f"{prefix} message {i}", "user": "U1"}
+            for i in reversed(range(count))]
+
+
+class FakeSlack:
+    """conversations.history over in-memory channels, newest message first"""
+
+    def __init__(self, channels):
+        self.channels = channels
+        self.active = 0
+        self.max_active = 0
+        self.calls = []
+
+    async def fetch_page(self, channel_id, params):
+        self.calls.append((channel_id, params.get("cursor")))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.02)
+        finally:
+            self.active -= 1
+        messages = [m for m in self.channels[channel_id] if float(m["ts"]) > float(params.get("oldest", 0))]
+        start = int(params.get("cursor") or 0)
+        page = messages[start:start + params["limit"]]
+        more = start + params["limit"] < len(messages)
+        return {"messages": page, "response_metadata": {"next_cursor": str(start + params["limit"]) if more else ""}}
+
+
+class SlackIndexingTestCase(unittest.IsolatedAsyncioTestCase):
+    """Base for tests indexing into a fresh in-memory "slack" collection"""
+
+    encode_delay = 0.0
+
+    async def asyncSetUp(self):
+        self.qdrant = AsyncQdrantClient(location=":memory:")
+        await self.qdrant.create_collection("slack", vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+        self.encoded = []
+        self.encode_batches = []
+
+    def encode(self, texts):
+        self.encode_batches.append((threading.current_thread().name, len(texts)))
+        self.encoded.extend(texts)
+        if self.encode_delay:
+            time.sleep(self.encode_delay)
+        return np.array([[1.0, float(len(text))] for text in texts])
+
+    async def upsert(self, embeddings, payloads):
+        return await upsert_message_embeddings(self.qdrant, "slack", embeddings, payloads)
+
+    async def stored_hashes(self, point_ids):
+        return await get_stored_text_hashes(self.qdrant, "slack", point_ids)
+
+    async def delete(self, point_ids):
+        return await delete_message_points(self.qdrant, "slack", point_ids)
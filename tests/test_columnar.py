@@ -0,0 +1,78 @@
+"""
+Columnar Result Tests
+
+This module contains tests for ColumnarResult and its use by the
+result aggregator and visualization dataset.
+"""
+
+import unittest
+
+import numpy as np
+
+from server.agent.db.columnar import ColumnarResult, to_dataframe
+from server.agent.db.orchestrator.result_aggregator import AggregationFunction, ResultAggregator
+from server.agent.visualization.types import VisualizationDataset
+
+
+class TestColumnarResult(unittest.TestCase):
+    """Test building, converting and aggregating columnar results"""
+
+    def test_columnar_results(self):
+        # Positional records (asyncpg style) get native dtypes per column
+        records = [(1, "north", 10.5), (2, "south", 4.0), (3, "north", None)]
+        pg = ColumnarResult.from_records(records, ["id", "region", "amount"])
+        self.assertEqual(pg.num_rows, 3)
+        self.assertEqual(pg.column("id").dtype, np.int64)
+        self.assertEqual(pg.column("region").dtype, object)
+        self.assertEqual(pg.column("amount").dtype, object)
+        self.assertEqual(pg.row(0), {"id": 1, "region": "north", "amount": 10.5})
+
+        # Heterogeneous documents (Mongo style) are back-filled with None
+        mongo = ColumnarResult.from_rows([{"id": 4, "region": "east"}, {"id": 5, "amount": 7.5}])
+        self.assertEqual(mongo.columns, ["id", "region", "amount"])
+        self.assertEqual(mongo.to_dicts()[0], {"id": 4, "region": "east", "amount": None})
+
+        # Concatenation keeps the union of columns and round-trips to rows
+        merged = ColumnarResult.concat([pg, mongo])
+        self.assertEqual(len(merged), 5)
+        self.assertEqual(merged.to_dicts()[4], {"id": 5, "region": None, "amount": 7.5})
+        self.assertEqual(merged.to_dict()["row_count"], 5)
+        self.assertEqual(merged.slice(1, 3).to_dicts()[0]["id"], 2)
+
+        df = to_dataframe(merged)
+        self.assertEqual(list(df.columns), ["id", "region", "amount"])
+        self.assertEqual(df.shape, (5, 3))
+        self.assertEqual(to_dataframe([{"a": 1}]).shape, (1, 1))
+        self.assertEqual(VisualizationDataset.from_columnar(merged).size, 5)
+
+        # The aggregator merges and aggregates columns directly
+        aggregator = ResultAggregator()
+        merged_result = aggregator.merge_results([
+            {"success": True, "data": pg},
+            {"success": True, "data": mongo},
+        ])
+        self.assertIsInstance(merged_result["results"], ColumnarResult)
+        self.assertEqual(merged_result["total_rows"], 5)
+
+        sales = ColumnarResult.from_rows([
+            {"region": "north", "amount": 10},
+            {"region": "south", "amount": 4},
+            {"region": "north", "amount": 6},
+        ])
+        self.assertEqual(aggregator.apply_aggregate_function(sales, AggregationFunction.SUM, "amount"), 20.0)
+        self.assertEqual(aggregator.apply_aggregate_function(sales, AggregationFunction.MAX, "amount"), 10)
+        self.assertEqual(aggregator.apply_aggregate_function(merged, AggregationFunction.COUNT, "amount"), 3)
+        self.assertIsNone(aggregator.apply_aggregate_function(sales, AggregationFunction.SUM, "missing"))
+
+        grouped = aggregator.group_by_aggregation(sales, ["region"], [
+            {"function": "sum", "field": "amount", "output_field": "total"},
+            {"function": "count", "field": "amount"},
+        ])
+        by_region = {row["region"]: row for row in grouped}
+        self.assertEqual(by_region["north"]["total"], 16.0)
+        self.assertEqual(by_region["north"]["count_amount"], 2)
+        self.assertEqual(by_region["south"]["total"], 4.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
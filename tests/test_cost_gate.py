@@ -0,0 +1,83 @@
+"""
+Cost Gate Tests
+
+This module contains tests for the EXPLAIN-based cost gate that limits,
+samples or rejects generated SQL before it runs.
+"""
+
+import json
+import unittest
+
+from server.agent.db.cost_gate import QueryCostGate, add_limit, add_tablesample
+
+
+class FakeConnection:
+    """Connection that answers EXPLAIN with fixed planner estimates"""
+
+    def __init__(self, rows, cost):
+        self.rows = rows
+        self.cost = cost
+        self.queries = []
+
+    async def fetchval(self, query, *args):
+        self.queries.append(query)
+        return json.dumps([{"Plan": {"Node Type": "Seq Scan", "Plan Rows": self.rows, "Total Cost": self.cost}}])
+
+
+class TestQueryCostGate(unittest.IsolatedAsyncioTestCase):
+    """Test the allow / limit / sample / reject decisions"""
+
+    async def test_cost_gate_decisions(self):
+        gate = QueryCostGate(enabled=True, max_rows=1000, sample_cost=10000, max_cost=100000, min_sample_percent=0.5)
+        single_table = "SELECT region, amount FROM public.orders o WHERE amount > $1;"
+        joined = "SELECT * FROM orders JOIN customers ON customers.id = orders.customer_id"
+
+        # Cheap, small queries run unchanged
+        conn = FakeConnection(rows=10, cost=50)
+        decision = await gate.check(conn, "SELECT * FROM orders")
+        self.assertEqual(decision.action, "allow")
+        self.assertEqual(decision.query, "SELECT * FROM orders")
+        self.assertEqual(conn.queries, ["EXPLAIN (FORMAT JSON) SELECT * FROM orders"])
+
+        # Large results get a LIMIT
+        decision = await gate.check(FakeConnection(rows=50000, cost=5000), joined)
+        self.assertEqual(decision.action, "limit")
+        self.assertEqual(decision.row_limit, 1000)
+        self.assertEqual(decision.query, add_limit(joined, 1000))
+        self.assertTrue(decision.query.endswith("LIMIT 1000"))
+        self.assertEqual(decision.to_dict()["estimated_rows"], 50000)
+
+        # Expensive single-table queries read a sample sized to the cost threshold
+        decision = gate.decide(single_table, estimated_rows=500, estimated_cost=40000)
+        self.assertEqual(decision.action, "sample")
+        self.assertEqual(decision.sample_percent, 25.0)
+        self.assertIn("FROM public.orders o TABLESAMPLE SYSTEM (25) WHERE", decision.query)
+        self.assertIsNone(decision.row_limit)
+
+        # ...and are still limited when the sample is too large
+        decision = gate.decide(single_table, estimated_rows=1000000, estimated_cost=40000)
+        self.assertEqual(decision.action, "sample")
+        self.assertEqual(decision.row_limit, 1000)
+
+        # Expensive queries that cannot be sampled are rejected above max_cost
+        self.assertEqual(gate.decide(joined, estimated_rows=10, estimated_cost=50000).action, "allow")
+        decision = gate.decide(joined, estimated_rows=10, estimated_cost=500000)
+        self.assertEqual(decision.action, "reject")
+        self.assertEqual(decision.query, joined)
+        self.assertIn("cannot be sampled", decision.reason)
+
+        # Only plain single-table selects are rewritten
+        self.assertIsNone(add_tablesample("SELECT * FROM a, b", 10))
+        self.assertIsNone(add_tablesample("SELECT * FROM (SELECT * FROM a) s", 10))
+        self.assertEqual(add_tablesample("SELECT * FROM a WHERE x = 1", 10),
+                         "SELECT * FROM a TABLESAMPLE SYSTEM (10) WHERE x = 1")
+
+        # Non-SELECT statements and disabled gates skip EXPLAIN
+        conn = FakeConnection(rows=10, cost=10 ** 9)
+        self.assertEqual((await gate.check(conn, "UPDATE orders SET a = 1")).action, "allow")
+        self.assertEqual((await QueryCostGate(enabled=False).check(conn, joined)).action, "allow")
+        self.assertEqual(conn.queries, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
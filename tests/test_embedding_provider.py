@@ -0,0 +1,156 @@
+"""
+Embedding Provider Tests
+
+This module contains tests for batched embedding generation, the embedding
+cache in front of it, and plan-level batching of vector search queries. The
+custom endpoint is a local aiohttp server and the OpenAI client is faked, so
+no embedding API is required.
+"""
+
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from aiohttp import web
+
+from server.agent.config.settings import Settings
+from server.agent.db.adapters import qdrant
+from server.agent.db.adapters.qdrant import EmbeddingProvider, close_embedding_session
+from server.agent.db.embedding_cache import EmbeddingCache
+from server.agent.db.orchestrator.implementation_agent import ImplementationAgent
+from server.agent.db.orchestrator.plans.base import QueryPlan
+from server.agent.db.orchestrator.plans.operations import QdrantOperation
+
+
+def fake_vector(text):
+    return [float(len(text)), float(sum(map(ord, text)) % 97)]
+
+
+class FakeOpenAIEmbeddings:
+    """Records embedding requests and answers with out-of-order data"""
+
+    def __init__(self):
+        self.inputs = []
+
+    async def create(self, input, model):
+        self.inputs.append(list(input))
+        data = [SimpleNamespace(index=i, embedding=fake_vector(text)) for i, text in enumerate(input)]
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+class FakeAdapter:
+    """Adapter exposing only an embedding provider"""
+
+    def __init__(self, provider):
+        self.embedding_provider = provider
+
+
+class TestEmbeddingProvider(unittest.IsolatedAsyncioTestCase):
+    """Test batching, caching, persistence and plan-level embedding"""
+
+    def make_provider(self, cache, **overrides):
+        settings = Settings()
+        for key, value in overrides.items():
+            setattr(settings, key, value)
+        return EmbeddingProvider(settings, cache=cache)
+
+    async def test_batched_cached_embeddings(self):
+        # OpenAI: duplicates are embedded once, misses go out in batches of batch_size, order is kept
+        cache = EmbeddingCache(max_entries=3)
+        provider = self.make_provider(cache, VECTOR_EMBEDDING_PROVIDER="openai", VECTOR_EMBEDDING_BATCH_SIZE=2)
+        embeddings = FakeOpenAIEmbeddings()
+        provider._openai_client = SimpleNamespace(embeddings=embeddings)
+
+        texts = ["alpha", "beta", "alpha", "gamma"]
+        self.assertEqual(await provider.get_embeddings(texts), [fake_vector(t) for t in texts])
+        self.assertEqual(embeddings.inputs, [["alpha", "beta"], ["gamma"]])
+
+        # Cached texts are not sent again
+        self.assertEqual(await provider.get_embedding("beta"), fake_vector("beta"))
+        await provider.get_embeddings(["gamma", "delta"])
+        self.assertEqual(embeddings.inputs[-1], ["delta"])
+        self.assertEqual(provider.requests, 3)
+
+        # The least recently used vector is evicted past max_entries
+        self.assertEqual(cache.get_stats()["entries"], 3)
+        await provider.get_embedding("alpha")
+        self.assertEqual(embeddings.inputs[-1], ["alpha"])
+
+        # Other models do not share cache entries
+        other = self.make_provider(cache, VECTOR_EMBEDDING_PROVIDER="openai", VECTOR_EMBEDDING_MODEL="other-model")
+        other._openai_client = SimpleNamespace(embeddings=embeddings)
+        await other.get_embedding("alpha")
+        self.assertEqual(other.requests, 1)
+
+        # Custom endpoint: a local server answering single-text and batch requests
+        requests = []
+
+        async def embed(request):
+            body = await request.json()
+            requests.append(body)
+            if "texts" in body:
+                return web.json_response({"result": {"vectors": [fake_vector(t) for t in body["texts"]]}})
+            return web.json_response({"embedding": fake_vector(body["text"])})
+
+        app = web.Application()
+        app.router.add_post("/embed", embed)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        self.addAsyncCleanup(runner.cleanup)
+        self.addAsyncCleanup(close_embedding_session)
+        port = site._server.sockets[0].getsockname()[1]
+        endpoint = f"http://127.0.0.1:{port}/embed"
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "embeddings.db")
+
+            # Batch-capable endpoints get one request for all texts
+            cache = EmbeddingCache(max_entries=10, path=path)
+            provider = self.make_provider(
+                cache, VECTOR_EMBEDDING_PROVIDER="custom", VECTOR_EMBEDDING_ENDPOINT=endpoint,
+                VECTOR_EMBEDDING_BATCH_REQUESTS=True, VECTOR_EMBEDDING_BATCH_RESPONSE_FIELD="result.vectors"
+            )
+            self.assertEqual(await provider.get_embeddings(["a", "bb"]), [fake_vector("a"), fake_vector("bb")])
+            self.assertEqual(requests, [{"texts": ["a", "bb"], "model": provider.model}])
+            session = await qdrant.get_embedding_session()
+            cache.close()
+
+            # A new cache on the same file serves them from disk; single-text endpoints get one request per miss
+            cache = EmbeddingCache(max_entries=10, path=path)
+            provider = self.make_provider(cache, VECTOR_EMBEDDING_PROVIDER="custom", VECTOR_EMBEDDING_ENDPOINT=endpoint)
+            self.assertEqual(await provider.get_embeddings(["bb", "ccc", "a"]),
+                             [fake_vector("bb"), fake_vector("ccc"), fake_vector("a")])
+            self.assertEqual(requests[1:], [{"text": "ccc", "model": provider.model}])
+            self.assertEqual(cache.get_stats()["hits"], 2)
+            cache.close()
+
+            # Requests share one HTTP session
+            self.assertIs(await qdrant.get_embedding_session(), session)
+
+        # A plan's query texts are embedded in one batch before its searches run
+        provider = self.make_provider(EmbeddingCache(max_entries=10), VECTOR_EMBEDDING_PROVIDER="openai")
+        embeddings = FakeOpenAIEmbeddings()
+        provider._openai_client = SimpleNamespace(embeddings=embeddings)
+        agent = ImplementationAgent()
+        adapter = FakeAdapter(provider)
+        agent._adapter_cache = {"qdrant_main": adapter, "qdrant:collection:docs": adapter}
+
+        searches = [
+            QdrantOperation(source_id="qdrant_main", collection="docs", query_text="refund policy"),
+            QdrantOperation(source_id="qdrant:collection:docs", collection="docs", query_text="shipping times"),
+            QdrantOperation(source_id="qdrant_main", collection="docs", vector_query=[1.0, 2.0]),
+        ]
+        self.assertTrue(searches[0].validate())
+        plan = QueryPlan(operations=searches)
+
+        await agent._embed_query_texts(plan)
+        self.assertEqual(embeddings.inputs, [["refund policy", "shipping times"]])
+        self.assertEqual(searches[0].get_adapter_params()["vector"], fake_vector("refund policy"))
+        self.assertEqual(searches[1].vector_query, fake_vector("shipping times"))
+        self.assertEqual(searches[2].vector_query, [1.0, 2.0])
+
+if __name__ == "__main__":
+    unittest.main()
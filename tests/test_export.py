@@ -0,0 +1,164 @@
+"""
+Query Export Tests
+
+This module contains tests for exporting full PostgreSQL results to spill
+files with COPY, using a fake asyncpg pool so no live database is required.
+"""
+
+import os
+import re
+import tempfile
+import unittest
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from server.agent.db.adapters.postgres import PostgresAdapter
+from server.agent.db.export import ARROW_AVAILABLE, ExportStore
+from server.agent.db.pool_manager import PostgresPoolManager
+from server.agent.db.statement_cache import PreparedStatementCache
+
+URI = "postgresql://app:pw@primary:5432/sales"
+
+
+class FakeStatement:
+    """Prepared statement describing an (id int4, region text, active bool) result"""
+
+    def __init__(self, query):
+        self.placeholders = len(set(re.findall(r"\$(\d+)", query)))
+
+    def get_parameters(self):
+        return [SimpleNamespace(name="int4")] * self.placeholders
+
+    def get_attributes(self):
+        return [SimpleNamespace(name=name, type=SimpleNamespace(name=type_name))
+                for name, type_name in (("id", "int4"), ("region", "text"), ("active", "bool"))]
+
+
+class FakeConnection:
+    """Connection whose COPY writes a fixed result as PostgreSQL CSV"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.copies = []
+        self.executed = []
+        self.in_transaction = False
+
+    @asynccontextmanager
+    async def transaction(self, **kwargs):
+        self.in_transaction = True
+        try:
+            yield
+        finally:
+            self.in_transaction = False
+
+    async def execute(self, query, *args):
+        assert self.in_transaction, "SET LOCAL only applies inside a transaction"
+        self.executed.append(query)
+
+    async def prepare(self, query):
+        return FakeStatement(query)
+
+    async def copy_from_query(self, query, *args, output, format, header, timeout=None):
+        assert self.in_transaction, "COPY must run in the transaction that set its timeout"
+        self.copies.append((query, args, format, header, timeout))
+        minimum = args[0] if args else 0
+        rows = [row for row in self.rows if row[0] >= minimum]
+        with open(output, "w", encoding="utf-8") as f:
+            f.write("id,region,active\n")
+            for id_, region, active in rows:
+                f.write(f"{id_},{region if region is not None else ''},{'t' if active else 'f'}\n")
+        return f"COPY {len(rows)}"
+
+
+class FakePool:
+    """Pool handing out a single fake connection"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._closed = False
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+    async def close(self):
+        self._closed = True
+
+    def terminate(self):
+        self._closed = True
+
+
+class TestQueryExport(unittest.IsolatedAsyncioTestCase):
+    """Test COPY exports, paging, handle lookup and expiry"""
+
+    async def asyncSetUp(self):
+        self.conn = FakeConnection([(i, "emea" if i % 2 else None, i % 3 == 0) for i in range(250)])
+
+        async def fake_create_pool(dsn=None, **kwargs):
+            return FakePool(self.conn)
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.store = ExportStore(directory=self.tmpdir.name, ttl_seconds=3600)
+
+        for patcher in (
+            patch("server.agent.db.pool_manager.asyncpg.create_pool", side_effect=fake_create_pool),
+            patch("server.agent.db.pool_manager._pool_manager",
+                  PostgresPoolManager(min_size=1, max_size=2, idle_timeout=0, max_inactive_connection_lifetime=0)),
+            patch("server.agent.db.statement_cache._statement_cache", PreparedStatementCache(max_size=8)),
+            patch("server.agent.db.export._export_store", self.store),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_export_query(self):
+        adapter = PostgresAdapter(URI, replicas=[])
+
+        # COPY streams the whole result to a CSV spill file, with parameters bound,
+        # under EXPORT_TIMEOUT rather than the pool's MAX_QUERY_TIMEOUT
+        with patch("server.agent.db.adapters.postgres.Settings", return_value=SimpleNamespace(EXPORT_TIMEOUT=900)):
+            handle = await adapter.export_query("SELECT id, region, active FROM orders WHERE id >= $1;", params=["100"])
+        self.assertEqual(self.conn.executed, ["SET LOCAL statement_timeout = 900000"])
+        self.assertEqual(self.conn.copies,
+                         [("SELECT id, region, active FROM orders WHERE id >= $1", (100,), "csv", True, 900)])
+        self.assertEqual(handle.row_count, 150)
+        self.assertEqual(handle.columns, ["id", "region", "active"])
+        self.assertEqual(handle.column_types, ["int4", "text", "bool"])
+        self.assertEqual(handle.size_bytes, os.path.getsize(handle.path))
+        self.assertTrue(handle.path.startswith(self.tmpdir.name))
+
+        # The handle is found again by ID and pages are read without loading the file
+        loaded = self.store.get(handle.export_id)
+        self.assertEqual(loaded, handle)
+        page = self.store.read_page(loaded, offset=148, limit=10)
+        self.assertEqual(page, [{"id": "248", "region": None, "active": "f"},
+                                {"id": "249", "region": "emea", "active": "t"}])
+        self.assertEqual(handle.to_dict()["filename"], f"export-{handle.export_id}.csv")
+
+        # Unknown, malformed and expired IDs are not served
+        self.assertIsNone(self.store.get("0" * 32))
+        self.assertIsNone(self.store.get("../../etc/passwd"))
+        self.assertEqual(ExportStore(directory=self.tmpdir.name, ttl_seconds=-1).cleanup_expired(), 1)
+        self.assertIsNone(self.store.get(handle.export_id))
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+        # Writes and unknown formats are refused before anything runs
+        with self.assertRaises(ValueError):
+            await adapter.export_query("DELETE FROM orders")
+        with self.assertRaises(ValueError):
+            await adapter.export_query("SELECT 1", format="xlsx")
+        self.assertEqual(len(self.conn.copies), 1)
+
+        if ARROW_AVAILABLE:
+            # Parquet is converted from the COPY output with typed columns; the CSV spill is removed
+            handle = await adapter.export_query("SELECT id, region, active FROM orders", format="parquet")
+            self.assertEqual(sorted(os.listdir(self.tmpdir.name)),
+                             [f"{handle.export_id}.json", f"{handle.export_id}.parquet"])
+            page = self.store.read_page(handle, offset=3, limit=2)
+            self.assertEqual(page, [{"id": 3, "region": "emea", "active": True},
+                                    {"id": 4, "region": None, "active": False}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Hybrid Message Search Tests
+
+This module contains tests for the BM25 lexical index kept next to the
+Slack message collections, reciprocal-rank fusion, and hybrid search
+running the vector and lexical legs concurrently. The embedding model is
+faked; Qdrant runs in local in-memory mode.
+"""
+
+import time
+import unittest
+
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import Distance, PointStruct, VectorParams
+
+from server.agent.mcp.hybrid_search import reciprocal_rank_fusion, search_messages
+from server.agent.mcp.indexer.pipeline import prepare_message
+from server.agent.mcp.lexical_index import LexicalIndex, match_expression
+from server.agent.mcp.qdrant_client import point_id_for
+
+NOW = 1_700_000_000
+
+MESSAGES = [
+    ("C1", "U1", "The deploy failed with ERR_CONN_RESET again"),
+    ("C1", "U2", "Can someone look at PROJ-1234 before the release?"),
+    ("C2", "U1", "Release notes are up for review"),
+    ("C2", "U3", "Network errors keep breaking the deployment pipeline"),
+    ("C1", "U3", "Lunch at noon?"),
+]
+
+
+def documents():
+    for i, (channel_id, user_id, text) in enumerate(MESSAGES):
+        _, payload = prepare_message({"ts": f"{NOW + i}.000100", "text": text, "user": user_id}, channel_id, channel_id, "T1")
+        yield point_id_for(payload), payload
+
+
+class SlowLexicalIndex(LexicalIndex):
+    def search(self, *args, **kwargs):
+        time.sleep(0.2)
+        return super().search(*args, **kwargs)
+
+
+class TestHybridSearch(unittest.IsolatedAsyncioTestCase):
+    """Test the BM25 index and fusion of the vector and lexical legs under filters"""
+
+    def setUp(self):
+        self.qdrant = QdrantClient(location=":memory:")
+        self.qdrant.create_collection("slack", vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+        # Deployment messages are close to each other in the fake embedding space
+        vectors = [[1.0, 0.1], [0.0, 1.0], [0.1, 1.0], [1.0, 0.0], [0.5, 0.5]]
+        self.ids = []
+        points = []
+        for (point_id, payload), vector in zip(documents(), vectors):
+            self.ids.append(point_id)
+            points.append(PointStruct(id=point_id, vector=vector, payload=payload))
+        self.qdrant.upsert("slack", points=points)
+        self.index = SlowLexicalIndex(":memory:")
+        self.index.upsert("slack", documents())
+
+    def encode(self, text):
+        time.sleep(0.2)
+        return [1.0, 0.0]
+
+    async def test_hybrid_search(self):
+        # BM25 matches identifiers as phrases and ranks messages with more of the words first
+        index = LexicalIndex(":memory:")
+        self.assertEqual(index.rebuild(self.qdrant, "slack", batch_size=2), 5)
+        self.assertEqual(match_expression('PROJ-1234 "deploy'), '"PROJ-1234" OR "deploy"')
+        self.assertIsNone(match_expression("?!"))
+        self.assertEqual(index.search("slack", "PROJ-1234")[0][0], self.ids[1])
+        self.assertEqual(index.search("slack", "err_conn_reset")[0][0], self.ids[0])
+        results = index.search("slack", "release review")
+        self.assertEqual([point_id for point_id, _ in results], [self.ids[2], self.ids[1]])
+        self.assertGreater(results[0][1], results[1][1])
+
+        # Channel, user and date filters apply to the lexical index
+        self.assertEqual([point_id for point_id, _ in index.search("slack", "release", channels=["C1"])], [self.ids[1]])
+        self.assertEqual(index.search("slack", "release", users=["U3"]), [])
+        self.assertEqual(len(index.search("slack", "release", ts_from=NOW + 2)), 1)
+        self.assertEqual(index.search("other", "release"), [])
+
+        # Messages are replaced, deleted and pruned by ts
+        point_id, payload = list(documents())[4]
+        index.upsert("slack", [(point_id, {**payload, "text": "Lunch moved to one"})])
+        self.assertEqual(index.count("slack"), 5)
+        self.assertEqual(index.search("slack", "noon"), [])
+        self.assertEqual(index.search("slack", "moved")[0][0], point_id)
+        self.assertEqual(index.delete("slack", [point_id, "missing"]), 1)
+        self.assertEqual(index.delete_older_than("slack", NOW + 2), 2)
+        self.assertEqual(index.count("slack"), 2)
+        self.assertEqual(index.search("slack", "PROJ-1234"), [])
+
+        # Reciprocal-rank fusion only uses ranks
+        fused = reciprocal_rank_fusion({"vector": ["a", "b", "c"], "lexical": ["c", "d"]}, k=60)
+        self.assertEqual([point_id for point_id, _, _ in fused], ["c", "a", "b", "d"])
+        self.assertAlmostEqual(fused[0][1], 1 / 63 + 1 / 61)
+        self.assertEqual(fused[0][2], {"vector": 3, "lexical": 1})
+
+        # The legs of a hybrid search run concurrently and are timed separately
+        start = time.perf_counter()
+        messages, timings = await search_messages(
+            self.qdrant, self.index, "slack", "deploy PROJ-1234", self.encode, limit=3, mode="hybrid"
+        )
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 0.38)
+        self.assertGreaterEqual(timings["vector_ms"], 190)
+        self.assertGreaterEqual(timings["lexical_ms"], 190)
+        self.assertIn("fusion_ms", timings)
+
+        # The ticket is far from the query vector, but the lexical leg brings it in
+        texts = [message["text"] for message in messages]
+        self.assertIn(MESSAGES[1][2], texts)
+        self.assertEqual(texts[0], MESSAGES[0][2])
+        self.assertEqual((messages[0]["vector_rank"], messages[0]["lexical_rank"]), (2, 1))
+        # "score" stays the cosine similarity; the fused score orders the results
+        self.assertAlmostEqual(messages[0]["score"], 1 / (1.01 ** 0.5), places=4)
+        self.assertAlmostEqual(messages[0]["fused_score"], 1 / 62 + 1 / 61)
+        self.assertGreater(messages[0]["lexical_score"], 0)
+        self.assertEqual(messages, sorted(messages, key=lambda message: -message["fused_score"]))
+
+        # Filters apply to both legs before fusion
+        messages, _ = await search_messages(
+            self.qdrant, self.index, "slack", "deploy PROJ-1234", self.encode, limit=5, mode="hybrid", channels=["C1"]
+        )
+        self.assertEqual({message["channel_id"] for message in messages}, {"C1"})
+        self.assertEqual(messages[0]["text"], MESSAGES[0][2])
+
+        messages, timings = await search_messages(
+            self.qdrant, self.index, "slack", "PROJ-1234", self.encode, limit=3, mode="lexical", channels=["C1"]
+        )
+        self.assertEqual([message["text"] for message in messages], [MESSAGES[1][2]])
+        self.assertIsNone(messages[0]["score"])
+        self.assertEqual(set(timings), {"lexical_ms", "fetch_ms"})
+
+        # Vector search is the default
+        messages, timings = await search_messages(
+            self.qdrant, self.index, "slack", "deploy", self.encode, limit=2, users=["U3"]
+        )
+        self.assertEqual([message["text"] for message in messages], [MESSAGES[3][2], MESSAGES[4][2]])
+        self.assertAlmostEqual(messages[0]["score"], 1.0, places=4)
+        self.assertEqual(set(timings), {"vector_ms"})
+        with self.assertRaises(ValueError):
+            await search_messages(self.qdrant, self.index, "slack", "deploy", self.encode, mode="fuzzy")
+
+if __name__ == "__main__":
+    unittest.main()
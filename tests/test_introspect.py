@@ -0,0 +1,145 @@
+"""
+PostgreSQL Introspection Tests
+
+This module contains tests for pg_catalog schema introspection, using a fake
+asyncpg pool that answers the catalog queries from an in-memory catalog.
+"""
+
+import asyncio
+import unittest
+from contextlib import asynccontextmanager
+
+from server.agent.db.introspect import (
+    COLUMNS_QUERY, FOREIGN_KEYS_QUERY, PRIMARY_KEYS_QUERY, RELATIONS_QUERY,
+    fetch_schema, format_schema_for_embedding
+)
+
+
+class FakeCatalog:
+    """In-memory catalog of tables keyed by OID"""
+
+    def __init__(self):
+        self.tables = {
+            1: {"schema": "public", "name": "customers", "signature": "a", "rows": 10,
+                "columns": [("id", "integer", False), ("name", "text", True)], "pk": ["id"], "fks": []},
+            2: {"schema": "sales", "name": "orders", "signature": "a", "rows": 500,
+                "columns": [("id", "integer", False), ("customer_id", "integer", True)], "pk": ["id"],
+                "fks": [("customer_id", 1, "id")]},
+            3: {"schema": "sales", "name": "refunds", "signature": "a", "rows": 3,
+                "columns": [("id", "bigint", False)], "pk": [], "fks": []},
+        }
+
+    def rows(self, query, oids):
+        rows = []
+        for oid, table in sorted(self.tables.items(), key=lambda item: (item[1]["schema"], item[1]["name"])):
+            base = {"table_oid": oid, "schema_name": table["schema"], "relname": table["name"]}
+            if query is RELATIONS_QUERY:
+                rows.append({**base, "row_count": table["rows"], "signature": table["signature"]})
+            elif query is COLUMNS_QUERY and (oids is None or oid in oids):
+                for position, (column, data_type, nullable) in enumerate(table["columns"], 1):
+                    rows.append({**base, "column_name": column, "ordinal_position": position,
+                                 "data_type": data_type, "column_default": None,
+                                 "is_nullable": "YES" if nullable else "NO"})
+            elif query is PRIMARY_KEYS_QUERY and (oids is None or oid in oids):
+                for position, column in enumerate(table["pk"], 1):
+                    rows.append({**base, "column_name": column, "key_position": position})
+            elif query is FOREIGN_KEYS_QUERY:
+                for position, (column, foreign_oid, foreign_column) in enumerate(table["fks"], 1):
+                    if oids is None or oid in oids or foreign_oid in oids:
+                        foreign = self.tables[foreign_oid]
+                        rows.append({**base, "column_name": column, "key_position": position,
+                                     "foreign_table_oid": foreign_oid, "foreign_schema_name": foreign["schema"],
+                                     "foreign_relname": foreign["name"], "foreign_column_name": foreign_column})
+        return rows
+
+
+class FakeConnection:
+    """Connection answering catalog queries and recording them"""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def fetch(self, query, *args):
+        self.pool.queries.append((query, args))
+        await asyncio.sleep(0.01)
+        return self.pool.catalog.rows(query, args[1] if len(args) > 1 else None)
+
+
+class FakePool:
+    """Pool that tracks how many connections are in use at once"""
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.queries = []
+        self.active = 0
+        self.max_active = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            yield FakeConnection(self)
+        finally:
+            self.active -= 1
+
+
+class TestFetchSchema(unittest.IsolatedAsyncioTestCase):
+    """Test concurrent catalog reads, schema qualification and incremental refresh"""
+
+    async def test_fetch_schema(self):
+        catalog = FakeCatalog()
+        pool = FakePool(catalog)
+
+        # A full read runs the four catalog queries concurrently
+        schema = await fetch_schema(pool, schemas=[])
+        self.assertEqual(pool.max_active, 4)
+        self.assertEqual(len(pool.queries), 4)
+        self.assertTrue(all(args[0] is None for _, args in pool.queries))
+        self.assertEqual([t["table_name"] for t in schema["tables"]],
+                         ["customers", "sales.orders", "sales.refunds"])
+        self.assertEqual(schema["foreign_keys"][0]["foreign_table_name"], "customers")
+        self.assertEqual(schema["changed_tables"], ["customers", "sales.orders", "sales.refunds"])
+
+        documents = {doc["id"]: doc["content"] for doc in await format_schema_for_embedding(schema)}
+        self.assertIn("table:sales.orders", documents)
+        self.assertIn("customer_id -> customers.id", documents["table:sales.orders"])
+        self.assertIn("APPROXIMATE ROW COUNT: 500", documents["table:sales.orders"])
+        self.assertIn("- id (integer), PRIMARY KEY, NOT NULL", documents["table:customers"])
+
+        # Nothing changed: only the relation list is read, row counts are refreshed
+        pool.queries.clear()
+        catalog.tables[2]["rows"] = 800
+        unchanged = await fetch_schema(pool, schemas=[], previous=schema)
+        self.assertEqual([query for query, _ in pool.queries], [RELATIONS_QUERY])
+        self.assertEqual(unchanged["columns"], schema["columns"])
+        self.assertEqual(unchanged["changed_tables"], [])
+        self.assertEqual(unchanged["row_counts"][1]["row_count"], 800)
+
+        # Renaming a referenced table re-reads it and refreshes the keys pointing at it;
+        # dropped tables disappear
+        pool.queries.clear()
+        catalog.tables[1].update(name="clients", signature="b")
+        catalog.tables[1]["columns"].append(("email", "text", True))
+        del catalog.tables[3]
+        changed = await fetch_schema(pool, schemas=[], previous=unchanged)
+        self.assertEqual(len(pool.queries), 4)
+        self.assertTrue(all(args[1] == [1] for query, args in pool.queries if query is not RELATIONS_QUERY))
+        self.assertEqual(changed["changed_tables"], ["clients"])
+        self.assertEqual(changed["removed_tables"], ["sales.refunds"])
+        self.assertEqual([(c["table_name"], c["column_name"]) for c in changed["columns"]], [
+            ("clients", "id"), ("clients", "name"), ("clients", "email"),
+            ("sales.orders", "id"), ("sales.orders", "customer_id"),
+        ])
+        self.assertEqual(len(changed["foreign_keys"]), 1)
+        self.assertEqual(changed["foreign_keys"][0]["foreign_table_name"], "clients")
+
+        # A snapshot taken for other schemas is not reused
+        pool.queries.clear()
+        await fetch_schema(pool, schemas=["sales"], previous=changed)
+        self.assertEqual(len(pool.queries), 4)
+        self.assertTrue(all(args[0] == ["sales"] for _, args in pool.queries))
+
+
+if __name__ == "__main__":
+    unittest.main()
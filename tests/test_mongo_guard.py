@@ -0,0 +1,89 @@
+"""
+Mongo Guard Tests
+
+This module contains tests for the explain-based guard that limits or
+samples generated aggregation pipelines before they run, and for the
+server-side limits the MongoAdapter sends with each aggregation.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from pymongo.errors import OperationFailure
+
+from server.agent.db.adapters.mongo import MongoAdapter
+from server.agent.db.mongo_client_manager import MongoClientManager
+from server.agent.db.mongo_guard import MongoQueryGuard, plan_stages
+from mongo_fixtures import IXSCAN_PLAN, FakeCollection, FakeDatabase
+
+COLLSCAN_PLAN = {"stages": [{"$cursor": {"queryPlanner": {
+    "winningPlan": {"stage": "PROJECTION_SIMPLE", "inputStage": {"stage": "COLLSCAN"}},
+    "rejectedPlans": []
+}}}, {"$group": {}}]}
+
+
+class TestMongoQueryGuard(unittest.IsolatedAsyncioTestCase):
+    """Test the allow / limit / sample decisions and the aggregate options"""
+
+    async def test_mongo_query_guard(self):
+        guard = MongoQueryGuard(enabled=True, scan_threshold=1000, sample_size=100, max_rows=500)
+        grouping = [{"$match": {"status": "paid"}}, {"$group": {"_id": "$region", "n": {"$sum": 1}}}]
+        listing = [{"$match": {"status": "paid"}}, {"$project": {"total": 1}}]
+
+        # Rejected plans are ignored when looking for collection scans
+        self.assertEqual(plan_stages(IXSCAN_PLAN), ["FETCH", "IXSCAN"])
+        self.assertEqual(plan_stages(COLLSCAN_PLAN), ["PROJECTION_SIMPLE", "COLLSCAN"])
+
+        # Index scans and small collections run unchanged
+        db = FakeDatabase(IXSCAN_PLAN, orders=FakeCollection(size=10 ** 6))
+        decision = await guard.check(db, "orders", grouping)
+        self.assertEqual((decision.action, decision.pipeline), ("allow", grouping))
+        self.assertEqual(db.commands[0]["explain"], {"aggregate": "orders", "pipeline": grouping, "cursor": {}})
+        decision = await guard.check(FakeDatabase(COLLSCAN_PLAN, orders=FakeCollection(size=1000)), "orders", listing)
+        self.assertEqual(decision.action, "allow")
+        self.assertTrue(decision.collection_scan)
+
+        # Large collection scans: aggregations read a sample, listings are limited
+        db = FakeDatabase(COLLSCAN_PLAN, orders=FakeCollection(size=10 ** 6))
+        decision = await guard.check(db, "orders", grouping)
+        self.assertEqual(decision.action, "sample")
+        self.assertEqual(decision.pipeline, [{"$sample": {"size": 100}}] + grouping)
+        self.assertEqual(decision.to_dict()["estimated_documents"], 10 ** 6)
+        decision = await guard.check(db, "orders", listing)
+        self.assertEqual(decision.action, "limit")
+        self.assertEqual(decision.pipeline, listing + [{"$limit": 500}])
+        self.assertEqual(decision.original_pipeline, listing)
+        self.assertEqual(guard.decide("orders", listing + [{"$limit": 20}], ["COLLSCAN"], 10 ** 6).action, "allow")
+        self.assertEqual(guard.decide("orders", [{"$geoNear": {}}], ["COLLSCAN"], 10 ** 6).action, "allow")
+
+        # Explain failures and disabled guards let the pipeline through
+        failing = FakeDatabase(OperationFailure("not authorized"), orders=FakeCollection(size=10 ** 6))
+        self.assertEqual((await guard.check(failing, "orders", listing)).action, "allow")
+        disabled = FakeDatabase(COLLSCAN_PLAN)
+        self.assertEqual((await MongoQueryGuard(enabled=False).check(disabled, "orders", listing)).action, "allow")
+        self.assertEqual(disabled.commands, [])
+
+        # The adapter applies the guard and sends the server-side limits with each aggregation
+        manager = MongoClientManager(max_pool_size=2, min_pool_size=0)
+        with patch("server.agent.db.mongo_client_manager._client_manager", manager):
+            adapter = MongoAdapter("mongodb://mongo:27017/shop", max_time_ms=5000, allow_disk_use=True)
+        self.addCleanup(manager.close_all)
+        adapter.guard = MongoQueryGuard(enabled=True, scan_threshold=1000, sample_size=100, max_rows=500)
+        orders = FakeCollection([{"n": 1}], size=10 ** 6)
+        adapter.db = FakeDatabase(COLLSCAN_PLAN, orders=orders)
+        query = {"collection": "orders", "pipeline": [{"$match": {"status": "paid"}}]}
+
+        self.assertEqual(await adapter.execute(query, use_cache=False), [{"n": 1}])
+        pipeline, options = orders.aggregations[-1]
+        self.assertEqual(pipeline[-1], {"$limit": 500})
+        self.assertEqual((options["maxTimeMS"], options["allowDiskUse"]), (5000, True))
+
+        # Stream callers check first and run the decision's pipeline unguarded
+        decision = await adapter.check_pipeline(query)
+        self.assertEqual(decision.action, "limit")
+        await adapter.execute({**query, "pipeline": decision.pipeline}, guard=False, use_cache=False)
+        self.assertEqual(orders.aggregations[-1][0], decision.pipeline)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Mongo Result Cache Tests
+
+This module contains tests for the pipeline result cache in front of
+MongoAdapter.execute, with fake Motor collections and change streams so no
+live MongoDB server is required.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from pymongo.errors import OperationFailure
+
+from server.agent.db.adapters.mongo import MongoAdapter
+from server.agent.db.mongo_client_manager import MongoClientManager
+from server.agent.db.mongo_result_cache import MongoResultCache, pipeline_hash
+from mongo_fixtures import FakeCollection, FakeDatabase
+
+
+class FakeChangeStream:
+    """Change stream fed from a queue; None ends the stream"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.queue = asyncio.Queue()
+
+    async def try_next(self):
+        if self.collection.change_streams_unavailable:
+            raise OperationFailure("The $changeStream stage is only supported on replica sets")
+        return None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        change = await self.queue.get()
+        if change is None:
+            raise StopAsyncIteration
+        return change
+
+    async def close(self):
+        pass
+
+
+class WatchedCollection(FakeCollection):
+    """Collection answering each aggregation with its run number, with optional change stream support"""
+
+    def __init__(self, change_streams_unavailable=False):
+        super().__init__()
+        self.change_streams_unavailable = change_streams_unavailable
+        self.streams = []
+
+    def results(self, pipeline):
+        return [{"run": len(self.aggregations)}]
+
+    def watch(self, pipeline=None, **kwargs):
+        self.streams.append(FakeChangeStream(self))
+        return self.streams[-1]
+
+
+class TestMongoResultCache(unittest.IsolatedAsyncioTestCase):
+    """Test hits, change stream invalidation, TTL fallback and LRU eviction"""
+
+    async def test_result_cache(self):
+        cache = MongoResultCache(enabled=True, max_entries=2, max_rows=100, ttl_seconds=0.2, watch=True)
+        manager = MongoClientManager(max_pool_size=2, min_pool_size=0)
+        self.addCleanup(manager.close_all)
+        self.addAsyncCleanup(cache.close)
+        with patch("server.agent.db.mongo_client_manager._client_manager", manager):
+            adapter = MongoAdapter("mongodb://mongo:27017/shop")
+        orders, events = WatchedCollection(), WatchedCollection(change_streams_unavailable=True)
+        adapter.db = FakeDatabase(orders=orders, events=events)
+
+        def query(collection, pipeline):
+            return {"collection": collection, "pipeline": pipeline}
+
+        # Equivalent pipelines share a hash, but $sort key order is significant
+        self.assertEqual(pipeline_hash([{"$match": {"a": 1, "b": 2}}]), pipeline_hash([{"$match": {"b": 2, "a": 1}}]))
+        self.assertNotEqual(pipeline_hash([{"$sort": {"a": 1, "b": 1}}]), pipeline_hash([{"$sort": {"b": 1, "a": 1}}]))
+
+        with patch("server.agent.db.mongo_result_cache._result_cache", cache):
+            # The first run starts a change stream in the background; repeats are served from the cache
+            paid = query("orders", [{"$match": {"status": "paid", "region": "eu"}}])
+            self.assertEqual(await adapter.execute(paid), [{"run": 1}])
+            self.assertTrue(await cache.ensure_watcher(adapter.source, adapter.db, "orders"))
+            self.assertEqual(await adapter.execute(paid), [{"run": 1}])
+            self.assertEqual(await adapter.execute(query("orders", [{"$match": {"region": "eu", "status": "paid"}}])),
+                             [{"run": 1}])
+            self.assertEqual(len(orders.aggregations), 1)
+            self.assertEqual(len(orders.streams), 1)
+
+            # A write reported by the change stream drops the collection's entries
+            await orders.streams[0].queue.put({"operationType": "insert"})
+            await asyncio.sleep(0.01)
+            self.assertEqual(await adapter.execute(paid), [{"run": 2}])
+
+            # Entries cached while the stream is open outlive the TTL
+            await asyncio.sleep(0.25)
+            self.assertEqual(await adapter.execute(paid), [{"run": 2}])
+            self.assertEqual(len(orders.aggregations), 2)
+
+            # Without change streams entries expire after the TTL, and opening is not retried per query
+            clicks = query("events", [{"$match": {"kind": "click"}}])
+            self.assertFalse(await cache.ensure_watcher(adapter.source, adapter.db, "events"))
+            self.assertEqual(await adapter.execute(clicks), [{"run": 1}])
+            self.assertEqual(await adapter.execute(clicks), [{"run": 1}])
+            await asyncio.sleep(0.25)
+            self.assertEqual(await adapter.execute(clicks), [{"run": 2}])
+            self.assertEqual(len(events.streams), 1)
+
+            # Least recently used entries are evicted past max_entries
+            await adapter.execute(query("orders", [{"$match": {"status": "open"}}]))
+            self.assertEqual(cache.get_stats()["entries"], 2)
+            self.assertEqual(cache.get_stats()["evictions"], 1)
+            self.assertIsNone(cache.get(adapter.source, "orders", paid["pipeline"]))
+
+            # Results of a query overlapping an invalidation are not stored
+            version = cache.version(adapter.source, "orders")
+            cache.invalidate(adapter.source)
+            self.assertFalse(cache.put(adapter.source, "orders", paid["pipeline"], [{"run": 0}], version, True))
+
+            # When the change stream ends, nothing cached under it is trusted any more
+            await adapter.execute(paid)
+            await orders.streams[0].queue.put(None)
+            await asyncio.sleep(0.01)
+            self.assertFalse(cache.is_watched(adapter.source, "orders"))
+            self.assertIsNone(cache.get(adapter.source, "orders", paid["pipeline"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
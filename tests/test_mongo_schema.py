@@ -0,0 +1,79 @@
+"""
+Mongo Schema Inference Tests
+
+This module contains tests for inferring collection schemas from $sample
+with fake Motor collections, so no live MongoDB server is required.
+"""
+
+import datetime
+import unittest
+
+from bson import ObjectId
+
+from server.agent.db.mongo_schema import MongoSchemaInferrer
+from mongo_fixtures import ConcurrencyTracker, FakeCollection, FakeDatabase
+
+
+class TestMongoSchemaInferrer(unittest.IsolatedAsyncioTestCase):
+    """Test type and presence merging, bounded concurrency and caching"""
+
+    async def test_infer_database(self):
+        tracker = ConcurrencyTracker()
+        created = datetime.datetime(2024, 1, 1)
+        orders = FakeCollection([
+            {"_id": ObjectId(), "total": 10, "status": "paid", "created": created,
+             "customer": {"name": "Ada", "tier": "gold"}, "items": [{"sku": "a"}, {"sku": "b"}]},
+            {"_id": ObjectId(), "total": 12.5, "status": None, "customer": {"name": "Bo"}},
+            {"_id": ObjectId(), "total": 7, "status": "open", "coupon": "X1", "items": []},
+            {"_id": ObjectId(), "total": 3, "status": "paid"},
+        ], delay=0.05, tracker=tracker)
+        db = FakeDatabase(orders=orders, **{
+            f"events_{i}": FakeCollection([{"_id": i, "kind": "click"}], delay=0.05, tracker=tracker) for i in range(5)
+        })
+        db["system.views"] = FakeCollection([], delay=0.05, tracker=tracker)
+        inferrer = MongoSchemaInferrer(sample_size=100, concurrency=2)
+
+        schemas = await inferrer.infer_database(db, source="mongodb://h/shop")
+
+        # Collections are sampled with $sample, at most two at a time, skipping system collections
+        self.assertEqual(sorted(schemas), ["events_0", "events_1", "events_2", "events_3", "events_4", "orders"])
+        self.assertEqual([pipeline for pipeline, _ in orders.aggregations], [[{"$sample": {"size": 100}}]])
+        self.assertEqual(tracker.max_active, 2)
+
+        # Field types and presence are merged across every sampled document
+        schema = schemas["orders"]
+        self.assertEqual((schema.document_count, schema.sampled), (4, 4))
+        self.assertEqual(list(schema.fields)[0], "_id")
+        self.assertEqual(schema.fields["total"].types, {"int": 3, "double": 1})
+        self.assertEqual(schema.fields["total"].dominant_type, "int")
+        self.assertEqual(schema.presence("coupon"), 0.25)
+        self.assertEqual(schema.fields["status"].types, {"string": 3, "null": 1})
+        self.assertEqual(schema.fields["created"].types, {"date": 1})
+        self.assertEqual(schema.presence("customer.name"), 0.5)
+        self.assertEqual(schema.fields["items.sku"].count, 1)
+        self.assertEqual(schema.fields["items"].types, {"array": 2})
+        fields = schema.to_fields()
+        self.assertEqual(fields["status"]["data_type"], "string")
+        self.assertTrue(fields["status"]["nullable"])
+        self.assertEqual(fields["total"]["types"], {"int": 0.75, "double": 0.25})
+        content = schema.to_content()
+        self.assertIn("APPROXIMATE DOCUMENT COUNT: 4", content)
+        self.assertIn("- coupon (string) present in 25% of documents; examples: X1", content)
+        self.assertIn("- total (int) present in 100% of documents; types: int 75%, double 25%", content)
+        self.assertIn("- _id_ (_id 1)", content)
+
+        # Cached schemas are reused until the document count or indexes change
+        self.assertIs((await inferrer.infer_database(db, ["orders"], source="mongodb://h/shop"))["orders"], schema)
+        self.assertEqual(len(orders.aggregations), 1)
+        orders.indexes["status_1"] = {"key": [("status", 1)]}
+        await inferrer.infer_collection(db, "orders", source="mongodb://h/shop")
+        orders.docs.append({"_id": ObjectId(), "total": 1})
+        refreshed = await inferrer.infer_collection(db, "orders", source="mongodb://h/shop")
+        self.assertEqual(len(orders.aggregations), 3)
+        self.assertEqual(refreshed.presence("status"), 0.8)
+        await inferrer.infer_collection(db, "orders", source="mongodb://other/shop")
+        self.assertEqual(len(orders.aggregations), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
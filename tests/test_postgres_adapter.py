@@ -0,0 +1,261 @@
+"""
+PostgreSQL Adapter Tests
+
+This module contains tests for the PostgresAdapter running against
+fake asyncpg pools, so no live database is required.
+"""
+
+import asyncio
+import json
+import re
+import unittest
+from contextlib import asynccontextmanager
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import asyncpg
+
+from server.agent.db.adapters.postgres import PostgresAdapter, QueryTimeoutError
+from server.agent.db.pool_manager import PostgresPoolManager
+from server.agent.db.statement_cache import PreparedStatementCache, normalize_sql
+
+
+class FakeCursor:
+    """Server-side cursor over a fixed list of rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.position = 0
+        self.fetch_sizes = []
+
+    async def fetch(self, n):
+        self.fetch_sizes.append(n)
+        batch = self.rows[self.position:self.position + n]
+        self.position += len(batch)
+        return batch
+
+
+class FakeRecord(dict):
+    """Row that, like asyncpg.Record, can be indexed by name or position"""
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return list(self.values())[key]
+        return super().__getitem__(key)
+
+
+class FakeStatement:
+    """Prepared statement whose parameter types come from the connection"""
+
+    def __init__(self, conn, query):
+        self.conn = conn
+        self.query = query
+        placeholders = {int(n) for n in re.findall(r"\$(\d+)", query)}
+        self.param_types = [conn.param_types.get(i, "text") for i in sorted(placeholders)]
+
+    def get_parameters(self):
+        return [SimpleNamespace(name=name) for name in self.param_types]
+
+    def get_attributes(self):
+        return [SimpleNamespace(name="dsn"), SimpleNamespace(name="n")]
+
+    async def fetch(self, *args):
+        self.conn.queries.append((self.query, args))
+        if self.conn.fetch_delay:
+            await asyncio.sleep(self.conn.fetch_delay)
+        if self.conn.fetch_error:
+            raise self.conn.fetch_error
+        return [FakeRecord(dsn=self.conn.dsn, n=1)]
+
+    async def cursor(self, *args):
+        return await self.conn.cursor(self.query, *args)
+
+
+class FakeConnection:
+    """Minimal stand-in for asyncpg.Connection that records executed SQL"""
+
+    def __init__(self, dsn):
+        self.dsn = dsn
+        self.queries = []
+        self.cursor_rows = [{"id": i} for i in range(7)]
+        self.cursors = []
+        self.in_transaction = False
+        self.prepared = []
+        self.param_types = {}
+        self.estimated_rows = 1
+        self.fetch_delay = 0
+        self.fetch_error = None
+
+    @asynccontextmanager
+    async def transaction(self, **kwargs):
+        self.in_transaction = True
+        try:
+            yield
+        finally:
+            self.in_transaction = False
+
+    async def cursor(self, query, *args, **kwargs):
+        assert self.in_transaction, "server-side cursors require a transaction"
+        self.queries.append((query, args))
+        cursor = FakeCursor(self.cursor_rows)
+        self.cursors.append(cursor)
+        return cursor
+
+    async def prepare(self, query):
+        self.prepared.append(query)
+        return FakeStatement(self, query)
+
+    async def fetch(self, query, *args, **kwargs):
+        self.queries.append((query, args))
+        return [{"dsn": self.dsn, "n": 1}]
+
+    async def fetchval(self, query, *args, **kwargs):
+        self.queries.append((query, args))
+        if query.startswith("EXPLAIN"):
+            return json.dumps([{"Plan": {"Plan Rows": self.estimated_rows, "Total Cost": 10.0}}])
+        return 1
+
+
+class FakePool:
+    """Minimal stand-in for asyncpg.Pool handing out a single connection"""
+
+    def __init__(self, dsn, **kwargs):
+        self.dsn = dsn
+        self._closed = False
+        self.conn = FakeConnection(dsn)
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+    async def close(self):
+        self._closed = True
+
+    def terminate(self):
+        self._closed = True
+
+
+class TestPostgresAdapter(unittest.IsolatedAsyncioTestCase):
+    """Test the PostgresAdapter against fake per-DSN pools"""
+
+    async def asyncSetUp(self):
+        self.pools = {}
+
+        async def fake_create_pool(dsn=None, **kwargs):
+            pool = FakePool(dsn, **kwargs)
+            self.pools[dsn] = pool
+            return pool
+
+        create_patcher = patch("server.agent.db.pool_manager.asyncpg.create_pool", side_effect=fake_create_pool)
+        create_patcher.start()
+        self.addCleanup(create_patcher.stop)
+
+        self.manager = PostgresPoolManager(min_size=1, max_size=2, idle_timeout=0, max_inactive_connection_lifetime=0)
+        manager_patcher = patch("server.agent.db.pool_manager._pool_manager", self.manager)
+        manager_patcher.start()
+        self.addCleanup(manager_patcher.stop)
+
+        self.statement_cache = PreparedStatementCache(max_size=2)
+        cache_patcher = patch("server.agent.db.statement_cache._statement_cache", self.statement_cache)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+    async def test_postgres_adapter(self):
+        # Plan parameters reach asyncpg, converted to the placeholder types
+        uri = "postgresql://app:pw@primary:5432/orders"
+        adapter = PostgresAdapter(uri)
+        adapter.cost_gate.enabled = False
+        query = "SELECT * FROM orders WHERE created_at >= $1 AND region = $2"
+
+        await adapter.execute_query(query, ["2024-01-31", "north"])
+        conn = self.pools[uri].conn
+        conn.param_types = {1: "date", 2: "text"}
+        self.statement_cache.invalidate(conn, query)
+        await adapter.execute_query(query, ["2024-01-31", "north"])
+        self.assertEqual(conn.queries[-1], (query, (date(2024, 1, 31), "north")))
+
+        # Formatting differences reuse the same prepared statement
+        await adapter.execute_query("SELECT *\n  FROM orders  WHERE created_at >= $1 -- recent\n AND region = $2;",
+                                    ["2024-02-01", "south"])
+        self.assertEqual(conn.prepared, [query, query])
+        stats = self.statement_cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["invalidations"]), (1, 2, 1))
+
+        # Whitespace inside literals is significant
+        self.assertNotEqual(normalize_sql("SELECT 'a  b'"), normalize_sql("SELECT 'a b'"))
+        self.assertEqual(normalize_sql("SELECT  1 ;"), "SELECT 1")
+
+        # Wrong parameter counts fail before reaching the database
+        with self.assertRaises(ValueError):
+            await adapter.execute(query, ["2024-01-31"])
+
+        # Least recently used statements are evicted past max_size
+        columnar = await adapter.execute_columnar("SELECT 1")
+        await adapter.execute("SELECT 2")
+        self.assertEqual(columnar.columns, ["dsn", "n"])
+        self.assertEqual(self.statement_cache.get_stats()["evictions"], 1)
+        self.assertEqual(self.statement_cache.get_stats()["statements"], 2)
+
+        # With the cost gate on, large estimated results are limited before running
+        adapter.cost_gate.enabled = True
+        conn.estimated_rows = adapter.cost_gate.max_rows + 1
+        await adapter.execute("SELECT * FROM orders")
+        self.assertTrue(conn.prepared[-1].endswith(f"LIMIT {adapter.cost_gate.max_rows}"))
+
+        # Each adapter runs against its own URI; config sections resolve to a DSN as well
+        uri_a = "postgresql://a:pw@host-a:5432/sales"
+        uri_b = "postgres://b:pw@host-b:5432/billing"
+        adapter_a = PostgresAdapter(uri_a)
+        adapter_b = PostgresAdapter(uri_b)
+        adapter_c = PostgresAdapter({"host": "host-c", "port": 5433, "database": "ops", "user": "c", "password": "pw"})
+        self.assertEqual(adapter_c.dsn, "postgresql://c:pw@host-c:5433/ops")
+        self.assertEqual(PostgresAdapter({"uri": uri_a}).dsn, uri_a)
+
+        rows_a = await adapter_a.execute("SELECT 1")
+        rows_b = await adapter_b.execute("SELECT 1")
+        self.assertTrue(await adapter_c.test_connection())
+
+        self.assertEqual(rows_a, [{"dsn": uri_a, "n": 1}])
+        self.assertEqual(rows_b, [{"dsn": uri_b, "n": 1}])
+        self.assertEqual(set(self.pools), {uri, uri_a, uri_b, adapter_c.dsn})
+
+        # Streaming yields server-side cursor batches inside a transaction
+        uri_big = "postgresql://a:pw@host-big:5432/sales"
+        batches = [batch async for batch in PostgresAdapter(uri_big).execute_stream("SELECT id FROM big", batch_size=3)]
+
+        self.assertEqual([len(b) for b in batches], [3, 3, 1])
+        self.assertEqual([row["id"] for b in batches for row in b], list(range(7)))
+        cursor = self.pools[uri_big].conn.cursors[0]
+        self.assertEqual(cursor.fetch_sizes, [3, 3, 3])
+        self.assertFalse(self.pools[uri_big].conn.in_transaction)
+
+        # Client-side (asyncpg command_timeout) and server-side (statement_timeout) timeouts
+        uri_slow = "postgresql://a:pw@host-slow:5432/sales"
+        adapter = PostgresAdapter(uri_slow)
+        adapter.cost_gate.enabled = False
+        await adapter.execute("SELECT 1")
+        conn = self.pools[uri_slow].conn
+
+        conn.fetch_error = asyncio.TimeoutError()
+        with self.assertRaises(QueryTimeoutError):
+            await adapter.execute("SELECT pg_sleep(100)")
+        conn.fetch_error = asyncpg.exceptions.QueryCanceledError("canceling statement due to statement timeout")
+        with self.assertRaises(QueryTimeoutError):
+            await adapter.execute("SELECT pg_sleep(100)")
+
+        # Cancelling the calling task releases the connection back to the pool
+        conn.fetch_error = None
+        conn.fetch_delay = 10
+        task = asyncio.create_task(adapter.execute("SELECT pg_sleep(100)"))
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.manager._pools[uri_slow].in_flight, 1)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(self.manager._pools[uri_slow].in_flight, 0)
+
+        await self.manager.close_all()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Qdrant Adapter Tests
+
+This module contains tests for the QdrantAdapter running on the shared async
+client, batched searches with query_batch_points, and plan-level batching of
+vector searches. Qdrant runs in local in-memory mode, so no server is
+required.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Distance, PointStruct, VectorParams
+
+from server.agent.db.adapters.qdrant import QdrantAdapter
+from server.agent.db.orchestrator.implementation_agent import ImplementationAgent
+from server.agent.db.orchestrator.plans.base import QueryPlan
+from server.agent.db.orchestrator.plans.operations import QdrantOperation
+from server.agent.db.qdrant_client_manager import ClientEntry, QdrantClientManager
+from server.agent.db.qdrant_indexes import FilterUsageTracker
+
+
+class CountingClient:
+    """In-memory Qdrant client counting the search round trips"""
+
+    def __init__(self):
+        self.client = AsyncQdrantClient(location=":memory:")
+        self.calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+        if name in ("query_points", "query_batch_points"):
+            async def counted(*args, **kwargs):
+                self.calls.append((name, kwargs.get("collection_name")))
+                return await method(*args, **kwargs)
+            return counted
+        return method
+
+
+class TestQdrantAdapter(unittest.IsolatedAsyncioTestCase):
+    """Test the shared client, single and batched searches, and plan batching"""
+
+    async def asyncSetUp(self):
+        self.counting = CountingClient()
+        self.manager = QdrantClientManager(prefer_grpc=True, grpc_port=6334, timeout=5)
+        self.manager._clients[("http://qdrant:6333", None, True)] = ClientEntry(client=self.counting)
+        for target, value in (
+            ("server.agent.db.qdrant_client_manager._client_manager", self.manager),
+            ("server.agent.db.qdrant_indexes._usage_tracker", FilterUsageTracker(path=":memory:", enabled=False)),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        for name in ("docs", "faq"):
+            await self.counting.create_collection(name, vectors_config=VectorParams(size=2, distance=Distance.DOT))
+        await self.counting.upsert("docs", points=[
+            PointStruct(id=1, vector=[1.0, 0.0], payload={"title": "deploys", "team": "eng"}),
+            PointStruct(id=2, vector=[0.0, 1.0], payload={"title": "pricing", "team": "sales"}),
+            PointStruct(id=3, vector=[0.9, 0.1], payload={"title": "rollbacks", "team": "eng"}),
+        ])
+        await self.counting.upsert("faq", points=[
+            PointStruct(id=1, vector=[0.5, 0.5], payload={"question": "refunds?"}),
+        ])
+        self.adapter = QdrantAdapter("qdrant://qdrant:6333", collection_name="docs", prefer_grpc=True)
+
+    async def test_shared_client_and_batched_searches(self):
+        # Adapters on the same URI share one client
+        self.assertIs(self.adapter.client, self.counting)
+        self.assertIs(QdrantAdapter("http://qdrant:6333", collection_name="faq", prefer_grpc=True).client, self.counting)
+        self.assertIsNot(self.manager.get_client("http://other:6333"), self.counting)
+        self.assertEqual(self.manager.get_stats()["http://qdrant:6333"]["transport"], "grpc")
+
+        # Single search with a filter in Qdrant's format
+        results = await self.adapter.execute({
+            "vector": [1.0, 0.0], "limit": 5,
+            "filter": {"must": [{"key": "team", "match": {"value": "eng"}}]}
+        })
+        self.assertEqual([r["title"] for r in results], ["deploys", "rollbacks"])
+
+        # Searches on one collection share a round trip; results keep query order
+        self.counting.calls.clear()
+        batch = await self.adapter.execute_batch([
+            {"vector": [0.0, 1.0], "limit": 1},
+            {"collection": "faq", "vector": [1.0, 1.0], "limit": 1},
+            {"vector": [1.0, 0.0], "top_k": 2, "filter": {"exact_match": {"field": "team", "value": "eng"}}},
+        ])
+        self.assertEqual([[r["id"] for r in results] for results in batch], [[2], [1], [1, 3]])
+        self.assertEqual(sorted(self.counting.calls), [("query_batch_points", "docs"), ("query_batch_points", "faq")])
+
+        with self.assertRaises(ValueError):
+            await self.adapter.execute_batch([{"collection": "docs"}])
+
+        # A plan's searches on one collection run in a single batch
+        agent = ImplementationAgent({"max_retry_attempts": 0})
+        agent._adapter_cache = {"qdrant_main": self.adapter}
+        searches = [
+            QdrantOperation(id=f"search_{i}", source_id="qdrant_main", collection="docs", vector_query=vector, top_k=1)
+            for i, vector in enumerate([[1.0, 0.0], [0.0, 1.0], [0.8, 0.2]])
+        ]
+        plan = QueryPlan(operations=searches, metadata={"output_operation_id": "search_1"})
+
+        self.counting.calls.clear()
+        result = await agent.execute_plan(plan, "find docs")
+        self.assertEqual(self.counting.calls, [("query_batch_points", "docs")])
+        self.assertEqual(result["result"][0]["title"], "pricing")
+        self.assertEqual(searches[0].metadata["batched_with"], 3)
+        self.assertEqual(agent._vector_results, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
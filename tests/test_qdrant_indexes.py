@@ -0,0 +1,129 @@
+"""
+Qdrant Payload Index Tests
+
+This module contains tests for filter usage tracking in the QdrantAdapter and
+for creating payload indexes on frequently filtered fields. Qdrant runs in
+local in-memory mode with the payload index bookkeeping faked, since local
+mode ignores payload indexes.
+"""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Distance, PointStruct, VectorParams
+
+from server.agent.db.adapters import qdrant as qdrant_adapter
+from server.agent.db.adapters.qdrant import QdrantAdapter
+from server.agent.db.qdrant_client_manager import ClientEntry, QdrantClientManager
+from server.agent.db.qdrant_indexes import FilterUsageTracker, filter_fields, index_type_for
+
+
+class IndexingClient:
+    """In-memory Qdrant client that remembers created payload indexes"""
+
+    def __init__(self):
+        self.client = AsyncQdrantClient(location=":memory:")
+        self.payload_schema = {}
+        self.created = []
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    async def get_collection(self, collection_name):
+        info = await self.client.get_collection(collection_name)
+        return SimpleNamespace(config=info.config, payload_schema=dict(self.payload_schema))
+
+    async def create_payload_index(self, collection_name, field_name, field_schema, wait=True):
+        self.created.append((collection_name, field_name, field_schema))
+        self.payload_schema[field_name] = SimpleNamespace(data_type=field_schema)
+
+
+class TestQdrantPayloadIndexes(unittest.IsolatedAsyncioTestCase):
+    """Test filter field extraction, usage statistics and index creation"""
+
+    async def asyncSetUp(self):
+        self.qdrant = IndexingClient()
+        manager = QdrantClientManager(prefer_grpc=False, timeout=5)
+        manager._clients[("http://qdrant:6333", None, False)] = ClientEntry(client=self.qdrant)
+        self.tracker = FilterUsageTracker(path=":memory:", enabled=True)
+        for target, value in (
+            ("server.agent.db.qdrant_client_manager._client_manager", manager),
+            ("server.agent.db.qdrant_indexes._usage_tracker", self.tracker),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        qdrant_adapter._indexed_fields.clear()
+
+        await self.qdrant.create_collection("docs", vectors_config=VectorParams(size=2, distance=Distance.DOT))
+        await self.qdrant.upsert("docs", points=[
+            PointStruct(id=i, vector=[1.0, float(i)], payload={"team": team, "year": 2020 + i, "body": "text"})
+            for i, team in enumerate(["eng", "sales", "eng"])
+        ])
+        self.adapter = QdrantAdapter("http://qdrant:6333", collection_name="docs", prefer_grpc=False)
+
+    async def test_filter_usage_and_payload_indexes(self):
+        # Filtered fields and their index types are read from Qdrant filters
+        fields = filter_fields({
+            "must": [
+                {"key": "team", "match": {"value": "eng"}},
+                {"key": "year", "range": {"gte": 2021, "lt": 2024}},
+                {"key": "created_at", "range": {"gte": "2024-01-01T00:00:00Z"}},
+            ],
+            "should": [{"must_not": [{"key": "tags", "match": {"any": ["a", "b"]}}]}],
+            "min_should": {"conditions": [{"key": "score", "range": {"gt": 0.5}}], "min_count": 1},
+            "must_not": [
+                {"key": "body", "match": {"text": "outage"}},
+                {"is_empty": {"key": "owner"}},
+                {"nested": {"key": "authors", "filter": {"must": [{"key": "name", "match": {"value": "ada"}}]}}},
+            ],
+        })
+        self.assertEqual(fields, {
+            "team": "keyword", "year": "integer", "created_at": "datetime", "tags": "keyword",
+            "score": "float", "body": "text", "authors[].name": "keyword",
+        })
+        self.assertEqual(filter_fields({"exact_match": {"field": "active", "value": True}}), {"active": "bool"})
+
+        # Sampled payload types win over the filter's guess, except for full-text matches
+        schema = {"year": {"type": "int"}, "body": {"type": "str"}, "meta": {"type": "dict"}}
+        self.assertEqual(index_type_for("year", "keyword", schema), "integer")
+        self.assertEqual(index_type_for("body", "text", schema), "text")
+        self.assertEqual(index_type_for("meta", None, schema), None)
+
+        # Filtered searches are tracked per field
+        team_filter = {"must": [{"key": "team", "match": {"value": "eng"}}]}
+        year_filter = {"must": [{"key": "year", "range": {"gte": 2021}}]}
+        for _ in range(3):
+            await self.adapter.execute({"vector": [1.0, 0.0], "filter": team_filter})
+        await self.adapter.execute_batch([
+            {"vector": [1.0, 0.0], "filter": team_filter},
+            {"vector": [1.0, 0.0], "filter": year_filter},
+            {"vector": [1.0, 0.0]},
+        ])
+
+        usage = {u.field: u for u in self.adapter.get_filter_usage("docs")}
+        self.assertEqual((usage["team"].uses, usage["team"].indexed_uses), (4, 0))
+        self.assertEqual(usage["year"].schema_type, "integer")
+        self.assertIsNotNone(usage["team"].avg_unindexed_ms)
+
+        # Only fields filtered min_uses times are indexed, and only with --apply
+        plan = await self.adapter.ensure_payload_indexes(apply=False, min_uses=2)
+        self.assertEqual([(a.field, a.action, a.schema_type) for a in plan],
+                         [("team", "create", "keyword"), ("year", "skip", "integer")])
+        self.assertEqual(self.qdrant.created, [])
+        actions = await self.adapter.ensure_payload_indexes(min_uses=2)
+        self.assertTrue(actions[0].created)
+        self.assertEqual(self.qdrant.created, [("docs", "team", "keyword")])
+
+        # Later searches count as indexed, so the latency difference shows up in the stats
+        await self.adapter.execute({"vector": [1.0, 0.0], "filter": team_filter})
+        team = self.tracker.get_stats()["fields"][0]
+        self.assertEqual((team["field"], team["uses"], team["indexed_uses"]), ("team", 5, 1))
+        self.assertIsNotNone(team["avg_indexed_ms"])
+        self.assertEqual((await self.adapter.ensure_payload_indexes(min_uses=2))[0].action, "exists")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Qdrant Collection Profile Tests
+
+This module contains tests for collection storage profiles (quantization,
+on-disk storage and HNSW settings), migrating existing collections to a
+profile, and rescoring of searches on quantized collections. Qdrant runs in
+local in-memory mode, which ignores storage settings, so the clients record
+what they were asked to do.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.http import models
+
+from server.agent.db.adapters import qdrant as qdrant_adapter
+from server.agent.db.adapters.qdrant import QdrantAdapter
+from server.agent.db.qdrant_client_manager import ClientEntry, QdrantClientManager
+from server.agent.db.qdrant_indexes import FilterUsageTracker
+from server.agent.mcp.collection_profiles import PROFILES, get_collection_profile, migrate_collection
+
+
+class RecordingClient:
+    """In-memory Qdrant client reporting a quantized collection and recording search parameters"""
+
+    def __init__(self):
+        self.client = AsyncQdrantClient(location=":memory:")
+        self.search_params = []
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    async def get_collection(self, collection_name):
+        info = await self.client.get_collection(collection_name)
+        if collection_name == "quantized":
+            info.config.quantization_config = PROFILES["balanced"].quantization_config()
+        return info
+
+    async def query_points(self, collection_name, **kwargs):
+        self.search_params.append((collection_name, kwargs.get("search_params")))
+        return await self.client.query_points(collection_name, **kwargs)
+
+    async def query_batch_points(self, collection_name, requests, **kwargs):
+        self.search_params.extend((collection_name, request.params) for request in requests)
+        return await self.client.query_batch_points(collection_name, requests, **kwargs)
+
+
+class MigratingClient:
+    """In-memory Qdrant client recording collection updates"""
+
+    def __init__(self):
+        self.client = QdrantClient(location=":memory:")
+        self.updates = []
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def update_collection(self, collection_name, **kwargs):
+        self.updates.append((collection_name, kwargs))
+        return True
+
+
+class TestCollectionProfiles(unittest.IsolatedAsyncioTestCase):
+    """Test profile settings, migration of existing collections and rescored search"""
+
+    async def asyncSetUp(self):
+        self.qdrant = RecordingClient()
+        manager = QdrantClientManager(prefer_grpc=False, timeout=5)
+        manager._clients[("http://qdrant:6333", None, False)] = ClientEntry(client=self.qdrant)
+        for target, value in (
+            ("server.agent.db.qdrant_client_manager._client_manager", manager),
+            ("server.agent.db.qdrant_indexes._usage_tracker", FilterUsageTracker(path=":memory:", enabled=False)),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        qdrant_adapter._indexed_fields.clear()
+        qdrant_adapter._quantized_collections.clear()
+
+        for name in ("quantized", "plain"):
+            await self.qdrant.create_collection(name, vectors_config=models.VectorParams(size=2, distance=models.Distance.DOT))
+            await self.qdrant.upsert(name, points=[
+                models.PointStruct(id=i, vector=[1.0, float(i)], payload={"n": i}) for i in range(3)
+            ])
+
+    async def test_collection_profiles(self):
+        # Profiles translate to on-disk, quantized collection settings
+        kwargs = PROFILES["balanced"].create_kwargs(384)
+        self.assertTrue(kwargs["vectors_config"].on_disk)
+        self.assertTrue(kwargs["on_disk_payload"])
+        self.assertEqual(kwargs["quantization_config"].scalar.type, models.ScalarType.INT8)
+        self.assertEqual(PROFILES["low_memory"].quantization_config().product.compression, models.CompressionRatio.X16)
+        self.assertIsNone(PROFILES["default"].search_params())
+        self.assertTrue(PROFILES["low_memory"].search_params().quantization.rescore)
+
+        with patch("server.agent.mcp.collection_profiles.settings.QDRANT_HNSW_M", 32):
+            profile = get_collection_profile("balanced")
+        self.assertEqual((profile.hnsw_m, profile.quantization), (32, "scalar"))
+        with self.assertRaises(ValueError):
+            get_collection_profile("huge")
+
+        # Existing collections are migrated in place; dry runs only report the changes
+        migrating = MigratingClient()
+        migrating.create_collection("messages", **PROFILES["default"].create_kwargs(4))
+
+        self.assertEqual(migrate_collection(migrating, "messages", PROFILES["default"]), [])
+        changes = migrate_collection(migrating, "messages", PROFILES["low_memory"], dry_run=True)
+        self.assertEqual(len(changes), 4)
+        self.assertEqual(migrating.updates, [])
+
+        migrate_collection(migrating, "messages", PROFILES["balanced"])
+        collection_name, update = migrating.updates[0]
+        self.assertEqual(collection_name, "messages")
+        self.assertEqual(sorted(update), ["collection_params", "quantization_config", "vectors_config"])
+        self.assertTrue(update["vectors_config"][""].on_disk)
+        self.assertIsNotNone(update["quantization_config"].scalar)
+
+        # The adapter rescores searches on quantized collections only
+        adapter = QdrantAdapter("http://qdrant:6333", collection_name="quantized", prefer_grpc=False, oversampling=3.0)
+        await adapter.execute({"vector": [1.0, 0.0], "limit": 2})
+        await adapter.execute({"collection": "plain", "vector": [1.0, 0.0], "limit": 2})
+        await adapter.execute_batch([{"vector": [1.0, 0.0]}, {"collection": "plain", "vector": [0.0, 1.0]}])
+
+        params = dict(self.qdrant.search_params[:2])
+        self.assertEqual((params["quantized"].quantization.rescore, params["quantized"].quantization.oversampling), (True, 3.0))
+        self.assertIsNone(params["plain"])
+        batch = dict(self.qdrant.search_params[2:])
+        self.assertTrue(batch["quantized"].quantization.rescore)
+        self.assertIsNone(batch["plain"])
+
+        # Rescoring can be turned off
+        self.qdrant.search_params.clear()
+        adapter = QdrantAdapter("http://qdrant:6333", collection_name="quantized", prefer_grpc=False, rescore=False)
+        await adapter.execute({"vector": [1.0, 0.0]})
+        self.assertEqual(self.qdrant.search_params, [("quantized", None)])
+
+if __name__ == "__main__":
+    unittest.main()
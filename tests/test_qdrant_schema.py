@@ -0,0 +1,110 @@
+"""
+Qdrant Schema Inference Tests
+
+This module contains tests for inferring payload schemas from sampled points
+and for skipping collections that have not changed since they were sampled.
+Qdrant runs in local in-memory mode, so no server is required.
+"""
+
+import asyncio
+import unittest
+
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Distance, PointStruct, VectorParams
+
+from server.agent.db.qdrant_schema import QdrantSchemaInferrer
+
+
+class SamplingClient:
+    """In-memory Qdrant client recording which collections were sampled, and how many at once"""
+
+    def __init__(self):
+        self.client = AsyncQdrantClient(location=":memory:")
+        self.sampled = []
+        self.active = 0
+        self.max_active = 0
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    async def query_points(self, collection_name, **kwargs):
+        self.sampled.append(collection_name)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.05)
+            return await self.client.query_points(collection_name, **kwargs)
+        finally:
+            self.active -= 1
+
+
+class TestQdrantSchemaInference(unittest.IsolatedAsyncioTestCase):
+    """Test type histograms, bounded concurrency and signature-based caching"""
+
+    async def asyncSetUp(self):
+        self.qdrant = SamplingClient()
+        for name in ("tickets", "docs", "faq"):
+            await self.qdrant.create_collection(name, vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+        await self.qdrant.upsert("tickets", points=[
+            PointStruct(id=i, vector=[1.0, float(i)], payload=payload)
+            for i, payload in enumerate([
+                {"team": "eng", "priority": 1, "author": {"name": "ada", "tags": [{"id": 1}]}},
+                {"team": "sales", "priority": 2.5, "author": {"name": "bob"}},
+                {"team": "eng", "priority": None},
+                {"team": "ops", "priority": 3},
+            ])
+        ])
+        await self.qdrant.upsert("docs", points=[
+            PointStruct(id=1, vector=[0.5, 0.5], payload={"title": "deploys"}),
+        ])
+
+    async def test_schema_inference(self):
+        # Payload fields get type histograms and presence ratios
+        inferrer = QdrantSchemaInferrer(sample_size=50, concurrency=2)
+        schema = await inferrer.infer_collection(self.qdrant, "tickets", source="local")
+        self.assertEqual((schema.points_count, schema.sampled), (4, 4))
+        self.assertEqual(schema.vectors, {"": {"size": 2, "distance": "Cosine"}})
+
+        payload = schema.to_payload_schema()
+        self.assertEqual(payload["team"], {"type": "str", "indexed": False, "presence": 1.0, "types": {"str": 1.0}})
+        self.assertEqual(payload["priority"]["type"], "int")
+        self.assertEqual(payload["priority"]["types"], {"int": 0.5, "float": 0.25, "null": 0.25})
+        self.assertEqual(payload["author.name"]["presence"], 0.5)
+        self.assertEqual(payload["author.tags[].id"]["type"], "int")
+
+        fields = schema.to_fields()
+        self.assertTrue(fields["priority"]["nullable"])
+        self.assertEqual(fields["vector_dimensions"]["dimensions"], "2")
+        content = schema.to_content()
+        self.assertIn("- priority: int; present in 100% of points; types: int 50%, float 25%, null 25%", content)
+        self.assertIn("POINTS COUNT: 4", content)
+
+        # Collections are sampled concurrently, at most concurrency at a time
+        inferrer = QdrantSchemaInferrer(sample_size=50, concurrency=2)
+        schemas = await inferrer.infer_all(self.qdrant, source="local")
+        self.assertEqual(sorted(schemas), ["docs", "faq", "tickets"])
+        self.assertEqual(schemas["faq"].sampled, 0)
+        self.assertEqual(self.qdrant.max_active, 2)
+
+        # Nothing changed: every collection comes from the cache
+        self.qdrant.sampled.clear()
+        cached = await inferrer.infer_all(self.qdrant, source="local")
+        self.assertEqual(self.qdrant.sampled, [])
+        self.assertIs(cached["docs"], schemas["docs"])
+
+        # A new point changes the points count, so only that collection is sampled again
+        await self.qdrant.upsert("docs", points=[
+            PointStruct(id=2, vector=[0.1, 0.9], payload={"title": "pricing", "draft": True}),
+        ])
+        refreshed = await inferrer.infer_all(self.qdrant, source="local")
+        self.assertEqual(self.qdrant.sampled, ["docs"])
+        self.assertEqual(refreshed["docs"].to_payload_schema()["draft"]["presence"], 0.5)
+
+        inferrer.invalidate("local", "faq")
+        self.qdrant.sampled.clear()
+        await inferrer.infer_all(self.qdrant, ["faq", "tickets"], source="local")
+        self.assertEqual(self.qdrant.sampled, ["faq"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Read Replica Routing Tests
+
+This module contains tests for routing read-only SQL to PostgreSQL
+replicas, using fake asyncpg pools so no live database is required.
+"""
+
+import unittest
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+from server.agent.db.pool_manager import PostgresPoolManager
+from server.agent.db.replica_router import ReplicaRouter, is_read_only
+
+PRIMARY = "postgresql://app:pw@primary:5432/sales"
+REPLICA_A = "postgresql://app:pw@replica-a:5432/sales"
+REPLICA_B = "postgresql://app:pw@replica-b:5432/sales"
+REPLICA_LAGGING = "postgresql://app:pw@replica-lagging:5432/sales"
+REPLICA_DOWN = "postgresql://app:pw@replica-down:5432/sales"
+
+
+class FakeConnection:
+    """Connection that reports a fixed replication lag"""
+
+    def __init__(self, dsn, lag_seconds):
+        self.dsn = dsn
+        self.lag_seconds = lag_seconds
+
+    async def fetchrow(self, query, *args):
+        return {"in_recovery": self.dsn != PRIMARY, "lag_seconds": self.lag_seconds}
+
+
+class FakePool:
+    """Pool handing out a single fake connection"""
+
+    def __init__(self, dsn, lag_seconds):
+        self._closed = False
+        self.conn = FakeConnection(dsn, lag_seconds)
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+    async def close(self):
+        self._closed = True
+
+    def terminate(self):
+        self._closed = True
+
+
+class TestReplicaRouter(unittest.IsolatedAsyncioTestCase):
+    """Test read-only detection, least-outstanding balancing, lag checks and fallback"""
+
+    async def asyncSetUp(self):
+        self.lags = {PRIMARY: 0, REPLICA_A: 1, REPLICA_B: 2, REPLICA_LAGGING: 300}
+
+        async def fake_create_pool(dsn=None, **kwargs):
+            if dsn not in self.lags:
+                raise OSError(f"could not connect to {dsn}")
+            return FakePool(dsn, self.lags[dsn])
+
+        create_patcher = patch("server.agent.db.pool_manager.asyncpg.create_pool", side_effect=fake_create_pool)
+        create_patcher.start()
+        self.addCleanup(create_patcher.stop)
+
+        self.manager = PostgresPoolManager(min_size=1, max_size=2, idle_timeout=0, max_inactive_connection_lifetime=0)
+        manager_patcher = patch("server.agent.db.pool_manager._pool_manager", self.manager)
+        manager_patcher.start()
+        self.addCleanup(manager_patcher.stop)
+
+    async def test_replica_routing(self):
+        # Only SELECT-style statements without side effects go to replicas
+        self.assertTrue(is_read_only("WITH t AS (SELECT 1) SELECT * FROM t"))
+        self.assertTrue(is_read_only("  select * from orders;"))
+        self.assertFalse(is_read_only("UPDATE orders SET status = 'x'"))
+        self.assertFalse(is_read_only("SELECT * FROM orders FOR UPDATE"))
+        self.assertFalse(is_read_only("SELECT * INTO archive FROM orders"))
+        self.assertFalse(is_read_only("WITH d AS (DELETE FROM orders RETURNING *) SELECT * FROM d"))
+        self.assertFalse(is_read_only("SELECT 1; DROP TABLE orders"))
+
+        router = ReplicaRouter(PRIMARY, [REPLICA_A, REPLICA_B, REPLICA_LAGGING],
+                               max_lag_seconds=30, health_check_interval=60)
+
+        # Lagging replicas are skipped; load goes to the least busy healthy replica
+        async with router.acquire(read_only=True) as first:
+            async with router.acquire(read_only=True) as second:
+                self.assertEqual({first.dsn, second.dsn}, {REPLICA_A, REPLICA_B})
+                async with router.acquire(read_only=True) as third:
+                    self.assertIn(third.dsn, (REPLICA_A, REPLICA_B))
+        stats = {replica["dsn"]: replica for replica in router.get_stats()["replicas"]}
+        lagging = stats[REPLICA_LAGGING.replace(":pw@", ":***@")]
+        self.assertFalse(lagging["healthy"])
+        self.assertEqual(lagging["lag_seconds"], 300)
+        self.assertIn("lag", lagging["last_error"])
+        self.assertTrue(all(replica["outstanding"] == 0 for replica in stats.values()))
+
+        # Writes always use the primary
+        async with router.acquire(read_only=False) as conn:
+            self.assertEqual(conn.dsn, PRIMARY)
+
+        # Unreachable replicas fail the health check; with none healthy, reads fall back
+        router = ReplicaRouter(PRIMARY, [REPLICA_DOWN], max_lag_seconds=30, health_check_interval=60)
+        async with router.acquire(read_only=True) as conn:
+            self.assertEqual(conn.dsn, PRIMARY)
+        self.assertEqual(router.get_stats()["fallbacks"], 1)
+        self.assertIsNotNone(router.get_stats()["replicas"][0]["last_error"])
+
+        # A replica failing between health checks is taken out of rotation
+        router = ReplicaRouter(PRIMARY, [REPLICA_A], max_lag_seconds=30, health_check_interval=60)
+        await router.check_health()
+        del self.lags[REPLICA_A]
+        await self.manager.close(REPLICA_A)
+        async with router.acquire(read_only=True) as conn:
+            self.assertEqual(conn.dsn, PRIMARY)
+        self.assertFalse(router.replicas[0].healthy)
+        self.assertEqual((await router.get_read_pool()).conn.dsn, PRIMARY)
+
+        await self.manager.close_all()
+
+
+if __name__ == "__main__":
+    unittest.main()
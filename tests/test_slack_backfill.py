@@ -0,0 +1,156 @@
+"""
+Slack Backfill Tests
+
+This module contains tests for resumable channel backfill: channels are
+indexed page by page without a message limit, every stored page saves a
+checkpoint, and a backfill interrupted part way resumes from the saved
+cursor (or from the oldest indexed message if the cursor has expired).
+Slack and the embedding model are faked; Qdrant runs in local in-memory mode.
+"""
+
+import unittest
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Distance, VectorParams
+
+from server.agent.mcp.indexer.embedding_cache import MessageEmbeddingCache
+from server.agent.mcp.indexer.pipeline import HISTORY_PAGE_SIZE, ChannelJob, IndexingPipeline
+from server.agent.mcp.qdrant_client import upsert_message_embeddings
+
+NOW = 1_700_000_000
+
+
+class PagingSlack:
+    """conversations.history with cursors that point at a ts, like Slack's, newest message first"""
+
+    def __init__(self, count):
+        self.messages = [{"ts": f"{NOW + i}.000100", "text": f"message {i}"} for i in reversed(range(count))]
+        self.fail_on_page = None
+        self.expired = set()
+        self.requests = []
+
+    def add(self, count):
+        start = len(self.messages)
+        self.messages = [{"ts": f"{NOW + start + i}.000100", "text": f"message {start + i}"}
+                         for i in reversed(range(count))] + self.messages
+
+    async def fetch_page(self, channel_id, params):
+        self.requests.append(params)
+        if len(self.requests) == self.fail_on_page:
+            raise ConnectionError("connection reset")
+        if params.get("cursor") in self.expired:
+            raise RuntimeError("invalid_cursor")
+        before = float(params.get("cursor") or params.get("latest") or "inf")
+        matching = [m for m in self.messages if float(params["oldest"]) < float(m["ts"]) < before]
+        page = matching[:params["limit"]]
+        more = len(matching) > params["limit"]
+        return {"messages": page, "response_metadata": {"next_cursor": page[-1]["ts"] if more else ""}}
+
+
+class TestChannelBackfill(unittest.IsolatedAsyncioTestCase):
+    """Test checkpoints and resuming a channel backfill"""
+
+    async def asyncSetUp(self):
+        self.qdrant = AsyncQdrantClient(location=":memory:")
+        await self.qdrant.create_collection("slack", vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+        self.checkpoint = {"message_count": 0}
+        self.checkpoints = []
+
+    def encode(self, texts):
+        return np.array([[1.0, float(len(text))] for text in texts])
+
+    async def upsert(self, embeddings, payloads):
+        return await upsert_message_embeddings(self.qdrant, "slack", embeddings, payloads)
+
+    def save_checkpoint(self, channel, checkpoint, indexed_messages):
+        self.checkpoints.append(dict(checkpoint))
+        self.checkpoint.update(checkpoint)
+        self.checkpoint["message_count"] += indexed_messages
+
+    def job(self):
+        return ChannelJob(
+            "C1", "general", self.checkpoint.get("last_indexed_ts"),
+            backfill_cursor=self.checkpoint.get("backfill_cursor"),
+            oldest_indexed_ts=self.checkpoint.get("oldest_indexed_ts")
+        )
+
+    async def index(self, slack):
+        pipeline = IndexingPipeline(
+            fetch_page=slack.fetch_page, encode=self.encode, upsert=self.upsert, cutoff_ts=0,
+            on_checkpoint=self.save_checkpoint, workspace_id="T1", embedding_cache=MessageEmbeddingCache(0),
+            batch_size=64, queue_size=128
+        )
+        return (await pipeline.run([self.job()]))["C1"]
+
+    async def test_channel_backfill(self):
+        slack = PagingSlack(HISTORY_PAGE_SIZE * 6 + 30)
+        slack.fail_on_page = 4
+        channel = await self.index(slack)
+
+        # Three pages were stored before the connection dropped; more than the old 1000-message cap follows
+        self.assertEqual(channel.error, "connection reset")
+        self.assertEqual(self.checkpoint["last_indexed_ts"], slack.messages[0]["ts"])
+        self.assertEqual(self.checkpoint["oldest_indexed_ts"], slack.messages[HISTORY_PAGE_SIZE * 3 - 1]["ts"])
+        self.assertEqual(self.checkpoint["backfill_cursor"], self.checkpoint["oldest_indexed_ts"])
+        self.assertEqual(self.checkpoint["message_count"], HISTORY_PAGE_SIZE * 3)
+
+        # After a restart, new messages are fetched and the backfill continues from the cursor
+        slack.fail_on_page = None
+        slack.add(5)
+        slack.requests.clear()
+        channel = await self.index(slack)
+        self.assertIsNone(channel.error)
+        self.assertEqual(slack.requests[0]["oldest"], f"{NOW + HISTORY_PAGE_SIZE * 6 + 29}.000100")
+        self.assertEqual(slack.requests[1]["cursor"], slack.messages[5 + HISTORY_PAGE_SIZE * 3 - 1]["ts"])
+        self.assertEqual(len(slack.requests), 1 + 4)
+        self.assertEqual(self.checkpoint["last_indexed_ts"], slack.messages[0]["ts"])
+        self.assertIsNone(self.checkpoint["backfill_cursor"])
+        self.assertEqual(self.checkpoint["oldest_indexed_ts"], slack.messages[-1]["ts"])
+        self.assertEqual(self.checkpoint["message_count"], len(slack.messages))
+        self.assertEqual((await self.qdrant.count("slack")).count, len(slack.messages))
+
+        # Once backfilled, a run only fetches new messages
+        slack.requests.clear()
+        await self.index(slack)
+        self.assertEqual(len(slack.requests), 1)
+
+        # An expired cursor is replaced by the oldest indexed message, on a fresh channel
+        self.checkpoint = {"message_count": 0}
+        await self.qdrant.delete_collection("slack")
+        await self.qdrant.create_collection("slack", vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+        slack = PagingSlack(HISTORY_PAGE_SIZE * 3)
+        slack.fail_on_page = 2
+        await self.index(slack)
+        cursor = self.checkpoint["backfill_cursor"]
+
+        slack.fail_on_page = None
+        slack.expired.add(cursor)
+        slack.requests.clear()
+        await self.index(slack)
+        self.assertEqual(slack.requests[2]["latest"], cursor)
+        self.assertIsNone(self.checkpoint["backfill_cursor"])
+        self.assertEqual((await self.qdrant.count("slack")).count, HISTORY_PAGE_SIZE * 3)
+
+        # A page that fails to store holds the checkpoint back
+        self.checkpoint = {"message_count": 0}
+        self.checkpoints.clear()
+
+        async def failing_upsert(embeddings, payloads):
+            if any(payload["text"] == "message 250" for payload in payloads):
+                raise RuntimeError("qdrant unavailable")
+            return await self.upsert(embeddings, payloads)
+
+        pipeline = IndexingPipeline(
+            fetch_page=PagingSlack(HISTORY_PAGE_SIZE * 3).fetch_page, encode=self.encode, upsert=failing_upsert,
+            cutoff_ts=0, on_checkpoint=self.save_checkpoint, embedding_cache=MessageEmbeddingCache(0),
+            batch_size=64, queue_size=128
+        )
+        channel = (await pipeline.run([ChannelJob("C1", "general")]))["C1"]
+        self.assertGreater(channel.failed, 0)
+        self.assertEqual(len(self.checkpoints), 1)
+        self.assertEqual(self.checkpoint["backfill_cursor"], f"{NOW + HISTORY_PAGE_SIZE * 2}.000100")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Slack Re-indexing Tests
+
+This module contains tests for deterministic message point IDs and the
+embedding cache: re-indexing a channel must not duplicate points, and
+messages whose text has not changed are neither encoded nor written again.
+Slack and the embedding model are faked; Qdrant runs in local in-memory mode.
+"""
+
+import unittest
+
+from qdrant_client.http.models import PointStruct
+
+from server.agent.mcp.indexer.embedding_cache import MessageEmbeddingCache
+from server.agent.mcp.indexer.pipeline import ChannelJob, IndexingPipeline, prepare_message
+from server.agent.mcp.qdrant_client import get_legacy_message_point_ids, message_point_id, point_id_for
+from slack_fixtures import NOW, SlackIndexingTestCase
+
+
+class TestReindexing(SlackIndexingTestCase):
+    """Test stable point IDs, skipping unchanged messages and encoding repeated texts once"""
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.cache = MessageEmbeddingCache(max_entries=1000)
+        self.messages = [{"ts": f"{NOW + i}.000100", "text": f"message {i % 40}", "user": "U1"} for i in reversed(range(60))]
+
+    async def index(self, stored_hashes=True):
+        async def fetch_page(channel_id, params):
+            return {"messages": self.messages}
+
+        pipeline = IndexingPipeline(
+            fetch_page=fetch_page, encode=self.encode, upsert=self.upsert, cutoff_ts=0, workspace_id="T1",
+            stored_hashes=self.stored_hashes if stored_hashes else None, embedding_cache=self.cache,
+            model_name="test-model", batch_size=16, queue_size=32
+        )
+        progress = await pipeline.run([ChannelJob("C1", "general")])
+        return pipeline.stats, progress["C1"]
+
+    async def test_reindexing(self):
+        # Point IDs only depend on workspace, channel and ts
+        _, payload = prepare_message({"ts": f"{NOW}.000100", "text": "hello"}, "C1", "general", "T1")
+        _, edited = prepare_message({"ts": f"{NOW}.000100", "text": "hello, edited"}, "C1", "general", "T1")
+        self.assertEqual(point_id_for(payload), message_point_id("T1", "C1", f"{NOW}.000100"))
+        self.assertEqual(point_id_for(payload), point_id_for(edited))
+        self.assertNotEqual(payload["text_hash"], edited["text_hash"])
+        # Messages sent in the same second of different channels or workspaces do not collide
+        self.assertNotEqual(message_point_id("T1", "C1", f"{NOW}.000100"), message_point_id("T1", "C2", f"{NOW}.000100"))
+        self.assertNotEqual(message_point_id("T1", "C1", f"{NOW}.000100"), message_point_id("T2", "C1", f"{NOW}.000100"))
+        self.assertNotEqual(message_point_id("T1", "C1", f"{NOW}.000100"), message_point_id("T1", "C1", f"{NOW}.000101"))
+
+        # Points written under the old integer IDs are found so a re-index can replace them
+        await self.qdrant.upsert("slack", points=[
+            PointStruct(id=NOW * 1000000 + i, vector=[1.0, 2.0], payload={"ts": float(NOW + i), "text": "old"})
+            for i in range(3)
+        ])
+        legacy_ids = await get_legacy_message_point_ids(self.qdrant, "slack", batch_size=2)
+        self.assertEqual(sorted(legacy_ids), [NOW * 1000000 + i for i in range(3)])
+        await self.delete(legacy_ids)
+
+        stats, channel = await self.index()
+        self.assertEqual((stats.indexed, stats.vectors_written, stats.unchanged), (60, 60, 0))
+        # Sixty messages but only forty distinct texts
+        self.assertEqual((stats.encoded, len(self.encoded)), (40, 40))
+        self.assertEqual((await self.qdrant.count("slack")).count, 60)
+        self.assertEqual(await get_legacy_message_point_ids(self.qdrant, "slack"), [])
+
+        # Nothing changed: no encoding, no writes
+        self.encoded.clear()
+        stats, channel = await self.index()
+        self.assertEqual((stats.vectors_written, stats.unchanged, stats.encoded), (0, 60, 0))
+        self.assertEqual((channel.indexed, channel.unchanged), (0, 60))
+        self.assertEqual(self.encoded, [])
+        self.assertGreater(stats.to_dict()["messages_per_second"], 0)
+
+        # An edited message is written again in place; its new text is encoded once
+        self.messages[0] = {**self.messages[0], "text": "edited"}
+        stats, _ = await self.index()
+        self.assertEqual((stats.vectors_written, stats.unchanged, self.encoded), (1, 59, ["edited"]))
+        self.assertEqual((await self.qdrant.count("slack")).count, 60)
+
+        # Without stored hashes every message is written again, but over the same points and from the cache
+        self.encoded.clear()
+        stats, _ = await self.index(stored_hashes=False)
+        self.assertEqual((stats.vectors_written, stats.encoded, stats.cache_hits), (60, 0, 60))
+        self.assertEqual(self.encoded, [])
+        self.assertEqual((await self.qdrant.count("slack")).count, 60)
+        self.assertEqual(self.cache.get_stats()["entries"], 41)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Slack Event Ingestion Tests
+
+This module contains tests for incremental indexing from Slack Events API
+payloads (new messages, edits, deletes and thread replies, replayed from a
+recorded file and from a queue), for fetching thread replies during a
+history sweep, and for the signature check of the events endpoint. Slack
+and the embedding model are faked; Qdrant runs in local in-memory mode.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from fastapi import FastAPI
+from slack_sdk.signature import SignatureVerifier
+
+from server.agent.mcp.api import indexing
+from server.agent.mcp.indexer.embedding_cache import MessageEmbeddingCache
+from server.agent.mcp.indexer.events import SlackEventIngester, read_event_file
+from server.agent.mcp.indexer.pipeline import ChannelJob, IndexingPipeline
+from server.agent.mcp.qdrant_client import message_point_id
+from slack_fixtures import NOW, SlackIndexingTestCase
+
+
+def event(**fields):
+    return {"type": "event_callback", "team_id": "T1", "event": {"type": "message", "channel": "C1", **fields}}
+
+
+class TestEventIngestion(SlackIndexingTestCase):
+    """Test applying message events to the collection"""
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.threads = {f"{NOW}.000100": [
+            {"ts": f"{NOW}.000100", "text": "deploy today?", "reply_count": 2},
+            {"ts": f"{NOW + 1}.000100", "thread_ts": f"{NOW}.000100", "text": "yes, after lunch"},
+            {"ts": f"{NOW + 2}.000100", "thread_ts": f"{NOW}.000100", "text": "done"},
+        ]}
+        self.reply_requests = []
+
+    async def fetch_replies(self, channel_id, thread_ts):
+        self.reply_requests.append((channel_id, thread_ts))
+        await asyncio.sleep(0.01)
+        return self.threads[thread_ts]
+
+    def pipeline(self, fetch_page, cutoff_ts=0):
+        return IndexingPipeline(
+            fetch_page=fetch_page, encode=self.encode, upsert=self.upsert, cutoff_ts=cutoff_ts,
+            fetch_replies=self.fetch_replies, workspace_id="T1", stored_hashes=self.stored_hashes,
+            embedding_cache=MessageEmbeddingCache(100), batch_size=16, queue_size=32
+        )
+
+    def ingester(self):
+        return SlackEventIngester("T1", self.pipeline, self.delete, channel_name={"C1": "general"}.get)
+
+    async def text(self, ts, channel_id="C1"):
+        points = await self.qdrant.retrieve("slack", [message_point_id("T1", channel_id, ts)], with_payload=True)
+        return points[0].payload["text"] if points else None
+
+    async def test_event_ingestion(self):
+        # Events replayed from a recorded file
+        events = [
+            event(ts=f"{NOW + 10}.000100", text="first", user="U1"),
+            event(ts=f"{NOW + 11}.000100", text="second", user="U2"),
+            event(ts=f"{NOW + 12}.000100", text="gone soon", user="U2"),
+            event(subtype="message_changed", message={"ts": f"{NOW + 10}.000100", "text": "first (edited)", "user": "U1"}),
+            event(subtype="message_deleted", deleted_ts=f"{NOW + 12}.000100"),
+            {"type": "event_callback", "team_id": "T2", "event": {"type": "message", "channel": "C9", "ts": "1.0", "text": "x"}},
+            event(subtype="message_replied", message={"ts": f"{NOW}.000100", "text": "deploy today?", "reply_count": 2}),
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "events.jsonl")
+            with open(path, "w") as events_file:
+                events_file.write("\n".join(json.dumps(payload) for payload in events) + "\n\n")
+            stats = await self.ingester().ingest(read_event_file(path))
+
+        self.assertEqual((stats.events, stats.ignored, stats.deletes, stats.upserts), (7, 1, 1, 3))
+        # The thread was fetched once and its two replies indexed with the parent
+        self.assertEqual(self.reply_requests, [("C1", f"{NOW}.000100")])
+        self.assertEqual(stats.replies, 2)
+        self.assertEqual((await self.qdrant.count("slack")).count, 5)
+        self.assertEqual(await self.text(f"{NOW + 10}.000100"), "first (edited)")
+        self.assertIsNone(await self.text(f"{NOW + 12}.000100"))
+        self.assertEqual(await self.text(f"{NOW + 2}.000100"), "done")
+
+        # Replaying the same events changes nothing
+        stats = await self.ingester().ingest(events)
+        self.assertEqual((stats.indexed, stats.unchanged), (0, 5))
+
+        # Events consumed from a queue in batches; tombstones delete the message
+        queue = asyncio.Queue()
+        consumer = asyncio.create_task(self.ingester().consume(queue, batch_size=2, linger_seconds=0.01))
+        await queue.put(event(ts=f"{NOW + 20}.000100", text="hello"))
+        await queue.put(event(ts=f"{NOW + 21}.000100", thread_ts=f"{NOW + 20}.000100", text="hi"))
+        await queue.put(event(subtype="message_changed", message={"ts": f"{NOW + 20}.000100", "subtype": "tombstone", "text": "This message was deleted."}))
+        await queue.put(None)
+        await asyncio.wait_for(consumer, 5)
+        self.assertIsNone(await self.text(f"{NOW + 20}.000100"))
+        self.assertEqual(await self.text(f"{NOW + 21}.000100"), "hi")
+
+        # A history sweep fetches the replies of threads it finds
+        async def fetch_page(channel_id, params):
+            return {"messages": [
+                {"ts": f"{NOW + 5}.000100", "text": "unrelated"},
+                {"ts": f"{NOW}.000100", "thread_ts": f"{NOW}.000100", "text": "deploy today?", "reply_count": 2},
+            ]}
+
+        pipeline = self.pipeline(fetch_page)
+        progress = await pipeline.run([ChannelJob("C2", "eng")])
+        self.assertEqual(progress["C2"].indexed, 4)
+        self.assertEqual((pipeline.stats.threads, pipeline.stats.replies), (1, 2))
+        self.assertEqual(await self.text(f"{NOW + 1}.000100", channel_id="C2"), "yes, after lunch")
+
+        # The events endpoint only accepts requests signed with the configured secret
+        app = FastAPI()
+        app.include_router(indexing.router)
+        body = json.dumps(event(ts=f"{NOW + 30}.000100", text="posted")).encode()
+        timestamp = str(int(time.time()))
+        signed = {
+            "X-Slack-Request-Timestamp": timestamp,
+            "X-Slack-Signature": SignatureVerifier("secret").generate_signature(timestamp=timestamp, body=body),
+        }
+        enqueue = AsyncMock(return_value=True)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mcp") as client:
+            with patch.object(indexing, "enqueue_slack_event", enqueue):
+                with patch.object(indexing.settings, "SLACK_SIGNING_SECRET", ""):
+                    self.assertEqual((await client.post("/events", content=body)).status_code, 503)
+                    self.assertEqual((await client.post("/events", content=body, headers=signed)).status_code, 503)
+                with patch.object(indexing.settings, "SLACK_SIGNING_SECRET", "secret"):
+                    self.assertEqual((await client.post("/events", content=body)).status_code, 401)
+                    enqueue.assert_not_awaited()
+                    self.assertEqual((await client.post("/events", content=body, headers=signed)).status_code, 200)
+        enqueue.assert_awaited_once_with(json.loads(body))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Slack Indexing Pipeline Tests
+
+This module contains tests for the staged Slack indexing pipeline
+(concurrent channel fetchers, batched embedding in a thread pool, async
+Qdrant upserts) and for the tier-aware Slack rate limiter. Slack and the
+embedding model are faked; Qdrant runs in local in-memory mode.
+"""
+
+import asyncio
+import time
+import unittest
+from types import SimpleNamespace
+
+from slack_sdk.errors import SlackApiError
+
+from server.agent.mcp.indexer.pipeline import ChannelJob, IndexingPipeline
+from server.agent.mcp.indexer.rate_limiter import SlackRateLimiter
+from slack_fixtures import NOW, FakeSlack, SlackIndexingTestCase, channel_messages
+
+
+class TestIndexingPipeline(SlackIndexingTestCase):
+    """Test the fetch, embed and upsert stages, per-channel completion and rate limiting"""
+
+    encode_delay = 0.01
+
+    async def test_indexing_pipeline(self):
+        general = channel_messages("general", 450)
+        general.append({"ts": f"{NOW - 86400 * 90}.000100", "text": "too old"})
+        general.insert(0, {"ts": f"{NOW + 1000}.000100", "subtype": "channel_join"})
+        slack = FakeSlack({
+            "C1": general,
+            "C2": channel_messages("random", 30, start=2000),
+            "C3": channel_messages("eng", 120, start=3000),
+        })
+        completed = []
+        pipeline = IndexingPipeline(
+            fetch_page=slack.fetch_page, encode=self.encode, upsert=self.upsert,
+            cutoff_ts=NOW - 86400 * 30, on_channel_complete=completed.append,
+            fetch_concurrency=2, embedding_workers=2, upsert_concurrency=2, batch_size=64, queue_size=128
+        )
+        progress = await pipeline.run([
+            ChannelJob("C1", "general"), ChannelJob("C2", "random"), ChannelJob("C3", "eng", oldest_ts=f"{NOW + 3099}.000100"),
+        ])
+
+        self.assertEqual((progress["C1"].fetched, progress["C1"].indexed, progress["C1"].skipped), (451, 450, 1))
+        self.assertEqual(progress["C1"].oldest_ts, f"{NOW}.000100")
+        self.assertEqual(progress["C3"].indexed, 20)
+        self.assertEqual(sorted(channel.channel_id for channel in completed), ["C1", "C2", "C3"])
+        self.assertEqual((await self.qdrant.count("slack")).count, 500)
+
+        # Channels are fetched two at a time and pages are paced by the fetcher, not the embedder
+        self.assertEqual(slack.max_active, 2)
+        self.assertEqual(len([call for call in slack.calls if call[0] == "C1"]), 3)
+        # Embedding runs in the pool, in batches drawn from every channel, behind a bounded queue
+        self.assertTrue(all(name.startswith("slack-embed") for name, _ in self.encode_batches))
+        self.assertLessEqual(max(size for _, size in self.encode_batches), 64)
+        self.assertLessEqual(pipeline.stats.max_queued, 128)
+        self.assertEqual(pipeline.stats.indexed, 500)
+        self.assertGreater(pipeline.stats.to_dict()["messages_per_second"], 0)
+
+        # A failing channel is reported without stopping the others
+        async def fetch_page(channel_id, params):
+            if channel_id == "C2":
+                raise RuntimeError("channel_not_found")
+            return await slack.fetch_page(channel_id, params)
+
+        slack.channels["C4"] = channel_messages("ops", 10, start=4000)
+        completed = []
+        pipeline = IndexingPipeline(
+            fetch_page=fetch_page, encode=self.encode, upsert=self.upsert, cutoff_ts=0,
+            on_channel_complete=completed.append, batch_size=8, queue_size=16
+        )
+        progress = await pipeline.run([ChannelJob("C4", "ops"), ChannelJob("C2", "gone")])
+        self.assertEqual(progress["C4"].indexed, 10)
+        self.assertEqual(progress["C2"].error, "channel_not_found")
+        self.assertEqual(len(completed), 2)
+
+        # The rate limiter paces each method separately
+        limiter = SlackRateLimiter(burst=2, requests_per_minute={"conversations.history": 1200})
+        self.assertAlmostEqual(SlackRateLimiter(factor=1.0).interval("conversations.list"), 3.0)
+
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire("conversations.history") for _ in range(6)))
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+        start = time.monotonic()
+        await limiter.acquire("users.info")
+        self.assertLess(time.monotonic() - start, 0.05)
+
+        # 429 responses pause the method for Retry-After, whatever the header's case
+        attempts = []
+
+        def history(**kwargs):
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise SlackApiError("ratelimited", SimpleNamespace(status_code=429, headers={"Retry-After": "0.2"}))
+            if len(attempts) == 3:
+                raise SlackApiError("ratelimited", SimpleNamespace(status_code=429, headers={"retry-after": "0.3"}))
+            return {"ok": True, "messages": []}
+
+        response = await limiter.call("conversations.history", history, channel="C1")
+        self.assertEqual(response["ok"], True)
+        self.assertGreaterEqual(attempts[1] - attempts[0], 0.19)
+        await limiter.call("conversations.history", history, channel="C1")
+        self.assertGreaterEqual(attempts[3] - attempts[2], 0.29)
+        self.assertLess(attempts[3] - attempts[2], 0.9)
+        self.assertEqual(limiter.get_stats()["rate_limited"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()